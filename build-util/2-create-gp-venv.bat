@@ -103,6 +103,7 @@ pip3 install pandas
 pip3 install openpyxl
 pip3 install requests[security]
 pip3 install SQLAlchemy
+pip3 install pyarrow
 rem Deactivate the virtual environment
 call Scripts\deactivate.bat
 
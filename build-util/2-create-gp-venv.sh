@@ -369,18 +369,18 @@ createGptestVirtualenvCygwinAndLinux() {
 	# xlwt - create Excel spreadsheet files
 	echo "Installing required Python packages using pip"
 	# Full list
-	#pipPackages='openpyxl pandas PyQt5 requests[security] SQLAlchemy xlwt'
+	#pipPackages='openpyxl pandas pyarrow PyQt5 requests[security] SQLAlchemy xlwt'
 	if [ "${operatingSystem}" = "cygwin" ]; then
 		# Cygwin Python can install most packages with pip, but the following
 		# must be installed in Cygwin via the setup program because no pip version.
 		#	python3-pyqt5
-		pipPackages='openpyxl pandas requests[security] SQLAlchemy xlwt'
+		pipPackages='openpyxl pandas pyarrow requests[security] SQLAlchemy xlwt'
 	elif [ "${operatingSystem}" = "linux" ]; then
 		# Linux Python can install most packages with pip, but the following
 		# must be installed via apt-get because no pip version.
 		#	apt-get install python3-pyqt5
 		#	apt-get install python3-pandas
-		pipPackages='openpyxl requests[security] SQLAlchemy xlwt'
+		pipPackages='openpyxl pyarrow requests[security] SQLAlchemy xlwt'
 	fi
 	for pipPackage in $pipPackages; do
 		echo "Installing package ${pipPackage}"
@@ -531,6 +531,10 @@ if __name__ == '__main__':
     # Start the http server (will store True in the 'http' variable)
     # --http
     parser.add_argument("--http", action='store_true', help="Start the web server.")
+    # Set the memory budget for Tables and GeoLayers, for example 8GB (will store the string in "max_memory")
+    # --max-memory Size
+    parser.add_argument("--max-memory", help="Spill Tables and GeoLayers to disk to keep memory use below the size "
+                                             "(for example 512MB or 8GB).")
     # Define processor properties on the command line, assumed to be str property
     # -p PropertyName=PropertyValue
     # Evaluate later how to allow values with quotes but maybe shell will handle?
@@ -558,6 +562,9 @@ if __name__ == '__main__':
     if args.p:
         print("-p options: " + str(args.p))
         runtime_properties_cl = parse_command_line_properties(args.p)
+    if args.max_memory:
+        # Passed to the processor as the MaxMemory property, which is checked when commands are run
+        runtime_properties_cl['MaxMemory'] = args.max_memory
 
     # Launch a GeoProcessor based on command line parameters that control run mode
     if args.commands:
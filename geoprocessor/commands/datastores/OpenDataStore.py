@@ -27,6 +27,7 @@ from geoprocessor.core.DataStore import DataStore
 
 import geoprocessor.util.command_util as command_util
 import geoprocessor.util.io_util as io_util
+import geoprocessor.util.string_util as string_util
 import geoprocessor.util.validator_util as validators
 
 import logging
@@ -42,13 +43,20 @@ class OpenDataStore(AbstractCommand):
         exists within the GeoProcessor. Available options are: `Replace`, `Open`, `ReplaceAndWarn`, `Warn` and `Fail`
         (Refer to user documentation for detailed description.) Default value is `Replace`.
     * DatabaseDialect (str, required): The database type, used to format the database connection URL for the matching
-            database driver software. Currently the following are supported: PostgreSQL.
+            database driver software. Currently the following are supported: PostgreSQL, SQLite, GeoPackage.
+            GeoPackage DataStores can read all tables but can only write attribute (non-spatial) tables.
     * DatabaseServer (str, required): The database server name or IP address. Can be specified using ${Property}.
-    * DatabaseName (str, required): the name of the database. Can be specified using ${Property}.
+            Not used for SQLite and GeoPackage.
+    * DatabaseName (str, required): the name of the database. Can be specified using ${Property}. For SQLite and
+            GeoPackage, the path (relative or absolute) to the database file, or :memory: for an in-memory database.
     * DatabaseUser (str, required): The database user. A read-only "guest" (or similar) account should be used for
-            read-only operations, if possible. Can be specified using ${Property}.
+            read-only operations, if possible. Can be specified using ${Property}. Not used for SQLite and GeoPackage.
     * DatabasePassword (str, required): The database password. Can be specified using ${Property}.
+            Not used for SQLite and GeoPackage.
     * DatabasePort (str, optional): The database port.
+    * AttachDatabases (str, optional): SQLite and GeoPackage only. Other database files to attach to the DataStore,
+            using the syntax SchemaName1=Path1;SchemaName2=Path2. Attached tables are referenced in SQL as
+            SchemaName.TableName. Can be specified using ${Property}.
     * ConfigFile (str, required): The path (relative or full) to the configuration file.
     """
 
@@ -61,12 +69,16 @@ class OpenDataStore(AbstractCommand):
         CommandParameterMetadata("DatabaseUser", type("")),
         CommandParameterMetadata("DatabasePassword", type("")),
         CommandParameterMetadata("DatabasePort", type("")),
+        CommandParameterMetadata("AttachDatabases", type("")),
         CommandParameterMetadata("DataStoreID", type("")),
         CommandParameterMetadata("ConfigFile", type("")),
         CommandParameterMetadata("IfDataStoreIDExists", type(""))]
 
     # Choices for DatabaseDialect, used to validate parameter and display in editor
-    __choices_DatabaseDialect = ["PostGreSQL"]
+    __choices_DatabaseDialect = ["PostGreSQL", "SQLite", "GeoPackage"]
+
+    # Database dialects that use a local database file rather than a database server
+    __file_DatabaseDialects = ["SQLITE", "GEOPACKAGE"]
 
     # Choices for IfDataStoreIDExists, used to validate parameter and display in editor
     __choices_IfDataStoreIDExists = ["Replace", "Open", "Warn", "Fail", "ReplaceAndWarn"]
@@ -119,38 +131,49 @@ class OpenDataStore(AbstractCommand):
         self.parameter_input_metadata['DatabaseServer.Label'] = "Database Server"
         self.parameter_input_metadata['DatabaseServer.Required'] = True
         self.parameter_input_metadata['DatabaseServer.Tooltip'] = \
-            "The database server name or IP address.\nCan be specified using ${Property}."
+            "The database server name or IP address.\nCan be specified using ${Property}.\n" \
+            "Not used for SQLite and GeoPackage."
         # DatabaseDialect
         self.parameter_input_metadata['DatabaseDialect.Description'] = "the database dialect"
         self.parameter_input_metadata['DatabaseDialect.Label'] = "Database Dialect"
         self.parameter_input_metadata['DatabaseDialect.Required'] = True
         self.parameter_input_metadata['DatabaseDialect.Tooltip'] = \
             "The database dialect, used to format the database connection URL for the matching database driver " \
-            "software. "
+            "software.\nGeoPackage DataStores can read all tables but can only write attribute (non-spatial) tables."
+        self.parameter_input_metadata['DatabaseDialect.Values'] = ["", "PostGreSQL", "SQLite", "GeoPackage"]
         # DatabaseName
         self.parameter_input_metadata['DatabaseName.Description'] = "the name of the database"
         self.parameter_input_metadata['DatabaseName.Label'] = "Database Name"
         self.parameter_input_metadata['DatabaseName.Required'] = True
         self.parameter_input_metadata['DatabaseName.Tooltip'] = \
-            "The name of the database. Can be specified using ${Property}."
+            "The name of the database. Can be specified using ${Property}.\n" \
+            "For SQLite and GeoPackage, the path (relative or absolute) to the database file,\n" \
+            "or :memory: for an in-memory database."
         # DatabaseUser
         self.parameter_input_metadata['DatabaseUser.Description'] = "the database user"
         self.parameter_input_metadata['DatabaseUser.Label'] = "Database User"
         self.parameter_input_metadata['DatabaseUser.Required'] = True
         self.parameter_input_metadata['DatabaseUser.Tooltip'] = \
             "The database user. A read-only 'guest' (or similar) account should be used for read-only operations, " \
-            "if possible.\nCan be specified using ${Property}."
+            "if possible.\nCan be specified using ${Property}.\nNot used for SQLite and GeoPackage."
         # DatabasePassword
         self.parameter_input_metadata['DatabasePassword.Description'] = "the database password"
         self.parameter_input_metadata['DatabasePassword.Label'] = "Database Password"
         self.parameter_input_metadata['DatabasePassword.Required'] = True
         self.parameter_input_metadata['DatabasePassword.Tooltip'] = \
-            "The database password. Can be specified using ${Property}."
+            "The database password. Can be specified using ${Property}.\nNot used for SQLite and GeoPackage."
         # DatabasePort
         self.parameter_input_metadata['DatabasePort.Description'] = "the database port"
         self.parameter_input_metadata['DatabasePort.Label'] = "Database Port"
         self.parameter_input_metadata['DatabasePort.Tooltip'] = "The database port."
         self.parameter_input_metadata['DatabasePort.Value.Default'] = "The default port for the DatabaseDialect"
+        # AttachDatabases
+        self.parameter_input_metadata['AttachDatabases.Description'] = "database files to attach"
+        self.parameter_input_metadata['AttachDatabases.Label'] = "Attach Databases"
+        self.parameter_input_metadata['AttachDatabases.Tooltip'] = \
+            "SQLite and GeoPackage only. Other database files to attach, using the syntax:\n" \
+            "SchemaName1=Path1;SchemaName2=Path2\n" \
+            "Attached tables are referenced in SQL as SchemaName.TableName.\nCan be specified using ${Property}."
         # ConfigFile
         self.parameter_input_metadata['ConfigFile.Description'] = "the path to the file"
         self.parameter_input_metadata['ConfigFile.Label'] = "Config File"
@@ -218,8 +241,16 @@ class OpenDataStore(AbstractCommand):
         # If there is no value for ConfigFile, assume "Parameters configure datastore" method.
         else:
 
+            # Check that parameter DatabaseDialect is one of the acceptable values.
+            pv_DatabaseDialect = self.get_parameter_value(parameter_name="DatabaseDialect",
+                                                          command_parameters=command_parameters)
+
             # Check that the required parameters are non-empty, non-None string.
-            required_parameters = ["DatabaseServer", "DatabaseName", "DatabaseUser", "DatabasePassword"]
+            # File databases only require the database file.
+            if pv_DatabaseDialect and pv_DatabaseDialect.upper() in self.__file_DatabaseDialects:
+                required_parameters = ["DatabaseName"]
+            else:
+                required_parameters = ["DatabaseServer", "DatabaseName", "DatabaseUser", "DatabasePassword"]
             for parameter in required_parameters:
 
                 parameter_value = self.get_parameter_value(parameter_name=parameter,
@@ -233,10 +264,6 @@ class OpenDataStore(AbstractCommand):
                         CommandPhaseType.INITIALIZATION,
                         CommandLogRecord(CommandStatusType.FAILURE, message, recommendation))
 
-            # Check that parameter DatabaseDialect is one of the acceptable values.
-            pv_DatabaseDialect = self.get_parameter_value(parameter_name="DatabaseDialect",
-                                                          command_parameters=command_parameters)
-
             if not validators.validate_string_in_list(pv_DatabaseDialect, self.__choices_DatabaseDialect, False, False,
                                                       True):
                 message = "DatabaseDialect parameter value ({}) is not recognized.".format(pv_DatabaseDialect)
@@ -246,6 +273,19 @@ class OpenDataStore(AbstractCommand):
                 self.command_status.add_to_log(CommandPhaseType.INITIALIZATION,
                                                CommandLogRecord(CommandStatusType.FAILURE, message, recommendation))
 
+            # Check that the AttachDatabases parameter is only used with file databases.
+            pv_AttachDatabases = self.get_parameter_value(parameter_name="AttachDatabases",
+                                                          command_parameters=command_parameters)
+
+            if pv_AttachDatabases and pv_DatabaseDialect and \
+                    pv_DatabaseDialect.upper() not in self.__file_DatabaseDialects:
+                message = "AttachDatabases parameter is not supported for DatabaseDialect {}.".format(
+                    pv_DatabaseDialect)
+                recommendation = "Only specify the AttachDatabases parameter for SQLite and GeoPackage."
+                warning += "\n" + message
+                self.command_status.add_to_log(CommandPhaseType.INITIALIZATION,
+                                               CommandLogRecord(CommandStatusType.FAILURE, message, recommendation))
+
         # Check for unrecognized parameters.
         # This returns a message that can be appended to the warning, which if non-empty triggers an exception below.
         warning = command_util.validate_command_parameter_names(self, warning)
@@ -330,6 +370,7 @@ class OpenDataStore(AbstractCommand):
         pv_DatabaseUser = self.get_parameter_value("DatabaseUser")
         pv_DatabasePassword = self.get_parameter_value("DatabasePassword")
         pv_DatabasePort = self.get_parameter_value("DatabasePort")
+        pv_AttachDatabases = self.get_parameter_value("AttachDatabases")
         pv_DataStoreID = self.get_parameter_value("DataStoreID")
         pv_ConfigFile = self.get_parameter_value("ConfigFile")
         pv_IfDataStoreIDExists = self.get_parameter_value("IfDataStoreIDExists", default_value="Replace")
@@ -339,6 +380,19 @@ class OpenDataStore(AbstractCommand):
         pv_DatabaseName = self.command_processor.expand_parameter_value(pv_DatabaseName, self)
         pv_DatabaseUser = self.command_processor.expand_parameter_value(pv_DatabaseUser, self)
         pv_DatabasePassword = self.command_processor.expand_parameter_value(pv_DatabasePassword, self)
+        pv_AttachDatabases = self.command_processor.expand_parameter_value(pv_AttachDatabases, self)
+
+        # For file databases, convert the DatabaseName and attached database paths to absolute paths.
+        attach_databases = {}
+        if pv_DatabaseDialect and pv_DatabaseDialect.upper() in self.__file_DatabaseDialects:
+            working_dir = self.command_processor.get_property('WorkingDir')
+            if pv_DatabaseName and pv_DatabaseName != ":memory:":
+                pv_DatabaseName = io_util.verify_path_for_os(io_util.to_absolute_path(working_dir, pv_DatabaseName))
+            if pv_AttachDatabases:
+                attach_databases = string_util.delimited_string_to_dictionary_one_value(pv_AttachDatabases)
+                for schema_name, database_file in attach_databases.items():
+                    attach_databases[schema_name] = io_util.verify_path_for_os(
+                        io_util.to_absolute_path(working_dir, database_file))
 
         # Convert the File parameter value relative path to an absolute path and expand for ${Property} syntax.
         if pv_ConfigFile:
@@ -375,6 +429,18 @@ class OpenDataStore(AbstractCommand):
                         new_datastore.get_db_uri_postgres(pv_DatabaseServer, pv_DatabaseName, pv_DatabaseUser,
                                                           pv_DatabasePassword, pv_DatabasePort)
 
+                    elif pv_DatabaseDialect.upper() == "SQLITE":
+
+                        new_datastore.get_db_uri_sqlite(pv_DatabaseName)
+
+                    elif pv_DatabaseDialect.upper() == "GEOPACKAGE":
+
+                        new_datastore.get_db_uri_geopackage(pv_DatabaseName)
+
+                    # Attach the other database files to the file database.
+                    for schema_name, database_file in attach_databases.items():
+                        new_datastore.attach_database(schema_name, database_file)
+
                     # Open a connection to the database and add the DataStore object to the GeoProcessor.
                     new_datastore.open_db_connection()
                     self.command_processor.add_datastore(new_datastore)
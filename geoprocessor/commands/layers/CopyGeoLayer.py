@@ -259,28 +259,20 @@ class CopyGeoLayer(AbstractCommand):
 
                 # Get the input GeoLayer.
                 input_geolayer = self.command_processor.get_geolayer(pv_GeoLayerID)
-                copied_geolayer = input_geolayer.deepcopy(pv_CopiedGeoLayerID)
 
-                # If the features are configured to be removed, continue.
-                if pv_IncludeFeaturesIf:
+                # Get the names of the attributes to copy.
+                attrs_to_copy = string_util.filter_list_of_strings(input_geolayer.get_attribute_field_names(),
+                                                                   attrs_to_include, attrs_to_exclude)
 
-                    # Get the QGSExpression object.
+                # Get the QGSExpression object of the features to copy, if the features are configured to be filtered.
+                if pv_IncludeFeaturesIf:
                     exp = qgis_util.get_qgsexpression_obj(pv_IncludeFeaturesIf)
+                else:
+                    exp = None
 
-                    # Get a list of Qgs Feature objects that do not match the IncludeFeaturesIf parameter criteria.
-                    non_matching_features = qgis_util.get_features_not_matching_expression(
-                        copied_geolayer.qgs_vector_layer, exp)
-
-                    # Get the ids of the matching features.
-                    non_matching_feats_ids = []
-                    for feat in non_matching_features:
-                        non_matching_feats_ids.append(feat.id())
-
-                    # Delete the non-matching features.
-                    qgis_util.remove_qgsvectorlayer_features(copied_geolayer.qgs_vector_layer, non_matching_feats_ids)
-
-                # Remove the attributes of the copied GeoLayer if configured to be excluded.
-                copied_geolayer.remove_attributes(attrs_to_include, attrs_to_exclude)
+                # Copy the GeoLayer. The feature filter and the attributes are applied as the input features are read,
+                # so features and attributes that are not copied are not read or copied.
+                copied_geolayer = input_geolayer.deepcopy(pv_CopiedGeoLayerID, attrs_to_copy, exp)
 
                 # Add the copied GeoLayer to the GeoProcessor's geolayers list.
                 self.command_processor.add_geolayer(copied_geolayer)
@@ -181,14 +181,11 @@ class FreeGeoLayers(AbstractCommand):
                     # Get GeoLayer to remove.
                     geolayer = self.command_processor.get_geolayer(geolayer_id)
 
-                    # Remove the GeoLayer from the GeoProcessor's geolayers list.
-                    index = self.command_processor.geolayers.index(geolayer)
-                    del self.command_processor.geolayers[index]
+                    # Remove the GeoLayer from the GeoProcessor's geolayers list. The GeoProcessor also stops managing
+                    # the memory of the GeoLayer.
+                    self.command_processor.free_geolayer(geolayer)
 
-                    # Delete the Qgs Vector Layer object.
-                    del geolayer.qgs_vector_layer
-
-                    # Delete the GeoLayer.
+                    # Delete the GeoLayer. The Qgs Vector Layer object is released with the GeoLayer.
                     del geolayer
 
             # Raise an exception if an unexpected error occurs during the process.
@@ -366,6 +366,10 @@ class IntersectGeoLayer(AbstractCommand):
         for input_attr in attributes_to_join:
             intersect_layer_attrs_to_add_idx.append(intersect_layer.fieldNameIndex(input_attr))
 
+        # The attribute values to change in the target layer, applied in batches after all attributes are processed.
+        # KEY: target feature id VALUE: attribute dictionary (KEY: target attribute index VALUE: new attribute value)
+        target_attr_changes = {}
+
         # Iterate over the intersect layer's attributes to add as indexes.
         for intersect_attr_to_add_idx in intersect_layer_attrs_to_add_idx:
 
@@ -390,11 +394,8 @@ class IntersectGeoLayer(AbstractCommand):
                 # Get the intersect attribute value.
                 intersect_feat_value = intersect_feat.attributes()[intersect_attr_to_add_idx]
 
-                # Create an an attribute dictionary. KEY: target attribute index VALUE: new attribute value
-                attr_dic = {target_attr_idx: intersect_feat_value}
-
-                # Add the correct attribute value to the target layer.
-                target_layer.dataProvider().changeAttributeValues(({target_feat.id(): attr_dic}))
+                # Add the correct attribute value to the target feature's attribute dictionary.
+                target_attr_changes.setdefault(target_feat.id(), {})[target_attr_idx] = intersect_feat_value
 
             # Iterate over the intersect dictionary.
             for target_feat, intersect_feats in intersecting_target_feats.items():
@@ -424,11 +425,11 @@ class IntersectGeoLayer(AbstractCommand):
                     elif statistic_summary.upper() == "MAX":
                         intersect_feat_value_updated = max(list_of_intersect_attr_values)
 
-                # Create an an attribute dictionary. KEY: target attribute index VALUE: new attribute value
-                attr_dic = {target_attr_idx: intersect_feat_value_updated}
+                # Add the correct attribute value to the target feature's attribute dictionary.
+                target_attr_changes.setdefault(target_feat.id(), {})[target_attr_idx] = intersect_feat_value_updated
 
-                # Add the correct attribute value to the target layer.
-                target_layer.dataProvider().changeAttributeValues(({target_feat.id(): attr_dic}))
+        # Add the attribute values to the target layer, in batches rather than one data provider call per feature.
+        qgis_util.change_qgsvectorlayer_attribute_values(target_layer, target_attr_changes)
 
         # Create a new GeoLayer and add it to the GeoProcessor's geolayers list.
         # intersected_output["OUTPUT"] returns the full file pathname of the memory output layer (saved
@@ -537,8 +538,7 @@ class IntersectGeoLayer(AbstractCommand):
                                                                pv_OutputGeoLayerID)
 
                 # Remove the copied intersect GeoLayer from the GeoProcessor's geolayers list. Delete the GeoLayer.
-                index = self.command_processor.geolayers.index(intersect_geolayer_copy)
-                del self.command_processor.geolayers[index]
+                self.command_processor.free_geolayer(intersect_geolayer_copy)
                 del intersect_geolayer_copy
 
             # Raise an exception if an unexpected error occurs during the process
@@ -31,9 +31,6 @@ import geoprocessor.util.string_util as string_util
 import geoprocessor.util.validator_util as validators
 
 import logging
-import os
-
-from plugins.processing.tools import general
 
 
 class MergeGeoLayers(AbstractCommand):
@@ -45,9 +42,11 @@ class MergeGeoLayers(AbstractCommand):
     * The attributes of the input GeoLayers are retained within the output GeoLayer attribute tables.
     * Attributes that share the same name will be converged in the output GeoLayer attribute tables.
     * Attributes that are unique to an input GeoLayer are included in the output GeoLayer attribute tables - features
-        from GeoLayers that don't have that unique attribute will have an attribute value of '0' for that unique field.
+        from GeoLayers that don't have that unique attribute will have a NULL value for that unique field.
     * Attributes from different input GeoLayers (with different names) that are meant to be converged in the output
         GeoLayer can be managed with the AttributeMap.
+    * The features are added to the output GeoLayer in batches as they are read from each input GeoLayer, so the input
+        GeoLayers are not copied or written to temporary files.
 
     Command Parameters
     * GeoLayerIDs (list of strings, required): a list of the IDs of the GeoLayers to be merged. Can be '*' where all
@@ -426,77 +425,26 @@ class MergeGeoLayers(AbstractCommand):
 
             try:
 
-                # A list to hold the GeoLayer IDs of the copied GeoLayers. Copied GeoLayers are only required for this
-                # command. They will be removed from the GeoProcessor (to save processing space and speed) after the
-                # processing has been completed. This list will be used to remove the copied GeoLayers.
-                copied_geolayer_ids = []
-
-                # A list to hold the full pathname of the copied GeoLayers (written to disk). The
-                # qgis:mergevectorlayers requires that the QGSVectorLayer objects are not in memory. This list will be
-                # used as an input to the qgis:mergevectorlayers algorithm.
-                copied_geolayer_sourcepath = []
-
-                first_geolayer = self.command_processor.get_geolayer(list_of_geolayer_ids[0])
-                first_crs = first_geolayer.get_crs()
-
-                # Iterate over the GeoLayers to be merged.
+                # Get the GeoLayers to be merged and, for each GeoLayer, an attribute dictionary mapping the GeoLayer
+                # attributes that are to be renamed. Key: Existing attribute name. Value: New attribute name.
+                # The input GeoLayers are not copied or modified. The attributes are renamed as the features are added
+                # to the merged GeoLayer.
+                geolayers = []
+                attribute_dictionaries = []
                 for geolayer_id in list_of_geolayer_ids:
-
-                    # Get the appropriate GeoLayer based on the GeoLayer ID.
                     geolayer = self.command_processor.get_geolayer(geolayer_id)
+                    geolayers.append(geolayer)
+                    attribute_dictionaries.append(self.__create_attribute_dictionary(geolayer, attribute_map_dic))
 
-                    # Get an attribute dictionary mapping the GeoLayer attributes that are to be renamed.
-                    # Key: Existing attribute name. Value: New attribute name.
-                    attribute_dictionary = self.__create_attribute_dictionary(geolayer, attribute_map_dic)
-
-                    # Make a copy of the GeoLayer and add it to the GeoProcessor. Renaming of attributes will occur on
-                    # a copy of the GeoLayer so that the original GeoLayer's attribute values are not affected.
-                    copied_geolayer = geolayer.deepcopy("{}_copyForMerge".format(geolayer_id))
-                    self.command_processor.add_geolayer(copied_geolayer)
-
-                    # Add the copied GeoLayer ID to the master list.
-                    copied_geolayer_ids.append(copied_geolayer.id)
-
-                    # Iterate over the GeoLayer's attribute dictionary.
-                    for existing_attr_name, new_attr_name in attribute_dictionary.items():
-
-                        # If the attribute should be renamed, then rename the attribute in the copied GeoLayer.
-                        if not (existing_attr_name == new_attr_name):
-                            copied_geolayer.rename_attribute(existing_attr_name, new_attr_name)
-
-                    # Write copied GeoLayer (memory) to the temporary directory (written to disk).
-                    output_file_absolute = os.path.join(self.command_processor.get_property('TempDir'),
-                                                        copied_geolayer.id)
-                    on_disk_geolayer = copied_geolayer.write_to_disk(output_file_absolute)
-
-                    # Overwrite the copied (memory) GeoLayer in the geoprocessor with the on-disk GeoLayer.
-                    self.command_processor.add_geolayer(on_disk_geolayer)
-
-                    # Add the source path of the copied on-disk GeoLayer to the master list.
-                    copied_geolayer_sourcepath.append(on_disk_geolayer.source_path)
-
-                # Merge all of the copied GeoLayers (the GeoLayers with the new attribute names).
-                # Using QGIS algorithm but can also use saga:mergelayers algorithm.
-                # saga:mergelayers documentation at http://www.saga-gis.org/saga_tool_doc/2.3.0/shapes_tools_2.html
-                alg_parameters = {"LAYERS": copied_geolayer_sourcepath,
-                                  "CRS": first_crs,
-                                  "OUTPUT": "memory:"}
-                merged_output = self.command_processor.qgis_processor.runAlgorithm("qgis:mergevectorlayers",
-                                                                                   alg_parameters)
+                # Merge the features of all GeoLayers into one in-memory layer, in batches, using the CRS of the first
+                # GeoLayer.
+                first_crs = geolayers[0].qgs_vector_layer.crs()
+                merged_qgsvectorlayer = qgis_util.merge_qgsvectorlayers(
+                    [geolayer.qgs_vector_layer for geolayer in geolayers], attribute_dictionaries, first_crs,
+                    layer_name=pv_OutputGeoLayerID)
 
                 # Create a new GeoLayer and add it to the GeoProcessor's geolayers list.
-                # in QGIS3, merged_output["OUTPUT"] returns the returns the QGS vector layer object
-                # see ClipGeoLayer.py for information about value in QGIS2 environment
-                self.command_processor.add_geolayer(GeoLayer(pv_OutputGeoLayerID, merged_output["OUTPUT"], "MEMORY"))
-
-                # Release the copied GeoLayers from the GeoProcessor.
-                for copied_geolayer_id in copied_geolayer_ids:
-
-                    # Get the copied GeoLayer based on the GeoLayer ID.
-                    copied_geolayer = self.command_processor.get_geolayer(copied_geolayer_id)
-
-                    # Remove the copied GeoLayer from the GeoProcessor
-                    self.command_processor.free_geolayer(copied_geolayer)
+                self.command_processor.add_geolayer(GeoLayer(pv_OutputGeoLayerID, merged_qgsvectorlayer, "MEMORY"))
 
             # Raise an exception if an unexpected error occurs during the process
             except Exception as e:
@@ -28,6 +28,7 @@ from geoprocessor.core.GeoLayer import GeoLayer
 import geoprocessor.util.command_util as command_util
 import geoprocessor.util.qgis_util as qgis_util
 import geoprocessor.util.io_util as io_util
+import geoprocessor.util.string_util as string_util
 import geoprocessor.util.validator_util as validators
 
 import logging
@@ -51,6 +52,7 @@ class ReadGeoLayerFromDelimitedFile(AbstractCommand):
 
     Command Parameters
     * DelimitedFile (str, required): The path (relative or absolute) to the delimited file to be read.
+        The file can be compressed with gzip (.gz) or zip (.zip), in which case it is decompressed as it is read.
     * GeometryFormat (str, required): The geometry representation used within the delimited file. Must either be `XY`
         or `WKT`.
     * XColumn (str, required if GeometryFormat is `XY`): The name of the delimited file column that holds the x
@@ -68,6 +70,13 @@ class ReadGeoLayerFromDelimitedFile(AbstractCommand):
     * IfGeoLayerIDExists (str, optional): This parameter determines the action that occurs if the CopiedGeoLayerID
         already exists within the GeoProcessor. Available options are: `Replace`, `ReplaceAndWarn`, `Warn` and `Fail`
         (Refer to user documentation for detailed description.) Default value is `Replace`.
+    * IncludeAttributes (str, optional): A list of glob-style patterns of the attributes to read.
+        Default: * (All attributes are read).
+    * ExcludeAttributes (str, optional): A list of glob-style patterns of the attributes to not read.
+        Default: '' (No attributes are excluded).
+
+    If attributes are selected, the features are copied to an in-memory layer with only the selected attributes. The
+    geometry is created from the coordinate or WKT columns even if those columns are not selected.
     """
 
     # Define the command parameters.
@@ -80,7 +89,9 @@ class ReadGeoLayerFromDelimitedFile(AbstractCommand):
         CommandParameterMetadata("CRS", type("")),
         CommandParameterMetadata("Delimiter", type("")),
         CommandParameterMetadata("GeoLayerID", type("")),
-        CommandParameterMetadata("IfGeoLayerIDExists", type(""))]
+        CommandParameterMetadata("IfGeoLayerIDExists", type("")),
+        CommandParameterMetadata("IncludeAttributes", type("")),
+        CommandParameterMetadata("ExcludeAttributes", type(""))]
 
     def __init__(self):
         """
@@ -103,8 +114,9 @@ class ReadGeoLayerFromDelimitedFile(AbstractCommand):
         self.parameter_input_metadata['DelimitedFile.Description'] = "delimited file to read"
         self.parameter_input_metadata['DelimitedFile.Label'] = "Delimited file"
         self.parameter_input_metadata['DelimitedFile.Required'] = True
-        self.parameter_input_metadata['DelimitedFile.Tooltip'] =\
-            "The delimited file to read (relative or absolute path). ${Property} syntax is recognized."
+        self.parameter_input_metadata['DelimitedFile.Tooltip'] = (
+            "The delimited file to read (relative or absolute path). ${Property} syntax is recognized.\n"
+            "The file can be compressed with gzip (.gz) or zip (.zip).")
         self.parameter_input_metadata['DelimitedFile.FileSelector.Type'] = "Read"
         self.parameter_input_metadata['DelimitedFile.FileSelector.Title'] = "Select a delimited file to read."
         # CRS
@@ -174,6 +186,18 @@ class ReadGeoLayerFromDelimitedFile(AbstractCommand):
             "Fail : The new GeoLayer is not created. A fail message is logged.")
         self.parameter_input_metadata['IfGeoLayerIDExists.Values'] = ["", "Replace", "ReplaceAndWarn", "Warn", "Fail"]
         self.parameter_input_metadata['IfGeoLayerIDExists.Value.Default'] = "Replace"
+        # IncludeAttributes
+        self.parameter_input_metadata['IncludeAttributes.Description'] = "attributes to read"
+        self.parameter_input_metadata['IncludeAttributes.Label'] = "Include attributes"
+        self.parameter_input_metadata['IncludeAttributes.Tooltip'] = (
+            "A comma-separated list of the glob-style patterns filtering which attributes to read.")
+        self.parameter_input_metadata['IncludeAttributes.Value.Default'] = "*"
+        # ExcludeAttributes
+        self.parameter_input_metadata['ExcludeAttributes.Description'] = "attributes to not read"
+        self.parameter_input_metadata['ExcludeAttributes.Label'] = "Exclude attributes"
+        self.parameter_input_metadata['ExcludeAttributes.Tooltip'] = (
+            "A comma-separated list of the glob-style patterns filtering which attributes to not read.")
+        self.parameter_input_metadata['ExcludeAttributes.Value.Default'] = "'' (empty string)"
 
         # Class data
         self.warning_count = 0
@@ -320,6 +344,19 @@ class ReadGeoLayerFromDelimitedFile(AbstractCommand):
         # If the Delimited File exists, continue with the following checks.
         if should_run_command[0] is True:
 
+            # If the Delimited File is compressed with bzip2 or xz, raise a FAILURE. GDAL can only decompress gzip and
+            # zip files as they are read.
+            compression_type = io_util.get_compression_type(delimited_file)
+            if compression_type in ["BZ2", "XZ"]:
+                message = 'The DelimitedFile ({}) is compressed with {}, which cannot be read as a GeoLayer.'.format(
+                    delimited_file, compression_type)
+                recommendation = "Compress the delimited file with gzip (.gz) or zip (.zip)."
+                self.warning_count += 1
+                self.logger.error(message)
+                self.command_status.add_to_log(CommandPhaseType.RUN,
+                                               CommandLogRecord(CommandStatusType.FAILURE, message, recommendation))
+                should_run_command.append(False)
+
             # If the geometry format is "XY", continue.
             if geom_format.upper() == "XY":
 
@@ -373,6 +410,17 @@ class ReadGeoLayerFromDelimitedFile(AbstractCommand):
         pv_WKTColumn = self.get_parameter_value("WKTColumn", default_value=None)
         pv_CRS = self.get_parameter_value("CRS")
         pv_GeoLayerID = self.get_parameter_value("GeoLayerID", default_value='%f')
+        pv_IncludeAttributes = self.get_parameter_value("IncludeAttributes")
+        pv_ExcludeAttributes = self.get_parameter_value("ExcludeAttributes")
+
+        # Convert the IncludeAttributes and ExcludeAttributes parameter values to lists of glob-style patterns. An empty
+        # parameter value is the same as the default.
+        include_attributes = None
+        if pv_IncludeAttributes:
+            include_attributes = string_util.delimited_string_to_list(pv_IncludeAttributes)
+        exclude_attributes = None
+        if pv_ExcludeAttributes:
+            exclude_attributes = string_util.delimited_string_to_list(pv_ExcludeAttributes)
 
         # Convert the DelimitedFile parameter value relative path to an absolute path and expand for ${Property}
         # syntax
@@ -404,6 +452,12 @@ class ReadGeoLayerFromDelimitedFile(AbstractCommand):
                                                                                              pv_Delimiter, pv_CRS,
                                                                                              pv_WKTColumn)
 
+                # Only keep the selected attributes.
+                if include_attributes or exclude_attributes:
+                    qgs_vector_layer = qgis_util.subset_qgsvectorlayer(qgs_vector_layer,
+                                                                       include_attributes=include_attributes,
+                                                                       exclude_attributes=exclude_attributes)
+
                 # Create a GeoLayer and add it to the geoprocessor's GeoLayers list.
                 geolayer_obj = GeoLayer(pv_GeoLayerID, qgs_vector_layer, delimited_file_abs)
                 self.command_processor.add_geolayer(geolayer_obj)
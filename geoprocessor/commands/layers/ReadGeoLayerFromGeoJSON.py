@@ -24,14 +24,18 @@ from geoprocessor.core.CommandParameterMetadata import CommandParameterMetadata
 from geoprocessor.core.CommandPhaseType import CommandPhaseType
 from geoprocessor.core.CommandStatusType import CommandStatusType
 from geoprocessor.core.GeoLayer import GeoLayer
+from geoprocessor.core.LazyGeoLayer import LazyGeoLayer
 
 import geoprocessor.util.command_util as command_util
+import geoprocessor.util.gdal_util as gdal_util
 import geoprocessor.util.qgis_util as qgis_util
 import geoprocessor.util.io_util as io_util
+import geoprocessor.util.string_util as string_util
 import geoprocessor.util.validator_util as validators
 
 import os
 import logging
+import tempfile
 
 
 class ReadGeoLayerFromGeoJSON(AbstractCommand):
@@ -59,17 +63,58 @@ class ReadGeoLayerFromGeoJSON(AbstractCommand):
     * IfGeoLayerIDExists (str, optional): This parameter determines the action that occurs if the CopiedGeoLayerID
         already exists within the GeoProcessor. Available options are: `Replace`, `ReplaceAndWarn`, `Warn` and `Fail`
         (Refer to user documentation for detailed description.) Default value is `Replace`.
+    * InputFormat (str, optional): the format of the file. Available options are:
+        * GeoJSON: a single GeoJSON FeatureCollection or Feature. Default.
+        * GeoJSONSeq: newline-delimited GeoJSON (GeoJSON text sequence), with one feature per line. A GeoJSONSeq file
+            is always streamed.
+    * StreamRead (boolean, optional): If TRUE, the file is parsed incrementally and the features are added to the
+        GeoLayer in batches, rather than the whole document being loaded by OGR. Use for very large files.
+        Default: False.
+    * StreamStorage (str, optional): where the features of a streamed file are stored. Available options are `Memory`
+        and `GeoPackage` (a GeoPackage file in the TempDir folder). Default: Memory. A GeoLayer stored in a GeoPackage
+        stays on disk until its features are first used, when they are copied to memory. The GeoLayer has the same
+        attributes for both options: the GeoPackage feature ID column is not included.
+    * BoundingBox (str, optional): the bounding box of the features to read, as comma-separated values
+        `xmin,ymin,xmax,ymax` in the coordinate reference system of the file. Only the features that intersect the
+        bounding box are read. Cannot be used with ClipGeoLayerID.
+    * ClipGeoLayerID (str, optional): the identifier of a GeoLayer. Only the features that intersect the extent of the
+        GeoLayer are read. Cannot be used with BoundingBox.
+    * Where (str, optional): an OGR SQL WHERE clause (for example, COUNTY = 'Larimer'). Only the features that match
+        the clause are read.
+    * IncludeAttributes (str, optional): A list of glob-style patterns of the attributes to read.
+        Default: * (All attributes are read).
+    * ExcludeAttributes (str, optional): A list of glob-style patterns of the attributes to not read.
+        Default: '' (No attributes are excluded).
+
+    The BoundingBox, ClipGeoLayerID and Where filters are passed to OGR, so that features that do not match are not
+    decoded. When the file is streamed, the BoundingBox is applied while the features are parsed, and the
+    ClipGeoLayerID and Where filters are applied to the streamed features. The attributes that are not read are not
+    stored.
     """
 
     # Define the command parameters.
     __command_parameter_metadata = [
         CommandParameterMetadata("SpatialDataFile", type("")),
         CommandParameterMetadata("GeoLayerID", type("")),
-        CommandParameterMetadata("IfGeoLayerIDExists", type(""))]
+        CommandParameterMetadata("IfGeoLayerIDExists", type("")),
+        CommandParameterMetadata("InputFormat", type("")),
+        CommandParameterMetadata("StreamRead", type(True)),
+        CommandParameterMetadata("StreamStorage", type("")),
+        CommandParameterMetadata("BoundingBox", type("")),
+        CommandParameterMetadata("ClipGeoLayerID", type("")),
+        CommandParameterMetadata("Where", type("")),
+        CommandParameterMetadata("IncludeAttributes", type("")),
+        CommandParameterMetadata("ExcludeAttributes", type(""))]
 
     # Choices for IfGeoLayerIDExists, used to validate parameter and display in editor
     __choices_IfGeoLayerIDExists = ["Replace", "ReplaceAndWarn", "Warn", "Fail"]
 
+    # Choices for InputFormat, used to validate parameter and display in editor
+    __choices_InputFormat = ["GeoJSON", "GeoJSONSeq"]
+
+    # Choices for StreamStorage, used to validate parameter and display in editor
+    __choices_StreamStorage = ["Memory", "GeoPackage"]
+
     def __init__(self):
         """
         Initialize the command.
@@ -116,6 +161,65 @@ class ReadGeoLayerFromGeoJSON(AbstractCommand):
             "  Fail : The new GeoLayer is not created. A fail message is logged.")
         self.parameter_input_metadata['IfGeoLayerIDExists.Values'] = ["", "Replace", "ReplaceAndWarn", "Warn", "Fail"]
         self.parameter_input_metadata['IfGeoLayerIDExists.Value.Default'] = "Replace"
+        # InputFormat
+        self.parameter_input_metadata['InputFormat.Description'] = "format of the file"
+        self.parameter_input_metadata['InputFormat.Label'] = "Input format"
+        self.parameter_input_metadata['InputFormat.Tooltip'] = (
+            "The format of the file.\n"
+            "GeoJSON : a single GeoJSON FeatureCollection or Feature.\n"
+            "GeoJSONSeq : newline-delimited GeoJSON, with one feature per line. The file is always streamed.")
+        self.parameter_input_metadata['InputFormat.Values'] = ["", "GeoJSON", "GeoJSONSeq"]
+        self.parameter_input_metadata['InputFormat.Value.Default'] = "GeoJSON"
+        # StreamRead
+        self.parameter_input_metadata['StreamRead.Description'] = "whether to parse the file incrementally"
+        self.parameter_input_metadata['StreamRead.Label'] = "Stream read?"
+        self.parameter_input_metadata['StreamRead.Tooltip'] = (
+            "If TRUE, the file is parsed one feature at a time and the features are added to the GeoLayer in "
+            "batches,\nrather than the whole document being loaded into memory. Use for very large files.")
+        self.parameter_input_metadata['StreamRead.Value.Default'] = "FALSE"
+        self.parameter_input_metadata['StreamRead.Values'] = ["", "TRUE", "FALSE"]
+        # StreamStorage
+        self.parameter_input_metadata['StreamStorage.Description'] = "storage of streamed features"
+        self.parameter_input_metadata['StreamStorage.Label'] = "Stream storage"
+        self.parameter_input_metadata['StreamStorage.Tooltip'] = (
+            "Where the features of a streamed file are stored.\n"
+            "Memory : the features are stored in memory.\n"
+            "GeoPackage : the features are stored in a GeoPackage file in the TempDir folder.")
+        self.parameter_input_metadata['StreamStorage.Values'] = ["", "Memory", "GeoPackage"]
+        self.parameter_input_metadata['StreamStorage.Value.Default'] = "Memory"
+        # BoundingBox
+        self.parameter_input_metadata['BoundingBox.Description'] = "bounding box of the features to read"
+        self.parameter_input_metadata['BoundingBox.Label'] = "Bounding box"
+        self.parameter_input_metadata['BoundingBox.Tooltip'] = (
+            "The bounding box of the features to read, as comma-separated values xmin,ymin,xmax,ymax\n"
+            "in the coordinate reference system of the file. Cannot be used with ClipGeoLayerID.")
+        self.parameter_input_metadata['BoundingBox.Value.Default.Description'] = "all features are read"
+        # ClipGeoLayerID
+        self.parameter_input_metadata['ClipGeoLayerID.Description'] = "GeoLayer with the extent to read"
+        self.parameter_input_metadata['ClipGeoLayerID.Label'] = "Clip GeoLayerID"
+        self.parameter_input_metadata['ClipGeoLayerID.Tooltip'] = (
+            "The identifier of a GeoLayer. Only the features that intersect the extent of the GeoLayer are read.\n"
+            "${Property} syntax is recognized. Cannot be used with BoundingBox.")
+        self.parameter_input_metadata['ClipGeoLayerID.Value.Default.Description'] = "all features are read"
+        # Where
+        self.parameter_input_metadata['Where.Description'] = "attribute filter"
+        self.parameter_input_metadata['Where.Label'] = "Where"
+        self.parameter_input_metadata['Where.Tooltip'] = (
+            "An OGR SQL WHERE clause (for example, COUNTY = 'Larimer'). Only the features that match the clause are "
+            "read.\n${Property} syntax is recognized.")
+        self.parameter_input_metadata['Where.Value.Default.Description'] = "all features are read"
+        # IncludeAttributes
+        self.parameter_input_metadata['IncludeAttributes.Description'] = "attributes to read"
+        self.parameter_input_metadata['IncludeAttributes.Label'] = "Include attributes"
+        self.parameter_input_metadata['IncludeAttributes.Tooltip'] = (
+            "A comma-separated list of the glob-style patterns filtering which attributes to read.")
+        self.parameter_input_metadata['IncludeAttributes.Value.Default'] = "*"
+        # ExcludeAttributes
+        self.parameter_input_metadata['ExcludeAttributes.Description'] = "attributes to not read"
+        self.parameter_input_metadata['ExcludeAttributes.Label'] = "Exclude attributes"
+        self.parameter_input_metadata['ExcludeAttributes.Tooltip'] = (
+            "A comma-separated list of the glob-style patterns filtering which attributes to not read.")
+        self.parameter_input_metadata['ExcludeAttributes.Value.Default'] = "'' (empty string)"
 
         # Class data
         self.warning_count = 0
@@ -163,6 +267,34 @@ class ReadGeoLayerFromGeoJSON(AbstractCommand):
                 CommandPhaseType.INITIALIZATION,
                 CommandLogRecord(CommandStatusType.FAILURE, message, recommendation))
 
+        # Check that optional parameters InputFormat and StreamStorage are one of the acceptable values or are None.
+        for parameter_name, choices in [("InputFormat", self.__choices_InputFormat),
+                                        ("StreamStorage", self.__choices_StreamStorage)]:
+            parameter_value = self.get_parameter_value(parameter_name=parameter_name,
+                                                       command_parameters=command_parameters)
+            if not validators.validate_string_in_list(parameter_value, choices, none_allowed=True,
+                                                      empty_string_allowed=True, ignore_case=True):
+                message = "{} parameter value ({}) is not recognized.".format(parameter_name, parameter_value)
+                recommendation = "Specify one of the acceptable values ({}) for the {} parameter.".format(
+                    choices, parameter_name)
+                warning += "\n" + message
+                self.command_status.add_to_log(
+                    CommandPhaseType.INITIALIZATION,
+                    CommandLogRecord(CommandStatusType.FAILURE, message, recommendation))
+
+        # Check that optional StreamRead parameter value is a valid Boolean value or is None.
+        pv_StreamRead = self.get_parameter_value(parameter_name="StreamRead", command_parameters=command_parameters)
+        if not validators.validate_bool(pv_StreamRead, none_allowed=True, empty_string_allowed=False):
+            message = "StreamRead parameter value ({}) is not a recognized boolean value.".format(pv_StreamRead)
+            recommendation = "Specify either 'True' or 'False for the StreamRead parameter."
+            warning += "\n" + message
+            self.command_status.add_to_log(
+                CommandPhaseType.INITIALIZATION,
+                CommandLogRecord(CommandStatusType.FAILURE, message, recommendation))
+
+        # Check that optional parameter BoundingBox is a valid bounding box and is not used with ClipGeoLayerID.
+        warning = command_util.check_read_bbox_parameters(self, command_parameters, warning)
+
         # Check for unrecognized parameters.
         # This returns a message that can be appended to the warning, which if non-empty triggers an exception below.
         warning = command_util.validate_command_parameter_names(self, warning)
@@ -175,17 +307,20 @@ class ReadGeoLayerFromGeoJSON(AbstractCommand):
             # Refresh the phase severity
             self.command_status.refresh_phase_severity(CommandPhaseType.INITIALIZATION, CommandStatusType.SUCCESS)
 
-    def __should_read_geolayer(self, spatial_data_file_abs, geolayer_id):
+    def __should_read_geolayer(self, spatial_data_file_abs, geolayer_id, sequence=False, clip_geolayer_id=None):
 
         """
         Checks the following:
         * the SpatialDataFile (absolute) is a valid file
-        * the SpatialDataFile (absolute) ends in .GEOJSON (warning, not error)
+        * the SpatialDataFile (absolute) ends in .GEOJSON (warning, not error), unless the file is a GeoJSONSeq file
         * the ID of the output GeoLayer is unique (not an existing GeoLayer ID)
+        * the ClipGeoLayerID, if specified, is an existing GeoLayer ID
 
         Args:
             spatial_data_file_abs: the full pathname to the input spatial data file
             geolayer_id: the ID of the output GeoLayer
+            sequence (bool): If TRUE, the file is a GeoJSONSeq file, which has other extensions.
+            clip_geolayer_id: the ID of the GeoLayer with the extent of the features to read, or None
 
         Returns:
             run_read: Boolean. If TRUE, the read process should be run. If FALSE, the read process should not be run.
@@ -206,7 +341,7 @@ class ReadGeoLayerFromGeoJSON(AbstractCommand):
                                            CommandLogRecord(CommandStatusType.FAILURE, message, recommendation))
 
         # If the input spatial data file does not end in .geojson, raise a WARNING.
-        if not spatial_data_file_abs.upper().endswith(".GEOJSON"):
+        if not sequence and not spatial_data_file_abs.upper().endswith(".GEOJSON"):
             self.warning_count += 1
             message = 'The SpatialDataFile ({}) does not end with the .geojson extension.'.format(spatial_data_file_abs)
             recommendation = "No recommendation logged."
@@ -253,10 +388,55 @@ class ReadGeoLayerFromGeoJSON(AbstractCommand):
                                                CommandLogRecord(CommandStatusType.FAILURE,
                                                                 message, recommendation))
 
+        # If the ClipGeoLayerID is not an existing GeoLayer ID, raise a FAILURE.
+        if clip_geolayer_id and not validators.run_check(self, "IsGeoLayerIdExisting", "ClipGeoLayerID",
+                                                         clip_geolayer_id, "FAIL"):
+            run_read = False
+
         # Return the Boolean to determine if the read process should be run. If TRUE, all checks passed. If FALSE,
         # one or many checks failed.
         return run_read
 
+    @staticmethod
+    def __get_geopackage_geolayer(geopackage_qgs_vector_layer, geopackage_file_abs, geolayer_id, source_path, where,
+                                  bbox, bbox_crs):
+        """
+        Create the GeoLayer for features that were streamed to a GeoPackage file. The GeoPackage layer has the
+        GeoPackage feature ID column as its first attribute, which a GeoLayer read with Memory storage does not have.
+        The GeoLayer is a LazyGeoLayer that stays on disk until it is first used, when the features that match the
+        filters are copied to memory without the feature ID column, so that the GeoLayer has the same attributes for
+        both storages and its attributes can be changed.
+
+        Args:
+            geopackage_qgs_vector_layer (QgsVectorLayer): the layer of the GeoPackage file
+            geopackage_file_abs (str): the full pathname to the GeoPackage file
+            geolayer_id (str): the GeoLayer identifier, which is also the name of the GeoPackage layer
+            source_path (str): the full pathname to the GeoJSON file
+            where (str): the Where filter, or None
+            bbox (tuple): the bounding box of the features to read, or None
+            bbox_crs (str): the coordinate reference system code of the bounding box, or None
+
+        Returns:
+            The LazyGeoLayer.
+
+        Raises:
+            ValueError if the Where filter is not valid.
+        """
+
+        fields = geopackage_qgs_vector_layer.fields()
+        fid_names = [fields.at(i).name() for i in geopackage_qgs_vector_layer.dataProvider().pkAttributeIndexes()]
+
+        # Read the metadata from the GeoPackage without reading the features. The Where filter is only applied when
+        # the GeoLayer is first used, so it is checked now.
+        metadata = gdal_util.read_ogr_layers_metadata(geopackage_file_abs, [geolayer_id], where=where)[0]
+        if bbox is not None or where:
+            metadata['feature_count'] = None
+            metadata['extent'] = None
+
+        open_arguments = (qgis_util.read_qgsvectorlayer_from_geopackage, (geopackage_file_abs, geolayer_id), where,
+                          bbox, bbox_crs, None, fid_names)
+        return LazyGeoLayer(geolayer_id, qgis_util.read_qgsvectorlayer_subset, open_arguments, source_path, metadata)
+
     def run_command(self):
         """
         Run the command. Read the layer file from a GeoJSON file, create a GeoLayer object, and add to the
@@ -272,9 +452,32 @@ class ReadGeoLayerFromGeoJSON(AbstractCommand):
         # Obtain the parameter values.
         pv_SpatialDataFile = self.get_parameter_value("SpatialDataFile")
         pv_GeoLayerID = self.get_parameter_value("GeoLayerID", default_value='%f')
+        pv_InputFormat = self.get_parameter_value("InputFormat", default_value="GeoJSON")
+        pv_StreamRead = self.get_parameter_value("StreamRead", default_value="False")
+        pv_StreamStorage = self.get_parameter_value("StreamStorage", default_value="Memory")
+        pv_BoundingBox = self.get_parameter_value("BoundingBox")
+        pv_ClipGeoLayerID = self.get_parameter_value("ClipGeoLayerID")
+        pv_Where = self.get_parameter_value("Where")
+        pv_IncludeAttributes = self.get_parameter_value("IncludeAttributes")
+        pv_ExcludeAttributes = self.get_parameter_value("ExcludeAttributes")
+
+        # A GeoJSONSeq file is always streamed.
+        sequence = pv_InputFormat.upper() == "GEOJSONSEQ"
+        stream_read = sequence or string_util.string_to_boolean(pv_StreamRead)
 
         # Expand for ${Property} syntax.
         pv_GeoLayerID = self.command_processor.expand_parameter_value(pv_GeoLayerID, self)
+        pv_ClipGeoLayerID = self.command_processor.expand_parameter_value(pv_ClipGeoLayerID, self)
+        pv_Where = self.command_processor.expand_parameter_value(pv_Where, self)
+
+        # Convert the IncludeAttributes and ExcludeAttributes parameter values to lists of glob-style patterns. An empty
+        # parameter value is the same as the default.
+        include_attributes = None
+        if pv_IncludeAttributes:
+            include_attributes = string_util.delimited_string_to_list(pv_IncludeAttributes)
+        exclude_attributes = None
+        if pv_ExcludeAttributes:
+            exclude_attributes = string_util.delimited_string_to_list(pv_ExcludeAttributes)
 
         # Convert the SpatialDataFile parameter value relative path to an absolute path and expand for ${Property}
         # syntax
@@ -287,16 +490,57 @@ class ReadGeoLayerFromGeoJSON(AbstractCommand):
             pv_GeoLayerID = io_util.expand_formatter(spatial_data_file_absolute, pv_GeoLayerID)
 
         # Run the checks on the parameter values. Only continue if the checks passed.
-        if self.__should_read_geolayer(spatial_data_file_absolute, pv_GeoLayerID):
+        if self.__should_read_geolayer(spatial_data_file_absolute, pv_GeoLayerID, sequence, pv_ClipGeoLayerID):
 
             try:
-                # Create a QGSVectorLayer object with the GeoJSON SpatialDataFile.
-                qgs_vector_layer = qgis_util.read_qgsvectorlayer_from_file(spatial_data_file_absolute)
-
-                # Create a GeoLayer and add it to the geoprocessor's GeoLayers list.
-                geolayer_obj = GeoLayer(geolayer_id=pv_GeoLayerID,
-                                        geolayer_qgs_vector_layer=qgs_vector_layer,
-                                        geolayer_source_path=spatial_data_file_absolute)
+                # Determine the bounding box of the features to read.
+                bbox, bbox_crs = command_util.get_read_bbox(self, pv_BoundingBox, pv_ClipGeoLayerID)
+
+                geolayer_obj = None
+                if stream_read:
+                    # Store the features in a GeoPackage file in a new folder in the TempDir folder, if requested.
+                    if pv_StreamStorage.upper() == "GEOPACKAGE":
+                        temp_folder = tempfile.mkdtemp(prefix="gp-geojson-",
+                                                       dir=self.command_processor.get_property('TempDir'))
+                        geopackage_file_absolute = os.path.join(temp_folder, pv_GeoLayerID + ".gpkg")
+                    else:
+                        geopackage_file_absolute = None
+
+                    # Parse the GeoJSON SpatialDataFile incrementally into a QgsVectorLayer object. A BoundingBox is
+                    # in the coordinate reference system of the file, so it is applied while the features are parsed.
+                    qgs_vector_layer = qgis_util.read_qgsvectorlayer_from_geojson_stream(
+                        spatial_data_file_absolute, sequence=sequence, bbox=bbox if bbox_crs is None else None,
+                        include_attributes=include_attributes, exclude_attributes=exclude_attributes,
+                        geopackage_file_abs=geopackage_file_absolute, layer_name=pv_GeoLayerID)
+                    if bbox_crs is None:
+                        bbox = None
+                    # The attributes were selected while the features were parsed.
+                    include_attributes = None
+                    exclude_attributes = None
+
+                    if geopackage_file_absolute is not None:
+                        geolayer_obj = self.__get_geopackage_geolayer(qgs_vector_layer, geopackage_file_absolute,
+                                                                      pv_GeoLayerID, spatial_data_file_absolute,
+                                                                      pv_Where, bbox, bbox_crs)
+                        qgs_vector_layer = None
+                else:
+                    # Create a QGSVectorLayer object with the GeoJSON SpatialDataFile.
+                    qgs_vector_layer = qgis_util.read_qgsvectorlayer_from_file(spatial_data_file_absolute)
+
+                if geolayer_obj is None:
+                    # Only keep the features and attributes that match the filters.
+                    if bbox is not None or pv_Where or include_attributes or exclude_attributes:
+                        qgs_vector_layer = qgis_util.subset_qgsvectorlayer(qgs_vector_layer, where=pv_Where,
+                                                                           bbox=bbox, bbox_crs=bbox_crs,
+                                                                           include_attributes=include_attributes,
+                                                                           exclude_attributes=exclude_attributes)
+
+                    # Create a GeoLayer.
+                    geolayer_obj = GeoLayer(geolayer_id=pv_GeoLayerID,
+                                            geolayer_qgs_vector_layer=qgs_vector_layer,
+                                            geolayer_source_path=spatial_data_file_absolute)
+
+                # Add the GeoLayer to the geoprocessor's GeoLayers list.
                 self.command_processor.add_geolayer(geolayer_obj)
 
             # Raise an exception if an unexpected error occurs during the process.
@@ -0,0 +1,386 @@
+# ReadGeoLayerFromGeoPackage - command to read a GeoLayer from a GeoPackage file
+# ________________________________________________________________NoticeStart_
+# GeoProcessor
+# Copyright (C) 2017-2019 Open Water Foundation
+# 
+# GeoProcessor is free software:  you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+# 
+#     GeoProcessor is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+# 
+#     You should have received a copy of the GNU General Public License
+#     along with GeoProcessor.  If not, see <https://www.gnu.org/licenses/>.
+# ________________________________________________________________NoticeEnd___
+
+from geoprocessor.commands.abstract.AbstractCommand import AbstractCommand
+
+from geoprocessor.core.CommandLogRecord import CommandLogRecord
+from geoprocessor.core.CommandParameterMetadata import CommandParameterMetadata
+from geoprocessor.core.CommandPhaseType import CommandPhaseType
+from geoprocessor.core.CommandStatusType import CommandStatusType
+from geoprocessor.core.GeoLayer import GeoLayer
+
+import geoprocessor.util.command_util as command_util
+import geoprocessor.util.qgis_util as qgis_util
+import geoprocessor.util.io_util as io_util
+import geoprocessor.util.string_util as string_util
+import geoprocessor.util.validator_util as validators
+
+import os
+import logging
+
+
+class ReadGeoLayerFromGeoPackage(AbstractCommand):
+
+    """
+    Reads a GeoLayer from a layer in a GeoPackage spatial data file.
+
+    This command reads a GeoLayer from a layer in a GeoPackage file and creates a GeoLayer object within the
+    geoprocessor. The GeoLayer can then be accessed in the geoprocessor by its identifier and further processed.
+    A GeoPackage file can hold many layers. The layer to read is selected with the LayerName parameter.
+
+    GeoLayers are stored on a computer or are available for download as a spatial data file (GeoJSON, shapefile,
+    feature class in a file geodatabase, etc.). Each GeoLayer has one feature type (point, line, polygon, etc.) and
+    other data (an identifier, a coordinate reference system, etc). Note that this function only reads a single
+    GeoLayer from a single layer in a GeoPackage file.
+
+    In order for the geoprocessor to use and manipulate spatial data files, GeoLayers are instantiated as
+    `QgsVectorLayer <https://qgis.org/api/classQgsVectorLayer.html>`_ objects.
+
+    Command Parameters
+    * SpatialDataFile (str, required): the relative pathname to the spatial data file (GeoPackage format)
+    * LayerName (str, optional): the name of the layer to read. If None, the first layer is read.
+    * GeoLayerID (str, optional): the GeoLayer identifier. If None, the LayerName is used, or if LayerName is None,
+        the spatial data filename (without the .gpkg extension) will be used as the GeoLayer identifier.
+    * IfGeoLayerIDExists (str, optional): This parameter determines the action that occurs if the CopiedGeoLayerID
+        already exists within the GeoProcessor. Available options are: `Replace`, `ReplaceAndWarn`, `Warn` and `Fail`
+        (Refer to user documentation for detailed description.) Default value is `Replace`.
+    * IncludeAttributes (str, optional): A list of glob-style patterns of the attributes to read.
+        Default: * (All attributes are read).
+    * ExcludeAttributes (str, optional): A list of glob-style patterns of the attributes to not read.
+        Default: '' (No attributes are excluded).
+
+    If attributes are selected, the features are copied to an in-memory layer with only the selected attributes. The
+    attributes that are not selected are ignored by OGR, so that they are not read from the GeoPackage.
+    """
+
+    # Define the command parameters.
+    __command_parameter_metadata = [
+        CommandParameterMetadata("SpatialDataFile", type(""),
+                                 parameter_description="Path to file",
+                                 editor_tooltip="Path to GeoPackage file to read, can use ${Property}."),
+        CommandParameterMetadata("LayerName", type(""),
+                                 parameter_description="Layer name",
+                                 editor_tooltip="Name of the layer to read."),
+        CommandParameterMetadata("GeoLayerID", type(""),
+                                 parameter_description="GeoLayer identifier",
+                                 editor_tooltip="GeoLayer identifier."),
+        CommandParameterMetadata("IfGeoLayerIDExists", type(""),
+                                 parameter_description="Action if GeoLayer exists",
+                                 default_value="Warn",
+                                 editor_tooltip="Action if GeoLayer exists."),
+        CommandParameterMetadata("IncludeAttributes", type(""),
+                                 parameter_description="Attributes to read",
+                                 editor_tooltip="Glob-style patterns of the attributes to read."),
+        CommandParameterMetadata("ExcludeAttributes", type(""),
+                                 parameter_description="Attributes to not read",
+                                 editor_tooltip="Glob-style patterns of the attributes to not read.")]
+
+    # Choices for IfGeoLayerIDExists, used to validate parameter and display in editor
+    __choices_IfGeoLayerIDExists = ["Replace", "ReplaceAndWarn", "Warn", "Fail"]
+
+    def __init__(self):
+        """
+        Initialize the command
+        """
+
+        # AbstractCommand data
+        super().__init__()
+        self.command_name = "ReadGeoLayerFromGeoPackage"
+        self.command_parameter_metadata = self.__command_parameter_metadata
+
+        # Command metadata for command editor display
+        self.command_metadata = dict()
+        self.command_metadata['Description'] = "Read a GeoLayer from a layer in a file in GeoPackage format."
+        self.command_metadata['EditorType'] = "Simple"
+
+        # Parameter Metadata
+        self.parameter_input_metadata = dict()
+        # SpatialDataFile
+        self.parameter_input_metadata['SpatialDataFile.Description'] = "GeoPackage file to read"
+        self.parameter_input_metadata['SpatialDataFile.Label'] = "GeoPackage file to read"
+        self.parameter_input_metadata['SpatialDataFile.Tooltip'] = (
+            "The GeoPackage file to read (relative or absolute path; should end in .gpkg). ${Property} syntax is "
+            "recognized.")
+        self.parameter_input_metadata['SpatialDataFile.Required'] = True
+        self.parameter_input_metadata['SpatialDataFile.FileSelector.Type'] = "Read"
+        # LayerName
+        self.parameter_input_metadata['LayerName.Description'] = "name of the layer to read"
+        self.parameter_input_metadata['LayerName.Label'] = "Layer name"
+        self.parameter_input_metadata['LayerName.Tooltip'] = (
+            "The name of the layer in the GeoPackage file to read. ${Property} syntax is recognized.")
+        self.parameter_input_metadata['LayerName.Value.Default'] = "The first layer in the file."
+        # GeoLayerID
+        self.parameter_input_metadata['GeoLayerID.Description'] = "output GeoLayer identifier"
+        self.parameter_input_metadata['GeoLayerID.Label'] = "GeoLayerID"
+        self.parameter_input_metadata['GeoLayerID.Tooltip'] = (
+            "A GeoLayer identifier. Formatting characters and ${Property} syntax is recognized.")
+        self.parameter_input_metadata['GeoLayerID.Value.Default'] = (
+            "The LayerName, or if not specified, the GeoPackage filename without the leading path and without the "
+            "file extension.")
+        # IfGeoLayerIDExists
+        self.parameter_input_metadata['IfGeoLayerIDExists.Description'] = "action if exists"
+        self.parameter_input_metadata['IfGeoLayerIDExists.Label'] = "If GeoLayerID exists"
+        self.parameter_input_metadata['IfGeoLayerIDExists.Tooltip'] = (
+            "The action that occurs if the GeoLayerID already exists within the GeoProcessor.\n"
+            "Replace : The existing GeoLayer within the GeoProcessor is overwritten with the new"
+            "GeoLayer. No warning is logged.\n"
+            "ReplaceAndWarn: The existing GeoLayer within the GeoProcessor is overwritten with the new "
+            "GeoLayer. A warning is logged. \n"
+            "Warn : The new GeoLayer is not created. A warning is logged. \n"
+            "Fail : The new GeoLayer is not created. A fail message is logged.")
+        self.parameter_input_metadata['IfGeoLayerIDExists.Values'] = ["", "Replace", "ReplaceAndWarn", "Warn", "Fail"]
+        self.parameter_input_metadata['IfGeoLayerIDExists.Value.Default'] = "Replace"
+        # IncludeAttributes
+        self.parameter_input_metadata['IncludeAttributes.Description'] = "attributes to read"
+        self.parameter_input_metadata['IncludeAttributes.Label'] = "Include attributes"
+        self.parameter_input_metadata['IncludeAttributes.Tooltip'] = (
+            "A comma-separated list of the glob-style patterns filtering which attributes to read.")
+        self.parameter_input_metadata['IncludeAttributes.Value.Default'] = "*"
+        # ExcludeAttributes
+        self.parameter_input_metadata['ExcludeAttributes.Description'] = "attributes to not read"
+        self.parameter_input_metadata['ExcludeAttributes.Label'] = "Exclude attributes"
+        self.parameter_input_metadata['ExcludeAttributes.Tooltip'] = (
+            "A comma-separated list of the glob-style patterns filtering which attributes to not read.")
+        self.parameter_input_metadata['ExcludeAttributes.Value.Default'] = "'' (empty string)"
+
+        # Class data
+        self.warning_count = 0
+        self.logger = logging.getLogger(__name__)
+
+    def check_command_parameters(self, command_parameters):
+        """
+        Check the command parameters for validity.
+
+        Args:
+            command_parameters: the dictionary of command parameters to check (key:string_value)
+
+        Returns: None.
+
+        Raises:
+            ValueError if any parameters are invalid or do not have a valid value.
+            The command status messages for initialization are populated with validation messages.
+        """
+        warning = ""
+
+        # Check that parameter SpatialDataFile is a non-empty, non-None string.
+        # - existence of the file will also be checked in run_command().
+        pv_SpatialDataFile = self.get_parameter_value(parameter_name='SpatialDataFile',
+                                                      command_parameters=command_parameters)
+
+        if not validators.validate_string(pv_SpatialDataFile, False, False):
+
+            message = "SpatialDataFile parameter has no value."
+            recommendation = "Specify the SpatialDataFile parameter to indicate the spatial data layer file."
+            warning += "\n" + message
+            self.command_status.add_to_log(
+                CommandPhaseType.INITIALIZATION,
+                CommandLogRecord(CommandStatusType.FAILURE, message, recommendation))
+
+        # Check that optional parameter IfGeoLayerIDExists is one of the acceptable values or is None.
+        pv_IfGeoLayerIDExists = self.get_parameter_value(parameter_name="IfGeoLayerIDExists",
+                                                         command_parameters=command_parameters)
+        if not validators.validate_string_in_list(pv_IfGeoLayerIDExists, self.__choices_IfGeoLayerIDExists,
+                                                  none_allowed=True, empty_string_allowed=True, ignore_case=True):
+            message = "IfGeoLayerIDExists parameter value ({}) is not recognized.".format(pv_IfGeoLayerIDExists)
+            recommendation = "Specify one of the acceptable values ({}) for the IfGeoLayerIDExists parameter.".format(
+                self.__choices_IfGeoLayerIDExists)
+            warning += "\n" + message
+            self.command_status.add_to_log(
+                CommandPhaseType.INITIALIZATION,
+                CommandLogRecord(CommandStatusType.FAILURE, message, recommendation))
+
+        # Check for unrecognized parameters.
+        # This returns a message that can be appended to the warning, which if non-empty triggers an exception below.
+        warning = command_util.validate_command_parameter_names(self, warning)
+
+        # If any warnings were generated, throw an exception.
+        if len(warning) > 0:
+            self.logger.warning(warning)
+            raise ValueError(warning)
+
+        else:
+            # Refresh the phase severity
+            self.command_status.refresh_phase_severity(CommandPhaseType.INITIALIZATION, CommandStatusType.SUCCESS)
+
+    def __should_read_geolayer(self, spatial_data_file_abs, geolayer_id):
+
+        """
+        Checks the following:
+        * the SpatialDataFile (absolute) is a valid file
+        * the SpatialDataFile (absolute) ends in .GPKG (warning, not error)
+        * the ID of the output GeoLayer is unique (not an existing GeoLayer ID)
+
+        Args:
+            spatial_data_file_abs: the full pathname to the input spatial data file
+            geolayer_id: the ID of the output GeoLayer
+
+        Returns:
+            run_read: Boolean. If TRUE, the read process should be run. If FALSE, the read process should not be run.
+        """
+
+        # Boolean to determine if the read process should be run. Set to true until an error occurs.
+        run_read = True
+
+        # If the input spatial data file is not a valid file path, raise a FAILURE.
+        if not os.path.isfile(spatial_data_file_abs):
+
+            run_read = False
+            self.warning_count += 1
+            message = "The SpatialDataFile ({}) is not a valid file.".format(spatial_data_file_abs)
+            recommendation = "Specify a valid file."
+            self.logger.error(message)
+            self.command_status.add_to_log(CommandPhaseType.RUN,
+                                           CommandLogRecord(CommandStatusType.FAILURE, message, recommendation))
+
+        # If the input spatial data file does not end in .gpkg, raise a WARNING.
+        if not spatial_data_file_abs.upper().endswith(".GPKG"):
+            self.warning_count += 1
+            message = 'The SpatialDataFile ({}) does not end with the .gpkg extension.'.format(spatial_data_file_abs)
+            recommendation = "No recommendation logged."
+            self.logger.warning(message)
+            self.command_status.add_to_log(CommandPhaseType.RUN,
+                                           CommandLogRecord(CommandStatusType.WARNING, message, recommendation))
+
+        # If the GeoLayerID is the same as an already-registered GeoLayerID, react according to the
+        # pv_IfGeoLayerIDExists value.
+        elif self.command_processor.get_geolayer(geolayer_id):
+
+            # Get the IfGeoLayerIDExists parameter value.
+            pv_IfGeoLayerIDExists = self.get_parameter_value("IfGeoLayerIDExists", default_value="Replace")
+
+            # Warnings/recommendations if the GeolayerID is the same as a registered GeoLayerID.
+            message = 'The GeoLayerID ({}) value is already in use as a GeoLayer ID.'.format(geolayer_id)
+            recommendation = 'Specify a new GeoLayerID.'
+
+            # The registered GeoLayer should be replaced with the new GeoLayer (with warnings).
+            if pv_IfGeoLayerIDExists.upper() == "REPLACEANDWARN":
+                self.warning_count += 1
+                self.logger.warning(message)
+                self.command_status.add_to_log(CommandPhaseType.RUN,
+                                               CommandLogRecord(CommandStatusType.WARNING,
+                                                                message, recommendation))
+
+            # The registered GeoLayer should not be replaced. A warning should be logged.
+            if pv_IfGeoLayerIDExists.upper() == "WARN":
+
+                run_read = False
+                self.warning_count += 1
+                self.logger.warning(message)
+                self.command_status.add_to_log(CommandPhaseType.RUN,
+                                               CommandLogRecord(CommandStatusType.WARNING,
+                                                                message, recommendation))
+
+            # The matching IDs should cause a FAILURE.
+            elif pv_IfGeoLayerIDExists.upper() == "FAIL":
+
+                run_read = False
+                self.warning_count += 1
+                self.logger.error(message)
+                self.command_status.add_to_log(CommandPhaseType.RUN,
+                                               CommandLogRecord(CommandStatusType.FAILURE,
+                                                                message, recommendation))
+
+        # Return the Boolean to determine if the read process should be run. If TRUE, all checks passed. If FALSE,
+        # one or many checks failed.
+        return run_read
+
+    def run_command(self):
+        """
+        Run the command. Read the layer from a GeoPackage file, create a GeoLayer object, and add to the
+        GeoProcessor's geolayer list.
+
+        Returns: None.
+
+        Raises:
+            RuntimeError if any warnings occurred during run_command method.
+        """
+
+        # Obtain the parameter values.
+        pv_SpatialDataFile = self.get_parameter_value("SpatialDataFile")
+        pv_LayerName = self.get_parameter_value("LayerName")
+        pv_IncludeAttributes = self.get_parameter_value("IncludeAttributes")
+        pv_ExcludeAttributes = self.get_parameter_value("ExcludeAttributes")
+
+        # Expand for ${Property} syntax.
+        if pv_LayerName:
+            pv_LayerName = self.command_processor.expand_parameter_value(pv_LayerName, self)
+
+        # Convert the IncludeAttributes and ExcludeAttributes parameter values to lists of glob-style patterns. An empty
+        # parameter value is the same as the default.
+        include_attributes = None
+        if pv_IncludeAttributes:
+            include_attributes = string_util.delimited_string_to_list(pv_IncludeAttributes)
+        exclude_attributes = None
+        if pv_ExcludeAttributes:
+            exclude_attributes = string_util.delimited_string_to_list(pv_ExcludeAttributes)
+
+        # The GeoLayerID defaults to the layer name, or the filename if the layer name is not specified.
+        pv_GeoLayerID = self.get_parameter_value("GeoLayerID", default_value=pv_LayerName if pv_LayerName else '%f')
+        pv_GeoLayerID = self.command_processor.expand_parameter_value(pv_GeoLayerID, self)
+
+        # Convert the SpatialDataFile parameter value relative path to an absolute path and expand for ${Property}
+        # syntax
+        spatial_data_file_absolute = io_util.verify_path_for_os(
+            io_util.to_absolute_path(self.command_processor.get_property('WorkingDir'),
+                                     self.command_processor.expand_parameter_value(pv_SpatialDataFile, self)))
+
+        # If the pv_GeoLayerID is a valid %-formatter, assign the pv_GeoLayerID the corresponding value.
+        if pv_GeoLayerID in ['%f', '%F', '%E', '%P', '%p']:
+            pv_GeoLayerID = io_util.expand_formatter(spatial_data_file_absolute, pv_GeoLayerID)
+
+        # Run the checks on the parameter values. Only continue if the checks passed.
+        if self.__should_read_geolayer(spatial_data_file_absolute, pv_GeoLayerID):
+
+            try:
+
+                # Create a QGSVectorLayer object with the layer in the SpatialDataFile in GeoPackage format
+                qgs_vector_layer = qgis_util.read_qgsvectorlayer_from_geopackage(spatial_data_file_absolute,
+                                                                                 pv_LayerName)
+
+                # Only keep the selected attributes. The attributes that are not selected are not read by OGR.
+                if include_attributes or exclude_attributes:
+                    qgs_vector_layer = qgis_util.subset_qgsvectorlayer(qgs_vector_layer,
+                                                                       include_attributes=include_attributes,
+                                                                       exclude_attributes=exclude_attributes)
+
+                # Create a GeoLayer and add it to the geoprocessor's GeoLayers list
+                geolayer_obj = GeoLayer(geolayer_id=pv_GeoLayerID,
+                                        geolayer_qgs_vector_layer=qgs_vector_layer,
+                                        geolayer_source_path=spatial_data_file_absolute)
+                self.command_processor.add_geolayer(geolayer_obj)
+
+            # Raise an exception if an unexpected error occurs during the process
+            except Exception as e:
+
+                self.warning_count += 1
+                message = "Unexpected error reading GeoLayer {} from GeoPackage {}.".format(pv_GeoLayerID,
+                                                                                            pv_SpatialDataFile)
+                recommendation = "Check the log file for details."
+                self.logger.error(message, exc_info=True)
+                self.command_status.add_to_log(CommandPhaseType.RUN,
+                                               CommandLogRecord(CommandStatusType.FAILURE, message, recommendation))
+
+        # Determine success of command processing. Raise Runtime Error if any errors occurred
+        if self.warning_count > 0:
+            message = "There were {} warnings proceeding this command.".format(self.warning_count)
+            raise RuntimeError(message)
+
+        # Set command status type as SUCCESS if there are no errors.
+        else:
+            self.command_status.refresh_phase_severity(CommandPhaseType.RUN, CommandStatusType.SUCCESS)
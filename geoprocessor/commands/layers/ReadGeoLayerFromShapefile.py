@@ -27,6 +27,7 @@ from geoprocessor.core.GeoLayer import GeoLayer
 
 import geoprocessor.util.command_util as command_util
 import geoprocessor.util.qgis_util as qgis_util
+import geoprocessor.util.string_util as string_util
 import geoprocessor.util.io_util as io_util
 import geoprocessor.util.validator_util as validators
 
@@ -59,6 +60,21 @@ class ReadGeoLayerFromShapefile(AbstractCommand):
     * IfGeoLayerIDExists (str, optional): This parameter determines the action that occurs if the CopiedGeoLayerID
         already exists within the GeoProcessor. Available options are: `Replace`, `ReplaceAndWarn`, `Warn` and `Fail`
         (Refer to user documentation for detailed description.) Default value is `Replace`.
+    * BoundingBox (str, optional): the bounding box of the features to read, as comma-separated values
+        `xmin,ymin,xmax,ymax` in the coordinate reference system of the file. Only the features that intersect the
+        bounding box are read. Cannot be used with ClipGeoLayerID.
+    * ClipGeoLayerID (str, optional): the identifier of a GeoLayer. Only the features that intersect the extent of the
+        GeoLayer are read. Cannot be used with BoundingBox.
+    * Where (str, optional): an OGR SQL WHERE clause (for example, COUNTY = 'Larimer'). Only the features that match
+        the clause are read.
+    * IncludeAttributes (str, optional): A list of glob-style patterns of the attributes to read.
+        Default: * (All attributes are read).
+    * ExcludeAttributes (str, optional): A list of glob-style patterns of the attributes to not read.
+        Default: '' (No attributes are excluded).
+
+    The BoundingBox, ClipGeoLayerID and Where filters are passed to OGR, so that features that do not match are not
+    decoded. The spatial filter uses the spatial index of the shapefile (a .qix or .sbn file), if the shapefile has
+    one. The attributes that are not read are ignored by OGR, so that they are not decoded from the .dbf file.
     """
 
     # Define the command parameters.
@@ -72,7 +88,22 @@ class ReadGeoLayerFromShapefile(AbstractCommand):
         CommandParameterMetadata("IfGeoLayerIDExists", type(""),
                                  parameter_description="Action if GeoLayer exists",
                                  default_value="Warn",
-                                 editor_tooltip="Action if GeoLayer exists.")]
+                                 editor_tooltip="Action if GeoLayer exists."),
+        CommandParameterMetadata("BoundingBox", type(""),
+                                 parameter_description="Bounding box of the features to read",
+                                 editor_tooltip="Bounding box xmin,ymin,xmax,ymax of the features to read."),
+        CommandParameterMetadata("ClipGeoLayerID", type(""),
+                                 parameter_description="GeoLayer with the extent to read",
+                                 editor_tooltip="GeoLayer with the extent of the features to read."),
+        CommandParameterMetadata("Where", type(""),
+                                 parameter_description="Attribute filter",
+                                 editor_tooltip="OGR SQL WHERE clause of the features to read."),
+        CommandParameterMetadata("IncludeAttributes", type(""),
+                                 parameter_description="Attributes to read",
+                                 editor_tooltip="Glob-style patterns of the attributes to read."),
+        CommandParameterMetadata("ExcludeAttributes", type(""),
+                                 parameter_description="Attributes to not read",
+                                 editor_tooltip="Glob-style patterns of the attributes to not read.")]
 
     # Choices for IfGeoLayerIDExists, used to validate parameter and display in editor
     __choices_IfGeoLayerIDExists = ["Replace", "ReplaceAndWarn", "Warn", "Fail"]
@@ -122,6 +153,39 @@ class ReadGeoLayerFromShapefile(AbstractCommand):
             "Fail : The new GeoLayer is not created. A fail message is logged.")
         self.parameter_input_metadata['IfGeoLayerIDExists.Values'] = ["", "Replace", "ReplaceAndWarn", "Warn", "Fail"]
         self.parameter_input_metadata['IfGeoLayerIDExists.Value.Default'] = "Replace"
+        # BoundingBox
+        self.parameter_input_metadata['BoundingBox.Description'] = "bounding box of the features to read"
+        self.parameter_input_metadata['BoundingBox.Label'] = "Bounding box"
+        self.parameter_input_metadata['BoundingBox.Tooltip'] = (
+            "The bounding box of the features to read, as comma-separated values xmin,ymin,xmax,ymax\n"
+            "in the coordinate reference system of the file. Cannot be used with ClipGeoLayerID.")
+        self.parameter_input_metadata['BoundingBox.Value.Default.Description'] = "all features are read"
+        # ClipGeoLayerID
+        self.parameter_input_metadata['ClipGeoLayerID.Description'] = "GeoLayer with the extent to read"
+        self.parameter_input_metadata['ClipGeoLayerID.Label'] = "Clip GeoLayerID"
+        self.parameter_input_metadata['ClipGeoLayerID.Tooltip'] = (
+            "The identifier of a GeoLayer. Only the features that intersect the extent of the GeoLayer are read.\n"
+            "${Property} syntax is recognized. Cannot be used with BoundingBox.")
+        self.parameter_input_metadata['ClipGeoLayerID.Value.Default.Description'] = "all features are read"
+        # Where
+        self.parameter_input_metadata['Where.Description'] = "attribute filter"
+        self.parameter_input_metadata['Where.Label'] = "Where"
+        self.parameter_input_metadata['Where.Tooltip'] = (
+            "An OGR SQL WHERE clause (for example, COUNTY = 'Larimer'). Only the features that match the clause are "
+            "read.\n${Property} syntax is recognized.")
+        self.parameter_input_metadata['Where.Value.Default.Description'] = "all features are read"
+        # IncludeAttributes
+        self.parameter_input_metadata['IncludeAttributes.Description'] = "attributes to read"
+        self.parameter_input_metadata['IncludeAttributes.Label'] = "Include attributes"
+        self.parameter_input_metadata['IncludeAttributes.Tooltip'] = (
+            "A comma-separated list of the glob-style patterns filtering which attributes to read.")
+        self.parameter_input_metadata['IncludeAttributes.Value.Default'] = "*"
+        # ExcludeAttributes
+        self.parameter_input_metadata['ExcludeAttributes.Description'] = "attributes to not read"
+        self.parameter_input_metadata['ExcludeAttributes.Label'] = "Exclude attributes"
+        self.parameter_input_metadata['ExcludeAttributes.Tooltip'] = (
+            "A comma-separated list of the glob-style patterns filtering which attributes to not read.")
+        self.parameter_input_metadata['ExcludeAttributes.Value.Default'] = "'' (empty string)"
 
         # Class data
         self.warning_count = 0
@@ -169,6 +233,9 @@ class ReadGeoLayerFromShapefile(AbstractCommand):
                 CommandPhaseType.INITIALIZATION,
                 CommandLogRecord(CommandStatusType.FAILURE, message, recommendation))
 
+        # Check that optional parameter BoundingBox is a valid bounding box and is not used with ClipGeoLayerID.
+        warning = command_util.check_read_bbox_parameters(self, command_parameters, warning)
+
         # Check for unrecognized parameters.
         # This returns a message that can be appended to the warning, which if non-empty triggers an exception below.
         warning = command_util.validate_command_parameter_names(self, warning)
@@ -182,17 +249,19 @@ class ReadGeoLayerFromShapefile(AbstractCommand):
             # Refresh the phase severity
             self.command_status.refresh_phase_severity(CommandPhaseType.INITIALIZATION, CommandStatusType.SUCCESS)
 
-    def __should_read_geolayer(self, spatial_data_file_abs, geolayer_id):
+    def __should_read_geolayer(self, spatial_data_file_abs, geolayer_id, clip_geolayer_id=None):
 
         """
         Checks the following:
         * the SpatialDataFile (absolute) is a valid file
         * the SpatialDataFile (absolute) ends in .SHP (warning, not error)
         * the ID of the output GeoLayer is unique (not an existing GeoLayer ID)
+        * the ClipGeoLayerID, if specified, is an existing GeoLayer ID
 
         Args:
             spatial_data_file_abs: the full pathname to the input spatial data file
             geolayer_id: the ID of the output GeoLayer
+            clip_geolayer_id: the ID of the GeoLayer with the extent of the features to read, or None
 
         Returns:
             run_read: Boolean. If TRUE, the read process should be run. If FALSE, the read process should not be run.
@@ -260,6 +329,11 @@ class ReadGeoLayerFromShapefile(AbstractCommand):
                                                CommandLogRecord(CommandStatusType.FAILURE,
                                                                 message, recommendation))
 
+        # If the ClipGeoLayerID is not an existing GeoLayer ID, raise a FAILURE.
+        if clip_geolayer_id and not validators.run_check(self, "IsGeoLayerIdExisting", "ClipGeoLayerID",
+                                                         clip_geolayer_id, "FAIL"):
+            run_read = False
+
         # Return the Boolean to determine if the read process should be run. If TRUE, all checks passed. If FALSE,
         # one or many checks failed.
         return run_read
@@ -278,9 +352,25 @@ class ReadGeoLayerFromShapefile(AbstractCommand):
         # Obtain the parameter values.
         pv_SpatialDataFile = self.get_parameter_value("SpatialDataFile")
         pv_GeoLayerID = self.get_parameter_value("GeoLayerID", default_value='%f')
+        pv_BoundingBox = self.get_parameter_value("BoundingBox")
+        pv_ClipGeoLayerID = self.get_parameter_value("ClipGeoLayerID")
+        pv_Where = self.get_parameter_value("Where")
+        pv_IncludeAttributes = self.get_parameter_value("IncludeAttributes")
+        pv_ExcludeAttributes = self.get_parameter_value("ExcludeAttributes")
 
         # Expand for ${Property} syntax.
         pv_GeoLayerID = self.command_processor.expand_parameter_value(pv_GeoLayerID, self)
+        pv_ClipGeoLayerID = self.command_processor.expand_parameter_value(pv_ClipGeoLayerID, self)
+        pv_Where = self.command_processor.expand_parameter_value(pv_Where, self)
+
+        # Convert the IncludeAttributes and ExcludeAttributes parameter values to lists of glob-style patterns. An empty
+        # parameter value is the same as the default.
+        include_attributes = None
+        if pv_IncludeAttributes:
+            include_attributes = string_util.delimited_string_to_list(pv_IncludeAttributes)
+        exclude_attributes = None
+        if pv_ExcludeAttributes:
+            exclude_attributes = string_util.delimited_string_to_list(pv_ExcludeAttributes)
 
         # Convert the SpatialDataFile parameter value relative path to an absolute path and expand for ${Property}
         # syntax
@@ -293,13 +383,21 @@ class ReadGeoLayerFromShapefile(AbstractCommand):
             pv_GeoLayerID = io_util.expand_formatter(spatial_data_file_absolute, pv_GeoLayerID)
 
         # Run the checks on the parameter values. Only continue if the checks passed.
-        if self.__should_read_geolayer(spatial_data_file_absolute, pv_GeoLayerID):
+        if self.__should_read_geolayer(spatial_data_file_absolute, pv_GeoLayerID, pv_ClipGeoLayerID):
 
             try:
 
                 # Create a QGSVectorLayer object with the SpatialDataFile in Shapefile format
                 qgs_vector_layer = qgis_util.read_qgsvectorlayer_from_file(spatial_data_file_absolute)
 
+                # Only keep the features and attributes that match the filters. The filters are applied by OGR.
+                bbox, bbox_crs = command_util.get_read_bbox(self, pv_BoundingBox, pv_ClipGeoLayerID)
+                if bbox is not None or pv_Where or include_attributes or exclude_attributes:
+                    qgs_vector_layer = qgis_util.subset_qgsvectorlayer(qgs_vector_layer, where=pv_Where, bbox=bbox,
+                                                                       bbox_crs=bbox_crs,
+                                                                       include_attributes=include_attributes,
+                                                                       exclude_attributes=exclude_attributes)
+
                 # Create a GeoLayer and add it to the geoprocessor's GeoLayers list
                 geolayer_obj = GeoLayer(geolayer_id=pv_GeoLayerID,
                                         geolayer_qgs_vector_layer=qgs_vector_layer,
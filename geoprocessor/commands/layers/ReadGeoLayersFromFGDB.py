@@ -24,8 +24,10 @@ from geoprocessor.core.CommandParameterMetadata import CommandParameterMetadata
 from geoprocessor.core.CommandPhaseType import CommandPhaseType
 from geoprocessor.core.CommandStatusType import CommandStatusType
 from geoprocessor.core.GeoLayer import GeoLayer
+from geoprocessor.core.LazyGeoLayer import LazyGeoLayer
 
 import geoprocessor.util.command_util as command_util
+import geoprocessor.util.gdal_util as gdal_util
 import geoprocessor.util.io_util as io_util
 import geoprocessor.util.string_util as string_util
 import geoprocessor.util.validator_util as validators
@@ -34,7 +36,6 @@ import geoprocessor.util.qgis_util as qgis_util
 import os
 import logging
 import re
-import ogr
 
 
 class ReadGeoLayersFromFGDB(AbstractCommand):
@@ -73,6 +74,21 @@ class ReadGeoLayersFromFGDB(AbstractCommand):
         already exists within the GeoProcessor. Available options are: `Replace`, `ReplaceAndWarn`, `Warn` and `Fail`
         (Refer to user documentation for detailed description.) Default value is `Replace`. Used if
         ReadOnlyOneFeatureClass is TRUE or FALSE.
+    * BoundingBox (str, optional): the bounding box of the features to read, as comma-separated values
+        `xmin,ymin,xmax,ymax` in the coordinate reference system of each feature class. Only the features that
+        intersect the bounding box are read. Cannot be used with ClipGeoLayerID.
+    * ClipGeoLayerID (str, optional): the identifier of a GeoLayer. Only the features that intersect the extent of the
+        GeoLayer are read. Cannot be used with BoundingBox.
+    * Where (str, optional): an OGR SQL WHERE clause (for example, COUNTY = 'Larimer'). Only the features that match
+        the clause are read.
+    * IncludeAttributes (str, optional): A list of glob-style patterns of the attributes to read.
+        Default: * (All attributes are read).
+    * ExcludeAttributes (str, optional): A list of glob-style patterns of the attributes to not read.
+        Default: '' (No attributes are excluded).
+
+    The BoundingBox, ClipGeoLayerID and Where filters are passed to OGR, so that features that do not match are not
+    decoded. The spatial filter uses the spatial index of each feature class, if the feature class has one. The
+    attributes that are not read are ignored by OGR, so that they are not decoded.
     """
 
     # Define the command parameters.
@@ -83,7 +99,12 @@ class ReadGeoLayersFromFGDB(AbstractCommand):
         CommandParameterMetadata("GeoLayerID", type("")),
         CommandParameterMetadata("GeoLayerID_prefix", type("")),
         CommandParameterMetadata("Subset_Pattern", type("")),
-        CommandParameterMetadata("IfGeoLayerIDExists", type(""))]
+        CommandParameterMetadata("IfGeoLayerIDExists", type("")),
+        CommandParameterMetadata("BoundingBox", type("")),
+        CommandParameterMetadata("ClipGeoLayerID", type("")),
+        CommandParameterMetadata("Where", type("")),
+        CommandParameterMetadata("IncludeAttributes", type("")),
+        CommandParameterMetadata("ExcludeAttributes", type(""))]
 
     def __init__(self):
         """
@@ -157,6 +178,39 @@ class ReadGeoLayersFromFGDB(AbstractCommand):
             "The glob-style pattern (e.g., CO_* or *_[MC]O) of feature classes to read from the file geodatabase."
         self.parameter_input_metadata['Subset_Pattern.Value.Default'] =\
             "No pattern is used. All feature classes within the file geodatabase are read."
+        # BoundingBox
+        self.parameter_input_metadata['BoundingBox.Description'] = "bounding box of the features to read"
+        self.parameter_input_metadata['BoundingBox.Label'] = "Bounding box"
+        self.parameter_input_metadata['BoundingBox.Tooltip'] = (
+            "The bounding box of the features to read, as comma-separated values xmin,ymin,xmax,ymax\n"
+            "in the coordinate reference system of each feature class. Cannot be used with ClipGeoLayerID.")
+        self.parameter_input_metadata['BoundingBox.Value.Default.Description'] = "all features are read"
+        # ClipGeoLayerID
+        self.parameter_input_metadata['ClipGeoLayerID.Description'] = "GeoLayer with the extent to read"
+        self.parameter_input_metadata['ClipGeoLayerID.Label'] = "Clip GeoLayerID"
+        self.parameter_input_metadata['ClipGeoLayerID.Tooltip'] = (
+            "The identifier of a GeoLayer. Only the features that intersect the extent of the GeoLayer are read.\n"
+            "${Property} syntax is recognized. Cannot be used with BoundingBox.")
+        self.parameter_input_metadata['ClipGeoLayerID.Value.Default.Description'] = "all features are read"
+        # Where
+        self.parameter_input_metadata['Where.Description'] = "attribute filter"
+        self.parameter_input_metadata['Where.Label'] = "Where"
+        self.parameter_input_metadata['Where.Tooltip'] = (
+            "An OGR SQL WHERE clause (for example, COUNTY = 'Larimer'). Only the features that match the clause are "
+            "read.\n${Property} syntax is recognized.")
+        self.parameter_input_metadata['Where.Value.Default.Description'] = "all features are read"
+        # IncludeAttributes
+        self.parameter_input_metadata['IncludeAttributes.Description'] = "attributes to read"
+        self.parameter_input_metadata['IncludeAttributes.Label'] = "Include attributes"
+        self.parameter_input_metadata['IncludeAttributes.Tooltip'] = (
+            "A comma-separated list of the glob-style patterns filtering which attributes to read.")
+        self.parameter_input_metadata['IncludeAttributes.Value.Default'] = "*"
+        # ExcludeAttributes
+        self.parameter_input_metadata['ExcludeAttributes.Description'] = "attributes to not read"
+        self.parameter_input_metadata['ExcludeAttributes.Label'] = "Exclude attributes"
+        self.parameter_input_metadata['ExcludeAttributes.Tooltip'] = (
+            "A comma-separated list of the glob-style patterns filtering which attributes to not read.")
+        self.parameter_input_metadata['ExcludeAttributes.Value.Default'] = "'' (empty string)"
 
         # Class data
         self.warning_count = 0
@@ -229,6 +283,9 @@ class ReadGeoLayersFromFGDB(AbstractCommand):
                     CommandPhaseType.INITIALIZATION,
                     CommandLogRecord(CommandStatusType.FAILURE, message, recommendation))
 
+        # Check that optional parameter BoundingBox is a valid bounding box and is not used with ClipGeoLayerID.
+        warning = command_util.check_read_bbox_parameters(self, command_parameters, warning)
+
         # Check for unrecognized parameters.
         # This returns a message that can be appended to the warning, which if non-empty triggers an exception below.
         warning = command_util.validate_command_parameter_names(self, warning)
@@ -242,32 +299,17 @@ class ReadGeoLayersFromFGDB(AbstractCommand):
             # Refresh the phase severity
             self.command_status.refresh_phase_severity(CommandPhaseType.INITIALIZATION, CommandStatusType.SUCCESS)
 
-    def __return_a_list_of_fc(self, fgdb_full_path):
-
-        # The file geodatabase will be read and each feature class will be added to the feature_class_list.
-        feature_class_list = []
-
-        # Append each feature class in the Esri File Geodatabase to the feature_class_list.
-        # REF: https://pcjericks.github.io/py-gdalogr-cookbook/vector_layers.html|
-        # "Get all layers in an Esri File GeoDataBase"
-        ogr.UseExceptions()
-        driver = ogr.GetDriverByName("OpenFileGDB")
-        gdb = driver.Open(fgdb_full_path)
-        for feature_class_idx in range(gdb.GetLayerCount()):
-            feature_class = gdb.GetLayerByIndex(feature_class_idx)
-            feature_class_list.append(feature_class.GetName())
-
-        return feature_class_list
-
-    def __should_read_gdb(self, spatial_data_folder_abs):
+    def __should_read_gdb(self, spatial_data_folder_abs, clip_geolayer_id=None):
 
         """
         Checks the following:
         * the SpatialDataFolder (absolute) is a valid folder
         * the SpatialDataFolder (absolute) is a valid File GeoDatabase
+        * the ClipGeoLayerID, if specified, is an existing GeoLayer ID
 
         Args:
             spatial_data_folder_abs (str): the full pathname to the input spatial data folder
+            clip_geolayer_id (str): the ID of the GeoLayer with the extent of the features to read, or None
 
         Returns:
              Boolean. If TRUE, the GeoDatabase should be read. If FALSE, at least one check failed and the GeoDatabase
@@ -289,6 +331,11 @@ class ReadGeoLayersFromFGDB(AbstractCommand):
             should_run_command.append(validators.run_check(self, "IsFolderAfGDB", "SpatialDataFolder",
                                                            spatial_data_folder_abs, "FAIL"))
 
+        # If the ClipGeoLayerID is not an existing GeoLayer ID, raise a FAILURE.
+        if clip_geolayer_id:
+            should_run_command.append(validators.run_check(self, "IsGeoLayerIdExisting", "ClipGeoLayerID",
+                                                           clip_geolayer_id, "FAIL"))
+
         # Return the Boolean to determine if the process should be run.
         if False in should_run_command:
             return False
@@ -334,6 +381,33 @@ class ReadGeoLayersFromFGDB(AbstractCommand):
         else:
             return True
 
+    def __get_read_metadata(self, metadata, features_filtered, include_attributes, exclude_attributes):
+        """
+        Determine the metadata of a GeoLayer that is read with filters, from the metadata of its data source.
+
+        Args:
+            metadata (dict): the metadata of the data source (see LazyGeoLayer)
+            features_filtered (bool): TRUE if only some of the features are read, in which case the feature count and
+                extent of the data source are not used
+            include_attributes (list): a list of glob-style patterns of the attributes to read, or None
+            exclude_attributes (list): a list of glob-style patterns of the attributes to not read, or None
+
+        Returns:
+            The metadata of the GeoLayer, with None for the values that are not known until the GeoLayer is opened.
+        """
+
+        metadata = dict(metadata)
+        if features_filtered:
+            metadata['feature_count'] = None
+            metadata['extent'] = None
+        if metadata.get('attribute_names') is not None and (include_attributes or exclude_attributes):
+            # Keep the attributes in the order of the data source.
+            selected_names = set(string_util.filter_list_of_strings(metadata['attribute_names'], include_attributes,
+                                                                    exclude_attributes, return_inclusions=True))
+            metadata['attribute_names'] = [attribute_name for attribute_name in metadata['attribute_names']
+                                           if attribute_name in selected_names]
+        return metadata
+
     def run_command(self):
         """
         Run the command. Read the feature classes within a file geodatabase. For each desired feature class (can be
@@ -353,6 +427,24 @@ class ReadGeoLayersFromFGDB(AbstractCommand):
         pv_GeoLayerID_prefix = self.get_parameter_value("GeoLayerID_prefix")
         pv_GeoLayerID = self.get_parameter_value("GeoLayerID")
         pv_FeatureClass = self.get_parameter_value("FeatureClass")
+        pv_BoundingBox = self.get_parameter_value("BoundingBox")
+        pv_ClipGeoLayerID = self.get_parameter_value("ClipGeoLayerID")
+        pv_Where = self.get_parameter_value("Where")
+        pv_IncludeAttributes = self.get_parameter_value("IncludeAttributes")
+        pv_ExcludeAttributes = self.get_parameter_value("ExcludeAttributes")
+
+        # Expand for ${Property} syntax.
+        pv_ClipGeoLayerID = self.command_processor.expand_parameter_value(pv_ClipGeoLayerID, self)
+        pv_Where = self.command_processor.expand_parameter_value(pv_Where, self)
+
+        # Convert the IncludeAttributes and ExcludeAttributes parameter values to lists of glob-style patterns. An empty
+        # parameter value is the same as the default.
+        include_attributes = None
+        if pv_IncludeAttributes:
+            include_attributes = string_util.delimited_string_to_list(pv_IncludeAttributes)
+        exclude_attributes = None
+        if pv_ExcludeAttributes:
+            exclude_attributes = string_util.delimited_string_to_list(pv_ExcludeAttributes)
 
         # Convert the ReadOnlyOneFeatureClass from a string value to a Boolean value.
         pv_ReadOnlyOneFeatureClass = string_util.str_to_bool(pv_ReadOnlyOneFeatureClass)
@@ -363,7 +455,10 @@ class ReadGeoLayersFromFGDB(AbstractCommand):
                                      self.command_processor.expand_parameter_value(pv_SpatialDataFolder, self)))
 
         # Run the initial checks on the parameter values. Only continue if the checks passed.
-        if self.__should_read_gdb(sd_folder_abs):
+        if self.__should_read_gdb(sd_folder_abs, pv_ClipGeoLayerID):
+
+            # Determine the bounding box of the features to read.
+            bbox, bbox_crs = command_util.get_read_bbox(self, pv_BoundingBox, pv_ClipGeoLayerID)
 
             # If configured to only read one Feature Class into one GeoLayer.
             if pv_ReadOnlyOneFeatureClass:
@@ -381,6 +476,14 @@ class ReadGeoLayersFromFGDB(AbstractCommand):
                         qgs_vector_layer = qgis_util.read_qgsvectorlayer_from_feature_class(sd_folder_abs,
                                                                                             pv_FeatureClass)
 
+                        # Only keep the features and attributes that match the filters. The filters are applied by
+                        # OGR.
+                        if bbox is not None or pv_Where or include_attributes or exclude_attributes:
+                            qgs_vector_layer = qgis_util.subset_qgsvectorlayer(qgs_vector_layer, where=pv_Where,
+                                                                               bbox=bbox, bbox_crs=bbox_crs,
+                                                                               include_attributes=include_attributes,
+                                                                               exclude_attributes=exclude_attributes)
+
                         # Create a GeoLayer and add it to the geoprocessor's GeoLayers list
                         geolayer_obj = GeoLayer(pv_GeoLayerID, qgs_vector_layer, spatial_data_file_absolute)
                         self.command_processor.add_geolayer(geolayer_obj)
@@ -400,14 +503,20 @@ class ReadGeoLayersFromFGDB(AbstractCommand):
             # If configured to read multiple Feature Classes into multiple GeoLayers.
             else:
 
-                # Get a list of all of the feature classes in the file geodatabase.
-                fc_list = self.__return_a_list_of_fc(sd_folder_abs)
+                # Read the metadata of all of the feature classes in the file geodatabase, using one OGR dataset handle.
+                # Only the geodatabase headers are read, not the features.
+                # Key: feature class name. Value: metadata dictionary (see gdal_util.read_ogr_layers_metadata()).
+                fc_metadata = {metadata["layer_name"]: metadata
+                               for metadata in gdal_util.read_ogr_layers_metadata(sd_folder_abs)}
 
-                # Filter the fc_list to only include feature classes that meet the Subset Pattern configuration. If
-                # the Subset Pattern configuration is None, all feature classes will remain in the fc_list.
-                fc_list = string_util.filter_list_of_strings(fc_list, [pv_Subset_Pattern])
+                # Filter the list of feature classes to only include feature classes that meet the Subset Pattern
+                # configuration. If the Subset Pattern configuration is None, all feature classes will remain in the
+                # fc_list.
+                fc_list = string_util.filter_list_of_strings(list(fc_metadata.keys()), [pv_Subset_Pattern])
 
-                # Iterate over the feature classes in the fc_list.
+                # Determine the GeoLayerID of each feature class, and run the secondary checks. Only the feature
+                # classes that passed the checks are read.
+                fcs_to_read = []
                 for feature_class in fc_list:
 
                     # Determine the GeoLayerID.
@@ -418,32 +527,66 @@ class ReadGeoLayersFromFGDB(AbstractCommand):
 
                     # Run the secondary checks on the parameter values. Only continue if the checks passed.
                     if self.__should_read_geolayer(geolayer_id, False):
+                        fcs_to_read.append((geolayer_id, feature_class))
 
-                        try:
+                # The Where filter is only applied when a feature class is opened, so it is checked for each feature
+                # class now (using one OGR dataset handle), so that an invalid filter is reported by this command.
+                if pv_Where and fcs_to_read:
+                    try:
+                        gdal_util.read_ogr_layers_metadata(sd_folder_abs, [feature_class for geolayer_id,
+                                                           feature_class in fcs_to_read], where=pv_Where)
+                    except Exception as e:
+                        fcs_to_read = []
+                        self.warning_count += 1
+                        message = "The Where parameter value ({}) is not valid for the file geodatabase ({}).".format(
+                            pv_Where, sd_folder_abs)
+                        recommendation = "Check the log file for details."
+                        self.logger.error(message, exc_info=True)
+                        self.command_status.add_to_log(CommandPhaseType.RUN,
+                                                       CommandLogRecord(CommandStatusType.FAILURE, message,
+                                                                        recommendation))
 
-                            # Get the full pathname to the feature class
-                            # TODO egiles 2018-01-04 Need to research how to properly document feature class source path
-                            spatial_data_file_absolute = os.path.join(sd_folder_abs, str(feature_class))
+                # Add a GeoLayer for each feature class, in the order of the feature classes in the geodatabase. The
+                # QgsVectorLayer objects are not created here: each GeoLayer is a LazyGeoLayer that opens its feature
+                # class when its features are first used, so feature classes that are not used by later commands are
+                # never opened by QGIS.
+                for geolayer_id, feature_class in fcs_to_read:
 
-                            # Create a QgsVectorLayer object from the feature class.
-                            qgs_vector_layer = qgis_util.read_qgsvectorlayer_from_feature_class(sd_folder_abs,
-                                                                                                feature_class)
+                    try:
+                        # Get the full pathname to the feature class
+                        # TODO egiles 2018-01-04 Need to research how to properly document feature class source path
+                        spatial_data_file_absolute = os.path.join(sd_folder_abs, str(feature_class))
+
+                        # Determine how the feature class is opened. If there are filters, the features and
+                        # attributes that match are selected when the feature class is opened. The feature count and
+                        # extent in the metadata, which are for all features, are not used, and the attribute names in
+                        # the metadata are filtered.
+                        open_function = qgis_util.read_qgsvectorlayer_from_feature_class
+                        open_arguments = (sd_folder_abs, feature_class)
+                        metadata = fc_metadata[feature_class]
+                        if bbox is not None or pv_Where or include_attributes or exclude_attributes:
+                            open_arguments = (open_function, open_arguments, pv_Where, bbox, bbox_crs,
+                                              include_attributes, exclude_attributes)
+                            open_function = qgis_util.read_qgsvectorlayer_subset
+                            metadata = self.__get_read_metadata(metadata, bbox is not None or pv_Where,
+                                                                include_attributes, exclude_attributes)
 
-                            # Create a GeoLayer and add it to the geoprocessor's GeoLayers list
-                            geolayer_obj = GeoLayer(geolayer_id, qgs_vector_layer, spatial_data_file_absolute)
-                            self.command_processor.add_geolayer(geolayer_obj)
+                        # Create a GeoLayer and add it to the geoprocessor's GeoLayers list
+                        geolayer_obj = LazyGeoLayer(geolayer_id, open_function, open_arguments,
+                                                    spatial_data_file_absolute, metadata)
+                        self.command_processor.add_geolayer(geolayer_obj)
 
-                        # Raise an exception if an unexpected error occurs during the process
-                        except Exception as e:
+                    # Raise an exception if an unexpected error occurs during the process
+                    except Exception as e:
 
-                            self.warning_count += 1
-                            message = "Unexpected error reading feature class ({}) from file geodatabase ({}).".format(
-                                feature_class, sd_folder_abs)
-                            recommendation = "Check the log file for details."
-                            self.logger.error(message, exc_info=True)
-                            self.command_status.add_to_log(CommandPhaseType.RUN,
-                                                           CommandLogRecord(CommandStatusType.FAILURE, message,
-                                                                            recommendation))
+                        self.warning_count += 1
+                        message = "Unexpected error reading feature class ({}) from file geodatabase ({}).".format(
+                            feature_class, sd_folder_abs)
+                        recommendation = "Check the log file for details."
+                        self.logger.error(message, exc_info=True)
+                        self.command_status.add_to_log(CommandPhaseType.RUN,
+                                                       CommandLogRecord(CommandStatusType.FAILURE, message,
+                                                                        recommendation))
 
         # Determine success of command processing. Raise Runtime Error if any errors occurred
         if self.warning_count > 0:
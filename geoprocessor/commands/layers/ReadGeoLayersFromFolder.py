@@ -23,16 +23,18 @@ from geoprocessor.core.CommandLogRecord import CommandLogRecord
 from geoprocessor.core.CommandParameterMetadata import CommandParameterMetadata
 from geoprocessor.core.CommandPhaseType import CommandPhaseType
 from geoprocessor.core.CommandStatusType import CommandStatusType
-from geoprocessor.core.GeoLayer import GeoLayer
+from geoprocessor.core.LazyGeoLayer import LazyGeoLayer
 
 import geoprocessor.util.command_util as command_util
+import geoprocessor.util.gdal_util as gdal_util
 import geoprocessor.util.io_util as io_util
 import geoprocessor.util.validator_util as validators
 import geoprocessor.util.qgis_util as qgis_util
+import geoprocessor.util.string_util as string_util
 
+import fnmatch
 import os
 import logging
-import glob
 
 
 class ReadGeoLayersFromFolder(AbstractCommand):
@@ -50,7 +52,10 @@ class ReadGeoLayersFromFolder(AbstractCommand):
 
     In order for the geoprocessor to use and manipulate spatial data files, GeoLayers are instantiated as
     `QgsVectorLayer <https://qgis.org/api/classQgsVectorLayer.html>`_ objects. This command will read the GeoLayers
-    from spatial data files within a folder and instantiate them as geoprocessor GeoLayer objects.
+    from spatial data files within a folder and instantiate them as geoprocessor GeoLayer objects. The file headers are
+    read concurrently with OGR (see gdal_util.read_ogr_files_metadata()) and the GeoLayers are added in file name
+    order. Each GeoLayer is a LazyGeoLayer, which only creates its QgsVectorLayer on the command thread when its
+    features are first used, so QGIS objects are never created on the reading threads.
 
     Command Parameters
     * SpatialDataFolder (str, required): the relative pathname to the folder containing spatial data files
@@ -63,6 +68,22 @@ class ReadGeoLayersFromFolder(AbstractCommand):
     * IfGeoLayerIDExists (str, optional): This parameter determines the action that occurs if the CopiedGeoLayerID
         already exists within the GeoProcessor. Available options are: `Replace`, `ReplaceAndWarn`, `Warn` and `Fail`
         Refer to user documentation for detailed description.) Default value is `Replace`.
+    * BoundingBox (str, optional): the bounding box of the features to read, as comma-separated values
+        `xmin,ymin,xmax,ymax` in the coordinate reference system of each file. Only the features that intersect the
+        bounding box are read. Cannot be used with ClipGeoLayerID.
+    * ClipGeoLayerID (str, optional): the identifier of a GeoLayer. Only the features that intersect the extent of the
+        GeoLayer are read. Cannot be used with BoundingBox.
+    * Where (str, optional): an OGR SQL WHERE clause (for example, COUNTY = 'Larimer'). Only the features that match
+        the clause are read.
+    * IncludeAttributes (str, optional): A list of glob-style patterns of the attributes to read.
+        Default: * (All attributes are read).
+    * ExcludeAttributes (str, optional): A list of glob-style patterns of the attributes to not read.
+        Default: '' (No attributes are excluded).
+
+    The BoundingBox, ClipGeoLayerID and Where filters are passed to OGR, so that features that do not match are not
+    decoded. The spatial filter uses the spatial index of each file (for example, a shapefile .qix or .sbn file or a
+    GeoPackage R-tree), if the file has one. The attributes that are not read are ignored by OGR, so that they are
+    not decoded (for example, from a shapefile .dbf file).
     """
 
     # Define the command parameters.
@@ -70,7 +91,12 @@ class ReadGeoLayersFromFolder(AbstractCommand):
         CommandParameterMetadata("SpatialDataFolder", type("")),
         CommandParameterMetadata("GeoLayerID_prefix", type("")),
         CommandParameterMetadata("Subset_Pattern", type("")),
-        CommandParameterMetadata("IfGeoLayerIDExists", type(""))]
+        CommandParameterMetadata("IfGeoLayerIDExists", type("")),
+        CommandParameterMetadata("BoundingBox", type("")),
+        CommandParameterMetadata("ClipGeoLayerID", type("")),
+        CommandParameterMetadata("Where", type("")),
+        CommandParameterMetadata("IncludeAttributes", type("")),
+        CommandParameterMetadata("ExcludeAttributes", type(""))]
 
     def __init__(self):
         """
@@ -124,6 +150,39 @@ class ReadGeoLayersFromFolder(AbstractCommand):
             "Fail : The new GeoLayer is not created. A fail message is logged.")
         self.parameter_input_metadata['IfGeoLayerIDExists.Values'] = ["", "Replace", "ReplaceAndWarn", "Warn", "Fail"]
         self.parameter_input_metadata['IfGeoLayerIDExists.Value.Default'] = "Replace"
+        # BoundingBox
+        self.parameter_input_metadata['BoundingBox.Description'] = "bounding box of the features to read"
+        self.parameter_input_metadata['BoundingBox.Label'] = "Bounding box"
+        self.parameter_input_metadata['BoundingBox.Tooltip'] = (
+            "The bounding box of the features to read, as comma-separated values xmin,ymin,xmax,ymax\n"
+            "in the coordinate reference system of each file. Cannot be used with ClipGeoLayerID.")
+        self.parameter_input_metadata['BoundingBox.Value.Default.Description'] = "all features are read"
+        # ClipGeoLayerID
+        self.parameter_input_metadata['ClipGeoLayerID.Description'] = "GeoLayer with the extent to read"
+        self.parameter_input_metadata['ClipGeoLayerID.Label'] = "Clip GeoLayerID"
+        self.parameter_input_metadata['ClipGeoLayerID.Tooltip'] = (
+            "The identifier of a GeoLayer. Only the features that intersect the extent of the GeoLayer are read.\n"
+            "${Property} syntax is recognized. Cannot be used with BoundingBox.")
+        self.parameter_input_metadata['ClipGeoLayerID.Value.Default.Description'] = "all features are read"
+        # Where
+        self.parameter_input_metadata['Where.Description'] = "attribute filter"
+        self.parameter_input_metadata['Where.Label'] = "Where"
+        self.parameter_input_metadata['Where.Tooltip'] = (
+            "An OGR SQL WHERE clause (for example, COUNTY = 'Larimer'). Only the features that match the clause are "
+            "read.\n${Property} syntax is recognized.")
+        self.parameter_input_metadata['Where.Value.Default.Description'] = "all features are read"
+        # IncludeAttributes
+        self.parameter_input_metadata['IncludeAttributes.Description'] = "attributes to read"
+        self.parameter_input_metadata['IncludeAttributes.Label'] = "Include attributes"
+        self.parameter_input_metadata['IncludeAttributes.Tooltip'] = (
+            "A comma-separated list of the glob-style patterns filtering which attributes to read.")
+        self.parameter_input_metadata['IncludeAttributes.Value.Default'] = "*"
+        # ExcludeAttributes
+        self.parameter_input_metadata['ExcludeAttributes.Description'] = "attributes to not read"
+        self.parameter_input_metadata['ExcludeAttributes.Label'] = "Exclude attributes"
+        self.parameter_input_metadata['ExcludeAttributes.Tooltip'] = (
+            "A comma-separated list of the glob-style patterns filtering which attributes to not read.")
+        self.parameter_input_metadata['ExcludeAttributes.Value.Default'] = "'' (empty string)"
 
         # Class data
         self.warning_count = 0
@@ -170,6 +229,9 @@ class ReadGeoLayersFromFolder(AbstractCommand):
                 CommandPhaseType.INITIALIZATION,
                 CommandLogRecord(CommandStatusType.FAILURE, message, recommendation))
 
+        # Check that optional parameter BoundingBox is a valid bounding box and is not used with ClipGeoLayerID.
+        warning = command_util.check_read_bbox_parameters(self, command_parameters, warning)
+
         # Check for unrecognized parameters.
         # This returns a message that can be appended to the warning, which if non-empty triggers an exception below.
         warning = command_util.validate_command_parameter_names(self, warning)
@@ -182,14 +244,16 @@ class ReadGeoLayersFromFolder(AbstractCommand):
             # Refresh the phase severity
             self.command_status.refresh_phase_severity(CommandPhaseType.INITIALIZATION, CommandStatusType.SUCCESS)
 
-    def __should_read_folder(self, spatial_data_folder_abs):
+    def __should_read_folder(self, spatial_data_folder_abs, clip_geolayer_id=None):
 
         """
         Checks the following:
         * the SpatialDataFolder (absolute) is a valid folder
+        * the ClipGeoLayerID, if specified, is an existing GeoLayer ID
 
         Args:
             spatial_data_folder_abs: the full pathname to the input spatial data folder
+            clip_geolayer_id: the ID of the GeoLayer with the extent of the features to read, or None
 
         Returns:
             run_read: Boolean. If TRUE, the folder read process should be run. If FALSE, it should not be run.
@@ -209,6 +273,11 @@ class ReadGeoLayersFromFolder(AbstractCommand):
             self.command_status.add_to_log(CommandPhaseType.RUN,
                                            CommandLogRecord(CommandStatusType.FAILURE, message, recommendation))
 
+        # If the ClipGeoLayerID is not an existing GeoLayer ID, raise a FAILURE.
+        if clip_geolayer_id and not validators.run_check(self, "IsGeoLayerIdExisting", "ClipGeoLayerID",
+                                                         clip_geolayer_id, "FAIL"):
+            run_read = False
+
         # Return the Boolean to determine if the read process should be run. If TRUE, all checks passed. If FALSE,
         # one or many checks failed.
         return run_read
@@ -272,6 +341,33 @@ class ReadGeoLayersFromFolder(AbstractCommand):
         # one or many checks failed.
         return run_read
 
+    def __get_read_metadata(self, metadata, features_filtered, include_attributes, exclude_attributes):
+        """
+        Determine the metadata of a GeoLayer that is read with filters, from the metadata of its data source.
+
+        Args:
+            metadata (dict): the metadata of the data source (see LazyGeoLayer)
+            features_filtered (bool): TRUE if only some of the features are read, in which case the feature count and
+                extent of the data source are not used
+            include_attributes (list): a list of glob-style patterns of the attributes to read, or None
+            exclude_attributes (list): a list of glob-style patterns of the attributes to not read, or None
+
+        Returns:
+            The metadata of the GeoLayer, with None for the values that are not known until the GeoLayer is opened.
+        """
+
+        metadata = dict(metadata)
+        if features_filtered:
+            metadata['feature_count'] = None
+            metadata['extent'] = None
+        if metadata.get('attribute_names') is not None and (include_attributes or exclude_attributes):
+            # Keep the attributes in the order of the data source.
+            selected_names = set(string_util.filter_list_of_strings(metadata['attribute_names'], include_attributes,
+                                                                    exclude_attributes, return_inclusions=True))
+            metadata['attribute_names'] = [attribute_name for attribute_name in metadata['attribute_names']
+                                           if attribute_name in selected_names]
+        return metadata
+
     def run_command(self):
         """
         Run the command. Read all spatial data files within the folder. For each desired spatial data file (can be
@@ -288,6 +384,24 @@ class ReadGeoLayersFromFolder(AbstractCommand):
         pv_SpatialDataFolder = self.get_parameter_value("SpatialDataFolder")
         pv_Subset_Pattern = self.get_parameter_value("Subset_Pattern")
         pv_GeoLayerID_prefix = self.get_parameter_value("GeoLayerID_prefix")
+        pv_BoundingBox = self.get_parameter_value("BoundingBox")
+        pv_ClipGeoLayerID = self.get_parameter_value("ClipGeoLayerID")
+        pv_Where = self.get_parameter_value("Where")
+        pv_IncludeAttributes = self.get_parameter_value("IncludeAttributes")
+        pv_ExcludeAttributes = self.get_parameter_value("ExcludeAttributes")
+
+        # Expand for ${Property} syntax.
+        pv_ClipGeoLayerID = self.command_processor.expand_parameter_value(pv_ClipGeoLayerID, self)
+        pv_Where = self.command_processor.expand_parameter_value(pv_Where, self)
+
+        # Convert the IncludeAttributes and ExcludeAttributes parameter values to lists of glob-style patterns. An empty
+        # parameter value is the same as the default.
+        include_attributes = None
+        if pv_IncludeAttributes:
+            include_attributes = string_util.delimited_string_to_list(pv_IncludeAttributes)
+        exclude_attributes = None
+        if pv_ExcludeAttributes:
+            exclude_attributes = string_util.delimited_string_to_list(pv_ExcludeAttributes)
 
         # Convert the SpatialDataFolder parameter value relative path to an absolute path
         sd_folder_abs = io_util.verify_path_for_os(
@@ -295,7 +409,10 @@ class ReadGeoLayersFromFolder(AbstractCommand):
                                      self.command_processor.expand_parameter_value(pv_SpatialDataFolder, self)))
 
         # Run the initial checks on the parameter values. Only continue if the checks passed.
-        if self.__should_read_folder(sd_folder_abs):
+        if self.__should_read_folder(sd_folder_abs, pv_ClipGeoLayerID):
+
+            # Determine the bounding box of the features to read.
+            bbox, bbox_crs = command_util.get_read_bbox(self, pv_BoundingBox, pv_ClipGeoLayerID)
 
             # Determine which files within the folder should be processed. All files will be processed if
             # pv_Subset_Pattern is set to None. Otherwise only files that match the given pattern will be processed.
@@ -303,19 +420,19 @@ class ReadGeoLayersFromFolder(AbstractCommand):
             #   1. a file
             #   2. a spatial data file (ends in .shp or .geojson)
             #   3. follows the given pattern (if Subset_Pattern parameter value does not equal None)
-            if pv_Subset_Pattern:
-                spatial_data_files_abs = [os.path.join(sd_folder_abs, source_file)
-                                          for source_file in glob.glob(os.path.join(sd_folder_abs, pv_Subset_Pattern))
-                                          if os.path.isfile(os.path.join(sd_folder_abs, source_file))
-                                          and (source_file.endswith(".shp") or source_file.endswith(".geojson"))]
-
-            else:
-                spatial_data_files_abs = [os.path.join(sd_folder_abs, source_file)
-                                          for source_file in os.listdir(sd_folder_abs)
-                                          if os.path.isfile(os.path.join(sd_folder_abs, source_file))
-                                          and (source_file.endswith(".shp") or source_file.endswith(".geojson"))]
-
-            # Iterate through the desired spatial data files
+            # The folder is listed once with os.scandir(), which returns the file type with each entry, so each file
+            # does not need to be checked separately.
+            spatial_data_files_abs = []
+            with os.scandir(sd_folder_abs) as entries:
+                for entry in entries:
+                    if entry.is_file() and (entry.name.endswith(".shp") or entry.name.endswith(".geojson")) \
+                            and (not pv_Subset_Pattern or fnmatch.fnmatch(entry.name, pv_Subset_Pattern)):
+                        spatial_data_files_abs.append(entry.path)
+            spatial_data_files_abs.sort()
+
+            # Determine the GeoLayerID of each spatial data file, and run the secondary checks. Only the files that
+            # passed the checks are read.
+            files_to_read = []
             for spatial_data_file_absolute in spatial_data_files_abs:
 
                 # Determine the GeoLayerID.
@@ -327,25 +444,53 @@ class ReadGeoLayersFromFolder(AbstractCommand):
 
                 # Run the secondary checks on the parameter values. Only continue if the checks passed.
                 if self.__should_read_geolayer(geolayer_id):
-
-                    try:
-                        # Create a QGSVectorLayer object with the GeoJSON SpatialDataFile
-                        qgs_vector_layer = qgis_util.read_qgsvectorlayer_from_file(spatial_data_file_absolute)
-
-                        # Create a GeoLayer and add it to the geoprocessor's GeoLayers list
-                        geolayer_obj = GeoLayer(geolayer_id, qgs_vector_layer, spatial_data_file_absolute)
-                        self.command_processor.add_geolayer(geolayer_obj)
-
-                    # Raise an exception if an unexpected error occurs during the process
-                    except Exception as e:
-                        self.warning_count += 1
-                        message = "Unexpected error reading GeoLayer {} from" \
-                                  " file {}.".format(geolayer_id, spatial_data_file_absolute)
-                        recommendation = "Check the log file for details."
-                        self.logger.error(message, exc_info=True)
-                        self.command_status.add_to_log(CommandPhaseType.RUN,
-                                                       CommandLogRecord(CommandStatusType.FAILURE, message,
-                                                                        recommendation))
+                    files_to_read.append((geolayer_id, spatial_data_file_absolute))
+
+            # Read the metadata of each spatial data file from the file headers. The files are read concurrently
+            # using a bounded pool of threads. The QgsVectorLayer objects are not created here: each GeoLayer is a
+            # LazyGeoLayer that opens its file when its features are first used, so files that are not used by later
+            # commands are never opened by QGIS. The Where filter is only applied when a file is opened, so it is
+            # checked for each file now, so that an invalid filter is reported by this command.
+            read_results = gdal_util.read_ogr_files_metadata([spatial_data_file_absolute for geolayer_id,
+                                                              spatial_data_file_absolute in files_to_read],
+                                                             where=pv_Where)
+
+            # Add the GeoLayers to the GeoProcessor in the order of the files, so that the result does not depend on
+            # the order in which the reads finish.
+            for (geolayer_id, spatial_data_file_absolute), (metadata, read_error) in zip(files_to_read, read_results):
+
+                try:
+                    # Raise the exception if the file could not be read.
+                    if read_error is not None:
+                        raise read_error
+
+                    # Determine how the file is opened. If there are filters, the features and attributes that match
+                    # are selected when the file is opened. The feature count and extent in the metadata, which are
+                    # for all features, are not used, and the attribute names in the metadata are filtered.
+                    open_function = qgis_util.read_qgsvectorlayer_from_file
+                    open_arguments = (spatial_data_file_absolute,)
+                    if bbox is not None or pv_Where or include_attributes or exclude_attributes:
+                        open_arguments = (open_function, open_arguments, pv_Where, bbox, bbox_crs,
+                                          include_attributes, exclude_attributes)
+                        open_function = qgis_util.read_qgsvectorlayer_subset
+                        metadata = self.__get_read_metadata(metadata, bbox is not None or pv_Where,
+                                                            include_attributes, exclude_attributes)
+
+                    # Create a GeoLayer and add it to the geoprocessor's GeoLayers list
+                    geolayer_obj = LazyGeoLayer(geolayer_id, open_function, open_arguments, spatial_data_file_absolute,
+                                                metadata)
+                    self.command_processor.add_geolayer(geolayer_obj)
+
+                # Raise an exception if an unexpected error occurs during the process
+                except Exception as e:
+                    self.warning_count += 1
+                    message = "Unexpected error reading GeoLayer {} from" \
+                              " file {}.".format(geolayer_id, spatial_data_file_absolute)
+                    recommendation = "Check the log file for details."
+                    self.logger.error(message, exc_info=True)
+                    self.command_status.add_to_log(CommandPhaseType.RUN,
+                                                   CommandLogRecord(CommandStatusType.FAILURE, message,
+                                                                    recommendation))
 
         # Determine success of command processing. Raise Runtime Error if any errors occurred
         if self.warning_count > 0:
@@ -24,16 +24,11 @@ from geoprocessor.core.CommandParameterMetadata import CommandParameterMetadata
 from geoprocessor.core.CommandPhaseType import CommandPhaseType
 from geoprocessor.core.CommandStatusType import CommandStatusType
 from geoprocessor.core.GeoLayer import GeoLayer
-from processing.core.Processing import Processing
-from qgis.core import QgsVectorLayer, QgsProject
 
-import glob
 import geoprocessor.util.command_util as command_util
 import geoprocessor.util.validator_util as validators
 import geoprocessor.util.qgis_util as qgis_util
 import logging
-import os
-import tempfile
 
 
 class SplitGeoLayerByAttribute(AbstractCommand):
@@ -53,6 +48,11 @@ class SplitGeoLayerByAttribute(AbstractCommand):
     * IfGeoLayerIDExists (str, optional): This parameter determines the action that occurs if the OutputGeoLayerIDs
         already exist within the GeoProcessor. Available options are: `Replace`, `ReplaceAndWarn`, `Warn` and `Fail`
         (Refer to user documentation for detailed description.) Default value is `Replace`.
+    * TemporaryFolder (str, optional): not used. The output GeoLayers are created in memory, so temporary files are
+        not written. The parameter is recognized so that existing command files can be run.
+
+    The input GeoLayer is split in one pass: the attribute values are read once (without the geometry) to group the
+    features, and then each output GeoLayer is populated with its features in batches.
     """
 
     # Define the command parameters.
@@ -115,8 +115,7 @@ class SplitGeoLayerByAttribute(AbstractCommand):
         self.parameter_input_metadata['TemporaryFolder.Description'] = "temporary location for output files"
         self.parameter_input_metadata['TemporaryFolder.Label'] = "Temporary Folder"
         self.parameter_input_metadata['TemporaryFolder.Tooltip'] = \
-            "sets the temporary folder for files and the default would be whatever QGIS uses.  This approach would be" \
-            "taken for similar commands."
+            "Not used. The output GeoLayers are created in memory, so temporary files are not written."
         self.parameter_input_metadata['TemporaryFolder.Value.Default'] = "default temporary folder directory"
         self.parameter_input_metadata['TemporaryFolder.FileSelector.Title'] = \
             "select the directory to save temp files to"
@@ -323,135 +322,23 @@ class SplitGeoLayerByAttribute(AbstractCommand):
 
                 logger.info('Input GeoLayer [GeoLayerID: ' + pv_InputGeoLayerID + '] has been read in successfully')
 
-                # TODO jurentie 01/26/2019 still need to figure out what the code below is for...
-                # If the input GeoLayer is an in-memory GeoLayer, make it an on-disk GeoLayer.
-                if input_geolayer.source_path is None or input_geolayer.source_path.upper() in ["", "MEMORY"]:
-
-                    # Get the absolute path of the GeoLayer to write to disk.
-                    geolayer_disk_abs_path = os.path.join(self.command_processor.get_property('TempDir'), input_geolayer.id)
-                    logger.info('GeoLayer path ' + geolayer_disk_abs_path)
-                    # Write the GeoLayer to disk. Overwrite the (memory) GeoLayer in the geoprocessor with the
-                    # on-disk GeoLayer.
-                    input_geolayer = input_geolayer.write_to_disk(geolayer_disk_abs_path)
-                    self.command_processor.add_geolayer(input_geolayer)
-
-                # Select the Attribute
-                # NEED TO CREATE A 'input_geolayer.select_attribute' FUNCTION IN GEOLAYER.PY??
-                # SOMETHING LIKE:  attribute_name = input_geolayer.select_attribute(pv_AttributeName)
-                # OR SHOULD THE FOLLOWING JUST WORK?
-                attribute_name = pv_AttributeName
-                working_dir = self.command_processor.properties['WorkingDir']
-
-
-                # @jurentie
-                # TODO @jurentie 01/31/2019 How to handle absolute path
-                # Assuming relative path for the moment....
-
-                # Perform the QGIS split vector layer function. Refer to the reference below for parameter descriptions.
-                # REF: https://docs.qgis.org/2.8/en/docs/user_manual/processing_algs/qgis/vector_general_tools.html#split-vector-layer
-
-                # @jurentie
-                # Check to see if parameter temporary folder has been specified, otherwise use the
-                # default environment temp folder directory.
-
-                #boolean to see if working with custom temp folder
-                temp_directory_custom = False
-                try:
-                    # Append specified temporary folder to working directory to create temp files in current
-                    # command file location.
-                    temp_directory = working_dir + "/" + self.get_parameter_value("TemporaryFolder")
-                    temp_directory_custom = True
-                except:
-                    # If using the default temp directory from environment variables create a temp folder to
-                    # easily remove all files
-                    temp_directory = tempfile.gettempdir()
-                    temp_directory += "/qgissplitvectorlayer-outputfiles"
-                # @jurentie
-                # Assign parameter to pass into runAlgorithm for splitting the GeoLayer
-                # Input = input GeoLayer (QgsVectorLayer)
-                # Field = Attribute name to split by
-                # Output = path to write output GeoLayers to this creates a list of files following the naming
-                #          convention attributeName_attribute.extension
-                #          ex: GNIS_ID_00030007.shp
-                #          file types generated = .dbf, .prj, .qpj, .shp, .shx
-                alg_parameters = {"INPUT": input_geolayer.qgs_vector_layer,
-                                  "FIELD": attribute_name,
-                                  "OUTPUT": temp_directory}
-                # @jurentie
-                # call runAlgorithm with the parameter "qgis:splitvectorlayer" (a list of possible parameters
-                # that can be passed here can be found here
-                # https://gist.github.com/jurentie/7b6c53d5a592991b6bb2491fcc5f01eb)
-                # pass in the parameters defined above
-                # This should result in separate GeoLayer shapefiles being written to the OUTPUT directory
-                split_output = self.command_processor.qgis_processor.runAlgorithm("qgis:splitvectorlayer", alg_parameters)
+                # Split the GeoLayer in one pass over the input features. Each output GeoLayer is an in-memory
+                # GeoLayer, so no temporary files are written and each output GeoLayer is only created once.
+                partitions = input_geolayer.split_by_attribute(pv_AttributeName)
 
                 # Create new GeoLayers and add them to the GeoProcessor's geolayers list.
-
-                # @jurentie
-                # TODO jurentie 01/26/2019 There probably needs to be some error handling happening below
-                # Get the list of features from the GeoLayer. This returns all attributes for each feature listed.
-                features = input_geolayer.qgs_vector_layer.getFeatures()
-                # Set the extension for the filename's to get the geolayer from
-                filename_extension = ".shp"
-                # Parse through the list of features and also enumerate to get the index which
-                # is used for accessing which OutputGeoLayerIDs to name each GeoLayer.
-                # TODO jurentie 01/26/2019 need to decide what to do with a default OutputGeoLayerIDs
-                # 1. Get the attribute of interest from each feature
-                # TODO jurentie 01/26/2019 need to handle parsing out unique attributes only...
-                # 2. Create the path name using the output folder specified in alg_parameters and passed in to
-                #    split_output, and the naming convention defaults for qgis:splitvectorlayer
-                # 3. Construct a QgsVectorLayer()
-                #    Parameters:
-                #       path: The path or url of the parameter. Typically this encodes parameters used by the data
-                #       provider as url query items.
-                #       baseName: The name used to represent the layer in the legend
-                #       providerLib: The name of the data provider, e.g., "memory", "postgres"
-                #       options: layer load options
-                #    For more info see:
-                #       https://qgis.org/api/classQgsVectorLayer.html#a1e7827a9d7bd33549babdc3bd7a279fd
-                # 4. Construct a new GeoLayer from the QgsVectorLayer()
-                #    Parameters:
-                #       geolayer_id (str): String that is the GeoLayer's reference ID. This ID is used to access the
-                #       GeoLayer from the GeoProcessor for manipulation.
-                #       geolayer_qgs_vector_layer (QGSVectorLayer): Object created by the QGIS processor.
-                #       All GeoLayer spatial manipulations are performed on the GeoLayer's qgs_vector_layer.
-                #       geolayer_source_path (str): The full pathname to the original spatial data file on the
-                #       user's local computer. If the geolayer was made in memory from the GeoProcessor, this value
-                #       is set to `MEMORY`.
-                # 5. Add the new GeoLayer to the GeoProcessor
-                for i, feature in enumerate(features):
-                    attribute = feature[attribute_name]
-                    path = temp_directory + "/" + attribute_name + "_" + str(attribute) + filename_extension
-                    layer = QgsVectorLayer(path, "layer" + str(attribute), "ogr")
-                    try:
-                        new_geolayer = GeoLayer(pv_OutputGeoLayerIDs[i], layer, path)
-                    except:
-                        # Default Output GeoLayerID's will be default title of output files from .runAlgorithm above
-                        new_geolayer = GeoLayer(attribute_name + "_" + str(attribute), layer, path)
+                # The OutputGeoLayerIDs are assigned in the order that the attribute values are first found. If not
+                # specified, the GeoLayer ID is the attribute name and value, for example GNIS_ID_00030007.
+                for i, (attribute_value, qgs_vector_layer) in enumerate(partitions):
+                    if pv_OutputGeoLayerIDs is not None and i < len(pv_OutputGeoLayerIDs):
+                        output_geolayer_id = pv_OutputGeoLayerIDs[i].strip()
+                    else:
+                        output_geolayer_id = "{}_{}".format(pv_AttributeName, attribute_value)
+                    new_geolayer = GeoLayer(output_geolayer_id, qgs_vector_layer, "MEMORY")
                     self.command_processor.add_geolayer(new_geolayer)
 
-                # @jurentie
-                # remove files if specified in parameters
-                # TODO @jurentie figure out how to delete files after using them...
-                # remove_files = self.get_parameter_value("RemoveTemporaryFiles")
-                # files = glob.glob(temp_directory + "/*")
-                # print(files)
-                # if remove_files == None:
-                #     # Remove all files from directory
-                #     for f in files:
-                #         os.remove(f)
-                #     os.rmdir(temp_directory)
-
-                # In QGIS 2 the clipped_output["OUTPUT"] returned the full file pathname of the memory output layer
-                # (saved in a QGIS temporary folder)
-                # qgs_vector_layer = qgis_util.read_qgsvectorlayer_from_file(clipped_output["OUTPUT"])
-                # new_geolayer = GeoLayer(pv_OutputGeoLayerID, qgs_vector_layer, "MEMORY")
-                # Get this list of ID's, name can be changed later to make more sense
-                # in a dynamic fashion
-
-                # In QGIS 3 the clipped_output["OUTPUT"] returns the QGS vector layer object
-                # new_geolayer = GeoLayer(pv_OutputGeoLayerIDs, split_output["OUTPUT"], "MEMORY")
-                # self.command_processor.add_geolayer(new_geolayer)
+                logger.info('Split GeoLayer {} into {} GeoLayers by attribute "{}".'.format(
+                    pv_InputGeoLayerID, len(partitions), pv_AttributeName))
 
             # Raise an exception if an unexpected error occurs during the process
             except Exception as e:
@@ -54,6 +54,7 @@ class WriteGeoLayerToDelimitedFile(AbstractCommand):
     * GeoLayerID (str, required): the identifier of the GeoLayer to be written to a spatial data file in CSV format.
     * OutputFile (str, required): the pathname (relative or absolute) of the output spatial data file (do not include
         the .csv extension)
+        If the OutputFile has a .bz2, .gz, .xz or .zip extension (for example, example.csv.gz), the file is compressed.
     * OutputCRS (str, EPSG code, optional): the coordinate reference system that the output spatial data file will be
         projected. By default, the output spatial data file will be projected to the GeoLayer's current CRS.
     * OutputGeometryFormat (str, optional): how the geometry will be displayed in the output CSV file. Default is
@@ -107,7 +108,8 @@ class WriteGeoLayerToDelimitedFile(AbstractCommand):
         self.parameter_input_metadata['OutputFile.Required'] = True
         self.parameter_input_metadata['OutputFile.Tooltip'] = (
             "The output delimited file (relative or absolute path). The file extension is not required. "
-            "${Property} syntax is recognized.")
+            "${Property} syntax is recognized.\n"
+            "Use a .bz2, .gz, .xz or .zip extension (for example, example.csv.gz) to compress the file.")
         self.parameter_input_metadata['OutputFile.FileSelector.Type'] = "Write"
         self.parameter_input_metadata['OutputFile.FileSelector.Title'] = "Select file to write"
         # OutputCRS
@@ -294,9 +296,15 @@ class WriteGeoLayerToDelimitedFile(AbstractCommand):
             io_util.to_absolute_path(self.command_processor.get_property('WorkingDir'),
                                      self.command_processor.expand_parameter_value(pv_OutputFile, self)))
 
+        # Get the compression type indicated by the extension of the OutputFile, or None if not compressed.
+        compression_type = io_util.get_compression_type(output_file_absolute, check_content=False)
+
         # Get the filename of the OutputFile with the path but without the extension.
+        # - a compressed file has the compression extension after the .csv extension, for example example.csv.gz
         path, filename= os.path.split(output_file_absolute)
         path = os.path.split(output_file_absolute)[0]
+        if compression_type is not None:
+            filename = os.path.splitext(filename)[0]
         filename_wo_ext_path = os.path.join(path, os.path.splitext(filename)[0])
 
         # Run the checks on the parameter values. Only continue if the checks passed.
@@ -310,12 +318,21 @@ class WriteGeoLayerToDelimitedFile(AbstractCommand):
                 if pv_OutputCRS is None:
                     pv_OutputCRS = geolayer.get_crs()
 
-                # Write the GeoLayer to a delimited spatial data file.
-                qgis_util.write_qgsvectorlayer_to_delimited_file(geolayer.qgs_vector_layer,
-                                                                 filename_wo_ext_path,
-                                                                 pv_OutputCRS,
-                                                                 pv_OutputGeometryFormat,
-                                                                 pv_OutputDelimiter)
+                if compression_type is None:
+                    # Write the GeoLayer to a delimited spatial data file.
+                    qgis_util.write_qgsvectorlayer_to_delimited_file(geolayer.qgs_vector_layer,
+                                                                     filename_wo_ext_path,
+                                                                     pv_OutputCRS,
+                                                                     pv_OutputGeometryFormat,
+                                                                     pv_OutputDelimiter)
+                else:
+                    # QgsVectorFileWriter always writes a .csv file, so stream the features to the OutputFile,
+                    # compressing the text as it is written, so an uncompressed copy of the file is never written.
+                    qgis_util.write_qgsvectorlayer_to_delimited_file_stream(geolayer.qgs_vector_layer,
+                                                                            output_file_absolute,
+                                                                            pv_OutputCRS,
+                                                                            pv_OutputGeometryFormat,
+                                                                            pv_OutputDelimiter)
 
             # Raise an exception if an unexpected error occurs during the process
             except Exception as e:
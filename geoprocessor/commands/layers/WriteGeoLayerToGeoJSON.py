@@ -27,6 +27,7 @@ from geoprocessor.core.CommandStatusType import CommandStatusType
 import geoprocessor.util.command_util as command_util
 import geoprocessor.util.io_util as io_util
 import geoprocessor.util.qgis_util as qgis_util
+import geoprocessor.util.string_util as string_util
 import geoprocessor.util.validator_util as validators
 
 import logging
@@ -52,6 +53,19 @@ class WriteGeoLayerToGeoJSON(AbstractCommand):
     * OutputPrecision (int, 0-15, optional): the precision (number of integers behind the GeoJSON geometry's decimal
         point) of the output spatial data file in GeoJSON format. Must be at or between 0 and 15. By default, the
         precision parameter is set to 5.
+    * OutputFormat (str, optional): the format of the output file. Available options are:
+        * GeoJSON: a single GeoJSON FeatureCollection. Default.
+        * GeoJSONSeq: newline-delimited GeoJSON (GeoJSON text sequence), with one feature per line.
+    * IncludeBoundingBox (boolean, optional): If TRUE, the bounding box of each feature is written as the feature
+        "bbox" member. Default: False.
+    * IncludeAttributes (str, optional): A list of glob-style patterns to determine the attributes to write.
+        Default: * (All attributes are written).
+    * ExcludeAttributes (str, optional): A list of glob-style patterns to determine the attributes to not write.
+        Default: '' (No attributes are excluded).
+
+    A GeoJSONSeq file, and a GeoJSON file with feature bounding boxes or selected attributes, is written by streaming
+    the features to the file in chunks, so that large GeoLayers are written in bounded memory. Otherwise, the GeoJSON
+    file is written by the QGIS vector file writer.
     """
 
     # Define the command parameters.
@@ -59,7 +73,14 @@ class WriteGeoLayerToGeoJSON(AbstractCommand):
         CommandParameterMetadata("GeoLayerID", type("")),
         CommandParameterMetadata("OutputFile", type("")),
         CommandParameterMetadata("OutputCRS", type("")),
-        CommandParameterMetadata("OutputPrecision", type(2))]
+        CommandParameterMetadata("OutputPrecision", type(2)),
+        CommandParameterMetadata("OutputFormat", type("")),
+        CommandParameterMetadata("IncludeBoundingBox", type(True)),
+        CommandParameterMetadata("IncludeAttributes", type("")),
+        CommandParameterMetadata("ExcludeAttributes", type(""))]
+
+    # Choices for OutputFormat, used to validate parameter and display in editor
+    __choices_OutputFormat = ["GeoJSON", "GeoJSONSeq"]
 
     def __init__(self):
         """
@@ -112,6 +133,36 @@ class WriteGeoLayerToGeoJSON(AbstractCommand):
             "For example, a higher OutputPrecision value increases the output GeoJSON file size and "
             "increases the geometry's precision.")
         self.parameter_input_metadata['OutputPrecision.Value.Default'] = "5"
+        # OutputFormat
+        self.parameter_input_metadata['OutputFormat.Description'] = "format of the output file"
+        self.parameter_input_metadata['OutputFormat.Label'] = "Output format"
+        self.parameter_input_metadata['OutputFormat.Tooltip'] = (
+            "The format of the output file.\n"
+            "GeoJSON : a single GeoJSON FeatureCollection.\n"
+            "GeoJSONSeq : newline-delimited GeoJSON, with one feature per line, which can be read and written one "
+            "feature at a time.")
+        self.parameter_input_metadata['OutputFormat.Values'] = ["", "GeoJSON", "GeoJSONSeq"]
+        self.parameter_input_metadata['OutputFormat.Value.Default'] = "GeoJSON"
+        # IncludeBoundingBox
+        self.parameter_input_metadata['IncludeBoundingBox.Description'] = "whether to write feature bounding boxes"
+        self.parameter_input_metadata['IncludeBoundingBox.Label'] = "Include bounding box?"
+        self.parameter_input_metadata['IncludeBoundingBox.Tooltip'] = (
+            "If TRUE, the bounding box of each feature is written as the feature \"bbox\" member, "
+            "with the output precision.")
+        self.parameter_input_metadata['IncludeBoundingBox.Value.Default'] = "FALSE"
+        self.parameter_input_metadata['IncludeBoundingBox.Values'] = ["", "TRUE", "FALSE"]
+        # IncludeAttributes
+        self.parameter_input_metadata['IncludeAttributes.Description'] = "attributes to write"
+        self.parameter_input_metadata['IncludeAttributes.Label'] = "Include attributes"
+        self.parameter_input_metadata['IncludeAttributes.Tooltip'] = \
+            "A comma-separated list of the glob-style patterns filtering which attributes to write."
+        self.parameter_input_metadata['IncludeAttributes.Value.Default'] = "*"
+        # ExcludeAttributes
+        self.parameter_input_metadata['ExcludeAttributes.Description'] = "attributes to not write"
+        self.parameter_input_metadata['ExcludeAttributes.Label'] = "Exclude attributes"
+        self.parameter_input_metadata['ExcludeAttributes.Tooltip'] = \
+            "A comma-separated list of the glob-style patterns filtering which attributes to not write."
+        self.parameter_input_metadata['ExcludeAttributes.Value.Default'] = "'' (empty string)"
 
         # Class data
         self.warning_count = 0
@@ -158,6 +209,30 @@ class WriteGeoLayerToGeoJSON(AbstractCommand):
                 CommandPhaseType.INITIALIZATION,
                 CommandLogRecord(CommandStatusType.FAILURE, message, recommendation))
 
+        # Check that optional parameter OutputFormat is one of the acceptable values or is None.
+        pv_OutputFormat = self.get_parameter_value(parameter_name="OutputFormat", command_parameters=command_parameters)
+        if not validators.validate_string_in_list(pv_OutputFormat, self.__choices_OutputFormat, none_allowed=True,
+                                                  empty_string_allowed=True, ignore_case=True):
+            message = "OutputFormat parameter value ({}) is not recognized.".format(pv_OutputFormat)
+            recommendation = "Specify one of the acceptable values ({}) for the OutputFormat parameter.".format(
+                self.__choices_OutputFormat)
+            warning += "\n" + message
+            self.command_status.add_to_log(
+                CommandPhaseType.INITIALIZATION,
+                CommandLogRecord(CommandStatusType.FAILURE, message, recommendation))
+
+        # Check that optional IncludeBoundingBox parameter value is a valid Boolean value or is None.
+        pv_IncludeBoundingBox = self.get_parameter_value(parameter_name="IncludeBoundingBox",
+                                                         command_parameters=command_parameters)
+        if not validators.validate_bool(pv_IncludeBoundingBox, none_allowed=True, empty_string_allowed=False):
+            message = "IncludeBoundingBox parameter value ({}) is not a recognized boolean value.".format(
+                pv_IncludeBoundingBox)
+            recommendation = "Specify either 'True' or 'False for the IncludeBoundingBox parameter."
+            warning += "\n" + message
+            self.command_status.add_to_log(
+                CommandPhaseType.INITIALIZATION,
+                CommandLogRecord(CommandStatusType.FAILURE, message, recommendation))
+
         # Check for unrecognized parameters.
         # This returns a message that can be appended to the warning, which if non-empty triggers an exception below.
         warning = command_util.validate_command_parameter_names(self, warning)
@@ -223,6 +298,16 @@ class WriteGeoLayerToGeoJSON(AbstractCommand):
         pv_GeoLayerID = self.get_parameter_value("GeoLayerID")
         pv_OutputPrecision = int(self.get_parameter_value("OutputPrecision", default_value=5))
         pv_OutputFile = self.get_parameter_value("OutputFile")
+        pv_OutputFormat = self.get_parameter_value("OutputFormat", default_value="GeoJSON")
+        pv_IncludeBoundingBox = self.get_parameter_value("IncludeBoundingBox", default_value="False")
+        pv_IncludeAttributes = self.get_parameter_value("IncludeAttributes")
+        pv_ExcludeAttributes = self.get_parameter_value("ExcludeAttributes")
+
+        # Convert the IncludeBoundingBox value to a Boolean value.
+        include_bbox = string_util.string_to_boolean(pv_IncludeBoundingBox)
+
+        # Determine whether the file is written as a GeoJSON text sequence.
+        sequence = pv_OutputFormat.upper() == "GEOJSONSEQ"
 
         # Expand for ${Property} syntax.
         pv_GeoLayerID = self.command_processor.expand_parameter_value(pv_GeoLayerID, self)
@@ -245,11 +330,34 @@ class WriteGeoLayerToGeoJSON(AbstractCommand):
                 # Obtain the parameter value of the OutputCRS
                 pv_OutputCRS = self.get_parameter_value("OutputCRS", default_value=geolayer_crs)
 
-                # Write the GeoLayer to a spatial data file in GeoJSONformat
-                qgis_util.write_qgsvectorlayer_to_geojson(geolayer.qgs_vector_layer,
-                                                          output_file_absolute,
-                                                          pv_OutputCRS,
-                                                          pv_OutputPrecision)
+                if sequence or include_bbox or pv_IncludeAttributes or pv_ExcludeAttributes:
+
+                    # Determine the attributes to write. By default, all attributes are written.
+                    if pv_IncludeAttributes or pv_ExcludeAttributes:
+                        attribute_names = string_util.filter_list_of_strings(
+                            geolayer.get_attribute_field_names(),
+                            string_util.delimited_string_to_list(pv_IncludeAttributes or "*"),
+                            string_util.delimited_string_to_list(pv_ExcludeAttributes or "''"),
+                            return_inclusions=True)
+                    else:
+                        attribute_names = None
+
+                    # Stream the features to the GeoJSON or GeoJSONSeq file.
+                    feature_count = qgis_util.write_qgsvectorlayer_to_geojson_stream(geolayer.qgs_vector_layer,
+                                                                                     output_file_absolute,
+                                                                                     pv_OutputCRS,
+                                                                                     pv_OutputPrecision,
+                                                                                     sequence=sequence,
+                                                                                     attribute_names=attribute_names,
+                                                                                     include_bbox=include_bbox)
+                    self.logger.info("Wrote {} features of GeoLayer {} to {}.".format(feature_count, pv_GeoLayerID,
+                                                                                      output_file_absolute))
+                else:
+                    # Write the GeoLayer to a spatial data file in GeoJSON format
+                    qgis_util.write_qgsvectorlayer_to_geojson(geolayer.qgs_vector_layer,
+                                                              output_file_absolute,
+                                                              pv_OutputCRS,
+                                                              pv_OutputPrecision)
 
                 # Save the output file in the processor
                 self.command_processor.add_output_file(output_file_absolute)
@@ -0,0 +1,362 @@
+# WriteGeoLayerToGeoPackage - command to write a GeoLayer to a GeoPackage file
+# ________________________________________________________________NoticeStart_
+# GeoProcessor
+# Copyright (C) 2017-2019 Open Water Foundation
+# 
+# GeoProcessor is free software:  you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+# 
+#     GeoProcessor is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+# 
+#     You should have received a copy of the GNU General Public License
+#     along with GeoProcessor.  If not, see <https://www.gnu.org/licenses/>.
+# ________________________________________________________________NoticeEnd___
+
+from geoprocessor.commands.abstract.AbstractCommand import AbstractCommand
+
+from geoprocessor.core.CommandLogRecord import CommandLogRecord
+from geoprocessor.core.CommandParameterMetadata import CommandParameterMetadata
+from geoprocessor.core.CommandPhaseType import CommandPhaseType
+from geoprocessor.core.CommandStatusType import CommandStatusType
+
+import geoprocessor.util.command_util as command_util
+import geoprocessor.util.io_util as io_util
+import geoprocessor.util.qgis_util as qgis_util
+import geoprocessor.util.string_util as string_util
+import geoprocessor.util.validator_util as validators
+
+import os
+import logging
+
+
+class WriteGeoLayerToGeoPackage(AbstractCommand):
+    """
+    Writes a GeoLayer to a layer in a spatial data file in GeoPackage format.
+
+    This command writes a GeoLayer registered within the geoprocessor to a layer in a GeoPackage file. A GeoPackage
+    file can hold many layers, so the command can be run for several GeoLayers to write them to the same file.
+    GeoPackage files are written faster than shapefiles and do not have the shapefile 2 GB file size and 10-character
+    attribute name limits.
+
+    Command Parameters
+    * GeoLayerID (str, required): the identifier of the GeoLayer to be written
+    * OutputFile (str, required): the relative pathname of the output GeoPackage file.
+    * OutputLayerName (str, optional): the name of the layer in the GeoPackage. Default: the GeoLayerID.
+    * OutputCRS (str, EPSG code, optional): the coordinate reference system that the output layer will be
+        projected. By default, the output layer will be projected to the GeoLayer's current CRS.
+    * WriteMode (str, optional): how the layer is written if the output file exists. Available options are:
+        `Overwrite` (replace the file), `ReplaceLayer` (add the layer, replacing a layer with the same name) and
+        `Append` (append the features to the layer with the same name). Default value is `ReplaceLayer`.
+    * SpatialIndex (boolean, optional): If TRUE, a spatial index is created for the layer. Default: True.
+    * TransactionSize (int, optional): the number of features written in each database transaction.
+        Default: all features are written in one transaction.
+    """
+
+    # Define the command parameters.
+    __command_parameter_metadata = [
+        CommandParameterMetadata("GeoLayerID", type("")),
+        CommandParameterMetadata("OutputFile", type("")),
+        CommandParameterMetadata("OutputLayerName", type("")),
+        CommandParameterMetadata("OutputCRS", type("")),
+        CommandParameterMetadata("WriteMode", type("")),
+        CommandParameterMetadata("SpatialIndex", type(True)),
+        CommandParameterMetadata("TransactionSize", type(0))]
+
+    # Choices for WriteMode, used to validate parameter and display in editor
+    __choices_WriteMode = ["Overwrite", "ReplaceLayer", "Append"]
+
+    def __init__(self):
+        """
+        Initialize the command.
+        """
+
+        # AbstractCommand data
+        super().__init__()
+        self.command_name = "WriteGeoLayerToGeoPackage"
+        self.command_parameter_metadata = self.__command_parameter_metadata
+
+        # Command metadata for command editor display
+        self.command_metadata = dict()
+        self.command_metadata['Description'] = "Write a GeoLayer to a layer in a file in GeoPackage format."
+        self.command_metadata['EditorType'] = "Simple"
+
+        # Command Parameter Metadata
+        self.parameter_input_metadata = dict()
+        # GeoLayerID
+        self.parameter_input_metadata['GeoLayerID.Description'] = "identifier of the GeoLayer to write"
+        self.parameter_input_metadata['GeoLayerID.Label'] = "GeoLayerID"
+        self.parameter_input_metadata['GeoLayerID.Required'] = True
+        self.parameter_input_metadata['GeoLayerID.Tooltip'] = "The identifier of the GeoLayer to write."
+        # OutputFile
+        self.parameter_input_metadata['OutputFile.Description'] = "the GeoPackage file to write"
+        self.parameter_input_metadata['OutputFile.Label'] = "Output file"
+        self.parameter_input_metadata['OutputFile.Required'] = True
+        self.parameter_input_metadata['OutputFile.Tooltip'] = \
+            "The output GeoPackage file (relative or absolute path; should end in .gpkg). ${Property} syntax is " \
+            "recognized."
+        self.parameter_input_metadata['OutputFile.FileSelector.Type'] = "Write"
+        self.parameter_input_metadata['OutputFile.FileSelector.Title'] = "Select GeoPackage file to write"
+        # OutputLayerName
+        self.parameter_input_metadata['OutputLayerName.Description'] = "name of the layer in the GeoPackage"
+        self.parameter_input_metadata['OutputLayerName.Label'] = "Output layer name"
+        self.parameter_input_metadata['OutputLayerName.Tooltip'] = \
+            "The name of the layer in the GeoPackage file. ${Property} syntax is recognized."
+        self.parameter_input_metadata['OutputLayerName.Value.Default'] = "The GeoLayerID"
+        # OutputCRS
+        self.parameter_input_metadata['OutputCRS.Description'] = "coordinate reference system of the output layer"
+        self.parameter_input_metadata['OutputCRS.Label'] = "Output CRS"
+        self.parameter_input_metadata['OutputCRS.Tooltip'] = (
+            "The coordinate reference system of the output layer. EPSG or ESRI code format required "
+            "(e.g. EPSG:4326, EPSG:26913, ESRI:102003).\n"
+            "If the output CRS is different than the CRS of the GeoLayer, the output layer is reprojected "
+            "to the new CRS.")
+        self.parameter_input_metadata['OutputCRS.Value.Default'] = "The GeoLayer's CRS"
+        # WriteMode
+        self.parameter_input_metadata['WriteMode.Description'] = "how the layer is written to an existing file"
+        self.parameter_input_metadata['WriteMode.Label'] = "Write mode"
+        self.parameter_input_metadata['WriteMode.Tooltip'] = (
+            "How the layer is written if the output file exists. The file is created if it does not exist.\n"
+            "Overwrite : The file is replaced with a file that only has the layer.\n"
+            "ReplaceLayer : The layer is added to the file, replacing a layer with the same name. "
+            "Other layers are kept.\n"
+            "Append : The features are appended to the layer with the same name.")
+        self.parameter_input_metadata['WriteMode.Values'] = ["", "Overwrite", "ReplaceLayer", "Append"]
+        self.parameter_input_metadata['WriteMode.Value.Default'] = "ReplaceLayer"
+        # SpatialIndex
+        self.parameter_input_metadata['SpatialIndex.Description'] = "whether to create a spatial index"
+        self.parameter_input_metadata['SpatialIndex.Label'] = "Spatial index?"
+        self.parameter_input_metadata['SpatialIndex.Tooltip'] = (
+            "If TRUE, a spatial index is created for the layer, which speeds up spatial queries.\n"
+            "If FALSE, a spatial index is not created, which is slightly faster to write.")
+        self.parameter_input_metadata['SpatialIndex.Value.Default'] = "TRUE"
+        self.parameter_input_metadata['SpatialIndex.Values'] = ["", "TRUE", "FALSE"]
+        # TransactionSize
+        self.parameter_input_metadata['TransactionSize.Description'] = "number of features in each transaction"
+        self.parameter_input_metadata['TransactionSize.Label'] = "Transaction size"
+        self.parameter_input_metadata['TransactionSize.Tooltip'] = (
+            "The number of features written in each database transaction.\n"
+            "Writing all features in one transaction is fastest. Smaller transactions limit the size of the "
+            "uncommitted data for very large layers.")
+        self.parameter_input_metadata['TransactionSize.Value.Default'] = "All features in one transaction"
+
+        # Class data
+        self.warning_count = 0
+        self.logger = logging.getLogger(__name__)
+
+    def check_command_parameters(self, command_parameters):
+        """
+        Check the command parameters for validity.
+
+        Args:
+            command_parameters: the dictionary of command parameters to check (key:string_value)
+
+        Returns: None.
+
+        Raises:
+            ValueError if any parameters are invalid or do not have a valid value.
+            The command status messages for initialization are populated with validation messages.
+        """
+
+        warning = ""
+
+        # Check that parameter GeoLayerID is a non-empty, non-None string.
+        # - existence of the GeoLayer will also be checked in run_command().
+        pv_GeoLayerID = self.get_parameter_value(parameter_name='GeoLayerID', command_parameters=command_parameters)
+
+        if not validators.validate_string(pv_GeoLayerID, False, False):
+            message = "GeoLayerID parameter has no value."
+            recommendation = "Specify the GeoLayerID parameter to indicate the GeoLayer to write."
+            warning += "\n" + message
+            self.command_status.add_to_log(
+                CommandPhaseType.INITIALIZATION,
+                CommandLogRecord(CommandStatusType.FAILURE, message, recommendation))
+
+        # Check that parameter OutputFile is a non-empty, non-None string.
+        # - existence of the folder will also be checked in run_command().
+        pv_OutputFile = self.get_parameter_value(parameter_name='OutputFile', command_parameters=command_parameters)
+
+        if not validators.validate_string(pv_OutputFile, False, False):
+            message = "OutputFile parameter has no value."
+            recommendation = "Specify the OutputFile parameter (relative or absolute pathname) to indicate the " \
+                             "location and name of the output spatial data file in GeoPackage format."
+            warning += "\n" + message
+            self.command_status.add_to_log(
+                CommandPhaseType.INITIALIZATION,
+                CommandLogRecord(CommandStatusType.FAILURE, message, recommendation))
+
+        # Check that optional parameter WriteMode is one of the acceptable values or is None.
+        pv_WriteMode = self.get_parameter_value(parameter_name="WriteMode", command_parameters=command_parameters)
+        if not validators.validate_string_in_list(pv_WriteMode, self.__choices_WriteMode, none_allowed=True,
+                                                  empty_string_allowed=True, ignore_case=True):
+            message = "WriteMode parameter value ({}) is not recognized.".format(pv_WriteMode)
+            recommendation = "Specify one of the acceptable values ({}) for the WriteMode parameter.".format(
+                self.__choices_WriteMode)
+            warning += "\n" + message
+            self.command_status.add_to_log(
+                CommandPhaseType.INITIALIZATION,
+                CommandLogRecord(CommandStatusType.FAILURE, message, recommendation))
+
+        # Check that optional SpatialIndex parameter value is a valid Boolean value or is None.
+        pv_SpatialIndex = self.get_parameter_value(parameter_name="SpatialIndex",
+                                                   command_parameters=command_parameters)
+        if not validators.validate_bool(pv_SpatialIndex, none_allowed=True, empty_string_allowed=False):
+            message = "SpatialIndex parameter value ({}) is not a recognized boolean value.".format(pv_SpatialIndex)
+            recommendation = "Specify either 'True' or 'False for the SpatialIndex parameter."
+            warning += "\n" + message
+            self.command_status.add_to_log(
+                CommandPhaseType.INITIALIZATION,
+                CommandLogRecord(CommandStatusType.FAILURE, message, recommendation))
+
+        # Check that optional TransactionSize parameter value is a positive integer or is None.
+        pv_TransactionSize = self.get_parameter_value(parameter_name="TransactionSize",
+                                                      command_parameters=command_parameters)
+        if not validators.validate_int(pv_TransactionSize, none_allowed=True, empty_string_allowed=True) or \
+                (pv_TransactionSize and int(pv_TransactionSize) < 1):
+            message = "TransactionSize parameter value ({}) is not a positive integer.".format(pv_TransactionSize)
+            recommendation = "Specify a positive integer for the TransactionSize parameter."
+            warning += "\n" + message
+            self.command_status.add_to_log(
+                CommandPhaseType.INITIALIZATION,
+                CommandLogRecord(CommandStatusType.FAILURE, message, recommendation))
+
+        # Check for unrecognized parameters.
+        # This returns a message that can be appended to the warning, which if non-empty triggers an exception below.
+        warning = command_util.validate_command_parameter_names(self, warning)
+
+        # If any warnings were generated, throw an exception.
+        if len(warning) > 0:
+            self.logger.warning(warning)
+            raise ValueError(warning)
+
+        # Refresh the phase severity
+        self.command_status.refresh_phase_severity(CommandPhaseType.INITIALIZATION, CommandStatusType.SUCCESS)
+
+    def __should_write_geolayer(self, geolayer_id, output_file_abs):
+        """
+        Checks the following:
+        * the ID of the GeoLayer is an existing GeoLayer ID
+        * the output folder is a valid folder
+
+        Args:
+            geolayer_id: the ID of the GeoLayer to be written
+            output_file_abs: the full pathname to the output file
+
+        Returns:
+            run_write: Boolean. If TRUE, the writing process should be run. If FALSE, it should not be run.
+        """
+
+        # Boolean to determine if the writing process should be run. Set to true until an error occurs.
+        run_write = True
+
+        # If the GeoLayer ID is not an existing GeoLayer ID, raise a FAILURE.
+        if not self.command_processor.get_geolayer(geolayer_id):
+            run_write = False
+            self.warning_count += 1
+            message = 'The GeoLayerID ({}) is not a valid GeoLayer ID.'.format(geolayer_id)
+            recommendation = 'Specify a valid GeoLayerID.'
+            self.logger.error(message)
+            self.command_status.add_to_log(CommandPhaseType.RUN,
+                                           CommandLogRecord(CommandStatusType.FAILURE, message, recommendation))
+
+        # If the OutputFolder is not a valid folder, raise a FAILURE.
+        output_folder = os.path.dirname(output_file_abs)
+        if not os.path.isdir(output_folder):
+            run_write = False
+            self.warning_count += 1
+            message = 'The output folder ({}) of the OutputFile is not a valid folder.'.format(output_folder)
+            recommendation = 'Specify a valid relative pathname for the output file.'
+            self.logger.error(message)
+            self.command_status.add_to_log(CommandPhaseType.RUN, CommandLogRecord(CommandStatusType.FAILURE,
+                                                                                    message, recommendation))
+
+        # Return the Boolean to determine if the write process should be run. If TRUE, all checks passed. If FALSE,
+        # one or many checks failed.
+        return run_write
+
+    def run_command(self):
+        """
+        Run the command. Write the GeoLayer to a layer in a spatial data file in GeoPackage format.
+
+        Returns: None.
+
+        Raises:
+            RuntimeError if any warnings occurred during run_command method.
+        """
+
+        # Obtain the parameter values except for the OutputCRS
+        pv_GeoLayerID = self.get_parameter_value("GeoLayerID")
+        pv_OutputFile = self.get_parameter_value("OutputFile")
+        pv_OutputLayerName = self.get_parameter_value("OutputLayerName")
+        pv_WriteMode = self.get_parameter_value("WriteMode", default_value="ReplaceLayer")
+        pv_SpatialIndex = self.get_parameter_value("SpatialIndex", default_value="True")
+        pv_TransactionSize = self.get_parameter_value("TransactionSize")
+
+        # Expand for ${Property} syntax.
+        pv_GeoLayerID = self.command_processor.expand_parameter_value(pv_GeoLayerID, self)
+
+        # Convert the SpatialIndex value to a Boolean value.
+        spatial_index_bool = string_util.string_to_boolean(pv_SpatialIndex)
+
+        # Convert the TransactionSize value to an integer. None writes all features in one transaction.
+        if pv_TransactionSize:
+            transaction_size = int(pv_TransactionSize)
+        else:
+            transaction_size = None
+
+        # The layer name defaults to the GeoLayerID.
+        if pv_OutputLayerName:
+            output_layer_name = self.command_processor.expand_parameter_value(pv_OutputLayerName, self)
+        else:
+            output_layer_name = pv_GeoLayerID
+
+        # Convert the OutputFile parameter value relative path to an absolute path and expand for ${Property} syntax
+        output_file_absolute = io_util.verify_path_for_os(
+            io_util.to_absolute_path(self.command_processor.get_property('WorkingDir'),
+                                     self.command_processor.expand_parameter_value(pv_OutputFile, self)))
+
+        # Run the checks on the parameter values. Only continue if the checks passed.
+        if self.__should_write_geolayer(pv_GeoLayerID, output_file_absolute):
+
+            try:
+
+                # Get the GeoLayer
+                geolayer = self.command_processor.get_geolayer(pv_GeoLayerID)
+
+                # Get the current coordinate reference system (in EPSG code) of the current GeoLayer
+                geolayer_crs = geolayer.get_crs()
+
+                # Obtain the parameter value of the OutputCRS
+                pv_OutputCRS = self.get_parameter_value("OutputCRS", default_value=geolayer_crs)
+
+                # Write the GeoLayer to a layer in a spatial data file in GeoPackage format
+                qgis_util.write_qgsvectorlayer_to_geopackage(geolayer.qgs_vector_layer,
+                                                             output_file_absolute,
+                                                             pv_OutputCRS,
+                                                             layer_name=output_layer_name,
+                                                             write_mode=pv_WriteMode,
+                                                             spatial_index=spatial_index_bool,
+                                                             transaction_size=transaction_size)
+
+            # Raise an exception if an unexpected error occurs during the process
+            except Exception as e:
+                self.warning_count += 1
+                message = "Unexpected error writing GeoLayer {} to spatial data file in GeoPackage format.".format(
+                    pv_GeoLayerID)
+                recommendation = "Check the log file for details."
+                self.logger.error(message, exc_info=True)
+                self.command_status.add_to_log(CommandPhaseType.RUN,
+                                               CommandLogRecord(CommandStatusType.FAILURE, message, recommendation))
+
+        # Determine success of command processing. Raise Runtime Error if any errors occurred
+        if self.warning_count > 0:
+            message = "There were {} warnings proceeding this command.".format(self.warning_count)
+            raise RuntimeError(message)
+
+        # Set command status type as SUCCESS if there are no errors.
+        else:
+            self.command_status.refresh_phase_severity(CommandPhaseType.RUN, CommandStatusType.SUCCESS)
@@ -176,6 +176,9 @@ class For(AbstractCommand):
         self.table = None
         self.table_column = None
         self.table_property_map = None
+        # The values of the columns in the table_property_map, retrieved once when the loop is initialized
+        # Key: column name, Value: list of column values
+        self.table_property_values = None
 
     def check_command_parameters(self, command_parameters):
         """
@@ -423,6 +426,11 @@ class For(AbstractCommand):
                                                                                                    entry_delimiter=",",
                                                                                                    key_value_delimiter=":",
                                                                                                    trim=False)
+                    # Get the values of the property map columns as lists once, rather than looking up the row in the
+                    # data frame for each iteration.
+                    self.table_property_values = {}
+                    for column in self.table_property_map.keys():
+                        self.table_property_values[column] = self.table.get_column_values_as_list(column)
                     # Get the values of the input column as a list
                     self.iterator_object_list_index = 0
                     self.iterator_list = self.table.get_column_values_as_list(pv_TableColumn)
@@ -600,18 +608,12 @@ class For(AbstractCommand):
         # Get the iterator object list index
         index = self.iterator_object_list_index
 
-        # Get the pandas data frame object for the table being iterated
-        df = self.table.df
-
-        # Get the pandas row that is currently being iterated over.
-        row = df.iloc[index]
-
         # Iterate over the entries in the table_property_map dictionary.
-        # key is the property name and value is the corresponding column name
+        # key is the column name and value is the corresponding property name
         for column, property in self.table_property_map.items():
 
             # Get the value for the given column and the current row.
-            property_val = row[column]
+            property_val = self.table_property_values[column][index]
 
             # Assign the geoprocessor property the corresponding value.
             self.command_processor.set_property(property, property_val)
@@ -0,0 +1,291 @@
+# SetPropertiesFromTableRow - command to set processor properties from the values of a table row
+# ________________________________________________________________NoticeStart_
+# GeoProcessor
+# Copyright (C) 2017-2019 Open Water Foundation
+#
+# GeoProcessor is free software:  you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     GeoProcessor is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with GeoProcessor.  If not, see <https://www.gnu.org/licenses/>.
+# ________________________________________________________________NoticeEnd___
+
+from geoprocessor.commands.abstract.AbstractCommand import AbstractCommand
+
+from geoprocessor.core.CommandLogRecord import CommandLogRecord
+from geoprocessor.core.CommandParameterMetadata import CommandParameterMetadata
+from geoprocessor.core.CommandPhaseType import CommandPhaseType
+from geoprocessor.core.CommandStatusType import CommandStatusType
+
+import geoprocessor.util.command_util as command_util
+import geoprocessor.util.string_util as string_util
+import geoprocessor.util.validator_util as validators
+
+from decimal import Decimal, InvalidOperation
+import logging
+import pandas.api.types as pd_types
+
+
+class SetPropertiesFromTableRow(AbstractCommand):
+    """
+    The SetPropertiesFromTableRow command sets GeoProcessor properties from the values of the Table row that has a
+    key value. This is particularly useful when inside a For() loop and values from a lookup Table are needed.
+    The row is found using the hash index of the key column (see Table.find_row_positions()), which is created the
+    first time the column is used as a key, so lookups in a loop do not scan the Table.
+    """
+
+    __command_parameter_metadata = [
+        CommandParameterMetadata("TableID", type("")),
+        CommandParameterMetadata("KeyColumn", type("")),
+        CommandParameterMetadata("KeyValue", type("")),
+        CommandParameterMetadata("PropertyMap", type("")),
+        CommandParameterMetadata("IfNotFound", type(""))
+    ]
+
+    # Choices for IfNotFound, used to validate parameter and display in editor
+    __choices_IfNotFound = ["Ignore", "Warn", "Fail"]
+
+    def __init__(self):
+        """
+        Initialize a command instance.
+        """
+        # AbstractCommand data
+        super().__init__()
+        self.command_name = "SetPropertiesFromTableRow"
+        self.command_parameter_metadata = self.__command_parameter_metadata
+
+        # Command metadata for command editor display
+        self.command_metadata = dict()
+        self.command_metadata['Description'] =\
+            "Set the values of properties used by the processor, using the values of the table row with a key value."
+        self.command_metadata['EditorType'] = "Simple"
+
+        # Command Parameter Metadata
+        self.parameter_input_metadata = dict()
+        # TableID
+        self.parameter_input_metadata['TableID.Description'] = "Table identifier"
+        self.parameter_input_metadata['TableID.Label'] = "TableID"
+        self.parameter_input_metadata['TableID.Required'] = True
+        self.parameter_input_metadata['TableID.Tooltip'] = "The Table identifier, can use ${Property} syntax."
+        # KeyColumn
+        self.parameter_input_metadata['KeyColumn.Description'] = "name of the key column"
+        self.parameter_input_metadata['KeyColumn.Label'] = "Key column"
+        self.parameter_input_metadata['KeyColumn.Required'] = True
+        self.parameter_input_metadata['KeyColumn.Tooltip'] = "The name of the column used to find the row."
+        # KeyValue
+        self.parameter_input_metadata['KeyValue.Description'] = "value of the key column"
+        self.parameter_input_metadata['KeyValue.Label'] = "Key value"
+        self.parameter_input_metadata['KeyValue.Required'] = True
+        self.parameter_input_metadata['KeyValue.Tooltip'] = (
+            "The value of the key column in the row to use, can use ${Property} syntax.\n"
+            "If more than one row has the value, the first row is used.")
+        # PropertyMap
+        self.parameter_input_metadata['PropertyMap.Description'] = "columns and properties to set"
+        self.parameter_input_metadata['PropertyMap.Label'] = "Property map"
+        self.parameter_input_metadata['PropertyMap.Tooltip'] = (
+            "Specify the names of column names and corresponding processor property names to set.\n\n"
+            "Specify using format:\n"
+            "ColumnName1:PropertyName1,ColumnName2:PropertyName2")
+        self.parameter_input_metadata['PropertyMap.Value.Default.Description'] = \
+            "All columns are set as properties with the same names as the columns."
+        # IfNotFound
+        self.parameter_input_metadata['IfNotFound.Description'] = "action if the key value is not found"
+        self.parameter_input_metadata['IfNotFound.Label'] = "If not found"
+        self.parameter_input_metadata['IfNotFound.Tooltip'] = (
+            "The action that occurs if no row has the key value.\n"
+            "Ignore : The properties are not set. No warning is logged.\n"
+            "Warn : The properties are not set. A warning is logged.\n"
+            "Fail : The properties are not set. A fail message is logged.")
+        self.parameter_input_metadata['IfNotFound.Values'] = ["", "Ignore", "Warn", "Fail"]
+        self.parameter_input_metadata['IfNotFound.Value.Default'] = "Warn"
+
+    def check_command_parameters(self, command_parameters):
+        """
+        Check the command parameters for validity.
+
+        Args:
+            command_parameters: the dictionary of command parameters to check (key:string_value)
+
+        Returns:
+            Nothing.
+
+        Raises:
+            ValueError if any parameters are invalid or do not have a valid value.
+            The command status messages for initialization are populated with validation messages.
+        """
+        warning = ""
+        logger = logging.getLogger(__name__)
+
+        # TableID, KeyColumn and KeyValue are required
+        # - non-empty, non-None string.
+        # - existence of the Table and column will also be checked in run_command().
+        for parameter in ["TableID", "KeyColumn", "KeyValue"]:
+            parameter_value = self.get_parameter_value(parameter_name=parameter, command_parameters=command_parameters)
+            if not validators.validate_string(parameter_value, False, False):
+                message = "{} parameter has no value.".format(parameter)
+                recommendation = "Specify the {} parameter.".format(parameter)
+                warning += "\n" + message
+                self.command_status.add_to_log(
+                    CommandPhaseType.INITIALIZATION,
+                    CommandLogRecord(CommandStatusType.FAILURE, message, recommendation))
+
+        # IfNotFound is optional, must be one of the acceptable values or None
+        pv_IfNotFound = self.get_parameter_value(parameter_name='IfNotFound', command_parameters=command_parameters)
+        if not validators.validate_string_in_list(pv_IfNotFound, self.__choices_IfNotFound, none_allowed=True,
+                                                  empty_string_allowed=True, ignore_case=True):
+            message = "IfNotFound parameter value ({}) is not recognized.".format(pv_IfNotFound)
+            recommendation = "Specify one of the acceptable values ({}) for the IfNotFound parameter.".format(
+                self.__choices_IfNotFound)
+            warning += "\n" + message
+            self.command_status.add_to_log(
+                CommandPhaseType.INITIALIZATION,
+                CommandLogRecord(CommandStatusType.FAILURE, message, recommendation))
+
+        # Check for unrecognized parameters.
+        # This returns a message that can be appended to the warning, which if non-empty
+        # triggers an exception below.
+        warning = command_util.validate_command_parameter_names(self, warning)
+
+        # If any warnings were generated, throw an exception
+        if len(warning) > 0:
+            logger.warning(warning)
+            raise ValueError(warning)
+
+        # Refresh the phase severity
+        self.command_status.refresh_phase_severity(CommandPhaseType.INITIALIZATION, CommandStatusType.SUCCESS)
+
+    @staticmethod
+    def __convert_key_value(column, key_value):
+        """
+        Convert the key value string to the type of the key column values, so that it matches the column values in
+        the column index.
+
+        Args:
+            column (pandas Series object): the key column
+            key_value (str): the key value
+
+        Returns:
+            The key value converted to a bool, int or float, if the column has that type, otherwise the key value.
+            None if the key value cannot be converted to the column type, in which case no row can match.
+        """
+
+        if pd_types.is_bool_dtype(column):
+            key_value_upper = key_value.strip().upper()
+            if key_value_upper in ["TRUE", "FALSE"]:
+                return key_value_upper == "TRUE"
+            return None
+        elif pd_types.is_integer_dtype(column):
+            try:
+                return int(key_value)
+            except ValueError:
+                pass
+            # Allow an integral value that is formatted as a decimal number, such as "12.0". Decimal is used rather
+            # than float so that large integers do not lose precision.
+            try:
+                decimal_value = Decimal(key_value.strip())
+            except InvalidOperation:
+                return None
+            if decimal_value.is_finite() and decimal_value == decimal_value.to_integral_value():
+                return int(decimal_value)
+            return None
+        elif pd_types.is_float_dtype(column):
+            try:
+                return float(key_value)
+            except ValueError:
+                return None
+        else:
+            return key_value
+
+    def run_command(self):
+        """
+        Run the command.  Set the GeoProcessor properties to the values of the Table row with the key value.
+
+        Returns:
+            Nothing.
+
+        Raises:
+            RuntimeError if an exception occurs, for example if the Table or key column is not found.
+        """
+        warning_count = 0
+        logger = logging.getLogger(__name__)
+
+        pv_TableID = self.get_parameter_value("TableID")
+        pv_KeyColumn = self.get_parameter_value("KeyColumn")
+        pv_KeyValue = self.get_parameter_value("KeyValue")
+        pv_PropertyMap = self.get_parameter_value("PropertyMap")
+        pv_IfNotFound = self.get_parameter_value("IfNotFound", default_value="Warn")
+
+        # Expand for ${Property} syntax.
+        pv_TableID = self.command_processor.expand_parameter_value(pv_TableID, self)
+        pv_KeyValue = self.command_processor.expand_parameter_value(pv_KeyValue, self)
+
+        try:
+            # Get the Table object
+            table = self.command_processor.get_table(pv_TableID)
+            if table is None:
+                message = 'Unable to find Table for TableID="' + pv_TableID + '"'
+                warning_count += 1
+                self.command_status.add_to_log(
+                    CommandPhaseType.RUN,
+                    CommandLogRecord(CommandStatusType.FAILURE, message, "Check the log file for details."))
+            elif pv_KeyColumn not in table.get_column_names():
+                message = 'Key column "' + pv_KeyColumn + '" is not in Table "' + pv_TableID + '"'
+                warning_count += 1
+                self.command_status.add_to_log(
+                    CommandPhaseType.RUN,
+                    CommandLogRecord(CommandStatusType.FAILURE, message, "Specify an existing column."))
+            else:
+                # Get the columns and property names. By default, all columns are set using the column names.
+                if pv_PropertyMap:
+                    property_map = string_util.delimited_string_to_dictionary_one_value(pv_PropertyMap,
+                                                                                        entry_delimiter=",",
+                                                                                        key_value_delimiter=":",
+                                                                                        trim=True)
+                else:
+                    property_map = {column: column for column in table.get_column_names()}
+
+                # Find the row using the key column index.
+                # A key value that cannot be converted to the key column type is handled as not found.
+                key_value = self.__convert_key_value(table.df[pv_KeyColumn], pv_KeyValue)
+                if key_value is None:
+                    row_positions = []
+                else:
+                    row_positions = table.find_row_positions(pv_KeyColumn, key_value)
+
+                if row_positions:
+                    # Get each value directly, rather than creating a pandas row object with all the columns.
+                    for column, property_name in property_map.items():
+                        property_value = table.df[column].iat[row_positions[0]]
+                        self.command_processor.set_property(property_name, property_value)
+                elif pv_IfNotFound.upper() != "IGNORE":
+                    message = 'No row in Table "{}" has {}="{}"'.format(pv_TableID, pv_KeyColumn, pv_KeyValue)
+                    logger.warning(message)
+                    if pv_IfNotFound.upper() == "FAIL":
+                        warning_count += 1
+                        status = CommandStatusType.FAILURE
+                    else:
+                        status = CommandStatusType.WARNING
+                    self.command_status.add_to_log(
+                        CommandPhaseType.RUN,
+                        CommandLogRecord(status, message, "Confirm that the Table has a row with the key value."))
+        except Exception as e:
+            warning_count += 1
+            message = 'Unexpected error setting properties from Table "' + str(pv_TableID) + '"'
+            logger.warning(message, exc_info=True)
+            self.command_status.add_to_log(
+                CommandPhaseType.RUN,
+                CommandLogRecord(CommandStatusType.FAILURE, message,
+                                 "Check the log file for details."))
+
+        if warning_count > 0:
+            message = "There were " + str(warning_count) + " warnings processing the command."
+            raise RuntimeError(message)
+
+        self.command_status.refresh_phase_severity(CommandPhaseType.RUN, CommandStatusType.SUCCESS)
@@ -0,0 +1,313 @@
+# AggregateTable - command to aggregate the rows of a table by group
+# ________________________________________________________________NoticeStart_
+# GeoProcessor
+# Copyright (C) 2017-2019 Open Water Foundation
+#
+# GeoProcessor is free software:  you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     GeoProcessor is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with GeoProcessor.  If not, see <https://www.gnu.org/licenses/>.
+# ________________________________________________________________NoticeEnd___
+
+from geoprocessor.commands.abstract.AbstractCommand import AbstractCommand
+
+from geoprocessor.core.CommandLogRecord import CommandLogRecord
+from geoprocessor.core.CommandParameterMetadata import CommandParameterMetadata
+from geoprocessor.core.CommandPhaseType import CommandPhaseType
+from geoprocessor.core.CommandStatusType import CommandStatusType
+from geoprocessor.core.Table_pandas import Table
+
+import geoprocessor.util.command_util as command_util
+import geoprocessor.util.string_util as string_util
+import geoprocessor.util.validator_util as validators
+
+import logging
+
+
+class AggregateTable(AbstractCommand):
+    """
+    Aggregates the rows of a Table by group, creating a new Table with one row for each group.
+
+    The groups are found by hashing the values of the group-by columns (pandas DataFrame.groupby) and each statistic is
+    computed on whole columns at once. Only the group-by and aggregate columns are used. The input Table is not
+    changed.
+
+    Command Parameters
+    * TableID (str, required): the identifier of the Table to aggregate.
+    * GroupByColumns (str, required): the names of the columns used to group rows, separated by commas.
+    * AggregateColumns (str, required): the columns to aggregate and the statistic to compute, using the syntax
+        Column1:Statistic1,Column2:Statistic2. Available statistics are Count, Max, Mean, Min and Sum.
+        The output columns are named Column_Statistic.
+    * NewTableID (str, required): the identifier of the new Table.
+    * IfTableIDExists (str, optional): This parameter determines the action that occurs if the NewTableID already
+        exists within the GeoProcessor. Available options are: `Replace`, `ReplaceAndWarn`, `Warn` and `Fail`
+        (Refer to user documentation for detailed description.) Default value is `Replace`.
+    """
+
+    # Define the command parameters.
+    __command_parameter_metadata = [
+        CommandParameterMetadata("TableID", type("")),
+        CommandParameterMetadata("GroupByColumns", type("")),
+        CommandParameterMetadata("AggregateColumns", type("")),
+        CommandParameterMetadata("NewTableID", type("")),
+        CommandParameterMetadata("IfTableIDExists", type(""))]
+
+    # Choices for the statistics in AggregateColumns, used to validate parameter.
+    __choices_Statistic = ["Count", "Max", "Mean", "Min", "Sum"]
+
+    def __init__(self):
+        """
+        Initialize the command.
+        """
+
+        # AbstractCommand data
+        super().__init__()
+        self.command_name = "AggregateTable"
+        self.command_parameter_metadata = self.__command_parameter_metadata
+
+        # Command metadata for command editor display
+        self.command_metadata = dict()
+        self.command_metadata['Description'] = "Aggregate the rows of a table by group."
+        self.command_metadata['EditorType'] = "Simple"
+
+        # Command Parameter Metadata
+        self.parameter_input_metadata = dict()
+        # TableID
+        self.parameter_input_metadata['TableID.Description'] = "table to aggregate"
+        self.parameter_input_metadata['TableID.Label'] = "TableID"
+        self.parameter_input_metadata['TableID.Required'] = True
+        self.parameter_input_metadata['TableID.Tooltip'] = "The Table identifier of the Table to aggregate."
+        # GroupByColumns
+        self.parameter_input_metadata['GroupByColumns.Description'] = "columns used to group rows"
+        self.parameter_input_metadata['GroupByColumns.Label'] = "Group by columns"
+        self.parameter_input_metadata['GroupByColumns.Required'] = True
+        self.parameter_input_metadata['GroupByColumns.Tooltip'] = \
+            "A comma-separated list of the names of the columns used to group rows."
+        # AggregateColumns
+        self.parameter_input_metadata['AggregateColumns.Description'] = "columns to aggregate"
+        self.parameter_input_metadata['AggregateColumns.Label'] = "Aggregate columns"
+        self.parameter_input_metadata['AggregateColumns.Required'] = True
+        self.parameter_input_metadata['AggregateColumns.Tooltip'] = (
+            "The columns to aggregate and the statistic to compute, using the syntax:\n"
+            "Column1:Statistic1,Column2:Statistic2\n"
+            "Available statistics are Count, Max, Mean, Min and Sum.\n"
+            "The output columns are named Column_Statistic.")
+        # NewTableID
+        self.parameter_input_metadata['NewTableID.Description'] = "identifier of the new table"
+        self.parameter_input_metadata['NewTableID.Label'] = "New TableID"
+        self.parameter_input_metadata['NewTableID.Required'] = True
+        self.parameter_input_metadata['NewTableID.Tooltip'] = \
+            "The identifier of the new Table, with one row for each group."
+        # IfTableIDExists
+        self.parameter_input_metadata['IfTableIDExists.Description'] = "action if the NewTableID exists"
+        self.parameter_input_metadata['IfTableIDExists.Label'] = "If table exists"
+        self.parameter_input_metadata['IfTableIDExists.Tooltip'] = (
+            "The action that occurs if the NewTableID already exists within the GeoProcessor.\n"
+            "Replace : The existing Table within the GeoProcessor is overwritten with the new Table. "
+            "No warning is logged.\n"
+            "ReplaceAndWarn: The existing Table within the GeoProcessor is overwritten with the new Table. "
+            "A warning is logged.\n"
+            "Warn : The new Table is not created. A warning is logged.\n"
+            "Fail : The new Table is not created. A fail message is logged.")
+        self.parameter_input_metadata['IfTableIDExists.Values'] = ["", "Replace", "ReplaceAndWarn", "Warn", "Fail"]
+        self.parameter_input_metadata['IfTableIDExists.Value.Default'] = "Replace"
+
+        # Class data
+        self.warning_count = 0
+        self.logger = logging.getLogger(__name__)
+
+    def check_command_parameters(self, command_parameters):
+        """
+        Check the command parameters for validity.
+
+        Args:
+            command_parameters: the dictionary of command parameters to check (key:string_value)
+
+        Returns: None.
+
+        Raises:
+            ValueError if any parameters are invalid or do not have a valid value.
+            The command status messages for initialization are populated with validation messages.
+        """
+
+        warning = ""
+
+        # Check that the required parameters are non-empty, non-None strings.
+        for parameter in ["TableID", "GroupByColumns", "AggregateColumns", "NewTableID"]:
+            parameter_value = self.get_parameter_value(parameter_name=parameter, command_parameters=command_parameters)
+
+            if not validators.validate_string(parameter_value, False, False):
+                message = "{} parameter has no value.".format(parameter)
+                recommendation = "Specify the {} parameter.".format(parameter)
+                warning += "\n" + message
+                self.command_status.add_to_log(
+                    CommandPhaseType.INITIALIZATION,
+                    CommandLogRecord(CommandStatusType.FAILURE, message, recommendation))
+
+        # Check that the statistics in the AggregateColumns parameter are acceptable values.
+        pv_AggregateColumns = self.get_parameter_value(parameter_name="AggregateColumns",
+                                                       command_parameters=command_parameters)
+        if pv_AggregateColumns:
+            for aggregate_column in string_util.delimited_string_to_list(pv_AggregateColumns):
+                statistic = aggregate_column.split(":", 1)[1].strip() if ":" in aggregate_column else None
+                if not validators.validate_string_in_list(statistic, self.__choices_Statistic, none_allowed=False,
+                                                          empty_string_allowed=False, ignore_case=True):
+                    message = "AggregateColumns parameter value ({}) does not have a recognized statistic.".format(
+                        aggregate_column)
+                    recommendation = "Specify Column:Statistic, where Statistic is one of ({}).".format(
+                        self.__choices_Statistic)
+                    warning += "\n" + message
+                    self.command_status.add_to_log(
+                        CommandPhaseType.INITIALIZATION,
+                        CommandLogRecord(CommandStatusType.FAILURE, message, recommendation))
+
+        # Check that optional parameter IfTableIDExists is either `Replace`, `ReplaceAndWarn`, `Warn`, `Fail`, None.
+        pv_IfTableIDExists = self.get_parameter_value(parameter_name="IfTableIDExists",
+                                                      command_parameters=command_parameters)
+        acceptable_values = ["Replace", "ReplaceAndWarn", "Warn", "Fail"]
+        if not validators.validate_string_in_list(pv_IfTableIDExists, acceptable_values, none_allowed=True,
+                                                  empty_string_allowed=True, ignore_case=True):
+            message = "IfTableIDExists parameter value ({}) is not recognized.".format(pv_IfTableIDExists)
+            recommendation = "Specify one of the acceptable values ({}) for the IfTableIDExists parameter.".format(
+                acceptable_values)
+            warning += "\n" + message
+            self.command_status.add_to_log(
+                CommandPhaseType.INITIALIZATION,
+                CommandLogRecord(CommandStatusType.FAILURE, message, recommendation))
+
+        # Check for unrecognized parameters.
+        # This returns a message that can be appended to the warning, which if non-empty triggers an exception below.
+        warning = command_util.validate_command_parameter_names(self, warning)
+
+        # If any warnings were generated, throw an exception.
+        if len(warning) > 0:
+            self.logger.warning(warning)
+            raise ValueError(warning)
+
+        # Refresh the phase severity
+        self.command_status.refresh_phase_severity(CommandPhaseType.INITIALIZATION, CommandStatusType.SUCCESS)
+
+    def __should_aggregate_table(self, table_id, columns, new_table_id):
+        """
+        Checks the following:
+        * the ID of the Table is an existing Table ID
+        * the group-by and aggregate columns are columns of the Table
+        * the ID of the new Table is unique (not an existing Table ID)
+
+        Args:
+            table_id (str): the ID of the Table to aggregate
+            columns (list): the names of the group-by and aggregate columns
+            new_table_id (str): the ID of the new Table
+
+        Returns:
+            Boolean. If TRUE, the aggregation process should be run. If FALSE, it should not be run.
+        """
+
+        # List of Boolean values. The Boolean values correspond to the results of the following tests. If TRUE, the
+        # test confirms that the command should be run.
+        should_run_command = []
+
+        # If the Table ID is not an existing Table ID, raise a FAILURE.
+        should_run_command.append(validators.run_check(self, "IsTableIdExisting", "TableID", table_id, "FAIL"))
+
+        # If the columns are not in the Table, raise a FAILURE.
+        if False not in should_run_command:
+            table_cols = self.command_processor.get_table(table_id).get_column_names()
+            for col in columns:
+                if col not in table_cols:
+                    self.warning_count += 1
+                    message = "The column ({}) is not a column of the Table ({}).".format(col, table_id)
+                    recommendation = "Specify existing columns in the GroupByColumns and AggregateColumns parameters."
+                    self.logger.error(message)
+                    self.command_status.add_to_log(CommandPhaseType.RUN,
+                                                   CommandLogRecord(CommandStatusType.FAILURE, message,
+                                                                    recommendation))
+                    should_run_command.append(False)
+
+        # If the NewTableID is the same as an already-existing TableID, raise a WARNING or FAILURE (depends on the
+        # value of the IfTableIDExists parameter.)
+        should_run_command.append(validators.run_check(self, "IsTableIdUnique", "NewTableID", new_table_id, None))
+
+        # Return the Boolean to determine if the process should be run.
+        if False in should_run_command:
+            return False
+        else:
+            return True
+
+    def run_command(self):
+        """
+        Run the command. Aggregate the rows of the Table into a new Table.
+
+        Returns: None.
+
+        Raises:
+            RuntimeError if any warnings occurred during run_command method.
+        """
+
+        # Obtain the parameter values.
+        pv_TableID = self.get_parameter_value("TableID")
+        pv_GroupByColumns = self.get_parameter_value("GroupByColumns")
+        pv_AggregateColumns = self.get_parameter_value("AggregateColumns")
+        pv_NewTableID = self.get_parameter_value("NewTableID")
+
+        # Expand for ${Property} syntax.
+        pv_TableID = self.command_processor.expand_parameter_value(pv_TableID, self)
+        pv_NewTableID = self.command_processor.expand_parameter_value(pv_NewTableID, self)
+
+        # Convert the GroupByColumns parameter value to a list.
+        group_by_cols = string_util.delimited_string_to_list(pv_GroupByColumns)
+
+        # Convert the AggregateColumns parameter value to the named aggregations used by pandas.
+        # Key: the output column name, Value: tuple of the input column name and the pandas statistic name
+        aggregations = {}
+        for aggregate_column in string_util.delimited_string_to_list(pv_AggregateColumns):
+            col, statistic = [x.strip() for x in aggregate_column.split(":", 1)]
+            statistic = [x for x in self.__choices_Statistic if x.upper() == statistic.upper()][0]
+            aggregations["{}_{}".format(col, statistic)] = (col, statistic.lower())
+        aggregate_cols = [col for col, statistic in aggregations.values()]
+
+        # Run the checks on the parameter values. Only continue if the checks passed.
+        if self.__should_aggregate_table(pv_TableID, group_by_cols + aggregate_cols, pv_NewTableID):
+
+            try:
+
+                # Get the Table object
+                table = self.command_processor.get_table(pv_TableID)
+
+                # Group the rows and compute the statistics. The groups are kept in the order they first occur in the
+                # Table (sort=False), which avoids sorting the group keys. Rows with empty group-by values are kept
+                # as their own group (dropna=False).
+                df = table.df.groupby(group_by_cols, sort=False, dropna=False).agg(**aggregations)
+                df.reset_index(inplace=True)
+
+                # Add the aggregated rows as a new Table.
+                self.command_processor.add_table(Table(pv_NewTableID, df, "MEMORY"))
+
+                self.logger.info("Aggregated {} rows of Table {} into {} groups.".format(
+                    len(table.df.index), pv_TableID, len(df.index)))
+
+            # Raise an exception if an unexpected error occurs during the process
+            except Exception as e:
+                self.warning_count += 1
+                message = "Unexpected error aggregating Table {}.".format(pv_TableID)
+                recommendation = "Check the log file for details."
+                self.logger.error(message, exc_info=True)
+                self.command_status.add_to_log(CommandPhaseType.RUN,
+                                               CommandLogRecord(CommandStatusType.FAILURE, message, recommendation))
+
+        # Determine success of command processing. Raise Runtime Error if any errors occurred
+        if self.warning_count > 0:
+            message = "There were {} warnings proceeding this command.".format(self.warning_count)
+            raise RuntimeError(message)
+
+        # Set command status type as SUCCESS if there are no errors.
+        else:
+            self.command_status.refresh_phase_severity(CommandPhaseType.RUN, CommandStatusType.SUCCESS)
@@ -0,0 +1,148 @@
+# CloseExcelWorkbook - command to write the buffered worksheets of an open Excel workbook
+# ________________________________________________________________NoticeStart_
+# GeoProcessor
+# Copyright (C) 2017-2019 Open Water Foundation
+#
+# GeoProcessor is free software:  you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     GeoProcessor is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with GeoProcessor.  If not, see <https://www.gnu.org/licenses/>.
+# ________________________________________________________________NoticeEnd___
+
+from geoprocessor.commands.abstract.AbstractCommand import AbstractCommand
+
+from geoprocessor.core.CommandLogRecord import CommandLogRecord
+from geoprocessor.core.CommandParameterMetadata import CommandParameterMetadata
+from geoprocessor.core.CommandPhaseType import CommandPhaseType
+from geoprocessor.core.CommandStatusType import CommandStatusType
+
+import geoprocessor.util.command_util as command_util
+import geoprocessor.util.io_util as io_util
+
+import logging
+
+
+class CloseExcelWorkbook(AbstractCommand):
+    """
+    Closes an Excel workbook that was kept open by WriteTableToExcel(KeepOpen=True), writing the buffered worksheets
+    to the workbook file.
+
+    Command Parameters
+    * OutputFile (str, optional): the relative pathname of the Excel workbook to close. Default: all open workbooks
+        are closed.
+    """
+
+    # Define the command parameters.
+    __command_parameter_metadata = [
+        CommandParameterMetadata("OutputFile", type(""))]
+
+    def __init__(self):
+        """
+        Initialize the command.
+        """
+
+        # AbstractCommand data
+        super().__init__()
+        self.command_name = "CloseExcelWorkbook"
+        self.command_parameter_metadata = self.__command_parameter_metadata
+
+        # Command metadata for command editor display
+        self.command_metadata = dict()
+        self.command_metadata['Description'] = (
+            "Close an Excel workbook that was kept open by WriteTableToExcel, writing the worksheets to the file.")
+        self.command_metadata['EditorType'] = "Simple"
+
+        # Command Parameter Metadata
+        self.parameter_input_metadata = dict()
+        # OutputFile
+        self.parameter_input_metadata['OutputFile.Description'] = "Excel file to close"
+        self.parameter_input_metadata['OutputFile.Label'] = "Output file"
+        self.parameter_input_metadata['OutputFile.Tooltip'] = (
+            "The name of the Excel workbook to close (relative or absolute path). ${Property} syntax is recognized.\n"
+            "Must match the OutputFile of the WriteTableToExcel commands.")
+        self.parameter_input_metadata['OutputFile.Value.Default.Description'] = "all open workbooks are closed"
+        self.parameter_input_metadata['OutputFile.FileSelector.Type'] = "Write"
+        self.parameter_input_metadata['OutputFile.FileSelector.Title'] = "Select the Excel file to close"
+
+        # Class data
+        self.warning_count = 0
+        self.logger = logging.getLogger(__name__)
+
+    def check_command_parameters(self, command_parameters):
+        """
+        Check the command parameters for validity.
+
+        Args:
+            command_parameters: the dictionary of command parameters to check (key:string_value)
+
+        Returns: None.
+
+        Raises:
+            ValueError if any parameters are invalid or do not have a valid value.
+            The command status messages for initialization are populated with validation messages.
+        """
+
+        warning = ""
+
+        # Check for unrecognized parameters.
+        # This returns a message that can be appended to the warning, which if non-empty triggers an exception below.
+        warning = command_util.validate_command_parameter_names(self, warning)
+
+        # If any warnings were generated, throw an exception.
+        if len(warning) > 0:
+            self.logger.warning(warning)
+            raise ValueError(warning)
+
+        # Refresh the phase severity
+        self.command_status.refresh_phase_severity(CommandPhaseType.INITIALIZATION, CommandStatusType.SUCCESS)
+
+    def run_command(self):
+        """
+        Run the command. Write the buffered worksheets to the Excel workbook file(s).
+
+        Returns: None.
+
+        Raises:
+            RuntimeError if any warnings occurred during run_command method.
+        """
+
+        # Obtain the parameter values.
+        pv_OutputFile = self.get_parameter_value("OutputFile")
+
+        # Convert the OutputFile parameter value relative path to an absolute path and expand for ${Property} syntax
+        output_file_absolute = None
+        if pv_OutputFile:
+            output_file_absolute = io_util.verify_path_for_os(
+                io_util.to_absolute_path(self.command_processor.get_property('WorkingDir'),
+                                         self.command_processor.expand_parameter_value(pv_OutputFile, self)))
+
+        try:
+
+            # Write the worksheets of the open workbook(s).
+            self.command_processor.close_excel_workbook_writers(output_file_absolute)
+
+        # Raise an exception if an unexpected error occurs during the process
+        except Exception as e:
+            self.warning_count += 1
+            message = "Unexpected error closing Excel workbook {}.".format(pv_OutputFile)
+            recommendation = "Check the log file for details."
+            self.logger.error(message, exc_info=True)
+            self.command_status.add_to_log(CommandPhaseType.RUN,
+                                           CommandLogRecord(CommandStatusType.FAILURE, message, recommendation))
+
+        # Determine success of command processing. Raise Runtime Error if any errors occurred
+        if self.warning_count > 0:
+            message = "There were {} warnings proceeding this command.".format(self.warning_count)
+            raise RuntimeError(message)
+
+        # Set command status type as SUCCESS if there are no errors.
+        else:
+            self.command_status.refresh_phase_severity(CommandPhaseType.RUN, CommandStatusType.SUCCESS)
@@ -0,0 +1,261 @@
+# FilterTable - command to filter the rows of a table
+# ________________________________________________________________NoticeStart_
+# GeoProcessor
+# Copyright (C) 2017-2019 Open Water Foundation
+#
+# GeoProcessor is free software:  you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     GeoProcessor is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with GeoProcessor.  If not, see <https://www.gnu.org/licenses/>.
+# ________________________________________________________________NoticeEnd___
+
+from geoprocessor.commands.abstract.AbstractCommand import AbstractCommand
+
+from geoprocessor.core.CommandLogRecord import CommandLogRecord
+from geoprocessor.core.CommandParameterMetadata import CommandParameterMetadata
+from geoprocessor.core.CommandPhaseType import CommandPhaseType
+from geoprocessor.core.CommandStatusType import CommandStatusType
+from geoprocessor.core.Table_pandas import Table
+
+import geoprocessor.util.command_util as command_util
+import geoprocessor.util.validator_util as validators
+
+import logging
+
+
+class FilterTable(AbstractCommand):
+    """
+    Filters the rows of a Table using a condition.
+
+    The condition is evaluated on whole columns at once (pandas DataFrame.query), rather than row by row.
+    If NewTableID is specified, a new Table is created with a copy of the matching rows and the original Table is not
+    changed. Otherwise, the rows of the Table are replaced with the matching rows and the memory used by the other rows
+    is released.
+
+    Command Parameters
+    * TableID (str, required): the identifier of the Table to filter.
+    * Condition (str, required): the condition that rows must match to be kept, using column names, comparison
+        operators (==, !=, <, <=, >, >=), and, or, not, in and parentheses. Column names that are not valid Python
+        names must be surrounded by backticks. For example: Year >= 2000 and County == "Larimer".
+        ${Property} syntax is recognized.
+    * NewTableID (str, optional): the identifier of a new Table to hold the matching rows. Default: the rows of the
+        input Table are replaced.
+    * IfTableIDExists (str, optional): This parameter determines the action that occurs if the NewTableID already
+        exists within the GeoProcessor. Available options are: `Replace`, `ReplaceAndWarn`, `Warn` and `Fail`
+        (Refer to user documentation for detailed description.) Default value is `Replace`.
+    """
+
+    # Define the command parameters.
+    __command_parameter_metadata = [
+        CommandParameterMetadata("TableID", type("")),
+        CommandParameterMetadata("Condition", type("")),
+        CommandParameterMetadata("NewTableID", type("")),
+        CommandParameterMetadata("IfTableIDExists", type(""))]
+
+    def __init__(self):
+        """
+        Initialize the command.
+        """
+
+        # AbstractCommand data
+        super().__init__()
+        self.command_name = "FilterTable"
+        self.command_parameter_metadata = self.__command_parameter_metadata
+
+        # Command metadata for command editor display
+        self.command_metadata = dict()
+        self.command_metadata['Description'] = "Filter the rows of a table using a condition."
+        self.command_metadata['EditorType'] = "Simple"
+
+        # Command Parameter Metadata
+        self.parameter_input_metadata = dict()
+        # TableID
+        self.parameter_input_metadata['TableID.Description'] = "table to filter"
+        self.parameter_input_metadata['TableID.Label'] = "TableID"
+        self.parameter_input_metadata['TableID.Required'] = True
+        self.parameter_input_metadata['TableID.Tooltip'] = "The Table identifier of the Table to filter."
+        # Condition
+        self.parameter_input_metadata['Condition.Description'] = "condition for rows to keep"
+        self.parameter_input_metadata['Condition.Label'] = "Condition"
+        self.parameter_input_metadata['Condition.Required'] = True
+        self.parameter_input_metadata['Condition.Tooltip'] = (
+            "The condition that rows must match to be kept, for example:\n"
+            "Year >= 2000 and County == \"Larimer\"\n"
+            "Column names that are not valid Python names must be surrounded by backticks.\n"
+            "${Property} syntax is recognized.")
+        # NewTableID
+        self.parameter_input_metadata['NewTableID.Description'] = "identifier of the new table"
+        self.parameter_input_metadata['NewTableID.Label'] = "New TableID"
+        self.parameter_input_metadata['NewTableID.Tooltip'] = \
+            "The identifier of a new Table to hold the matching rows. The input Table is not changed."
+        self.parameter_input_metadata['NewTableID.Value.Default.Description'] = \
+            "the rows of the input Table are replaced"
+        # IfTableIDExists
+        self.parameter_input_metadata['IfTableIDExists.Description'] = "action if the NewTableID exists"
+        self.parameter_input_metadata['IfTableIDExists.Label'] = "If table exists"
+        self.parameter_input_metadata['IfTableIDExists.Tooltip'] = (
+            "The action that occurs if the NewTableID already exists within the GeoProcessor.\n"
+            "Replace : The existing Table within the GeoProcessor is overwritten with the new Table. "
+            "No warning is logged.\n"
+            "ReplaceAndWarn: The existing Table within the GeoProcessor is overwritten with the new Table. "
+            "A warning is logged.\n"
+            "Warn : The new Table is not created. A warning is logged.\n"
+            "Fail : The new Table is not created. A fail message is logged.")
+        self.parameter_input_metadata['IfTableIDExists.Values'] = ["", "Replace", "ReplaceAndWarn", "Warn", "Fail"]
+        self.parameter_input_metadata['IfTableIDExists.Value.Default'] = "Replace"
+
+        # Class data
+        self.warning_count = 0
+        self.logger = logging.getLogger(__name__)
+
+    def check_command_parameters(self, command_parameters):
+        """
+        Check the command parameters for validity.
+
+        Args:
+            command_parameters: the dictionary of command parameters to check (key:string_value)
+
+        Returns: None.
+
+        Raises:
+            ValueError if any parameters are invalid or do not have a valid value.
+            The command status messages for initialization are populated with validation messages.
+        """
+
+        warning = ""
+
+        # Check that parameters TableID and Condition are non-empty, non-None strings.
+        for parameter in ["TableID", "Condition"]:
+            parameter_value = self.get_parameter_value(parameter_name=parameter, command_parameters=command_parameters)
+
+            if not validators.validate_string(parameter_value, False, False):
+                message = "{} parameter has no value.".format(parameter)
+                recommendation = "Specify the {} parameter.".format(parameter)
+                warning += "\n" + message
+                self.command_status.add_to_log(
+                    CommandPhaseType.INITIALIZATION,
+                    CommandLogRecord(CommandStatusType.FAILURE, message, recommendation))
+
+        # Check that optional parameter IfTableIDExists is either `Replace`, `ReplaceAndWarn`, `Warn`, `Fail`, None.
+        pv_IfTableIDExists = self.get_parameter_value(parameter_name="IfTableIDExists",
+                                                      command_parameters=command_parameters)
+        acceptable_values = ["Replace", "ReplaceAndWarn", "Warn", "Fail"]
+        if not validators.validate_string_in_list(pv_IfTableIDExists, acceptable_values, none_allowed=True,
+                                                  empty_string_allowed=True, ignore_case=True):
+            message = "IfTableIDExists parameter value ({}) is not recognized.".format(pv_IfTableIDExists)
+            recommendation = "Specify one of the acceptable values ({}) for the IfTableIDExists parameter.".format(
+                acceptable_values)
+            warning += "\n" + message
+            self.command_status.add_to_log(
+                CommandPhaseType.INITIALIZATION,
+                CommandLogRecord(CommandStatusType.FAILURE, message, recommendation))
+
+        # Check for unrecognized parameters.
+        # This returns a message that can be appended to the warning, which if non-empty triggers an exception below.
+        warning = command_util.validate_command_parameter_names(self, warning)
+
+        # If any warnings were generated, throw an exception.
+        if len(warning) > 0:
+            self.logger.warning(warning)
+            raise ValueError(warning)
+
+        # Refresh the phase severity
+        self.command_status.refresh_phase_severity(CommandPhaseType.INITIALIZATION, CommandStatusType.SUCCESS)
+
+    def __should_filter_table(self, table_id, new_table_id):
+        """
+        Checks the following:
+        * the ID of the Table is an existing Table ID
+        * the ID of the new Table is unique (not an existing Table ID), if specified
+
+        Args:
+            table_id (str): the ID of the Table to filter
+            new_table_id (str): the ID of the new Table, or None if the Table is filtered in place
+
+        Returns:
+            Boolean. If TRUE, the filtering process should be run. If FALSE, it should not be run.
+        """
+
+        # List of Boolean values. The Boolean values correspond to the results of the following tests. If TRUE, the
+        # test confirms that the command should be run.
+        should_run_command = []
+
+        # If the Table ID is not an existing Table ID, raise a FAILURE.
+        should_run_command.append(validators.run_check(self, "IsTableIdExisting", "TableID", table_id, "FAIL"))
+
+        # If the NewTableID is the same as an already-existing TableID, raise a WARNING or FAILURE (depends on the
+        # value of the IfTableIDExists parameter.)
+        if new_table_id:
+            should_run_command.append(validators.run_check(self, "IsTableIdUnique", "NewTableID", new_table_id, None))
+
+        # Return the Boolean to determine if the process should be run.
+        if False in should_run_command:
+            return False
+        else:
+            return True
+
+    def run_command(self):
+        """
+        Run the command. Filter the rows of the Table.
+
+        Returns: None.
+
+        Raises:
+            RuntimeError if any warnings occurred during run_command method.
+        """
+
+        # Obtain the parameter values.
+        pv_TableID = self.get_parameter_value("TableID")
+        pv_Condition = self.get_parameter_value("Condition")
+        pv_NewTableID = self.get_parameter_value("NewTableID")
+
+        # Expand for ${Property} syntax.
+        pv_TableID = self.command_processor.expand_parameter_value(pv_TableID, self)
+        pv_Condition = self.command_processor.expand_parameter_value(pv_Condition, self)
+        pv_NewTableID = self.command_processor.expand_parameter_value(pv_NewTableID, self)
+
+        # Run the checks on the parameter values. Only continue if the checks passed.
+        if self.__should_filter_table(pv_TableID, pv_NewTableID):
+
+            try:
+
+                # Get the Table object
+                table = self.command_processor.get_table(pv_TableID)
+
+                # Evaluate the condition on the columns and select the matching rows. The result is a new data frame.
+                input_row_count = len(table.df.index)
+                df = table.df.query(pv_Condition)
+
+                # Add the matching rows as a new Table, or replace the rows of the input Table.
+                if pv_NewTableID:
+                    self.command_processor.add_table(Table(pv_NewTableID, df, "MEMORY"))
+                else:
+                    table.df = df
+
+                self.logger.info("Kept {} of {} rows of Table {}.".format(len(df.index), input_row_count, pv_TableID))
+
+            # Raise an exception if an unexpected error occurs during the process
+            except Exception as e:
+                self.warning_count += 1
+                message = "Unexpected error filtering Table {}.".format(pv_TableID)
+                recommendation = "Check the log file for details."
+                self.logger.error(message, exc_info=True)
+                self.command_status.add_to_log(CommandPhaseType.RUN,
+                                               CommandLogRecord(CommandStatusType.FAILURE, message, recommendation))
+
+        # Determine success of command processing. Raise Runtime Error if any errors occurred
+        if self.warning_count > 0:
+            message = "There were {} warnings proceeding this command.".format(self.warning_count)
+            raise RuntimeError(message)
+
+        # Set command status type as SUCCESS if there are no errors.
+        else:
+            self.command_status.refresh_phase_severity(CommandPhaseType.RUN, CommandStatusType.SUCCESS)
@@ -0,0 +1,388 @@
+# JoinTables - command to join the columns of a table to another table
+# ________________________________________________________________NoticeStart_
+# GeoProcessor
+# Copyright (C) 2017-2019 Open Water Foundation
+#
+# GeoProcessor is free software:  you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     GeoProcessor is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with GeoProcessor.  If not, see <https://www.gnu.org/licenses/>.
+# ________________________________________________________________NoticeEnd___
+
+from geoprocessor.commands.abstract.AbstractCommand import AbstractCommand
+
+from geoprocessor.core.CommandLogRecord import CommandLogRecord
+from geoprocessor.core.CommandParameterMetadata import CommandParameterMetadata
+from geoprocessor.core.CommandPhaseType import CommandPhaseType
+from geoprocessor.core.CommandStatusType import CommandStatusType
+from geoprocessor.core.Table_pandas import Table
+
+import geoprocessor.util.command_util as command_util
+import geoprocessor.util.string_util as string_util
+import geoprocessor.util.validator_util as validators
+
+import logging
+
+
+class JoinTables(AbstractCommand):
+    """
+    Joins the columns of a Table (the join table) to another Table, matching rows using key columns.
+
+    The join is a hash join (pandas DataFrame.merge): the key values of one table are hashed once and the rows of the
+    other table are matched by looking up their key values, rather than comparing every pair of rows.
+    Only the key columns and the included columns of the join table are used in the join. The result is always a new
+    data frame. If NewTableID is specified, the result is added as a new Table and the input Tables are not changed.
+    Otherwise, the rows of the Table are replaced with the result and the memory used by the original rows is released.
+
+    Command Parameters
+    * TableID (str, required): the identifier of the Table that columns are joined to.
+    * JoinTableID (str, required): the identifier of the Table with the columns to join.
+    * JoinColumns (str, required): the key columns used to match rows, using the syntax TableColumn:JoinTableColumn,
+        separated by commas. If the column names are the same in both tables, the JoinTableColumn can be omitted.
+    * IncludeColumns (str, optional): A list of glob-style patterns to determine the join table columns to join.
+        Default: * (All columns are joined).
+    * ExcludeColumns (str, optional): A list of glob-style patterns to determine the join table columns to NOT join.
+        Default: '' (No columns are excluded).
+    * JoinType (str, optional): Inner (only rows with matching keys in both tables), Left (all rows of the Table), or
+        Outer (all rows of both tables). Default: Left
+    * NewTableID (str, optional): the identifier of a new Table to hold the joined rows. Default: the rows of the Table
+        are replaced.
+    * IfTableIDExists (str, optional): This parameter determines the action that occurs if the NewTableID already
+        exists within the GeoProcessor. Available options are: `Replace`, `ReplaceAndWarn`, `Warn` and `Fail`
+        (Refer to user documentation for detailed description.) Default value is `Replace`.
+    """
+
+    # Define the command parameters.
+    __command_parameter_metadata = [
+        CommandParameterMetadata("TableID", type("")),
+        CommandParameterMetadata("JoinTableID", type("")),
+        CommandParameterMetadata("JoinColumns", type("")),
+        CommandParameterMetadata("IncludeColumns", type("")),
+        CommandParameterMetadata("ExcludeColumns", type("")),
+        CommandParameterMetadata("JoinType", type("")),
+        CommandParameterMetadata("NewTableID", type("")),
+        CommandParameterMetadata("IfTableIDExists", type(""))]
+
+    # Choices for JoinType, used to validate parameter and display in editor
+    __choices_JoinType = ["Inner", "Left", "Outer"]
+
+    def __init__(self):
+        """
+        Initialize the command.
+        """
+
+        # AbstractCommand data
+        super().__init__()
+        self.command_name = "JoinTables"
+        self.command_parameter_metadata = self.__command_parameter_metadata
+
+        # Command metadata for command editor display
+        self.command_metadata = dict()
+        self.command_metadata['Description'] = "Join the columns of a table to another table using key columns."
+        self.command_metadata['EditorType'] = "Simple"
+
+        # Command Parameter Metadata
+        self.parameter_input_metadata = dict()
+        # TableID
+        self.parameter_input_metadata['TableID.Description'] = "table to join to"
+        self.parameter_input_metadata['TableID.Label'] = "TableID"
+        self.parameter_input_metadata['TableID.Required'] = True
+        self.parameter_input_metadata['TableID.Tooltip'] = "The Table identifier of the Table that columns are joined to."
+        # JoinTableID
+        self.parameter_input_metadata['JoinTableID.Description'] = "table with columns to join"
+        self.parameter_input_metadata['JoinTableID.Label'] = "JoinTableID"
+        self.parameter_input_metadata['JoinTableID.Required'] = True
+        self.parameter_input_metadata['JoinTableID.Tooltip'] = \
+            "The Table identifier of the Table with the columns to join."
+        # JoinColumns
+        self.parameter_input_metadata['JoinColumns.Description'] = "key columns used to match rows"
+        self.parameter_input_metadata['JoinColumns.Label'] = "Join columns"
+        self.parameter_input_metadata['JoinColumns.Required'] = True
+        self.parameter_input_metadata['JoinColumns.Tooltip'] = (
+            "The key columns used to match rows, using the syntax:\n"
+            "TableColumn1:JoinTableColumn1,TableColumn2:JoinTableColumn2\n"
+            "If the column names are the same in both tables, the JoinTableColumn can be omitted.")
+        # IncludeColumns
+        self.parameter_input_metadata['IncludeColumns.Description'] = "join table columns to join"
+        self.parameter_input_metadata['IncludeColumns.Label'] = "Include columns"
+        self.parameter_input_metadata['IncludeColumns.Tooltip'] = \
+            "A comma-separated list of the glob-style patterns filtering which join table columns to join."
+        self.parameter_input_metadata['IncludeColumns.Value.Default'] = "* - all columns are joined"
+        # ExcludeColumns
+        self.parameter_input_metadata['ExcludeColumns.Description'] = "join table columns to NOT join"
+        self.parameter_input_metadata['ExcludeColumns.Label'] = "Exclude columns"
+        self.parameter_input_metadata['ExcludeColumns.Tooltip'] = \
+            "A comma-separated list of the glob-style patterns filtering which join table columns to NOT join."
+        self.parameter_input_metadata['ExcludeColumns.Value.Default'] = "No columns are excluded"
+        # JoinType
+        self.parameter_input_metadata['JoinType.Description'] = "rows to include in the result"
+        self.parameter_input_metadata['JoinType.Label'] = "Join type"
+        self.parameter_input_metadata['JoinType.Tooltip'] = (
+            "Inner : Only rows with matching keys in both tables are included.\n"
+            "Left : All rows of the Table are included. Columns are empty if there is no matching join table row.\n"
+            "Outer : All rows of both tables are included.")
+        self.parameter_input_metadata['JoinType.Values'] = ["", "Inner", "Left", "Outer"]
+        self.parameter_input_metadata['JoinType.Value.Default'] = "Left"
+        # NewTableID
+        self.parameter_input_metadata['NewTableID.Description'] = "identifier of the new table"
+        self.parameter_input_metadata['NewTableID.Label'] = "New TableID"
+        self.parameter_input_metadata['NewTableID.Tooltip'] = \
+            "The identifier of a new Table to hold the joined rows. The input Tables are not changed."
+        self.parameter_input_metadata['NewTableID.Value.Default.Description'] = "the rows of the Table are replaced"
+        # IfTableIDExists
+        self.parameter_input_metadata['IfTableIDExists.Description'] = "action if the NewTableID exists"
+        self.parameter_input_metadata['IfTableIDExists.Label'] = "If table exists"
+        self.parameter_input_metadata['IfTableIDExists.Tooltip'] = (
+            "The action that occurs if the NewTableID already exists within the GeoProcessor.\n"
+            "Replace : The existing Table within the GeoProcessor is overwritten with the new Table. "
+            "No warning is logged.\n"
+            "ReplaceAndWarn: The existing Table within the GeoProcessor is overwritten with the new Table. "
+            "A warning is logged.\n"
+            "Warn : The new Table is not created. A warning is logged.\n"
+            "Fail : The new Table is not created. A fail message is logged.")
+        self.parameter_input_metadata['IfTableIDExists.Values'] = ["", "Replace", "ReplaceAndWarn", "Warn", "Fail"]
+        self.parameter_input_metadata['IfTableIDExists.Value.Default'] = "Replace"
+
+        # Class data
+        self.warning_count = 0
+        self.logger = logging.getLogger(__name__)
+
+    def check_command_parameters(self, command_parameters):
+        """
+        Check the command parameters for validity.
+
+        Args:
+            command_parameters: the dictionary of command parameters to check (key:string_value)
+
+        Returns: None.
+
+        Raises:
+            ValueError if any parameters are invalid or do not have a valid value.
+            The command status messages for initialization are populated with validation messages.
+        """
+
+        warning = ""
+
+        # Check that parameters TableID, JoinTableID and JoinColumns are non-empty, non-None strings.
+        for parameter in ["TableID", "JoinTableID", "JoinColumns"]:
+            parameter_value = self.get_parameter_value(parameter_name=parameter, command_parameters=command_parameters)
+
+            if not validators.validate_string(parameter_value, False, False):
+                message = "{} parameter has no value.".format(parameter)
+                recommendation = "Specify the {} parameter.".format(parameter)
+                warning += "\n" + message
+                self.command_status.add_to_log(
+                    CommandPhaseType.INITIALIZATION,
+                    CommandLogRecord(CommandStatusType.FAILURE, message, recommendation))
+
+        # Check that optional parameter JoinType is one of the acceptable values or None.
+        pv_JoinType = self.get_parameter_value(parameter_name="JoinType", command_parameters=command_parameters)
+
+        if not validators.validate_string_in_list(pv_JoinType, self.__choices_JoinType, none_allowed=True,
+                                                  empty_string_allowed=False, ignore_case=True):
+            message = "JoinType parameter value ({}) is not recognized.".format(pv_JoinType)
+            recommendation = "Specify one of the acceptable values ({}) for the JoinType parameter.".format(
+                self.__choices_JoinType)
+            warning += "\n" + message
+            self.command_status.add_to_log(
+                CommandPhaseType.INITIALIZATION,
+                CommandLogRecord(CommandStatusType.FAILURE, message, recommendation))
+
+        # Check that optional parameter IfTableIDExists is either `Replace`, `ReplaceAndWarn`, `Warn`, `Fail`, None.
+        pv_IfTableIDExists = self.get_parameter_value(parameter_name="IfTableIDExists",
+                                                      command_parameters=command_parameters)
+        acceptable_values = ["Replace", "ReplaceAndWarn", "Warn", "Fail"]
+        if not validators.validate_string_in_list(pv_IfTableIDExists, acceptable_values, none_allowed=True,
+                                                  empty_string_allowed=True, ignore_case=True):
+            message = "IfTableIDExists parameter value ({}) is not recognized.".format(pv_IfTableIDExists)
+            recommendation = "Specify one of the acceptable values ({}) for the IfTableIDExists parameter.".format(
+                acceptable_values)
+            warning += "\n" + message
+            self.command_status.add_to_log(
+                CommandPhaseType.INITIALIZATION,
+                CommandLogRecord(CommandStatusType.FAILURE, message, recommendation))
+
+        # Check for unrecognized parameters.
+        # This returns a message that can be appended to the warning, which if non-empty triggers an exception below.
+        warning = command_util.validate_command_parameter_names(self, warning)
+
+        # If any warnings were generated, throw an exception.
+        if len(warning) > 0:
+            self.logger.warning(warning)
+            raise ValueError(warning)
+
+        # Refresh the phase severity
+        self.command_status.refresh_phase_severity(CommandPhaseType.INITIALIZATION, CommandStatusType.SUCCESS)
+
+    def __should_join_tables(self, table_id, join_table_id, join_columns, new_table_id):
+        """
+        Checks the following:
+        * the IDs of the Table and the join Table are existing Table IDs
+        * the key columns are columns of the Table and the join Table
+        * the ID of the new Table is unique (not an existing Table ID), if specified
+
+        Args:
+            table_id (str): the ID of the Table that columns are joined to
+            join_table_id (str): the ID of the Table with the columns to join
+            join_columns (dict): the key columns. Key: the Table column, Value: the join Table column
+            new_table_id (str): the ID of the new Table, or None if the Table rows are replaced
+
+        Returns:
+            Boolean. If TRUE, the join process should be run. If FALSE, it should not be run.
+        """
+
+        # List of Boolean values. The Boolean values correspond to the results of the following tests. If TRUE, the
+        # test confirms that the command should be run.
+        should_run_command = []
+
+        # If the Table IDs are not existing Table IDs, raise a FAILURE.
+        should_run_command.append(validators.run_check(self, "IsTableIdExisting", "TableID", table_id, "FAIL"))
+        should_run_command.append(validators.run_check(self, "IsTableIdExisting", "JoinTableID", join_table_id,
+                                                       "FAIL"))
+
+        # If the key columns are not in the tables, raise a FAILURE.
+        if False not in should_run_command:
+            for parameter, tid, cols in [("TableID", table_id, join_columns.keys()),
+                                         ("JoinTableID", join_table_id, join_columns.values())]:
+                table_cols = self.command_processor.get_table(tid).get_column_names()
+                for col in cols:
+                    if col not in table_cols:
+                        self.warning_count += 1
+                        message = "The join column ({}) is not a column of the {} ({}).".format(col, parameter, tid)
+                        recommendation = "Specify existing columns in the JoinColumns parameter."
+                        self.logger.error(message)
+                        self.command_status.add_to_log(CommandPhaseType.RUN,
+                                                       CommandLogRecord(CommandStatusType.FAILURE, message,
+                                                                        recommendation))
+                        should_run_command.append(False)
+
+        # If the NewTableID is the same as an already-existing TableID, raise a WARNING or FAILURE (depends on the
+        # value of the IfTableIDExists parameter.)
+        if new_table_id:
+            should_run_command.append(validators.run_check(self, "IsTableIdUnique", "NewTableID", new_table_id, None))
+
+        # Return the Boolean to determine if the process should be run.
+        if False in should_run_command:
+            return False
+        else:
+            return True
+
+    def run_command(self):
+        """
+        Run the command. Join the columns of the join Table to the Table.
+
+        Returns: None.
+
+        Raises:
+            RuntimeError if any warnings occurred during run_command method.
+        """
+
+        # Obtain the parameter values.
+        pv_TableID = self.get_parameter_value("TableID")
+        pv_JoinTableID = self.get_parameter_value("JoinTableID")
+        pv_JoinColumns = self.get_parameter_value("JoinColumns")
+        pv_IncludeColumns = self.get_parameter_value("IncludeColumns", default_value="*")
+        pv_ExcludeColumns = self.get_parameter_value("ExcludeColumns", default_value="")
+        pv_JoinType = self.get_parameter_value("JoinType", default_value="Left")
+        pv_NewTableID = self.get_parameter_value("NewTableID")
+
+        # Expand for ${Property} syntax.
+        pv_TableID = self.command_processor.expand_parameter_value(pv_TableID, self)
+        pv_JoinTableID = self.command_processor.expand_parameter_value(pv_JoinTableID, self)
+        pv_NewTableID = self.command_processor.expand_parameter_value(pv_NewTableID, self)
+
+        # Convert the JoinColumns parameter value to a dictionary. Key: the Table column, Value: the join Table column
+        join_columns = {}
+        for join_column in string_util.delimited_string_to_list(pv_JoinColumns):
+            if ":" in join_column:
+                table_col, join_table_col = [x.strip() for x in join_column.split(":", 1)]
+            else:
+                table_col = join_table_col = join_column
+            join_columns[table_col] = join_table_col
+
+        # Convert the IncludeColumns and ExcludeColumns parameter values to lists.
+        cols_to_include = string_util.delimited_string_to_list(pv_IncludeColumns)
+        cols_to_exclude = string_util.delimited_string_to_list(pv_ExcludeColumns)
+
+        # Run the checks on the parameter values. Only continue if the checks passed.
+        if self.__should_join_tables(pv_TableID, pv_JoinTableID, join_columns, pv_NewTableID):
+
+            try:
+
+                # Get the Table objects
+                table = self.command_processor.get_table(pv_TableID)
+                join_table = self.command_processor.get_table(pv_JoinTableID)
+
+                # Select the key columns and the included columns of the join table, in join table order.
+                # Only these columns are copied into the hash table used by the join.
+                join_table_cols = join_table.get_column_names()
+                cols_to_join = string_util.filter_list_of_strings(join_table_cols, cols_to_include, cols_to_exclude)
+                join_cols = []
+                for col in join_table_cols:
+                    if col in join_columns.values():
+                        join_cols.append(col)
+                    elif col in cols_to_join:
+                        # Columns that are already in the Table are not joined, to avoid duplicate column names.
+                        if col in table.df.columns:
+                            self.logger.warning("Column {} is already in Table {} and is not joined.".format(
+                                col, pv_TableID))
+                        else:
+                            join_cols.append(col)
+
+                # Join the tables. The key columns of the join table that have different names than the Table key
+                # columns are renamed to temporary names that are not used by either table, so that they cannot
+                # collide with Table columns (which pandas would rename with suffixes), and are dropped after the join
+                # so that the result has one set of key columns.
+                join_df = join_table.df[join_cols]
+                used_cols = set(table.df.columns) | set(join_cols)
+                temp_key_cols = {}
+                for table_col, join_table_col in join_columns.items():
+                    if join_table_col != table_col and join_table_col not in temp_key_cols:
+                        temp_col = "__join_key_{}".format(len(temp_key_cols))
+                        while temp_col in used_cols:
+                            temp_col = "_" + temp_col
+                        used_cols.add(temp_col)
+                        temp_key_cols[join_table_col] = temp_col
+                if temp_key_cols:
+                    join_df = join_df.rename(columns=temp_key_cols)
+                df = table.df.merge(join_df, how=pv_JoinType.lower(), left_on=list(join_columns.keys()),
+                                    right_on=[temp_key_cols.get(join_table_col, join_table_col)
+                                              for join_table_col in join_columns.values()],
+                                    copy=False)
+                if temp_key_cols:
+                    df.drop(columns=list(temp_key_cols.values()), inplace=True)
+
+                # Add the result as a new Table, or replace the rows of the Table.
+                if pv_NewTableID:
+                    self.command_processor.add_table(Table(pv_NewTableID, df, "MEMORY"))
+                else:
+                    table.df = df
+
+                self.logger.info("Joined Table {} to Table {}: {} rows.".format(pv_JoinTableID, pv_TableID,
+                                                                                 len(df.index)))
+
+            # Raise an exception if an unexpected error occurs during the process
+            except Exception as e:
+                self.warning_count += 1
+                message = "Unexpected error joining Table {} to Table {}.".format(pv_JoinTableID, pv_TableID)
+                recommendation = "Check the log file for details."
+                self.logger.error(message, exc_info=True)
+                self.command_status.add_to_log(CommandPhaseType.RUN,
+                                               CommandLogRecord(CommandStatusType.FAILURE, message, recommendation))
+
+        # Determine success of command processing. Raise Runtime Error if any errors occurred
+        if self.warning_count > 0:
+            message = "There were {} warnings proceeding this command.".format(self.warning_count)
+            raise RuntimeError(message)
+
+        # Set command status type as SUCCESS if there are no errors.
+        else:
+            self.command_status.refresh_phase_severity(CommandPhaseType.RUN, CommandStatusType.SUCCESS)
@@ -30,6 +30,7 @@ from geoprocessor.core.Table import TableRecord
 import geoprocessor.util.command_util as command_util
 import geoprocessor.util.io_util as io_util
 import geoprocessor.util.string_util as string_util
+import geoprocessor.util.type_util as type_util
 import geoprocessor.util.validator_util as validators
 
 import logging
@@ -325,10 +326,16 @@ class ReadTableFromDataStore(AbstractCommand):
             return True
 
     @staticmethod
-    def __read_table_from_datastore(ds, table_name, table_id, top, sql, cols_to_include, cols_to_exclude):
+    def __read_table_from_datastore(ds, table_name, table_id, top, sql, cols_to_include, cols_to_exclude,
+                                    fetch_batch_size=10000):
         """
         Creates a GeoProcessor table object from a DataStore table.
 
+        The query is executed exactly once. Rows are fetched from a server-side cursor in batches of fetch_batch_size
+        rows and are appended directly to the column buffers, so that the full result set is never held twice by the
+        database driver. When reading a DataStoreTable, the column selection and the row limit are pushed down into the
+        SELECT statement so that only the requested data are sent by the database.
+
         Args:
             ds (obj): the DataStore object that contains the DataStore table to read
             table_name (str): the name of the DataStore table to read
@@ -342,6 +349,7 @@ class ReadTableFromDataStore(AbstractCommand):
                 Can be None if using the Sql method or SqlFile method.
             cols_to_exclude (list): a list of glob-style patterns representing the DataStore Table columns to read
                 Can be None if using the Sql method or SqlFile method.
+            fetch_batch_size (int): the number of rows to fetch from the cursor at a time
 
         Return: A GeoProcessor Table object.
         """
@@ -349,186 +357,75 @@ class ReadTableFromDataStore(AbstractCommand):
         # Create a GeoProcessor Table object.
         table = Table(table_id)
 
-        # If a SQL statement has been specified, then continue.
+        # If a SQL statement has been specified, run the user-specified SQL statement as is.
         if sql:
 
-            # Run the SQL statement
-            result_from_sql = ds.connection.execute(sql)
-
-            # Get the columns from the sql statement.
-            table_cols = ds.connection.execute(sql).keys()
-
-            # Get the first row from the result set.
-            row = result_from_sql.fetchone()
-
-            # An empty list to hold the columns that were included in the result set in response to the user-specified
-            # sql.
-            included_cols = []
-
-            # Iterate over all of the available columns in the DataStore table.
-            for table_col in table_cols:
-
-                # Try to read the value of the DataStore table column. If it does not throw an error, it is known that
-                # the column was included in the result set of the user-specified SQL statement. Add the column name to
-                # the included_cols list.
-                try:
-                    value = row[table_col]
-                    included_cols.append(table_col)
-
-                # If an error is thrown, it is known that the column was not included in the result set of the
-                #  user-specified SQL statement. Do not add the column name to the included_cols list.
-                except:
-                    pass
-
-            # Iterate over the DataStore table columns that do have results from the user-specified SQL statement.
-            for included_col in included_cols:
-
-                # Create a TableField object and assign the field "name" as the column name.
-                table_field = TableField(included_col)
-
-                # Run the SQL statement
-                result_from_sql = ds.connection.execute(sql)
-
-                # Iterate over the rows of the DataStore table data.
-                for row in result_from_sql:
-                    # Add the row data for the column to the item list of the TableField.
-                    table_field.items.append(row[included_col])
-
-                # Determine the data type of the column's data.
-                # A list that holds the data type for each data value in the column.
-                data_types = []
+            statement = sql
 
-                # Iterate over each of the data values in the column.
-                for item in table_field.items:
-
-                    # Add the data type of the item to the data_types list. Ignore data values that are None.
-                    if item is not None:
-                        data_types.append(type(item))
-
-                # If the data_types list is empty, assume that all values in the column are set to None.
-                if not data_types:
-                    table_field.data_type = None
-
-                # Set the data_type attribute of the TableField object to that specified in the data_types list.
-                elif all(x == data_types[0] for x in data_types):
-                    table_field.data_type = data_types[0]
-
-                # All of the data types in the list should be the same value because database columns require that
-                # the data in each column is only one data type. If more than one data type exists in the data_types
-                # list, print an error message.
-                else:
-                    print("There was an error. Not all the data types are the same.")
-
-                # Add the TableField object to the Table attributes.
-                table.add_table_field(table_field)
-
-                # Get the number of row entries in the TableField. This will be the same number for each of the
-                # TableField objects so only the count of the entries in the last TableField object is used in the
-                # remaining code.
-                table.entry_count = len(table_field.items)
-
-        # If a SQL statement has not been specified, continue.
+        # If a SQL statement has not been specified, build a SELECT statement for the DataStore table.
         else:
 
             # Read the DataStore table into a DataStore Table object.
-            ds_table_obj = ds.metadata.tables[table_name]
-
-            # Query the DataStore table. The allows access to table information.
-            q = ds.session.query(ds_table_obj)
-
-            # Select all fields and rows of the table.
-            s = sqlalchemy.sql.select([ds_table_obj])
+            ds_table_obj = ds.return_sql_alchemy_table_object(table_name)
 
-            # Get a list of all of the column names.
-            table_cols = [col["name"] for col in q.column_descriptions]
+            # Get a list of all of the column names, in the same order as the columns in the DataStore table.
+            table_cols = ds.return_col_names(table_name)
 
-            # Sort the list of column names to create create a second list that only includes the columns to read.
+            # Filter the list of column names to create a second list that only includes the columns to read.
             table_cols_to_read = string_util.filter_list_of_strings(table_cols, cols_to_include, cols_to_exclude, True)
+            table_cols_to_read = [col_name for col_name in table_cols if col_name in table_cols_to_read]
+
+            # Select only the columns to read. If configured, limit the number of rows that are returned.
+            statement = sqlalchemy.sql.select([ds_table_obj.c[col] for col in table_cols_to_read])
+            if top:
+                statement = statement.limit(top)
+
+        # Run the SQL statement once. Request a server-side cursor so that rows are streamed in batches rather than
+        # buffered in full by the database driver (drivers that do not support server-side cursors ignore this).
+        result = ds.connection.execution_options(stream_results=True).execute(statement)
+
+        try:
+            # Get the columns from the result set.
+            included_cols = list(result.keys())
+
+            # A list of column buffers, one for each column in the result set.
+            col_buffers = [[] for _ in included_cols]
+
+            # Fetch the rows in batches and append the values directly to the column buffers.
+            while True:
+                rows = result.fetchmany(fetch_batch_size)
+                if not rows:
+                    break
+                for col_buffer, col_values in zip(col_buffers, zip(*rows)):
+                    col_buffer.extend(col_values)
+        finally:
+            result.close()
+
+        # Iterate over the columns in the result set.
+        for included_col, col_buffer in zip(included_cols, col_buffers):
+
+            # Create a TableField object and assign the field "name" as the column name.
+            table_field = TableField(included_col)
+
+            # Determine the data type of the column's data. Values that are None are ignored. If all values are None,
+            # the data type remains None. All of the data types in the column should be the same because database
+            # columns require that the data in each column is only one data type. The check stops at the first value
+            # with a different data type, in which case the data type is object. Strings are not converted.
+            table_field.data_type, table_field.items = type_util.convert_column(col_buffer, parse_strings=False)
+
+            # Add the TableField object to the Table attributes.
+            table.add_table_field(table_field)
+
+        # Get the number of row entries. This is the same number for each of the TableField objects.
+        if col_buffers:
+            table.entry_count = len(col_buffers[0])
+        else:
+            table.entry_count = 0
 
-            # Sort the table_cols_to_read list to order in the same order as the table columns in the DataStore table.
-            cols_names = ds.return_col_names(table_name)
-            table_cols_to_read = [col_name for col_name in cols_names if col_name in table_cols_to_read]
-
-            # Iterate over the column names to read.
-            for col in table_cols_to_read:
-
-                # Create a TableField object and assign the field "name" as the column name.
-                table_field = TableField(col)
-
-                # Run the SQL query to get the DataStore tables' data. Save as result variable.
-                result = ds.connection.execute(s)
-
-                # If configured to limit the table read to a specified number of top rows, continue.
-                if top:
-
-                    # Counter to track the number of rows read into the Table Field items.
-                    count = 0
-
-                    # Iterate over the rows of the DataStore table data.
-                    for row in result:
-
-                        # If the current row count is less than the desired row count, continue.
-                        while count < top:
-                            # Add the row data for the column to the item list of the TableField. Increase the counter.
-                            table_field.items.append(row[col])
-                            count += 1
-
-                # If configured to read all rows of the DataStore table, continue.
-                else:
-
-                    # Iterate over the rows of the DataStore table data.
-                    for row in result:
-                        # Add the row data for the column to the item list of the TableField.
-                        table_field.items.append(row[col])
-
-                # Determine the data type of the column's data.
-                # A list that holds the data type for each data value in the column.
-                data_types = []
-
-                # Iterate over each of the data values in the column.
-                for item in table_field.items:
-
-                    # Add the data type of the item to the data_types list. Ignore data values that are None.
-                    if item is not None:
-                        data_types.append(type(item))
-
-                # If the data_types list is empty, assume that all values in the column are set to None.
-                if not data_types:
-                    table_field.data_type = None
-
-                # Set the data_type attribute of the TableField object to that specified in the data_types list.
-                elif all(x == data_types[0] for x in data_types):
-                    table_field.data_type = data_types[0]
-
-                # All of the data types in the list should be the same value because database columns require that the
-                # data in each column is only one data type. If more than one data type exists in the data_types list,
-                # print an error message.
-                else:
-                    print("There was an error. Not all the data types are the same.")
-
-                # Add the TableField object to the Table attributes.
-                table.add_table_field(table_field)
-
-                # Get the number of rows in the TableField. This will be the same number for each of the TableField
-                # objects so only the count of the entries in the last TableField object is used in the remaining code.
-                table.entry_count = len(table_field.items)
-
-        # Iterate over the number of row entries.
-        for i_row in range(table.entry_count):
-
-            # Create a TableRecord object.
+        # Create a TableRecord object for each row and add it to the Table attributes.
+        for row_items in zip(*col_buffers):
             table_record = TableRecord()
-
-            # Iterate over the table fields.
-            for i_col in range(len(table.table_fields)):
-
-                # Get the data value for the specified row and the specified field.
-                new_item = table.table_fields[i_col].items[i_row]
-
-                # Assign that data value to the items list of the TableRecord.
-                table_record.add_item(new_item)
-
-            # Add the TableRecord object to the Table attributes.
+            table_record.items = list(row_items)
             table.table_records.append(table_record)
 
         # Return the GeoProcessor Table object.
@@ -564,6 +461,12 @@ class ReadTableFromDataStore(AbstractCommand):
         cols_to_include = string_util.delimited_string_to_list(pv_IncludeColumns)
         cols_to_exclude = string_util.delimited_string_to_list(pv_ExcludeColumns)
 
+        # Convert the Top parameter value to an integer. Top is only used with the DataStoreTable method.
+        if pv_Top and pv_DataStoreTable:
+            pv_Top = int(pv_Top)
+        else:
+            pv_Top = None
+
         # If available, convert the SqlFile parameter value relative path to an absolute path and expand for
         # ${Property} syntax.
         if pv_SqlFile:
@@ -41,7 +41,8 @@ class ReadTableFromDelimitedFile(AbstractCommand):
     Reads a Table from a delimited file.
 
     Command Parameters
-    * InputFile (str, required): the relative or absolute pathname of the delimited file to read.
+    * InputFile (str, required): the relative or absolute pathname of the delimited file to read. The file can be
+        compressed (gzip, bzip2, xz or zip), which is detected from the file content.
     * TableID (str, required): the identifier of the Table.
     * Delimiter (str, optional): the delimiter of the input file. Default is `,`.
     * HeaderLines (str, optional): The number of rows representing non-data comments. These columns are not included
@@ -83,8 +84,9 @@ class ReadTableFromDelimitedFile(AbstractCommand):
         self.parameter_input_metadata['InputFile.Description'] = "delimited file to read"
         self.parameter_input_metadata['InputFile.Label'] = "Input file"
         self.parameter_input_metadata['InputFile.Required'] = True
-        self.parameter_input_metadata['InputFile.Tooltip'] = \
-            "The delimited file (relative or absolute path) to read. ${Property} syntax is recognized."
+        self.parameter_input_metadata['InputFile.Tooltip'] = (
+            "The delimited file (relative or absolute path) to read. ${Property} syntax is recognized.\n"
+            "Compressed files (.gz, .bz2, .xz, .zip) are decompressed as they are read.")
         self.parameter_input_metadata['InputFile.FileSelector.Type'] = "Read"
         self.parameter_input_metadata['InputFile.FileSelector.Title'] = "Select a delimited file to read"
         # TableID
@@ -257,8 +259,8 @@ class ReadTableFromDelimitedFile(AbstractCommand):
         # Create a table object
         table = Table(table_id)
 
-        # Open the csv file to read.
-        with open(path, 'r') as csvfile:
+        # Open the csv file to read. The file may be compressed (see io_util.open_file()), so it is read in one pass.
+        with io_util.open_file(path, 'r', newline='') as csvfile:
 
             # Pass the csv file to the csv.reader object. Specify the delimiter.
             csvreader = csv.reader(csvfile, delimiter=delimiter)
@@ -267,56 +269,35 @@ class ReadTableFromDelimitedFile(AbstractCommand):
             for i in range(header_count + 1):
                 col_headers = next(csvreader)
 
-            # Iterate over the number of columns specified by a column header name.
-            for i in range(len(col_headers)):
+            # Read the non-header rows.
+            rows = list(csvreader)
 
-                # Create a TableField object and assign the field "name" as the column header name.
-                table_field = TableField(col_headers[i])
+        # Iterate over the number of columns specified by a column header name.
+        for i in range(len(col_headers)):
 
-                # An empty list to hold the items within the TableField.
-                col_content = []
+            # Create a TableField object and assign the field "name" as the column header name.
+            table_field = TableField(col_headers[i])
 
-                # Reset the csv reader to start the reading of the csv file at the first row.
-                csvfile.seek(0)
+            # Add the column contents to the TableField object.
+            table_field.items = [row[i] for row in rows]
 
-                # Skip the header rows.
-                for i_head in range(header_count+1):
-                    next(csvreader)
+            # Set the null values
+            table_field.null_values = null_values
 
-                # Iterate over the non-header rows and append the column items to the col_content list.
-                for row in csvreader:
-                    col_content.append(row[i])
+            # Convert the column contents to the correct data type, and the data values that represent null values into
+            # None values, in one pass.
+            table_field.assign_data_type()
 
-                # Add the column contents to the TableField object.
-                table_field.items = col_content
+            # Add the updated table field object to the Table attribute.
+            table.add_table_field(table_field)
 
-                # Set the null values
-                table_field.null_values = null_values
+        # Get the number of row entries.
+        table.entry_count = len(rows)
 
-                # Convert the data value that represent null values into None value.\
-                table_field.assign_nulls()
-
-                # Convert the column contents to the correct data type.
-                table_field.assign_data_type()
-
-                # Add the updated table field object to the Table attribute.
-                table.add_table_field(table_field)
-
-            # Get the number of row entries.
-            table.entry_count = len(table_field.items)
-
-        # Iterate over the number of row entries.
-        for i_row in range(table.entry_count):
-
-            # Create a TableRecord object.
+        # Create a TableRecord object for each row and add it to the Table attributes.
+        for row_items in zip(*[table_field.items for table_field in table.table_fields]):
             table_record = TableRecord()
-
-            # Iterate over the table fields.
-            for i_col in range(len(table.table_fields)):
-                new_item = table.table_fields[i_col].items[i_row]
-                table_record.add_item(new_item)
-
-            # Add the table record to the Table attributes.
+            table_record.items = list(row_items)
             table.table_records.append(table_record)
 
         # Return the GeoProcessor Table object.
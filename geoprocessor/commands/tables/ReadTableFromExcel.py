@@ -28,6 +28,7 @@ from geoprocessor.core.Table_pandas import Table
 import geoprocessor.util.command_util as command_util
 import geoprocessor.util.pandas_util as pandas_util
 import geoprocessor.util.io_util as io_util
+import geoprocessor.util.string_util as string_util
 import geoprocessor.util.validator_util as validators
 
 import logging
@@ -45,6 +46,16 @@ class ReadTableFromExcel(AbstractCommand):
     * InputFile (str, required): the relative pathname to the excel data file (known as a workbook)
     * Worksheet (str, optional): the name of the worksheet to read. Default: the first worksheet is read.
     * TableID (str, optional): the Table identifier. Default: the Worksheet's name.
+    * HeaderRow (str, optional): the worksheet row number (1 is the first row) containing the column names. Rows above
+        the header row are ignored. Default: the first row that is not empty.
+    * IncludeColumns (str, optional): A list of glob-style patterns to determine the worksheet columns to read.
+        Default: * (All columns are read).
+    * ExcludeColumns (str, optional): A list of glob-style patterns to determine the worksheet columns to NOT read.
+        Default: '' (No columns are excluded - All columns are read).
+    * Top (str, optional): Indicate how many rows to read. Default: read all rows. Must be a string representing a
+        positive integer.
+    * ColumnTypes (str, optional): Data types for columns, using the syntax ColumnName1:Type1,ColumnName2:Type2 where
+        the type is Boolean, DateTime, Float, Int or Str. Default: data types are determined from the column values.
     * IfTableIDExists (str, optional): This parameter determines the action that occurs if the TableID already exists
         within the GeoProcessor. Available options are: `Replace`, `ReplaceAndWarn`, `Warn` and `Fail` 
         (Refer to user documentation for detailed description.) Default value is `Replace`.
@@ -55,8 +66,16 @@ class ReadTableFromExcel(AbstractCommand):
         CommandParameterMetadata("InputFile", type("")),
         CommandParameterMetadata("Worksheet", type("")),
         CommandParameterMetadata("TableID", type("")),
+        CommandParameterMetadata("HeaderRow", type("")),
+        CommandParameterMetadata("IncludeColumns", type("")),
+        CommandParameterMetadata("ExcludeColumns", type("")),
+        CommandParameterMetadata("Top", type("")),
+        CommandParameterMetadata("ColumnTypes", type("")),
         CommandParameterMetadata("IfTableIDExists", type(""))]
 
+    # Choices for the ColumnTypes data types, used to validate parameter
+    __choices_ColumnTypes = ["Boolean", "DateTime", "Float", "Int", "Str"]
+
     def __init__(self):
         """
         Initialize the command.
@@ -95,6 +114,42 @@ class ReadTableFromExcel(AbstractCommand):
         self.parameter_input_metadata['TableID.Label'] = "TableID"
         self.parameter_input_metadata['TableID.Tooltip'] = "A Table identifier"
         self.parameter_input_metadata['TableID.Value.Default.Description'] = "worksheet name"
+        # HeaderRow
+        self.parameter_input_metadata['HeaderRow.Description'] = "row containing column names"
+        self.parameter_input_metadata['HeaderRow.Label'] = "Header row"
+        self.parameter_input_metadata['HeaderRow.Tooltip'] = \
+            "The worksheet row number (1 is the first row) containing the column names.\n" \
+            "Rows above the header row are ignored."
+        self.parameter_input_metadata['HeaderRow.Value.Default.Description'] = "the first row that is not empty"
+        # IncludeColumns
+        self.parameter_input_metadata['IncludeColumns.Description'] = \
+            "list of patterns to determine the columns to read"
+        self.parameter_input_metadata['IncludeColumns.Label'] = "Include columns"
+        self.parameter_input_metadata['IncludeColumns.Tooltip'] = \
+            "A list of glob-style patterns to determine the worksheet columns to read."
+        self.parameter_input_metadata['IncludeColumns.Value.Default.Description'] = "* - all columns read"
+        # ExcludeColumns
+        self.parameter_input_metadata['ExcludeColumns.Description'] = \
+            "list of patterns to determine the columns to NOT read"
+        self.parameter_input_metadata['ExcludeColumns.Label'] = "Exclude columns"
+        self.parameter_input_metadata['ExcludeColumns.Tooltip'] = \
+            "A list of glob-style patterns to determine the worksheet columns to NOT read."
+        self.parameter_input_metadata['ExcludeColumns.Value.Default'] = "No columns are excluded"
+        # Top
+        self.parameter_input_metadata['Top.Description'] = "number of rows to read"
+        self.parameter_input_metadata['Top.Label'] = "Top"
+        self.parameter_input_metadata['Top.Tooltip'] = \
+            "An integer to indicate the number of rows that should be read. Must be a positive integer."
+        self.parameter_input_metadata['Top.Value.Default.Description'] = "All rows are read."
+        # ColumnTypes
+        self.parameter_input_metadata['ColumnTypes.Description'] = "column data types"
+        self.parameter_input_metadata['ColumnTypes.Label'] = "Column types"
+        self.parameter_input_metadata['ColumnTypes.Tooltip'] = \
+            "Data types for columns, using the syntax:\n" \
+            "ColumnName1:Type1,ColumnName2:Type2\n" \
+            "where the type is Boolean, DateTime, Float, Int or Str."
+        self.parameter_input_metadata['ColumnTypes.Value.Default.Description'] = \
+            "data types are determined from the column values"
         # IfTableIDExists
         self.parameter_input_metadata[
             'IfTableIDExists.Description'] = "action if the TableID exists"
@@ -157,6 +212,35 @@ class ReadTableFromExcel(AbstractCommand):
                 CommandPhaseType.INITIALIZATION,
                 CommandLogRecord(CommandStatusType.FAILURE, message, recommendation))
 
+        # Check that the optional HeaderRow and Top parameters are positive integers.
+        for parameter in ["HeaderRow", "Top"]:
+            parameter_value = self.get_parameter_value(parameter_name=parameter, command_parameters=command_parameters)
+
+            if not validators.validate_int(parameter_value, True, False) or \
+                    (parameter_value is not None and not int(parameter_value) > 0):
+                message = "{} parameter value ({}) is not a positive, non-zero integer value.".format(
+                    parameter, parameter_value)
+                recommendation = "Specify a positive integer for the {} parameter.".format(parameter)
+                warning += "\n" + message
+                self.command_status.add_to_log(
+                    CommandPhaseType.INITIALIZATION,
+                    CommandLogRecord(CommandStatusType.FAILURE, message, recommendation))
+
+        # Check that the optional ColumnTypes parameter uses recognized data types.
+        pv_ColumnTypes = self.get_parameter_value(parameter_name="ColumnTypes", command_parameters=command_parameters)
+
+        if pv_ColumnTypes:
+            col_types = string_util.delimited_string_to_dictionary_one_value(pv_ColumnTypes, ",", ":")
+            for col_name, col_type in col_types.items():
+                if not validators.validate_string_in_list(col_type, self.__choices_ColumnTypes, False, False, True):
+                    message = "ColumnTypes data type ({}) for column {} is not recognized.".format(col_type, col_name)
+                    recommendation = "Specify one of the acceptable data types ({}).".format(
+                        self.__choices_ColumnTypes)
+                    warning += "\n" + message
+                    self.command_status.add_to_log(
+                        CommandPhaseType.INITIALIZATION,
+                        CommandLogRecord(CommandStatusType.FAILURE, message, recommendation))
+
         # Check for unrecognized parameters.
         # This returns a message that can be appended to the warning, which if non-empty triggers an exception below.
         warning = command_util.validate_command_parameter_names(self, warning)
@@ -199,7 +283,7 @@ class ReadTableFromExcel(AbstractCommand):
 
             # If the Worksheet parameter is None, assign it with the name of the first worksheet in the excel file.
             if sheet_name is None:
-                sheet_name = pandas_util.create_excel_workbook_obj(file_abs).sheet_names[0]
+                sheet_name = pandas_util.get_excel_sheet_names(file_abs)[0]
 
             # If the input sheet name is not a valid sheet name in the excel workbook file, raise a FAILURE.
             should_run_command.append(validators.run_check(self, "IsExcelSheetNameValid", "Worksheet", sheet_name,
@@ -234,6 +318,26 @@ class ReadTableFromExcel(AbstractCommand):
         pv_InputFile = self.get_parameter_value("InputFile")
         pv_Worksheet = self.get_parameter_value("Worksheet")
         pv_TableID = self.get_parameter_value("TableID")
+        pv_HeaderRow = self.get_parameter_value("HeaderRow")
+        pv_IncludeColumns = self.get_parameter_value("IncludeColumns", default_value="*")
+        pv_ExcludeColumns = self.get_parameter_value("ExcludeColumns", default_value="")
+        pv_Top = self.get_parameter_value("Top")
+        pv_ColumnTypes = self.get_parameter_value("ColumnTypes")
+
+        # Convert the IncludeColumns and ExcludeColumns parameter values to lists.
+        cols_to_include = string_util.delimited_string_to_list(pv_IncludeColumns)
+        cols_to_exclude = string_util.delimited_string_to_list(pv_ExcludeColumns)
+
+        # Convert the HeaderRow and Top parameter values to integers.
+        if pv_HeaderRow:
+            pv_HeaderRow = int(pv_HeaderRow)
+        if pv_Top:
+            pv_Top = int(pv_Top)
+
+        # Convert the ColumnTypes parameter value to a dictionary.
+        col_types = None
+        if pv_ColumnTypes:
+            col_types = string_util.delimited_string_to_dictionary_one_value(pv_ColumnTypes, ",", ":")
 
         # Convert the InputFile parameter value relative path to an absolute path and expand for ${Property} syntax.
         file_absolute = io_util.verify_path_for_os(
@@ -251,14 +355,15 @@ class ReadTableFromExcel(AbstractCommand):
 
                 # Assign the Worksheet parameter to the name of the first Excel worksheet, if it was not specified.
                 if pv_Worksheet is None:
-                    pv_Worksheet = pandas_util.create_excel_workbook_obj(file_absolute).sheet_names[0]
+                    pv_Worksheet = pandas_util.get_excel_sheet_names(file_absolute)[0]
 
                 # Assign the TableID parameter to the name of the first Excel worksheet, if it was not specified.
                 if pv_TableID is None:
                     pv_TableID = pv_Worksheet
 
-                # Create a Pandas Data Frame object.
-                df = pandas_util.create_data_frame_from_excel(file_absolute, pv_Worksheet)
+                # Create a Pandas Data Frame object. Only the selected columns and rows of the worksheet are kept.
+                df = pandas_util.create_data_frame_from_excel(file_absolute, pv_Worksheet, cols_to_include,
+                                                              cols_to_exclude, pv_Top, pv_HeaderRow, col_types)
 
                 # Create a Table and add it to the geoprocessor's Tables list.
                 table_obj = Table(pv_TableID, df, file_absolute)
@@ -0,0 +1,305 @@
+# ReadTableFromParquet - command to read a table from a Parquet file
+# ________________________________________________________________NoticeStart_
+# GeoProcessor
+# Copyright (C) 2017-2019 Open Water Foundation
+#
+# GeoProcessor is free software:  you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     GeoProcessor is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with GeoProcessor.  If not, see <https://www.gnu.org/licenses/>.
+# ________________________________________________________________NoticeEnd___
+
+from geoprocessor.commands.abstract.AbstractCommand import AbstractCommand
+
+from geoprocessor.core.CommandLogRecord import CommandLogRecord
+from geoprocessor.core.CommandParameterMetadata import CommandParameterMetadata
+from geoprocessor.core.CommandPhaseType import CommandPhaseType
+from geoprocessor.core.CommandStatusType import CommandStatusType
+from geoprocessor.core.Table_pandas import Table
+
+import geoprocessor.util.arrow_util as arrow_util
+import geoprocessor.util.command_util as command_util
+import geoprocessor.util.io_util as io_util
+import geoprocessor.util.string_util as string_util
+import geoprocessor.util.validator_util as validators
+
+import logging
+
+
+class ReadTableFromParquet(AbstractCommand):
+    """
+    Reads a Table from a Parquet file.
+
+    Only the selected columns are read from the file. Row filters are checked against the Parquet row group statistics
+    so that row groups that cannot contain matching rows are skipped without being read.
+
+    Command Parameters
+    * InputFile (str, required): the relative or absolute pathname of the Parquet file to read.
+    * TableID (str, required): the identifier of the Table.
+    * IncludeColumns (str, optional): A list of glob-style patterns to determine the columns to read.
+        Default: * (All columns are read).
+    * ExcludeColumns (str, optional): A list of glob-style patterns to determine the columns to NOT read.
+        Default: '' (No columns are excluded - All columns are read).
+    * RowFilters (str, optional): Conditions that rows must match to be read, separated by semicolons, using the
+        syntax ColumnName Operator Value (for example: Year >= 2000;County == 'Larimer'). The operator is one of ==, !=,
+        <, <=, >, >=. Default: all rows are read.
+    * IfTableIDExists (str, optional): This parameter determines the action that occurs if the TableID already exists
+        within the GeoProcessor. Available options are: `Replace`, `ReplaceAndWarn`, `Warn` and `Fail`
+        (Refer to user documentation for detailed description.) Default value is `Replace`.
+    """
+
+    # Define the command parameters.
+    __command_parameter_metadata = [
+        CommandParameterMetadata("InputFile", type("")),
+        CommandParameterMetadata("TableID", type("")),
+        CommandParameterMetadata("IncludeColumns", type("")),
+        CommandParameterMetadata("ExcludeColumns", type("")),
+        CommandParameterMetadata("RowFilters", type("")),
+        CommandParameterMetadata("IfTableIDExists", type(""))]
+
+    def __init__(self):
+        """
+        Initialize the command.
+        """
+
+        # AbstractCommand data
+        super().__init__()
+        self.command_name = "ReadTableFromParquet"
+        self.command_parameter_metadata = self.__command_parameter_metadata
+
+        # Command metadata for command editor display
+        self.command_metadata = dict()
+        self.command_metadata['Description'] = "Read a table from a Parquet file."
+        self.command_metadata['EditorType'] = "Simple"
+
+        # Command Parameter Metadata
+        self.parameter_input_metadata = dict()
+        # InputFile
+        self.parameter_input_metadata['InputFile.Description'] = "Parquet file to read"
+        self.parameter_input_metadata['InputFile.Label'] = "Input file"
+        self.parameter_input_metadata['InputFile.Required'] = True
+        self.parameter_input_metadata['InputFile.Tooltip'] = \
+            "The Parquet file (relative or absolute path) to read. ${Property} syntax is recognized."
+        self.parameter_input_metadata['InputFile.FileSelector.Type'] = "Read"
+        self.parameter_input_metadata['InputFile.FileSelector.Title'] = "Select a Parquet file to read"
+        # TableID
+        self.parameter_input_metadata['TableID.Description'] = "output table identifier"
+        self.parameter_input_metadata['TableID.Label'] = "TableID"
+        self.parameter_input_metadata['TableID.Required'] = True
+        self.parameter_input_metadata['TableID.Tooltip'] = "A Table identifier"
+        # IncludeColumns
+        self.parameter_input_metadata['IncludeColumns.Description'] = \
+            "list of patterns to determine the columns to read"
+        self.parameter_input_metadata['IncludeColumns.Label'] = "Include columns"
+        self.parameter_input_metadata['IncludeColumns.Tooltip'] = \
+            "A list of glob-style patterns to determine the columns to read."
+        self.parameter_input_metadata['IncludeColumns.Value.Default.Description'] = "* - all columns read"
+        # ExcludeColumns
+        self.parameter_input_metadata['ExcludeColumns.Description'] = \
+            "list of patterns to determine the columns to NOT read"
+        self.parameter_input_metadata['ExcludeColumns.Label'] = "Exclude columns"
+        self.parameter_input_metadata['ExcludeColumns.Tooltip'] = \
+            "A list of glob-style patterns to determine the columns to NOT read."
+        self.parameter_input_metadata['ExcludeColumns.Value.Default'] = "No columns are excluded"
+        # RowFilters
+        self.parameter_input_metadata['RowFilters.Description'] = "conditions for rows to read"
+        self.parameter_input_metadata['RowFilters.Label'] = "Row filters"
+        self.parameter_input_metadata['RowFilters.Tooltip'] = (
+            "Conditions that rows must match to be read, separated by semicolons, using the syntax:\n"
+            "ColumnName Operator Value\n"
+            "For example: Year >= 2000;County == 'Larimer'\n"
+            "The operator is one of ==, !=, <, <=, >, >=.")
+        self.parameter_input_metadata['RowFilters.Value.Default.Description'] = "all rows are read"
+        # IfTableIDExists
+        self.parameter_input_metadata[
+            'IfTableIDExists.Description'] = "action if TableID exists"
+        self.parameter_input_metadata['IfTableIDExists.Label'] = "If table exists"
+        self.parameter_input_metadata['IfTableIDExists.Tooltip'] = (
+            "The action that occurs if the TableID already exists within the GeoProcessor.\n"
+            "Replace : The existing Table within the GeoProcessor is overwritten with the new Table. "
+            "No warning is logged.\n"
+            "ReplaceAndWarn: The existing Table within the GeoProcessor is overwritten with the new Table. "
+            "A warning is logged.\n"
+            "Warn : The new Table is not created. A warning is logged.\n"
+            "Fail : The new Table is not created. A fail message is logged.")
+        self.parameter_input_metadata['IfTableIDExists.Values'] = ["", "Replace", "ReplaceAndWarn", "Warn", "Fail"]
+        self.parameter_input_metadata['IfTableIDExists.Value.Default'] = "Replace"
+
+        # Class data
+        self.warning_count = 0
+        self.logger = logging.getLogger(__name__)
+
+    def check_command_parameters(self, command_parameters):
+        """
+        Check the command parameters for validity.
+
+        Args:
+            command_parameters: the dictionary of command parameters to check (key:string_value)
+
+        Returns: None.
+
+        Raises:
+            ValueError if any parameters are invalid or do not have a valid value.
+            The command status messages for initialization are populated with validation messages.
+        """
+
+        warning = ""
+
+        # Check that parameters InputFile and TableID are non-empty, non-None strings.
+        for parameter in ["InputFile", "TableID"]:
+            parameter_value = self.get_parameter_value(parameter_name=parameter, command_parameters=command_parameters)
+
+            if not validators.validate_string(parameter_value, False, False):
+                message = "{} parameter has no value.".format(parameter)
+                recommendation = "Specify the {} parameter.".format(parameter)
+                warning += "\n" + message
+                self.command_status.add_to_log(
+                    CommandPhaseType.INITIALIZATION,
+                    CommandLogRecord(CommandStatusType.FAILURE, message, recommendation))
+
+        # Check that the RowFilters parameter has valid syntax.
+        pv_RowFilters = self.get_parameter_value(parameter_name="RowFilters", command_parameters=command_parameters)
+
+        if pv_RowFilters:
+            try:
+                arrow_util.parse_row_filters(string_util.delimited_string_to_list(pv_RowFilters, delimiter=";"))
+            except ValueError as e:
+                message = str(e)
+                recommendation = "Specify the row filters using the syntax: ColumnName Operator Value"
+                warning += "\n" + message
+                self.command_status.add_to_log(
+                    CommandPhaseType.INITIALIZATION,
+                    CommandLogRecord(CommandStatusType.FAILURE, message, recommendation))
+
+        # Check that optional parameter IfTableIDExists is either `Replace`, `ReplaceAndWarn`, `Warn`, `Fail`, None.
+        pv_IfTableIDExists = self.get_parameter_value(parameter_name="IfTableIDExists",
+                                                      command_parameters=command_parameters)
+        acceptable_values = ["Replace", "ReplaceAndWarn", "Warn", "Fail"]
+        if not validators.validate_string_in_list(pv_IfTableIDExists, acceptable_values, none_allowed=True,
+                                                  empty_string_allowed=True, ignore_case=True):
+            message = "IfTableIDExists parameter value ({}) is not recognized.".format(pv_IfTableIDExists)
+            recommendation = "Specify one of the acceptable values ({}) for the IfTableIDExists parameter.".format(
+                acceptable_values)
+            warning += "\n" + message
+            self.command_status.add_to_log(
+                CommandPhaseType.INITIALIZATION,
+                CommandLogRecord(CommandStatusType.FAILURE, message, recommendation))
+
+        # Check for unrecognized parameters.
+        # This returns a message that can be appended to the warning, which if non-empty triggers an exception below.
+        warning = command_util.validate_command_parameter_names(self, warning)
+
+        # If any warnings were generated, throw an exception.
+        if len(warning) > 0:
+            self.logger.warning(warning)
+            raise ValueError(warning)
+
+        # Refresh the phase severity
+        self.command_status.refresh_phase_severity(CommandPhaseType.INITIALIZATION, CommandStatusType.SUCCESS)
+
+    def __should_read_table(self, input_file_abs, table_id):
+        """
+        Checks the following:
+        * the InputFile (absolute) is a valid file
+        * the ID of the Table is unique (not an existing Table ID)
+
+        Args:
+            input_file_abs (str): the full pathname to the input data file
+            table_id (str): the ID of the output Table
+
+        Returns:
+            Boolean. If TRUE, the reading process should be run. If FALSE, it should not be run.
+        """
+
+        # List of Boolean values. The Boolean values correspond to the results of the following tests. If TRUE, the
+        # test confirms that the command should be run.
+        should_run_command = []
+
+        # If the input file is not a valid file path, raise a FAILURE.
+        should_run_command.append(validators.run_check(self, "IsFilePathValid", "InputFile", input_file_abs, "FAIL"))
+
+        # If the TableID is the same as an already-existing TableID, raise a WARNING or FAILURE (depends on the
+        # value of the IfTableIDExists parameter.)
+        should_run_command.append(validators.run_check(self, "IsTableIdUnique", "TableID", table_id, None))
+
+        # Return the Boolean to determine if the process should be run.
+        if False in should_run_command:
+            return False
+        else:
+            return True
+
+    def run_command(self):
+        """
+        Run the command. Read the Table from the Parquet file.
+
+        Returns: None.
+
+        Raises:
+            RuntimeError if any warnings occurred during run_command method.
+        """
+
+        # Obtain the parameter values.
+        pv_InputFile = self.get_parameter_value("InputFile")
+        pv_TableID = self.get_parameter_value("TableID")
+        pv_IncludeColumns = self.get_parameter_value("IncludeColumns", default_value="*")
+        pv_ExcludeColumns = self.get_parameter_value("ExcludeColumns", default_value="")
+        pv_RowFilters = self.get_parameter_value("RowFilters", default_value="")
+
+        # Expand for ${Property} syntax.
+        pv_TableID = self.command_processor.expand_parameter_value(pv_TableID, self)
+        pv_RowFilters = self.command_processor.expand_parameter_value(pv_RowFilters, self)
+
+        # Convert the InputFile parameter value relative path to an absolute path and expand for ${Property} syntax
+        input_file_absolute = io_util.verify_path_for_os(
+            io_util.to_absolute_path(self.command_processor.get_property('WorkingDir'),
+                                     self.command_processor.expand_parameter_value(pv_InputFile, self)))
+
+        # Convert the IncludeColumns, ExcludeColumns and RowFilters parameter values to lists.
+        cols_to_include = string_util.delimited_string_to_list(pv_IncludeColumns)
+        cols_to_exclude = string_util.delimited_string_to_list(pv_ExcludeColumns)
+        row_filters = string_util.delimited_string_to_list(pv_RowFilters, delimiter=";")
+
+        # Run the checks on the parameter values. Only continue if the checks passed.
+        if self.__should_read_table(input_file_absolute, pv_TableID):
+
+            try:
+
+                # Determine the columns to read from the file schema, in file order.
+                all_cols_names = arrow_util.get_column_names(input_file_absolute, "Parquet")
+                cols_to_keep = string_util.filter_list_of_strings(all_cols_names, cols_to_include, cols_to_exclude)
+                cols_to_read = [col for col in all_cols_names if col in cols_to_keep]
+
+                # Read the selected columns and rows into a pandas data frame.
+                df = arrow_util.read_df(input_file_absolute, "Parquet", cols_to_read,
+                                        arrow_util.parse_row_filters(row_filters))
+
+                # Create a Table and add it to the GeoProcessor's Tables list.
+                table_obj = Table(pv_TableID, df, input_file_absolute)
+                self.command_processor.add_table(table_obj)
+
+            # Raise an exception if an unexpected error occurs during the process
+            except Exception as e:
+                self.warning_count += 1
+                message = "Unexpected error reading Table {} from Parquet file ({}).".format(pv_TableID,
+                                                                                             input_file_absolute)
+                recommendation = "Check the log file for details."
+                self.logger.error(message, exc_info=True)
+                self.command_status.add_to_log(CommandPhaseType.RUN,
+                                               CommandLogRecord(CommandStatusType.FAILURE, message, recommendation))
+
+        # Determine success of command processing. Raise Runtime Error if any errors occurred
+        if self.warning_count > 0:
+            message = "There were {} warnings proceeding this command.".format(self.warning_count)
+            raise RuntimeError(message)
+
+        # Set command status type as SUCCESS if there are no errors.
+        else:
+            self.command_status.refresh_phase_severity(CommandPhaseType.RUN, CommandStatusType.SUCCESS)
@@ -59,6 +59,11 @@ class WriteTableToDataStore(AbstractCommand):
         5. ExistingTableInsertUpdate: Rows of the TableID that do NOT conflict with any of the rows in the existing
             database table are appended to the database table. Rows of the TableID that do conflict with any of the
             rows in the existing database table are used to update the existing database rows.
+    * KeyColumns (str, optional): A comma-separated list of the DataStore table columns that identify a row, used to
+        match rows with the ExistingTableUpdate and ExistingTableInsertUpdate write modes.
+        Default: the primary key columns of the DataStore table.
+    * BatchSize (str, optional): The number of rows to load into the database with each bulk insert statement.
+        Default: 10000. All rows are written in a single transaction regardless of the batch size.
     """
 
     # Define the command parameters.
@@ -70,7 +75,9 @@ class WriteTableToDataStore(AbstractCommand):
         CommandParameterMetadata("DataStoreTable", type("")),
         CommandParameterMetadata("ColumnMap", type("")),
         CommandParameterMetadata("DataStoreRelatedColumnsMap", type("")),
-        CommandParameterMetadata("WriteMode", type(""))]
+        CommandParameterMetadata("WriteMode", type("")),
+        CommandParameterMetadata("KeyColumns", type("")),
+        CommandParameterMetadata("BatchSize", type(""))]
 
     # Choices for WriteMode, used to validate parameter and display in editor
     __choices_WriteMode = ["NewTableInsert", "ExistingTableOverwrite", "ExistingTableInsert", "ExistingTableUpdate",
@@ -162,6 +169,21 @@ class WriteTableToDataStore(AbstractCommand):
             "existing database table are appended to the database table.\n"
             "Rows of the TableID that do conflict with any of the rows in the existing database table are "
             "used to update the existing database rows.")
+        # KeyColumns
+        self.parameter_input_metadata['KeyColumns.Description'] = "datastore columns that identify a row"
+        self.parameter_input_metadata['KeyColumns.Label'] = "Key columns"
+        self.parameter_input_metadata['KeyColumns.Tooltip'] = (
+            "A comma-separated list of the DataStore table columns that identify a row.\n"
+            "Used to match rows with the ExistingTableUpdate and ExistingTableInsertUpdate write modes.")
+        self.parameter_input_metadata['KeyColumns.Value.Default.Description'] = \
+            "the primary key columns of the DataStore table"
+        # BatchSize
+        self.parameter_input_metadata['BatchSize.Description'] = "number of rows per bulk insert"
+        self.parameter_input_metadata['BatchSize.Label'] = "Batch size"
+        self.parameter_input_metadata['BatchSize.Tooltip'] = (
+            "The number of rows to load into the database with each bulk insert statement.\n"
+            "All rows are written in a single transaction.")
+        self.parameter_input_metadata['BatchSize.Value.Default'] = "10000"
 
         # Class data
         self.warning_count = 0
@@ -208,6 +230,15 @@ class WriteTableToDataStore(AbstractCommand):
             self.command_status.add_to_log(CommandPhaseType.INITIALIZATION,
                                            CommandLogRecord(CommandStatusType.FAILURE, message, recommendation))
 
+        # Check that optional parameter BatchSize is a positive integer or None.
+        pv_BatchSize = self.get_parameter_value(parameter_name="BatchSize", command_parameters=command_parameters)
+        if not validators.validate_int(pv_BatchSize, True, False) or (pv_BatchSize and not int(pv_BatchSize) > 0):
+            message = "BatchSize parameter value ({}) is not a positive integer.".format(pv_BatchSize)
+            recommendation = "Specify a positive integer for the BatchSize parameter."
+            warning += "\n" + message
+            self.command_status.add_to_log(CommandPhaseType.INITIALIZATION,
+                                           CommandLogRecord(CommandStatusType.FAILURE, message, recommendation))
+
         # Check for unrecognized parameters.
         # This returns a message that can be appended to the warning, which if non-empty triggers an exception below.
         warning = command_util.validate_command_parameter_names(self, warning)
@@ -462,6 +493,8 @@ class WriteTableToDataStore(AbstractCommand):
         pv_ColumnMap = self.get_parameter_value("ColumnMap", default_value="")
         pv_DataStoreRelatedColumnsMap = self.get_parameter_value("DataStoreRelatedColumnsMap")
         pv_WriteMode = self.get_parameter_value("WriteMode").upper()
+        pv_KeyColumns = self.get_parameter_value("KeyColumns")
+        pv_BatchSize = int(self.get_parameter_value("BatchSize", default_value="10000"))
 
         # Expand for ${Property} syntax.
         pv_TableID = self.command_processor.expand_parameter_value(pv_TableID, self)
@@ -505,33 +538,14 @@ class WriteTableToDataStore(AbstractCommand):
                     # Rename the copied pandas Data Frame columns to match the columns in the database table.
                     table_obj_copy = table_obj_copy.rename(columns=col_map_dic)
 
-                    # Write the copied pandas Data Frame to the DataStore's database table.
-                    # If the WriteMode is NewTableInsert, continue.
-                    if pv_WriteMode.upper() == "NEWTABLEINSERT":
-
-                        table_obj_copy.to_sql(name=pv_DataStoreTable, con=datastore_obj.engine, index=False)
-
-                    # If the WriteMode is ExistingTableOverwrite, continue.
-                    elif pv_WriteMode.upper() == "EXISTINGTABLEOVERWRITE":
-
-                        table_obj_copy.to_sql(name=pv_DataStoreTable, con=datastore_obj.engine, if_exists="replace",
-                                              index=False)
-
-                    # If the WriteMode is ExistingTableInsert, continue.
-                    elif pv_WriteMode.upper() == "EXISTINGTABLEINSERT":
-
-                        table_obj_copy.to_sql(name=pv_DataStoreTable, con=datastore_obj.engine, if_exists="append",
-                                              index=False)
-
-                    # If the WriteMode is ExistingTableUpdate, continue.
-                    elif pv_WriteMode.upper() == "EXISTINGTABLEUPDATE":
-
-                        print("The ExistingTableUpdate WriteMode is currently disabled.")
-
-                    # If the WriteMode is ExistingTableInsertUpdate, continue.
-                    elif pv_WriteMode.upper() == "EXISTINGTABLEINSERTUPDATE":
+                    # Convert the KeyColumns parameter value to a list. If None, the primary key columns are used.
+                    key_cols = None
+                    if pv_KeyColumns:
+                        key_cols = string_util.delimited_string_to_list(pv_KeyColumns)
 
-                        print("The ExistingTableInsertUpdate WriteMode is currently disabled.")
+                    # Write the copied pandas Data Frame to the DataStore's database table in a single transaction.
+                    datastore_obj.write_df_to_table(table_obj_copy, pv_DataStoreTable, pv_WriteMode, key_cols,
+                                                    pv_BatchSize)
 
                 # Raise an exception if an unexpected error occurs during the process
                 except Exception as e:
@@ -40,7 +40,8 @@ class WriteTableToDelimitedFile(AbstractCommand):
 
     Command Parameters
     * TableID (str, required): the identifier of the Table to be written to the delimited file
-    * OutputFile (str, required): the relative pathname of the output delimited file.
+    * OutputFile (str, required): the relative pathname of the output delimited file. If the file has a .gz, .bz2,
+        .xz or .zip extension, the file is compressed as it is written.
     * Delimiter (str, optional): the delimiter of the output file. Default is `,` Must be a one-character
         string (limitation is built into the Pandas to_csv command).
     * IncludeColumns (str, optional): A list of glob-style patterns to determine the table columns to include in the
@@ -108,7 +109,8 @@ class WriteTableToDelimitedFile(AbstractCommand):
         self.parameter_input_metadata['OutputFile.Required'] = True
         self.parameter_input_metadata['OutputFile.Tooltip'] = (
             "The output delimited file (relative or absolute path).\n"
-            "${Property} syntax is recognized.")
+            "${Property} syntax is recognized.\n"
+            "The file is compressed if it has a .gz, .bz2, .xz or .zip extension.")
         self.parameter_input_metadata['OutputFile.FileSelector.Type'] = 'Write'
         self.parameter_input_metadata['OutputFile.FileSelector.Title'] = 'Select delimited file'
         # Delimiter
@@ -458,7 +460,7 @@ class WriteTableToDelimitedFile(AbstractCommand):
                 del record[index]
 
         # Open the output delimited file. Can be an existing or a new file path.
-        with open(path, "w") as f:
+        with io_util.open_file(path, "w") as f:
 
             # Write the records (one record for each row) to the output delimited file. Use the specified delimiter
             # character.
@@ -474,7 +476,7 @@ class WriteTableToDelimitedFile(AbstractCommand):
             replacement_dictionary = {}
 
             # Open the output delimited file.
-            with open(path, "r") as f:
+            with io_util.open_file(path, "r") as f:
 
                 # Iterate over each row of the output delimited file.
                 reader = csv.reader(f, delimiter=delimiter)
@@ -521,7 +523,7 @@ class WriteTableToDelimitedFile(AbstractCommand):
             if replacement_dictionary:
 
                 # Open the output csv file and read the text in as a variable.
-                with open(path, 'r') as f:
+                with io_util.open_file(path, 'r') as f:
                     file_text = f.read()
 
                 # Iterate over the characters to be replaced.
@@ -530,7 +532,7 @@ class WriteTableToDelimitedFile(AbstractCommand):
                     file_text = file_text.replace(orig, new)
 
                 # Open the output csv file and overwrite the content with the updated text.
-                with open(path, "w") as f:
+                with io_util.open_file(path, "w") as f:
                     f.write(file_text)
 
         # If specified to use curly brackets around array/list data values, continue.
@@ -547,7 +549,7 @@ class WriteTableToDelimitedFile(AbstractCommand):
             replacement_dictionary["]"] = "}"
 
             # Open the output csv file and read the text in as a variable.
-            with open(path, 'r') as f:
+            with io_util.open_file(path, 'r') as f:
                 file_text = f.read()
 
             # Iterate over the characters to be replaced.
@@ -556,14 +558,14 @@ class WriteTableToDelimitedFile(AbstractCommand):
                 file_text = file_text.replace(orig, new)
 
             # Open the output csv file and overwrite the content with the updated text.
-            with open(path, "w") as f:
+            with io_util.open_file(path, "w") as f:
                 f.write(file_text)
 
             # If there are items to replace, continue.
             if replacement_dictionary:
 
                 # Open the output csv file and read the text in as a variable.
-                with open(path, 'r') as f:
+                with io_util.open_file(path, 'r') as f:
                     file_text = f.read()
 
                 # Iterate over the characters to be replaced.
@@ -572,7 +574,7 @@ class WriteTableToDelimitedFile(AbstractCommand):
                     file_text = file_text.replace(orig, new)
 
                 # Open the output csv file and overwrite the content with the updated text.
-                with open(path, "w") as f:
+                with io_util.open_file(path, "w") as f:
                     f.write(file_text)
 
     def run_command(self):
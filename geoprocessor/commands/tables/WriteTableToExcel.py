@@ -26,7 +26,6 @@ from geoprocessor.core.CommandStatusType import CommandStatusType
 
 import geoprocessor.util.command_util as command_util
 import geoprocessor.util.io_util as io_util
-import geoprocessor.util.pandas_util as pandas_util
 import geoprocessor.util.string_util as string_util
 import geoprocessor.util.validator_util as validators
 
@@ -48,6 +47,10 @@ class WriteTableToExcel(AbstractCommand):
         output delimited file. Default: Default: '' (No columns are excluded from the output delimited file).
     * WriteIndexColumn (bool, optional): If TRUE, the index column is written, If FALSE, the index column is excluded.
         Default: True
+    * KeepOpen (bool, optional): If TRUE, the worksheet is buffered and the workbook is written when the
+        CloseExcelWorkbook command is run or at the end of the run, so that many worksheets can be written to a workbook
+        at once. If FALSE, the workbook is written when this command is run, including any buffered worksheets.
+        Default: False
     """
 
     # Define the command parameters/
@@ -57,7 +60,8 @@ class WriteTableToExcel(AbstractCommand):
         CommandParameterMetadata("OutputWorksheet", type("")),
         CommandParameterMetadata("ColumnsToInclude", type("")),
         CommandParameterMetadata("ColumnsToExclude", type("")),
-        CommandParameterMetadata("WriteIndexColumn", type(""))]
+        CommandParameterMetadata("WriteIndexColumn", type("")),
+        CommandParameterMetadata("KeepOpen", type(""))]
 
     def __init__(self):
         """
@@ -117,6 +121,15 @@ class WriteTableToExcel(AbstractCommand):
             "If FALSE, the Table's index column is not included in the output Excel file")
         self.parameter_input_metadata['WriteIndexColumn.Value.Default'] = "TRUE"
         self.parameter_input_metadata['WriteIndexColumn.Values'] = ["", "TRUE", "FALSE"]
+        # KeepOpen
+        self.parameter_input_metadata['KeepOpen.Description'] = "whether to keep the workbook open"
+        self.parameter_input_metadata['KeepOpen.Label'] = "Keep open?"
+        self.parameter_input_metadata['KeepOpen.Tooltip'] = (
+            "If TRUE, the worksheet is buffered and the workbook is written when the CloseExcelWorkbook command is "
+            "run or at the end of the run.\nUse when writing many worksheets to the same workbook.\n"
+            "If FALSE, the workbook is written when this command is run.")
+        self.parameter_input_metadata['KeepOpen.Value.Default'] = "FALSE"
+        self.parameter_input_metadata['KeepOpen.Values'] = ["", "TRUE", "FALSE"]
 
         # Class data
         self.warning_count = 0
@@ -173,6 +186,17 @@ class WriteTableToExcel(AbstractCommand):
                 CommandPhaseType.INITIALIZATION,
                 CommandLogRecord(CommandStatusType.FAILURE, message, recommendation))
 
+        # Check that parameter KeepOpen is a valid Boolean value or None.
+        pv_KeepOpen = self.get_parameter_value(parameter_name='KeepOpen', command_parameters=command_parameters)
+
+        if not validators.validate_bool(pv_KeepOpen, True, False):
+            message = "KeepOpen parameter is not a valid Boolean value."
+            recommendation = "Specify a valid Boolean value for the KeepOpen parameter."
+            warning += "\n" + message
+            self.command_status.add_to_log(
+                CommandPhaseType.INITIALIZATION,
+                CommandLogRecord(CommandStatusType.FAILURE, message, recommendation))
+
         # Check for unrecognized parameters.
         # This returns a message that can be appended to the warning, which if non-empty triggers an exception below.
         warning = command_util.validate_command_parameter_names(self, warning)
@@ -252,9 +276,11 @@ class WriteTableToExcel(AbstractCommand):
         pv_ColumnsToInclude = self.get_parameter_value("ColumnsToInclude", default_value="*")
         pv_ColumnsToExclude = self.get_parameter_value("ColumnsToExclude", default_value="")
         pv_WriteIndexColumn = self.get_parameter_value("WriteIndexColumn", default_value="True")
+        pv_KeepOpen = self.get_parameter_value("KeepOpen", default_value="False")
 
         # Convert the Boolean parameters from string to valid Boolean values.
         pv_WriteIndexColumn = string_util.str_to_bool(pv_WriteIndexColumn)
+        pv_KeepOpen = string_util.str_to_bool(pv_KeepOpen)
 
         # Convert the ColumnsToInclude and ColumnsToExclude parameter values to lists.
         cols_to_include = string_util.delimited_string_to_list(pv_ColumnsToInclude)
@@ -288,9 +314,14 @@ class WriteTableToExcel(AbstractCommand):
                     if col in cols_to_keep:
                         sorted_cols_to_keep.append(col)
 
-                # Write the tables to an Excel file.
-                pandas_util.write_df_to_excel(table.df, output_file_absolute, pv_OutputWorksheet, sorted_cols_to_keep,
-                                              pv_WriteIndexColumn)
+                # Add the table to the workbook's worksheets. If the workbook is not kept open, write the workbook
+                # now, along with any worksheets that were buffered by previous commands. If the workbook is kept open,
+                # the writer records this command so that a failure to write the workbook later is reported on it.
+                writer = self.command_processor.get_excel_workbook_writer(output_file_absolute)
+                writer.add_sheet(table.df, pv_OutputWorksheet, sorted_cols_to_keep, pv_WriteIndexColumn,
+                                 command=self if pv_KeepOpen else None)
+                if not pv_KeepOpen:
+                    self.command_processor.close_excel_workbook_writers(output_file_absolute)
 
                 # Add the output file to the GeoProcessor's list of output files.
                 self.command_processor.add_output_file(output_file_absolute)
@@ -0,0 +1,339 @@
+# WriteTableToParquet - command to write a table to a Parquet file
+# ________________________________________________________________NoticeStart_
+# GeoProcessor
+# Copyright (C) 2017-2019 Open Water Foundation
+#
+# GeoProcessor is free software:  you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     GeoProcessor is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with GeoProcessor.  If not, see <https://www.gnu.org/licenses/>.
+# ________________________________________________________________NoticeEnd___
+
+from geoprocessor.commands.abstract.AbstractCommand import AbstractCommand
+
+from geoprocessor.core.CommandLogRecord import CommandLogRecord
+from geoprocessor.core.CommandParameterMetadata import CommandParameterMetadata
+from geoprocessor.core.CommandPhaseType import CommandPhaseType
+from geoprocessor.core.CommandStatusType import CommandStatusType
+
+import geoprocessor.util.arrow_util as arrow_util
+import geoprocessor.util.command_util as command_util
+import geoprocessor.util.io_util as io_util
+import geoprocessor.util.string_util as string_util
+import geoprocessor.util.validator_util as validators
+
+import logging
+
+
+class WriteTableToParquet(AbstractCommand):
+    """
+    Writes a Table to a Parquet file.
+
+    Command Parameters
+    * TableID (str, required): the identifier of the Table to be written to the Parquet file
+    * OutputFile (str, required): the relative pathname of the output Parquet file.
+    * IncludeColumns (str, optional): A list of glob-style patterns to determine the table columns to include in the
+        output file. Default: * (All columns are written).
+    * ExcludeColumns (str, optional): A list of glob-style patterns to determine the table columns to exclude in the
+        output file. Default: '' (No columns are excluded from the output file).
+    * WriteIndexColumn (bool, optional): If TRUE, the index column is written, If FALSE, the index column is excluded.
+        Default: False
+    * Compression (str, optional): The compression codec: Snappy, Gzip, Brotli, LZ4, Zstd or None.
+        Default: Snappy
+    * DictionaryColumns (str, optional): A list of glob-style patterns to determine the table columns that are
+        dictionary encoded. Dictionary encoding is efficient for columns with many repeated values.
+        Default: * (All columns are dictionary encoded, falling back to plain encoding for columns with many values).
+    * RowGroupSize (str, optional): The maximum number of rows in each row group. Smaller row groups allow more rows
+        to be skipped when the file is read with row filters. Default: all rows are written in one row group, up to
+        the pyarrow limit.
+    """
+
+    # Define the command parameters.
+    __command_parameter_metadata = [
+        CommandParameterMetadata("TableID", type("")),
+        CommandParameterMetadata("OutputFile", type("")),
+        CommandParameterMetadata("IncludeColumns", type("")),
+        CommandParameterMetadata("ExcludeColumns", type("")),
+        CommandParameterMetadata("WriteIndexColumn", type("")),
+        CommandParameterMetadata("Compression", type("")),
+        CommandParameterMetadata("DictionaryColumns", type("")),
+        CommandParameterMetadata("RowGroupSize", type(""))]
+
+    # Choices for Compression, used to validate parameter and display in editor
+    __choices_Compression = ["Snappy", "Gzip", "Brotli", "LZ4", "Zstd", "None"]
+
+    def __init__(self):
+        """
+        Initialize the command.
+        """
+
+        # AbstractCommand data
+        super().__init__()
+        self.command_name = "WriteTableToParquet"
+        self.command_parameter_metadata = self.__command_parameter_metadata
+
+        # Command metadata for command editor display
+        self.command_metadata = dict()
+        self.command_metadata['Description'] = "Write a table to a Parquet file."
+        self.command_metadata['EditorType'] = "Simple"
+
+        # Command Parameter Metadata
+        self.parameter_input_metadata = dict()
+        # TableID
+        self.parameter_input_metadata['TableID.Description'] = "table to write"
+        self.parameter_input_metadata['TableID.Label'] = "TableID"
+        self.parameter_input_metadata['TableID.Required'] = True
+        self.parameter_input_metadata['TableID.Tooltip'] = "The Table identifier of the Table to write."
+        # OutputFile
+        self.parameter_input_metadata['OutputFile.Description'] = "output Parquet file"
+        self.parameter_input_metadata['OutputFile.Label'] = "Output file"
+        self.parameter_input_metadata['OutputFile.Required'] = True
+        self.parameter_input_metadata['OutputFile.Tooltip'] = \
+            "The output Parquet file (relative or absolute path). ${Property} syntax is recognized."
+        self.parameter_input_metadata['OutputFile.FileSelector.Type'] = "Write"
+        self.parameter_input_metadata['OutputFile.FileSelector.Title'] = "Select the Parquet file to write"
+        # IncludeColumns
+        self.parameter_input_metadata['IncludeColumns.Description'] = "columns to include"
+        self.parameter_input_metadata['IncludeColumns.Label'] = "Include columns"
+        self.parameter_input_metadata['IncludeColumns.Tooltip'] = \
+            "A comma-separated list of the glob-style patterns filtering which columns to write."
+        self.parameter_input_metadata['IncludeColumns.Value.Default'] = "* - all columns are written"
+        # ExcludeColumns
+        self.parameter_input_metadata['ExcludeColumns.Description'] = "columns to exclude"
+        self.parameter_input_metadata['ExcludeColumns.Label'] = "Exclude columns"
+        self.parameter_input_metadata['ExcludeColumns.Tooltip'] = \
+            "A comma-separated list of the glob-style patterns filtering which columns to NOT write."
+        self.parameter_input_metadata['ExcludeColumns.Value.Default'] = "No columns are excluded"
+        # WriteIndexColumn
+        self.parameter_input_metadata['WriteIndexColumn.Description'] = "whether to write index column"
+        self.parameter_input_metadata['WriteIndexColumn.Label'] = "Write index column?"
+        self.parameter_input_metadata['WriteIndexColumn.Tooltip'] = (
+            "If TRUE, the Table's index column is included in the output file.\n"
+            "If FALSE, the Table's index column is not included in the output file.")
+        self.parameter_input_metadata['WriteIndexColumn.Value.Default'] = "FALSE"
+        self.parameter_input_metadata['WriteIndexColumn.Values'] = ["", "TRUE", "FALSE"]
+        # Compression
+        self.parameter_input_metadata['Compression.Description'] = "compression codec"
+        self.parameter_input_metadata['Compression.Label'] = "Compression"
+        self.parameter_input_metadata['Compression.Tooltip'] = "The compression codec used for the column data."
+        self.parameter_input_metadata['Compression.Value.Default'] = "Snappy"
+        self.parameter_input_metadata['Compression.Values'] = [""] + self.__choices_Compression
+        # DictionaryColumns
+        self.parameter_input_metadata['DictionaryColumns.Description'] = "columns to dictionary encode"
+        self.parameter_input_metadata['DictionaryColumns.Label'] = "Dictionary columns"
+        self.parameter_input_metadata['DictionaryColumns.Tooltip'] = (
+            "A comma-separated list of the glob-style patterns filtering which columns to dictionary encode.\n"
+            "Dictionary encoding is efficient for columns with many repeated values.")
+        self.parameter_input_metadata['DictionaryColumns.Value.Default'] = "* - all columns are dictionary encoded"
+        # RowGroupSize
+        self.parameter_input_metadata['RowGroupSize.Description'] = "maximum rows in a row group"
+        self.parameter_input_metadata['RowGroupSize.Label'] = "Row group size"
+        self.parameter_input_metadata['RowGroupSize.Tooltip'] = (
+            "The maximum number of rows in each row group.\n"
+            "Smaller row groups allow more rows to be skipped when the file is read with row filters.")
+        self.parameter_input_metadata['RowGroupSize.Value.Default.Description'] = "pyarrow default"
+
+        # Class data
+        self.warning_count = 0
+        self.logger = logging.getLogger(__name__)
+
+    def check_command_parameters(self, command_parameters):
+        """
+        Check the command parameters for validity.
+
+        Args:
+            command_parameters: the dictionary of command parameters to check (key:string_value)
+
+        Returns: None.
+
+        Raises:
+            ValueError if any parameters are invalid or do not have a valid value.
+            The command status messages for initialization are populated with validation messages.
+        """
+
+        warning = ""
+
+        # Check that parameters TableID and OutputFile are non-empty, non-None strings.
+        for parameter in ["TableID", "OutputFile"]:
+            parameter_value = self.get_parameter_value(parameter_name=parameter, command_parameters=command_parameters)
+
+            if not validators.validate_string(parameter_value, False, False):
+                message = "{} parameter has no value.".format(parameter)
+                recommendation = "Specify the {} parameter.".format(parameter)
+                warning += "\n" + message
+                self.command_status.add_to_log(
+                    CommandPhaseType.INITIALIZATION,
+                    CommandLogRecord(CommandStatusType.FAILURE, message, recommendation))
+
+        # Check that parameter WriteIndexColumn is a valid Boolean value or None.
+        pv_WriteIndexColumn = self.get_parameter_value(parameter_name='WriteIndexColumn',
+                                                       command_parameters=command_parameters)
+
+        if not validators.validate_bool(pv_WriteIndexColumn, True, False):
+            message = "WriteIndexColumn parameter is not a valid Boolean value."
+            recommendation = "Specify a valid Boolean value for the WriteIndexColumn parameter."
+            warning += "\n" + message
+            self.command_status.add_to_log(
+                CommandPhaseType.INITIALIZATION,
+                CommandLogRecord(CommandStatusType.FAILURE, message, recommendation))
+
+        # Check that optional parameter Compression is one of the acceptable values or None.
+        pv_Compression = self.get_parameter_value(parameter_name="Compression", command_parameters=command_parameters)
+
+        if not validators.validate_string_in_list(pv_Compression, self.__choices_Compression, none_allowed=True,
+                                                  empty_string_allowed=False, ignore_case=True):
+            message = "Compression parameter value ({}) is not recognized.".format(pv_Compression)
+            recommendation = "Specify one of the acceptable values ({}) for the Compression parameter.".format(
+                self.__choices_Compression)
+            warning += "\n" + message
+            self.command_status.add_to_log(
+                CommandPhaseType.INITIALIZATION,
+                CommandLogRecord(CommandStatusType.FAILURE, message, recommendation))
+
+        # Check that optional parameter RowGroupSize is a positive integer or None.
+        pv_RowGroupSize = self.get_parameter_value(parameter_name="RowGroupSize", command_parameters=command_parameters)
+
+        if not validators.validate_int(pv_RowGroupSize, True, False) or \
+                (pv_RowGroupSize is not None and not int(pv_RowGroupSize) > 0):
+            message = "RowGroupSize parameter value ({}) is not a positive, non-zero integer value.".format(
+                pv_RowGroupSize)
+            recommendation = "Specify a positive integer for the RowGroupSize parameter."
+            warning += "\n" + message
+            self.command_status.add_to_log(
+                CommandPhaseType.INITIALIZATION,
+                CommandLogRecord(CommandStatusType.FAILURE, message, recommendation))
+
+        # Check for unrecognized parameters.
+        # This returns a message that can be appended to the warning, which if non-empty triggers an exception below.
+        warning = command_util.validate_command_parameter_names(self, warning)
+
+        # If any warnings were generated, throw an exception.
+        if len(warning) > 0:
+            self.logger.warning(warning)
+            raise ValueError(warning)
+
+        # Refresh the phase severity
+        self.command_status.refresh_phase_severity(CommandPhaseType.INITIALIZATION, CommandStatusType.SUCCESS)
+
+    def __should_write_table(self, table_id, output_file_abs):
+        """
+        Checks the following:
+        * the ID of the Table is an existing Table ID
+        * the output folder is a valid folder
+
+        Args:
+            table_id: the ID of the Table to be written
+            output_file_abs: the full pathname to the output file
+
+        Returns:
+            run_write: Boolean. If TRUE, the writing process should be run. If FALSE, it should not be run.
+        """
+
+        # List of Boolean values. The Boolean values correspond to the results of the following tests. If TRUE, the
+        # test confirms that the command should be run.
+        should_run_command = []
+
+        # If the Table ID is not an existing Table ID, raise a FAILURE.
+        should_run_command.append(validators.run_check(self, "IsTableIdExisting", "TableID", table_id, "FAIL"))
+
+        # Get the full path to the output folder
+        output_folder_abs = io_util.get_path(output_file_abs)
+
+        # If the output folder is not an existing folder, raise a FAILURE.
+        should_run_command.append(validators.run_check(self, "IsFolderPathValid", "OutputFile", output_folder_abs,
+                                                       "FAIL"))
+
+        # Return the Boolean to determine if the process should be run.
+        if False in should_run_command:
+            return False
+        else:
+            return True
+
+    def run_command(self):
+        """
+        Run the command. Write the Table to a Parquet file.
+
+        Returns: None.
+
+        Raises:
+            RuntimeError if any warnings occurred during run_command method.
+        """
+
+        # Obtain the parameter values.
+        pv_TableID = self.get_parameter_value("TableID")
+        pv_OutputFile = self.get_parameter_value("OutputFile")
+        pv_IncludeColumns = self.get_parameter_value("IncludeColumns", default_value="*")
+        pv_ExcludeColumns = self.get_parameter_value("ExcludeColumns", default_value="")
+        pv_WriteIndexColumn = self.get_parameter_value("WriteIndexColumn", default_value="False")
+        pv_Compression = self.get_parameter_value("Compression", default_value="Snappy")
+        pv_DictionaryColumns = self.get_parameter_value("DictionaryColumns", default_value="*")
+        pv_RowGroupSize = self.get_parameter_value("RowGroupSize")
+
+        # Expand for ${Property} syntax.
+        pv_TableID = self.command_processor.expand_parameter_value(pv_TableID, self)
+
+        # Convert the Boolean parameters from string to valid Boolean values.
+        pv_WriteIndexColumn = string_util.str_to_bool(pv_WriteIndexColumn)
+
+        # Convert the RowGroupSize parameter value to an integer.
+        if pv_RowGroupSize:
+            pv_RowGroupSize = int(pv_RowGroupSize)
+
+        # Convert the IncludeColumns, ExcludeColumns and DictionaryColumns parameter values to lists.
+        cols_to_include = string_util.delimited_string_to_list(pv_IncludeColumns)
+        cols_to_exclude = string_util.delimited_string_to_list(pv_ExcludeColumns)
+        dictionary_cols = string_util.delimited_string_to_list(pv_DictionaryColumns)
+
+        # Convert the OutputFile parameter value relative path to an absolute path and expand for ${Property} syntax
+        output_file_absolute = io_util.verify_path_for_os(
+            io_util.to_absolute_path(self.command_processor.get_property('WorkingDir'),
+                                     self.command_processor.expand_parameter_value(pv_OutputFile, self)))
+
+        # Run the checks on the parameter values. Only continue if the checks passed.
+        if self.__should_write_table(pv_TableID, output_file_absolute):
+
+            try:
+
+                # Get the Table object
+                table = self.command_processor.get_table(pv_TableID)
+
+                # Determine the columns to write, in the same order as the Table.
+                all_cols_names = list(table.df)
+                cols_to_keep = string_util.filter_list_of_strings(all_cols_names, cols_to_include, cols_to_exclude)
+                sorted_cols_to_keep = [col for col in all_cols_names if col in cols_to_keep]
+
+                # Determine the columns to dictionary encode.
+                dictionary_cols = string_util.filter_list_of_strings(sorted_cols_to_keep, dictionary_cols)
+
+                # Write the Table to the Parquet file.
+                arrow_util.write_df(table.df, output_file_absolute, "Parquet", sorted_cols_to_keep,
+                                    pv_WriteIndexColumn, pv_Compression.lower(), dictionary_cols, pv_RowGroupSize)
+
+                # Add the output file to the GeoProcessor's list of output files.
+                self.command_processor.add_output_file(output_file_absolute)
+
+            # Raise an exception if an unexpected error occurs during the process
+            except Exception as e:
+                self.warning_count += 1
+                message = "Unexpected error writing Table {} to Parquet file {}.".format(pv_TableID, pv_OutputFile)
+                recommendation = "Check the log file for details."
+                self.logger.error(message, exc_info=True)
+                self.command_status.add_to_log(CommandPhaseType.RUN,
+                                               CommandLogRecord(CommandStatusType.FAILURE, message, recommendation))
+
+        # Determine success of command processing. Raise Runtime Error if any errors occurred
+        if self.warning_count > 0:
+            message = "There were {} warnings proceeding this command.".format(self.warning_count)
+            raise RuntimeError(message)
+
+        # Set command status type as SUCCESS if there are no errors.
+        else:
+            self.command_status.refresh_phase_severity(CommandPhaseType.RUN, CommandStatusType.SUCCESS)
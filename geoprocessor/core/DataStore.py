@@ -17,7 +17,14 @@
 #     along with GeoProcessor.  If not, see <https://www.gnu.org/licenses/>.
 # ________________________________________________________________NoticeEnd___
 
+import csv
+import io
+import logging
+import re
+import uuid
+
 import sqlalchemy
+from sqlalchemy import event
 from sqlalchemy.engine.url import URL
 
 
@@ -41,8 +48,35 @@ class DataStore(object):
      are used to read from and write to datastores. This is useful to run automated workflows. In the future, the
      ability to configure datastore connections for use at software startup will be enabled, which is useful to
      interactively browse datastore resources.
+
+     SqlAlchemy engines (and therefore their connection pools) are shared by all DataStore instances that use the same
+     database URI, so that reopening a DataStore, or opening several DataStores for the same database, reuses pooled
+     connections. Engines for in-memory SQLite databases are not shared, because each in-memory database only exists
+     for its engine, and a new DataStore must not see the tables of another in-memory DataStore. Table schema information is read from the database only when a table is first used and is then
+     cached by the DataStore until invalidate_schema_cache() is called (for example, after DDL is run).
+
+     SQLite and GeoPackage (which is a SQLite database) datastores can be used to stage large intermediate tables
+     locally, either in a file or in memory. File databases are opened in write-ahead log (WAL) mode with pragmas that
+     favor bulk loading, and other database files can be attached so that tables can be joined across files in SQL.
+     GeoPackage datastores are limited to attribute (non-spatial) tables: new tables are registered in gpkg_contents
+     as attribute tables, and feature tables can be read but not written, because the spatial index triggers of
+     feature tables require the GeoPackage SQL functions (ST_MinX, etc.), which are not loaded.
     """
 
+    # Dictionary of SqlAlchemy engines shared by all DataStore instances.
+    # Key: the database URI (URL objects compare all URL parts, including the password), Value: the SqlAlchemy engine
+    __engines = {}
+
+    # SQLite pragmas that are set on each new SQLite connection, to favor fast bulk loading over durability on power
+    # loss. WAL mode also allows readers to continue while a table is being loaded.
+    __sqlite_pragmas = ["PRAGMA synchronous = NORMAL",
+                        "PRAGMA temp_store = MEMORY",
+                        "PRAGMA cache_size = -65536",
+                        "PRAGMA mmap_size = 268435456"]
+
+    # Regular expression used to detect SQL statements that may change the database schema.
+    __ddl_pattern = re.compile(r"\b(CREATE|DROP|ALTER|RENAME|TRUNCATE)\b", re.IGNORECASE)
+
     def __init__(self, datastore_id):
         """
         Initialize a new DataStore instance.
@@ -84,9 +118,36 @@ class DataStore(object):
         # "status_message" is a string that provides the user information about the DataStore's current status.
         self.status_message = "No connection - connection has not been attempted."
 
+        # "metadata" is the SqlAlchemy MetaData that holds the Table objects that have been reflected from the
+        # database. Tables are reflected on demand (see return_sql_alchemy_table_object).
         self.metadata = sqlalchemy.MetaData()
         self.session = None
 
+        # "table_names_cache" is the list of table names in the database, or None if not yet read.
+        self.table_names_cache = None
+
+        # "attached_databases" is a dictionary of the databases to attach to each SQLite connection.
+        # Key: the schema name (alias) used in SQL, Value: the full path to the database file
+        self.attached_databases = {}
+
+        # "columns_cache" is a dictionary of the column information for tables that have been used.
+        # Key: the table name, Value: the list of column dictionaries returned by the SqlAlchemy inspector
+        self.columns_cache = {}
+
+    def attach_database(self, schema_name, database_file):
+        """
+        Attach a database file to a SQLite or GeoPackage DataStore. The tables in the attached database can then be
+        used in SQL with the syntax schema_name.table_name. Databases must be attached before the connection is opened.
+
+        Args:
+            schema_name (str): the schema name (alias) used to reference the attached database in SQL
+            database_file (str): the full path to the database file to attach
+
+        Return: None
+        """
+
+        self.attached_databases[schema_name] = database_file
+
     def close_db_connection(self):
         """
         Closes the DataStore's connection to the database.
@@ -103,6 +164,103 @@ class DataStore(object):
         # Update the is_connected Boolean value to reflect that the connection is closed.
         self.is_connected = False
 
+    def __configure_sqlite_connection(self, dbapi_connection, connection_record):
+        """
+        Configure a new SQLite DBAPI connection. This is called by SqlAlchemy each time that the connection pool
+        creates a new connection. WAL mode is enabled for file databases, the bulk load pragmas are set, and the
+        DataStore's attached databases are attached.
+
+        Args:
+            dbapi_connection: the sqlite3 connection object
+            connection_record: the SqlAlchemy connection pool record (not used)
+
+        Return: None
+        """
+
+        cursor = dbapi_connection.cursor()
+        try:
+            # WAL mode is persistent for a database file and is not available for in-memory databases.
+            if self.db_uri.database:
+                cursor.execute("PRAGMA journal_mode = WAL")
+            for pragma in DataStore.__sqlite_pragmas:
+                cursor.execute(pragma)
+            for schema_name, database_file in self.attached_databases.items():
+                cursor.execute('ATTACH DATABASE ? AS "{}"'.format(schema_name.replace('"', '""')), (database_file,))
+        finally:
+            cursor.close()
+
+    def __copy_df_postgres(self, df, table_name, batch_size, schema_name=None):
+        """
+        Load the rows of a pandas data frame into a PostgreSQL table using COPY FROM STDIN. This is much faster than
+        INSERT statements because the rows are streamed to the server in CSV format and are not parsed as SQL.
+        The COPY is run within the transaction that is active on the DataStore's connection.
+
+        Args:
+            df (pandas Data Frame): the rows to load. The data frame column names must match the table column names.
+            table_name (str): the name of the existing database table to receive the rows
+            batch_size (int): the number of rows to send to the server with each COPY statement
+            schema_name (str): the schema of the table, or None to use the search path
+
+        Return: None
+        """
+
+        # Format the COPY statement. NULL values are written with the \N marker so that empty strings are retained.
+        preparer = self.engine.dialect.identifier_preparer
+        table_q = preparer.quote(table_name)
+        if schema_name is not None:
+            table_q = "{}.{}".format(preparer.quote_schema(schema_name), table_q)
+        copy_sql = "COPY {} ({}) FROM STDIN WITH (FORMAT csv, NULL '\\N')".format(
+            table_q, ", ".join([preparer.quote(col) for col in df.columns]))
+
+        # Use the DBAPI (psycopg2) cursor of the SqlAlchemy connection so that the COPY joins the active transaction.
+        cursor = self.connection.connection.cursor()
+        try:
+            for i_start in range(0, len(df.index), batch_size):
+                buffer = io.StringIO()
+                df.iloc[i_start:i_start + batch_size].to_csv(buffer, index=False, header=False, na_rep="\\N",
+                                                             quoting=csv.QUOTE_MINIMAL)
+                buffer.seek(0)
+                cursor.copy_expert(copy_sql, buffer)
+        finally:
+            cursor.close()
+
+    def __get_columns(self, table):
+        """
+        Get the column information for a database table. The information is read from the database the first time
+        that the table is requested and is then cached until invalidate_schema_cache() is called.
+
+        Args:
+            table (str): An existing table name within the database.
+
+        Return: A list of the column dictionaries (name, type, nullable, default) returned by the SqlAlchemy inspector.
+        """
+
+        columns = self.columns_cache.get(table)
+        if columns is None:
+            columns = self.inspector.get_columns(table)
+            self.columns_cache[table] = columns
+        return columns
+
+    def __get_geopackage_table_type(self, table_name):
+        """
+        Get the GeoPackage data type of a table in a GeoPackage DataStore, from the gpkg_contents table.
+
+        Args:
+            table_name (str): the name of the table
+
+        Return: The data type ("features", "attributes", "tiles", etc.), or None if the table is not registered in
+            gpkg_contents or the database does not have a gpkg_contents table.
+        """
+
+        if "gpkg_contents" not in self.return_table_names():
+            return None
+        row = self.connection.execute(
+            sqlalchemy.text("SELECT data_type FROM gpkg_contents WHERE lower(table_name) = lower(:table_name)"),
+            table_name=table_name).fetchone()
+        if row is None:
+            return None
+        return row[0]
+
     def get_db_uri_postgres(self, host, dbname, user, password, port="5432"):
         """
         Create the database URI for the PostgreSql dialect. Assign the URI to the DataStore's db_uri attribute.
@@ -131,6 +289,111 @@ class DataStore(object):
         # Assign the database dialect to the DataStore's dialect attribute.
         self.dialect = "POSTGRES"
 
+    def get_db_uri_geopackage(self, database_file):
+        """
+        Create the database URI for a GeoPackage database. A GeoPackage is a SQLite database so the GeoPackage's
+        attribute tables can be read and written like any other database table. Feature tables can only be read, and
+        their geometry columns are read as GeoPackage geometry binary values (see write_df_to_table()).
+        Assign the URI to the DataStore's db_uri attribute.
+
+        Args:
+            database_file (str): The full path to the GeoPackage (.gpkg) file.
+
+        Return: None
+        """
+
+        # Create the database URI and assign it to the DataStore's db_uri attribute.
+        self.get_db_uri_sqlite(database_file)
+
+        # Assign the database dialect to the DataStore's dialect attribute.
+        self.dialect = "GEOPACKAGE"
+
+    def get_db_uri_sqlite(self, database_file):
+        """
+        Create the database URI for the SQLite dialect. Assign the URI to the DataStore's db_uri attribute.
+
+        Args:
+            database_file (str): The full path to the SQLite database file, or ":memory:" for an in-memory database.
+                The file is created when the connection is opened if it does not exist.
+
+        Return: None
+        """
+
+        # An in-memory database is specified with an empty database in the URI.
+        if database_file == ":memory:":
+            database_file = None
+
+        # Set the argument variables to create the database URI.
+        sqlite_db = {'drivername': "sqlite",
+                     'database': database_file}
+
+        # Create the database URI and assign it to the DataStore's db_uri attribute.
+        self.db_uri = URL(**sqlite_db)
+
+        # Assign the database dialect to the DataStore's dialect attribute.
+        self.dialect = "SQLITE"
+
+    def __insert_df(self, df, table_name, batch_size, schema_name=None):
+        """
+        Insert the rows of a pandas data frame into a database table. The PostgreSQL COPY command is used if
+        available. Otherwise, the rows are inserted in chunks of batch_size rows using a single executemany() call per
+        chunk. The rows are inserted within the transaction that is active on the DataStore's connection.
+
+        Args:
+            df (pandas Data Frame): the rows to insert. The data frame column names must match the table column names.
+            table_name (str): the name of the existing database table to receive the rows
+            batch_size (int): the number of rows to insert with each executemany() call
+            schema_name (str): the schema of the table, or None to use the default schema
+
+        Return: None
+        """
+
+        # Use the COPY fast path for PostgreSQL databases accessed with psycopg2.
+        if self.engine.dialect.name == "postgresql" and self.engine.dialect.driver == "psycopg2":
+            self.__copy_df_postgres(df, table_name, batch_size, schema_name)
+            return
+
+        # A lightweight table construct that does not require reflecting the table from the database.
+        cols = list(df.columns)
+        table_obj = sqlalchemy.sql.table(table_name, *[sqlalchemy.sql.column(col) for col in cols],
+                                         schema=schema_name)
+        insert_statement = table_obj.insert()
+
+        # Convert the data frame values to Python objects and replace missing values with None (NULL).
+        values = df.astype(object).where(df.notnull(), None).values.tolist()
+
+        # Insert the rows in chunks. Each chunk is sent to the database with one executemany() call.
+        for i_start in range(0, len(values), batch_size):
+            self.connection.execute(insert_statement,
+                                    [dict(zip(cols, row)) for row in values[i_start:i_start + batch_size]])
+
+    def invalidate_schema_cache(self, table_name=None):
+        """
+        Clear the cached schema information so that it is read again from the database when next needed. This must be
+        called after any change to the database schema, such as creating, altering or dropping tables.
+
+        Args:
+            table_name (str): the name of the table for which to clear the cached schema information.
+                If None, the cached schema information for all tables is cleared.
+
+        Return: None
+        """
+
+        # The table names may have changed whether or not a single table was specified.
+        self.table_names_cache = None
+
+        if table_name is None:
+            self.columns_cache.clear()
+            self.metadata.clear()
+        else:
+            self.columns_cache.pop(table_name, None)
+            if table_name in self.metadata.tables:
+                self.metadata.remove(self.metadata.tables[table_name])
+
+        # The SqlAlchemy inspector also caches schema information so create a new inspector.
+        if self.engine is not None:
+            self.inspector = sqlalchemy.inspect(self.engine)
+
     def open_db_connection(self):
         """
         Open a database connection.
@@ -138,13 +401,28 @@ class DataStore(object):
         Return: None.
         """
 
-        # Create the SqlAlchemy engine and assign it to the DataStore's engine attribute.
-        self.engine = sqlalchemy.create_engine(self.db_uri)
+        # Get the SqlAlchemy engine for the database URI and assign it to the DataStore's engine attribute.
+        # Engines are shared by DataStores that use the same URI (and attached databases) so that their connection
+        # pool is reused. Pooled connections are checked before use in case the database server has closed them.
+        # An in-memory SQLite database (no database in the URI) belongs to its engine, so each DataStore that uses an
+        # in-memory database creates its own engine, which is not shared.
+        in_memory = self.db_uri.drivername == "sqlite" and not self.db_uri.database
+        engine_key = (self.db_uri, tuple(sorted(self.attached_databases.items())))
+        self.engine = None
+        if not in_memory:
+            self.engine = DataStore.__engines.get(engine_key)
+        if self.engine is None:
+            self.engine = sqlalchemy.create_engine(self.db_uri, pool_pre_ping=True)
+            if self.engine.dialect.name == "sqlite":
+                event.listen(self.engine, "connect", self.__configure_sqlite_connection)
+            if not in_memory:
+                DataStore.__engines[engine_key] = self.engine
 
         # Create the SqlAlchemy connection and assign it to the DataStore's connection attribute.
         self.connection = self.engine.connect()
 
-        self.metadata.reflect(bind=self.engine)
+        # Table schemas are reflected when the tables are used, not when the connection is opened.
+        self.invalidate_schema_cache()
 
         from sqlalchemy.orm import sessionmaker
         Session = sessionmaker(bind=self.engine)
@@ -156,8 +434,18 @@ class DataStore(object):
         # Update the is_connected Boolean value to reflect that the connection is open.
         self.is_connected = True
 
-        # Create the SqlAlchemy inspect object and assign it to the DataStore's inspector attribute.
-        self.inspector = sqlalchemy.inspect(self.engine)
+    def return_pk_col_names(self, table):
+        """
+        Get a list of the primary key column names of a given database table.
+
+        Args:
+            table (str): An existing table name within the database.
+
+        Return: A list of the primary key column names of the table. The list is empty if there is no primary key.
+        """
+
+        # Return a list of the primary key column names.
+        return self.inspector.get_pk_constraint(table).get("constrained_columns", [])
 
     def return_sql_alchemy_column_object(self, col_name, table_name):
 
@@ -173,7 +461,18 @@ class DataStore(object):
                 return col_dic["expr"]
 
     def return_sql_alchemy_table_object(self, table_name):
+        """
+        Get the SqlAlchemy Table object for a database table. The table is reflected from the database the first time
+        that it is requested. Only the requested table (and tables that it references) are reflected.
+
+        Args:
+            table_name (str): An existing table name within the database.
 
+        Return: The SqlAlchemy Table object.
+        """
+
+        if table_name not in self.metadata.tables:
+            sqlalchemy.Table(table_name, self.metadata, autoload=True, autoload_with=self.engine)
         return self.metadata.tables[table_name]
 
     def return_table_names(self):
@@ -183,8 +482,10 @@ class DataStore(object):
         Return: A list of the database's table names.
         """
 
-        # Return a list of the database's table names.
-        return self.inspector.get_table_names()
+        # Return a list of the database's table names. The names are read from the database only when needed.
+        if self.table_names_cache is None:
+            self.table_names_cache = self.inspector.get_table_names()
+        return self.table_names_cache
 
     def return_col_names(self, table):
         """
@@ -197,7 +498,7 @@ class DataStore(object):
         """
 
         # Return a list of the column names in the table.
-        return [col["name"] for col in self.inspector.get_columns(table)]
+        return [col["name"] for col in self.__get_columns(table)]
 
     def return_col_types(self, table):
         """
@@ -210,7 +511,7 @@ class DataStore(object):
         """
 
         # Return a list of the column data types in the table.
-        return [col["type"] for col in self.inspector.get_columns(table)]
+        return [col["type"] for col in self.__get_columns(table)]
 
     def return_int_col_names(self, table):
         """
@@ -223,7 +524,8 @@ class DataStore(object):
         """
 
         import sqlalchemy.sql.sqltypes
-        return [col["name"] for col in self.inspector.get_columns(table) if type(col["type"]) == sqlalchemy.sql.sqltypes.INTEGER]
+        return [col["name"] for col in self.__get_columns(table)
+                if type(col["type"]) == sqlalchemy.sql.sqltypes.INTEGER]
 
     def run_sql(self, sql):
         """
@@ -244,6 +546,10 @@ class DataStore(object):
         # Commit the changes made to the database.
         trans.commit()
 
+        # If the SQL statement may have changed the database schema, clear the cached schema information.
+        if DataStore.__ddl_pattern.search(sql):
+            self.invalidate_schema_cache()
+
     def update_status_message(self, message):
         """
         Updates the status message. The existing status message will be overwritten.
@@ -257,4 +563,142 @@ class DataStore(object):
         # Update the status message to inform users of a specific message.
         self.status_message = message
 
+    def write_df_to_table(self, df, table_name, write_mode, key_cols=None, batch_size=10000):
+        """
+        Write a pandas data frame to a database table. All changes are made in a single transaction, which is rolled
+        back if an error occurs. Rows are loaded in bulk (see __insert_df). The update modes load the rows into a
+        temporary staging table and then update the target table with one set-based SQL statement. The SQL that is
+        used is supported by PostgreSQL (9.5 and later) and SQLite (3.24 and later).
+
+        Args:
+            df (pandas Data Frame): the rows to write. The data frame column names must match the table column names.
+            table_name (str): the name of the database table to receive the rows
+            write_mode (str): the method used to write data (case-insensitive):
+                NewTableInsert: create the table and insert all rows
+                ExistingTableOverwrite: drop and recreate the table and insert all rows
+                ExistingTableInsert: insert all rows into the existing table
+                ExistingTableUpdate: update the existing rows that match the key columns, do not insert new rows
+                ExistingTableInsertUpdate: update the existing rows that match the key columns and insert new rows
+            key_cols (list of str): the columns that identify a row, used with the update modes. If None, the
+                primary key columns of the table are used.
+            batch_size (int): the number of rows to load with each bulk statement
+
+        Raises:
+            ValueError if key columns are required but are not available, or if the table is a GeoPackage feature
+                table.
 
+        Return: None
+        """
+
+        logger = logging.getLogger(__name__)
+        write_mode = write_mode.upper()
+
+        # GeoPackage feature tables cannot be written because their spatial index triggers use GeoPackage SQL functions
+        # that are not available, and their geometry columns and gpkg_contents extent must be maintained.
+        if self.dialect == "GEOPACKAGE" and write_mode != "NEWTABLEINSERT":
+            if self.__get_geopackage_table_type(table_name) not in [None, "attributes"]:
+                message = "Table ({}) is a GeoPackage feature table. Only attribute tables can be written.".format(
+                    table_name)
+                logger.error(message)
+                raise ValueError(message)
+
+        # Determine the key columns for the update modes.
+        if write_mode in ["EXISTINGTABLEUPDATE", "EXISTINGTABLEINSERTUPDATE"]:
+            if not key_cols:
+                key_cols = self.return_pk_col_names(table_name)
+            if not key_cols:
+                message = "Key columns must be specified for table ({}) because it has no primary key.".format(
+                    table_name)
+                logger.error(message)
+                raise ValueError(message)
+
+        preparer = self.engine.dialect.identifier_preparer
+        table_q = preparer.quote(table_name)
+        cols = list(df.columns)
+
+        # Start a single transaction for all of the changes.
+        trans = self.connection.begin()
+        try:
+
+            if write_mode in ["NEWTABLEINSERT", "EXISTINGTABLEOVERWRITE"]:
+
+                # Create (or replace) the table using the data frame column types, then load the rows in bulk.
+                if_exists = "fail"
+                if write_mode == "EXISTINGTABLEOVERWRITE":
+                    if_exists = "replace"
+                df.head(0).to_sql(name=table_name, con=self.connection, if_exists=if_exists, index=False)
+                self.__insert_df(df, table_name, batch_size)
+
+                # Register a new GeoPackage table as an attribute table, so that GeoPackage software recognizes it.
+                if self.dialect == "GEOPACKAGE" and self.__get_geopackage_table_type(table_name) is None and \
+                        "gpkg_contents" in self.return_table_names():
+                    self.connection.execute(
+                        sqlalchemy.text("INSERT INTO gpkg_contents (table_name, data_type, identifier) "
+                                        "VALUES (:table_name, 'attributes', :table_name)"),
+                        table_name=table_name)
+
+            elif write_mode == "EXISTINGTABLEINSERT":
+
+                # Append the rows in bulk.
+                self.__insert_df(df, table_name, batch_size)
+
+            else:
+
+                # Load the rows into an empty temporary staging table that has the same column types as the target.
+                # The staging table has a unique name and is created in the session's temporary schema ("pg_temp" for
+                # PostgreSQL, "temp" for SQLite and GeoPackage), so that it cannot collide with or replace a user
+                # table. It is only visible to this connection and is removed by a rollback.
+                if self.engine.dialect.name == "postgresql":
+                    stage_schema = "pg_temp"
+                else:
+                    stage_schema = "temp"
+                stage_name = "gp_stage_{}".format(uuid.uuid4().hex)
+                stage_q = "{}.{}".format(preparer.quote_schema(stage_schema), preparer.quote(stage_name))
+                cols_q = ", ".join([preparer.quote(col) for col in cols])
+                self.connection.execute("CREATE TEMPORARY TABLE {} AS SELECT {} FROM {} WHERE 1 = 0".format(
+                    stage_q, cols_q, table_q))
+                self.__insert_df(df, stage_name, batch_size, stage_schema)
+
+                # The columns that are updated are all of the columns that are not key columns.
+                update_cols = [col for col in cols if col not in key_cols]
+
+                if write_mode == "EXISTINGTABLEUPDATE":
+
+                    # Update the matching rows using correlated subqueries, which are portable across databases.
+                    if update_cols:
+                        match_sql = " AND ".join(["{0}.{1} = {2}.{1}".format(stage_q, preparer.quote(col), table_q)
+                                                  for col in key_cols])
+                        set_sql = ", ".join(["{0} = (SELECT {1}.{0} FROM {1} WHERE {2})".format(
+                            preparer.quote(col), stage_q, match_sql) for col in update_cols])
+                        self.connection.execute("UPDATE {} SET {} WHERE EXISTS (SELECT 1 FROM {} WHERE {})".format(
+                            table_q, set_sql, stage_q, match_sql))
+
+                else:
+
+                    # Insert new rows and update the matching rows. This requires a unique index on the key columns.
+                    if update_cols:
+                        conflict_action = "DO UPDATE SET " + ", ".join(["{0} = excluded.{0}".format(
+                            preparer.quote(col)) for col in update_cols])
+                    else:
+                        conflict_action = "DO NOTHING"
+                    # "WHERE true" is required by SQLite to parse an upsert that uses INSERT ... SELECT.
+                    self.connection.execute(
+                        "INSERT INTO {0} ({1}) SELECT {1} FROM {2} WHERE true ON CONFLICT ({3}) {4}".format(
+                            table_q, cols_q, stage_q, ", ".join([preparer.quote(col) for col in key_cols]),
+                            conflict_action))
+
+                self.connection.execute("DROP TABLE {}".format(stage_q))
+
+            # Commit the changes made to the database.
+            trans.commit()
+
+        except Exception:
+            trans.rollback()
+            raise
+
+        finally:
+            # The table may have been created or replaced so clear its cached schema information.
+            if write_mode in ["NEWTABLEINSERT", "EXISTINGTABLEOVERWRITE"]:
+                self.invalidate_schema_cache(table_name)
+
+        logger.info("Wrote {} rows to table {} using write mode {}.".format(len(df.index), table_name, write_mode))
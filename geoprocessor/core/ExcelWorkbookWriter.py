@@ -0,0 +1,147 @@
+# ExcelWorkbookWriter - class to buffer worksheets and write them to an Excel workbook at once
+# ________________________________________________________________NoticeStart_
+# GeoProcessor
+# Copyright (C) 2017-2019 Open Water Foundation
+#
+# GeoProcessor is free software:  you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     GeoProcessor is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with GeoProcessor.  If not, see <https://www.gnu.org/licenses/>.
+# ________________________________________________________________NoticeEnd___
+
+import geoprocessor.util.io_util as io_util
+import geoprocessor.util.pandas_util as pandas_util
+
+from openpyxl import load_workbook, Workbook
+
+import logging
+import os
+
+
+class ExcelWorkbookWriter(object):
+    """
+    The ExcelWorkbookWriter class buffers the worksheets that are written to an Excel workbook file and writes them
+    all at once when the workbook is closed. Writing each worksheet separately requires loading and rewriting the whole
+    workbook for each worksheet, which is slow for workbooks that contain many worksheets.
+
+    The GeoProcessor maintains a dictionary of open ExcelWorkbookWriter instances, one for each output workbook path
+    (see GeoProcessor.get_excel_workbook_writer()). The WriteTableToExcel command adds worksheets to the writer and the
+    CloseExcelWorkbook command closes the writer. Writers that are still open at the end of a run are closed by the
+    GeoProcessor.
+
+    New workbooks are written with openpyxl in write-only mode, which streams rows to the file and does not keep the
+    cells in memory. Existing workbooks are loaded once so that the worksheets that are not replaced are retained.
+    """
+
+    def __init__(self, workbook_path):
+        """
+        Initialize the ExcelWorkbookWriter object.
+
+        Args:
+            workbook_path (str): the full pathname to the output Excel workbook file
+        """
+
+        # "workbook_path" is the full pathname to the output Excel workbook file.
+        self.workbook_path = workbook_path
+
+        # "sheets" is a dictionary of the buffered worksheets, in the order that they were added.
+        # Key: the worksheet name, Value: a tuple (data frame, include column list, include index).
+        # A worksheet that is added more than once is replaced but keeps its original position.
+        self.sheets = {}
+
+        # "commands" is the list of the commands that added the buffered worksheets, so that a failure to write the
+        # workbook can be reported on the commands that requested the worksheets.
+        self.commands = []
+
+        self.logger = logging.getLogger(__name__)
+
+    def add_sheet(self, df, worksheet_name, include_col_list, include_index, command=None):
+        """
+        Add a worksheet to the workbook. The worksheet is not written until close() is called. The selected columns of
+        the data frame are copied so that later changes to the Table do not change the worksheet.
+
+        Args:
+            df (object): the pandas data frame object to write
+            worksheet_name (str): the worksheet name to write to (either existing or non-existing)
+            include_col_list (list of strings): A list of Table columns to write to the worksheet
+            include_index (bool): If TRUE, write the index column. If FALSE, do not write the index column.
+            command (object): the command that added the worksheet, or None
+
+        Return: None
+        """
+
+        self.sheets[worksheet_name] = (df[include_col_list].copy(), include_col_list, include_index)
+        if command is not None and command not in self.commands:
+            self.commands.append(command)
+
+    def close(self):
+        """
+        Write the buffered worksheets to the workbook file and clear the buffer.
+
+        Return: None
+        """
+
+        if not self.sheets:
+            return
+
+        # Old format workbooks are written with pandas, one worksheet at a time.
+        if io_util.get_extension(self.workbook_path).upper() == ".XLS":
+            for worksheet_name, (df, include_col_list, include_index) in self.sheets.items():
+                pandas_util.write_df_to_excel(df, self.workbook_path, worksheet_name, include_col_list, include_index)
+
+        # If the workbook exists, load it once, replace the buffered worksheets and save once.
+        elif os.path.exists(self.workbook_path):
+            workbook = load_workbook(self.workbook_path)
+            for worksheet_name, sheet in self.sheets.items():
+                if worksheet_name in workbook.sheetnames:
+                    index = workbook.sheetnames.index(worksheet_name)
+                    workbook.remove(workbook[worksheet_name])
+                    worksheet = workbook.create_sheet(worksheet_name, index)
+                else:
+                    worksheet = workbook.create_sheet(worksheet_name)
+                self.__append_rows(worksheet, *sheet)
+            workbook.save(self.workbook_path)
+
+        # Otherwise, stream the worksheets to a new workbook.
+        else:
+            workbook = Workbook(write_only=True)
+            for worksheet_name, sheet in self.sheets.items():
+                self.__append_rows(workbook.create_sheet(worksheet_name), *sheet)
+            workbook.save(self.workbook_path)
+
+        self.logger.info("Wrote {} worksheet(s) to Excel workbook {}".format(len(self.sheets), self.workbook_path))
+        self.sheets = {}
+        self.commands = []
+
+    @staticmethod
+    def __append_rows(worksheet, df, include_col_list, include_index):
+        """
+        Append the header row and data rows of a data frame to a worksheet, using the same layout as
+        pandas.DataFrame.to_excel (the header row is the column names, null values are written as empty cells).
+
+        Args:
+            worksheet (object): the openpyxl worksheet to append to
+            df (object): the pandas data frame object to write
+            include_col_list (list of strings): A list of Table columns to write to the worksheet
+            include_index (bool): If TRUE, write the index column. If FALSE, do not write the index column.
+
+        Return: None
+        """
+
+        header = [str(col) for col in include_col_list]
+        if include_index:
+            header.insert(0, df.index.name)
+        worksheet.append(header)
+
+        # Convert the values to Python objects and nulls to None, which openpyxl writes as empty cells.
+        df = df.astype(object).where(df.notnull(), None)
+        for row in df.itertuples(index=include_index, name=None):
+            worksheet.append(row)
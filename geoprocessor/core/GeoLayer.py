@@ -76,8 +76,12 @@ class GeoLayer(object):
         self.source_path = geolayer_source_path
 
         # "qgs_id" (str) is the GeoLayer's id in the QGS environment (this is automatically assigned by the QGIS
-        # GeoProcessor when a GeoLayer is originally created)
-        self.qgs_id = geolayer_qgs_vector_layer.id()
+        # GeoProcessor when a GeoLayer is originally created). It is None if the QgsVectorLayer has not been opened
+        # (see LazyGeoLayer).
+        if geolayer_qgs_vector_layer is not None:
+            self.qgs_id = geolayer_qgs_vector_layer.id()
+        else:
+            self.qgs_id = None
 
         # "properties" (dict) is a dictionary of user (non-built-in) properties that are assigned to the layer.
         # These properties facilitate processing and may or may not be output to to a persistent format,
@@ -106,19 +110,23 @@ class GeoLayer(object):
         # Run processing in the qgis utility function.
         qgis_util.add_qgsvectorlayer_attribute(self.qgs_vector_layer, attribute_name, attribute_type)
 
-    def deepcopy(self, copied_geolayer_id):
+    def deepcopy(self, copied_geolayer_id, attribute_names=None, filter_expression=None):
         """
         Create a copy of the GeoLayer.
 
         Args:
             copied_geolayer_id(str): The ID of the output copied GeoLayer.
+            attribute_names (list): the names of the attributes to copy. Default: all attributes are copied.
+            filter_expression (QgsExpression): an expression that features must match to be copied.
+                Default: all features are copied.
 
         Returns:
             The copied GeoLayer object.
         """
 
-        # Create a deep copy of the qgs vecotor layer.
-        duplicate_qgs_vector_layer = qgis_util.deepcopy_qqsvectorlayer(self.qgs_vector_layer)
+        # Create a deep copy of the qgs vecotor layer. Features and attributes that are not copied are not read.
+        duplicate_qgs_vector_layer = qgis_util.copy_qgsvectorlayer(self.qgs_vector_layer, attribute_names,
+                                                                   filter_expression)
 
         # Update the layer's fields.
         self.qgs_vector_layer.updateFields()
@@ -147,6 +155,15 @@ class GeoLayer(object):
         # <EPSG format 'http://spatialreference.org/ref/epsg/'>_. Return the crs variable.
         return self.qgs_vector_layer.crs().authid()
 
+    def get_extent(self):
+        """
+        Returns the extent of the GeoLayer as a tuple (minimum x, minimum y, maximum x, maximum y), in the coordinate
+        reference system of the GeoLayer.
+        """
+
+        extent = self.qgs_vector_layer.extent()
+        return extent.xMinimum(), extent.yMinimum(), extent.xMaximum(), extent.yMaximum()
+
     def get_feature_count(self):
         """
         Returns the number of features (int) within a GeoLayer.
@@ -277,6 +294,20 @@ class GeoLayer(object):
         # Run processing in the qgis utility function.
         qgis_util.rename_qgsvectorlayer_attribute(self.qgs_vector_layer, attribute_name, new_attribute_name)
 
+    def rename_attributes(self, attribute_names):
+        """
+        Renames attributes, in one operation rather than one operation for each attribute.
+
+        Args:
+            attribute_names (dict): Key: the original attribute name, Value: the new attribute name.
+
+        Returns:
+            None
+        """
+
+        # Run processing in the qgis utility function.
+        qgis_util.rename_qgsvectorlayer_attributes(self.qgs_vector_layer, attribute_names)
+
     def set_property(self, property_name, property_value):
         """
         Set a GeoLayer property
@@ -287,58 +318,62 @@ class GeoLayer(object):
         """
         self.properties[property_name] = property_value
 
-    def split_by_attribute(self, attribute_name, output_qgsvectorlayers):
+    def split_by_attribute(self, attribute_name):
         """
-        Splits a GeoLayer by a selected attribute.
+        Splits a GeoLayer by a selected attribute, in one pass over the features.
 
         Args:
             attribute_name (str): the name of the attribute to split on.
-            output_qgsvectorlayers (str): the names of the output GeoLayers.
 
         Returns:
-            multiple GeoLayers.  The number of layers is based on the number of unique values of the selected attribute.
+            A list of (attribute value, QgsVectorLayer) tuples, one in-memory QgsVectorLayer for each unique value of
+            the selected attribute, in the order that the values are first found.
         """
 
         # Run processing in the qgis utility function.
-        qgis_util.split_qgsvectorlayer_by_attribute(self.qgs_vector_layer, attribute_name, output_qgsvectorlayers)
+        return qgis_util.split_qgsvectorlayer_by_attribute(self.qgs_vector_layer, attribute_name)
 
     def write_to_disk(self, output_file_absolute):
         """
         Write the GeoLayer to a file on disk. The in-memory GeoLayer will be replaced by the on-disk GeoLayer. This
         utility method is useful when running a command that requires the input of a source path rather than a
-        QGSVectorLayer object. For example, the "qgis:mergevectorlayers" requires source paths as inputs.
+        QGSVectorLayer object, for example to spool an in-memory GeoLayer to the TempDir folder.
+
+        The GeoLayer is written in GeoPackage format, with a spatial index, which is faster to write than a shapefile
+        and does not have the shapefile limits on file size and attribute name length. The features of the returned
+        GeoLayer are copied from the GeoPackage into memory without the GeoPackage feature ID column, so that the
+        returned GeoLayer has the same attributes as the current GeoLayer and its attributes can be changed by later
+        commands. Its source path is the GeoPackage file.
 
         Args:
-            output_file_absolute: the full file path for the on-disk GeoLayer
+            output_file_absolute: the full file path for the on-disk GeoLayer, without the .gpkg extension
 
         Returns:
             geolayer_on_disk: GeoLayer object of on-disk file. The id of the returned GeoLayer in the same as the
             current GeoLayer.
         """
 
-        # Remove the shapefile (with its component files) from the temporary directory if it already exists. This
-        # block of code was developed to see if it would fix the issue of tests failing when running under suite mode
-        # and passing when running as a single test.
-        if os.path.exists(output_file_absolute + '.shp'):
-
-            # Iterate over the possible extensions of a shapefile.
-            for extension in ['.shx', '.shp', '.qpj', '.prj', '.dbf', '.cpg', '.sbn', '.sbx', '.shp.xml']:
-
-                # Get the full pathname of the shapefile component file.
-                output_file_full_path = os.path.join(output_file_absolute + extension)
+        output_file_gpkg = output_file_absolute + ".gpkg"
 
-                # If the shapefile component file exists, add it' s absolute path to the files_to_archive list. Note that not
-                # all shapefile component files are required -- some may not exist.
-                if os.path.exists(output_file_full_path):
-                    os.remove(output_file_full_path)
+        # Remove the GeoPackage (with its journal files) from the temporary directory if it already exists, so that
+        # the GeoLayer is written to a new file.
+        for extension in ['', '-wal', '-shm', '-journal']:
+            if os.path.exists(output_file_gpkg + extension):
+                os.remove(output_file_gpkg + extension)
 
-        # Write the GeoLayer (generally an in-memory GeoLayer) to a GeoJSON on disk (with the input absolute path).
-        qgis_util.write_qgsvectorlayer_to_shapefile(self.qgs_vector_layer, output_file_absolute, self.get_crs())
+        # Write the GeoLayer (generally an in-memory GeoLayer) to a GeoPackage on disk (with the input absolute path).
+        layer_name = os.path.basename(output_file_absolute)
+        qgis_util.write_qgsvectorlayer_to_geopackage(self.qgs_vector_layer, output_file_gpkg, self.get_crs(),
+                                                     layer_name=layer_name)
 
-        # Read a QGSVectorLayer object from the on disk spatial data file (GeoJSON)
-        qgs_vector_layer = qgis_util.read_qgsvectorlayer_from_file(output_file_absolute + ".shp")
+        # Read a QGSVectorLayer object from the on disk GeoPackage. The GeoPackage feature ID column is not included, so
+        # that the on-disk GeoLayer has the same attributes as the current GeoLayer. A layer read without the feature
+        # ID column cannot have its attributes changed, so its features are copied to an in-memory layer.
+        spool_qgs_vector_layer = qgis_util.read_qgsvectorlayer_from_geopackage(output_file_gpkg, layer_name,
+                                                                               include_fid=False)
+        qgs_vector_layer = qgis_util.copy_qgsvectorlayer(spool_qgs_vector_layer, layer_name=layer_name)
 
-        # Create a new GeoLayer object with the same ID as the current object. The data however is not written to disk.
+        # Create a new GeoLayer object with the same ID as the current object.
         # Return the new on-disk GeoLayer object.
-        geolayer_on_disk = GeoLayer(self.id, qgs_vector_layer, output_file_absolute + ".shp")
+        geolayer_on_disk = GeoLayer(self.id, qgs_vector_layer, output_file_gpkg)
         return geolayer_on_disk
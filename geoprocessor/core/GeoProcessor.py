@@ -21,6 +21,8 @@ from geoprocessor.core.GeoProcessorCommandFactory import GeoProcessorCommandFact
 from geoprocessor.core.CommandLogRecord import CommandLogRecord
 from geoprocessor.core.CommandPhaseType import CommandPhaseType
 from geoprocessor.core.CommandStatusType import CommandStatusType
+from geoprocessor.core.ExcelWorkbookWriter import ExcelWorkbookWriter
+from geoprocessor.core.MemoryManager import MemoryManager
 
 import geoprocessor.util.qgis_util as qgis_util
 import geoprocessor.util.command_util as command_util
@@ -71,6 +73,14 @@ class GeoProcessor(object):
         # list that holds the absolute paths to the output files
         self.output_files = []
 
+        # dictionary that holds the open Excel workbook writers, which buffer worksheets until closed
+        # Key: the absolute path to the Excel workbook, Value: ExcelWorkbookWriter object
+        self.excel_workbook_writers = {}
+
+        # MemoryManager that keeps the memory used by Tables and GeoLayers within the budget set by the MaxMemory
+        # property (for example, from the gp --max-memory option), or None if there is no budget
+        self.memory_manager = None
+
         # holds the initialized qgis processor
         self.qgis_processor = qgis_util.initialize_qgis_processor()
 
@@ -218,6 +228,8 @@ class GeoProcessor(object):
 
         # Add the input GeoLayer to the geolayers list.
         self.geolayers.append(geolayer)
+        if self.memory_manager is not None:
+            self.memory_manager.add(geolayer)
 
     def add_model_listener(self, listener):
         """
@@ -277,6 +289,51 @@ class GeoProcessor(object):
 
         # Add the input Table to the tables list.
         self.tables.append(table)
+        if self.memory_manager is not None:
+            self.memory_manager.add(table)
+
+    def close_excel_workbook_writers(self, workbook_path=None):
+        """
+        Close open Excel workbook writers, writing the buffered worksheets to the workbook files.
+        If a workbook cannot be written, a failure is added to the run log of the commands that added its worksheets
+        (for example, WriteTableToExcel with KeepOpen), the other workbooks are still written, and the first error is
+        raised.
+
+        Args:
+            workbook_path (str): the absolute path to the Excel workbook to close, or None to close all open writers.
+
+        Returns:
+            None
+        """
+
+        logger = logging.getLogger(__name__)
+
+        if workbook_path is None:
+            workbook_paths = list(self.excel_workbook_writers.keys())
+        else:
+            workbook_paths = [workbook_path]
+
+        first_error = None
+        for path in workbook_paths:
+            # Remove the writer before closing so that a failed write is not retried at the end of the run.
+            writer = self.excel_workbook_writers.pop(path, None)
+            if writer is None:
+                continue
+            try:
+                writer.close()
+            except Exception as e:
+                logger.error("Error writing Excel workbook {}.".format(path), exc_info=True)
+                message = "Error writing the worksheets buffered by this command to Excel workbook {}.".format(path)
+                recommendation = "Check the log file for details."
+                for command in writer.commands:
+                    command.command_status.add_to_log(CommandPhaseType.RUN,
+                                                      CommandLogRecord(CommandStatusType.FAILURE, message,
+                                                                       recommendation))
+                if first_error is None:
+                    first_error = e
+
+        if first_error is not None:
+            raise first_error
 
     def convert_command_line_from_comment(self, selected_indices):
         """
@@ -519,6 +576,8 @@ class GeoProcessor(object):
             None
         """
         self.geolayers.remove(geolayer)
+        if self.memory_manager is not None:
+            self.memory_manager.remove(geolayer)
 
     def free_table(self, table):
         """
@@ -531,6 +590,8 @@ class GeoProcessor(object):
             None
         """
         self.tables.remove(table)
+        if self.memory_manager is not None:
+            self.memory_manager.remove(table)
 
     def get_command_list(self):
         """
@@ -577,6 +638,23 @@ class GeoProcessor(object):
         # Return the list of the available DataStore IDs.
         return datastore_id_list
 
+    def get_excel_workbook_writer(self, workbook_path):
+        """
+        Return the open Excel workbook writer for a workbook, creating it if it is not open.
+
+        Args:
+            workbook_path (str): the absolute path to the Excel workbook
+
+        Returns:
+            The ExcelWorkbookWriter object for the workbook.
+        """
+
+        writer = self.excel_workbook_writers.get(workbook_path)
+        if writer is None:
+            writer = ExcelWorkbookWriter(workbook_path)
+            self.excel_workbook_writers[workbook_path] = writer
+        return writer
+
     def get_geolayer(self, geolayer_id):
         """
         Return the GeoLayer that has the requested ID.
@@ -586,11 +664,16 @@ class GeoProcessor(object):
 
         Returns:
             The GeoLayer that has the requested ID, or None if not found.
+            If the GeoLayer was spilled to disk by the memory manager, it is reloaded.
+            If the GeoLayer is a LazyGeoLayer, its data source is opened when its features are first used, so checking
+            whether a GeoLayer exists, or getting its CRS or feature count, does not open the data source.
         """
         for geolayer in self.geolayers:
             if geolayer is not None:
                 if geolayer.id == geolayer_id:
                     # Found the requested identifier
+                    if self.memory_manager is not None:
+                        self.memory_manager.access(geolayer)
                     return geolayer
         # Did not find the requested identifier so return None
         return None
@@ -656,11 +739,14 @@ class GeoProcessor(object):
 
         Returns:
             The Table that has the requested ID, or None if not found.
+            If the Table was spilled to disk by the memory manager, it is reloaded.
         """
         for table in self.tables:
             if table is not None:
                 if table.id == table_id:
                     # Found the requested identifier
+                    if self.memory_manager is not None:
+                        self.memory_manager.access(table)
                     return table
         # Did not find the requested identifier so return None
         return None
@@ -1110,6 +1196,10 @@ class GeoProcessor(object):
         self.geolayers = []
         self.tables = []
         self.output_files = []
+        self.excel_workbook_writers = {}
+        if self.memory_manager is not None:
+            self.memory_manager.close()
+            self.memory_manager = None
 
         # Reset the global workflow properties if requested, used when RunCommands command calls recursively...
         # - This code is a port of Java TSCommandProcessor.runCommands().
@@ -1133,6 +1223,16 @@ class GeoProcessor(object):
         self.env_properties = env_properties
         # ...end reset of global workflow properties
 
+        # Create the memory manager if a memory budget is set, for example with the gp --max-memory option.
+        max_memory = self.get_property("MaxMemory")
+        if max_memory is not None and str(max_memory) != "":
+            try:
+                self.memory_manager = MemoryManager(MemoryManager.parse_size(str(max_memory)),
+                                                    self.get_property("TempDir"))
+                logger.info("Memory budget for Tables and GeoLayers is " + str(max_memory) + ".")
+            except ValueError as e:
+                logger.warning("MaxMemory property is invalid ({}). Tables and GeoLayers are kept in memory.".format(e))
+
         # The remainder of this code is a port of the Java TSEngine.processCommands() function.
 
         # Indicate whether results should be cleared between runs.
@@ -1370,6 +1470,13 @@ class GeoProcessor(object):
                             message = "Error running command in GeoProcessor.py"
                             warning_count += 1
                             logger.error(message, exc_info=True)
+                        # Spill Tables and GeoLayers to disk if the memory budget is exceeded.
+                        # This is done between commands so that objects used by a command are not spilled.
+                        if self.memory_manager is not None:
+                            try:
+                                self.memory_manager.enforce(self.geolayers + self.tables)
+                            except Exception:
+                                logger.warning("Error enforcing the memory budget.", exc_info=True)
                         # If the command generated an output file, add it to the list of output files.
                         # The list is used by the UI to display results.
                         # TODO smalers 2017-12-21 - add the file list generator like TSEngine
@@ -1443,6 +1550,14 @@ class GeoProcessor(object):
                     #   does result in a new exception, but keep the code for now.
                     logger.warning("Exception logging threw an exception.")
 
+        # Write the worksheets of Excel workbooks that were not closed with CloseExcelWorkbook.
+        # A failure is recorded on the commands that added the worksheets, and is counted as an error of the run.
+        try:
+            self.close_excel_workbook_writers()
+        except Exception:
+            warning_count += 1
+            logger.error("Error writing open Excel workbooks at end of run.", exc_info=True)
+
         # The following checks to see if any warnings were caught in the above code.
         # If there were any warnings raise and exception.
         if warning_count > 0:
@@ -1450,6 +1565,9 @@ class GeoProcessor(object):
             logger.error(message)
             # raise RuntimeError(message)
 
+        if self.memory_manager is not None:
+            self.memory_manager.log_statistics()
+
         self.notify_command_list_processor_listener_of_all_commands_completed()
 
         # TODO smalers 2018-01-01 Java code has multiple checks at the end for checking error counts
@@ -32,6 +32,7 @@ from geoprocessor.commands.layers.IntersectGeoLayer import IntersectGeoLayer
 from geoprocessor.commands.layers.MergeGeoLayers import MergeGeoLayers
 from geoprocessor.commands.layers.ReadGeoLayerFromDelimitedFile import ReadGeoLayerFromDelimitedFile
 from geoprocessor.commands.layers.ReadGeoLayerFromGeoJSON import ReadGeoLayerFromGeoJSON
+from geoprocessor.commands.layers.ReadGeoLayerFromGeoPackage import ReadGeoLayerFromGeoPackage
 from geoprocessor.commands.layers.ReadGeoLayerFromShapefile import ReadGeoLayerFromShapefile
 from geoprocessor.commands.layers.ReadGeoLayersFromFGDB import ReadGeoLayersFromFGDB
 from geoprocessor.commands.layers.ReadGeoLayersFromFolder import ReadGeoLayersFromFolder
@@ -44,6 +45,7 @@ from geoprocessor.commands.layers.SplitGeoLayerByAttribute import SplitGeoLayerB
 from geoprocessor.commands.layers.WriteGeoLayerPropertiesToFile import WriteGeoLayerPropertiesToFile
 from geoprocessor.commands.layers.WriteGeoLayerToDelimitedFile import WriteGeoLayerToDelimitedFile
 from geoprocessor.commands.layers.WriteGeoLayerToGeoJSON import WriteGeoLayerToGeoJSON
+from geoprocessor.commands.layers.WriteGeoLayerToGeoPackage import WriteGeoLayerToGeoPackage
 from geoprocessor.commands.layers.WriteGeoLayerToKML import WriteGeoLayerToKML
 from geoprocessor.commands.layers.WriteGeoLayerToShapefile import WriteGeoLayerToShapefile
 from geoprocessor.commands.logging.Message import Message
@@ -55,14 +57,23 @@ from geoprocessor.commands.running.If import If
 from geoprocessor.commands.running.RunCommands import RunCommands
 from geoprocessor.commands.running.RunProgram import RunProgram
 from geoprocessor.commands.running.SetProperty import SetProperty
+from geoprocessor.commands.running.SetPropertiesFromTableRow import SetPropertiesFromTableRow
 from geoprocessor.commands.running.SetPropertyFromGeoLayer import SetPropertyFromGeoLayer
 from geoprocessor.commands.running.WritePropertiesToFile import WritePropertiesToFile
+from geoprocessor.commands.tables.AggregateTable import AggregateTable
+from geoprocessor.commands.tables.CloseExcelWorkbook import CloseExcelWorkbook
+from geoprocessor.commands.tables.FilterTable import FilterTable
+from geoprocessor.commands.tables.JoinTables import JoinTables
 from geoprocessor.commands.tables.ReadTableFromDataStore import ReadTableFromDataStore
 from geoprocessor.commands.tables.ReadTableFromDelimitedFile import ReadTableFromDelimitedFile
 from geoprocessor.commands.tables.ReadTableFromExcel import ReadTableFromExcel
+from geoprocessor.commands.tables.ReadTableFromFeather import ReadTableFromFeather
+from geoprocessor.commands.tables.ReadTableFromParquet import ReadTableFromParquet
 from geoprocessor.commands.tables.WriteTableToDelimitedFile import WriteTableToDelimitedFile
 from geoprocessor.commands.tables.WriteTableToDataStore import WriteTableToDataStore
 from geoprocessor.commands.tables.WriteTableToExcel import WriteTableToExcel
+from geoprocessor.commands.tables.WriteTableToFeather import WriteTableToFeather
+from geoprocessor.commands.tables.WriteTableToParquet import WriteTableToParquet
 from geoprocessor.commands.testing.CompareFiles import CompareFiles
 from geoprocessor.commands.testing.CreateRegressionTestCommandFile import CreateRegressionTestCommandFile
 from geoprocessor.commands.testing.StartRegressionTestResultsReport import StartRegressionTestResultsReport
@@ -98,9 +109,11 @@ class GeoProcessorCommandFactory(object):
     # 2) It provides the list of constructor functions to call, to simplify logic
     registered_commands = {
         "ADDGEOLAYERATTRIBUTE": AddGeoLayerAttribute(),
+        "AGGREGATETABLE": AggregateTable(),
         "BLANK": Blank(),  # Actually has no name, is whitespace only
         "CLIPGEOLAYER": ClipGeoLayer(),
         "CLOSEDATASTORE": CloseDataStore(),
+        "CLOSEEXCELWORKBOOK": CloseExcelWorkbook(),
         "COMMENT": Comment(),
         "COMMENTBLOCKEND": CommentBlockEnd(),
         "COMMENTBLOCKSTART": CommentBlockStart(),
@@ -114,22 +127,27 @@ class GeoProcessorCommandFactory(object):
         "ENDIF": EndIf(),
         "EXPECTEDSTATUSFAILURE": ExpectedStatusFailure(),
         "EXPECTEDSTATUSWARNING": ExpectedStatusWarning(),
+        "FILTERTABLE": FilterTable(),
         "FOR": For(),
         "FREEGEOLAYERS": FreeGeoLayers(),
         "IF": If(),
         "INTERSECTGEOLAYER": IntersectGeoLayer(),
+        "JOINTABLES": JoinTables(),
         "LISTFILES": ListFiles(),
         "MERGEGEOLAYERS": MergeGeoLayers(),
         "MESSAGE": Message(),
         "OPENDATASTORE": OpenDataStore(),
         "READGEOLAYERFROMDELIMITEDFILE": ReadGeoLayerFromDelimitedFile(),
         "READGEOLAYERFROMGEOJSON": ReadGeoLayerFromGeoJSON(),
+        "READGEOLAYERFROMGEOPACKAGE": ReadGeoLayerFromGeoPackage(),
         "READGEOLAYERFROMSHAPEFILE": ReadGeoLayerFromShapefile(),
         "READGEOLAYERSFROMFGDB": ReadGeoLayersFromFGDB(),
         "READGEOLAYERSFROMFOLDER": ReadGeoLayersFromFolder(),
         "READTABLEFROMDATASTORE": ReadTableFromDataStore(),
         "READTABLEFROMDELIMITEDFILE": ReadTableFromDelimitedFile(),
         "READTABLEFROMEXCEL": ReadTableFromExcel(),
+        "READTABLEFROMFEATHER": ReadTableFromFeather(),
+        "READTABLEFROMPARQUET": ReadTableFromParquet(),
         "REMOVEFILE": RemoveFile(),
         "REMOVEGEOLAYERATTRIBUTES": RemoveGeoLayerAttributes(),
         "RENAMEGEOLAYERATTRIBUTE": RenameGeoLayerAttribute(),
@@ -138,6 +156,7 @@ class GeoProcessorCommandFactory(object):
         "RUNSQL": RunSql(),
         "SETGEOLAYERCRS": SetGeoLayerCRS(),
         "SETGEOLAYERPROPERTY": SetGeoLayerProperty(),
+        "SETPROPERTIESFROMTABLEROW": SetPropertiesFromTableRow(),
         "SETPROPERTY": SetProperty(),
         "SETPROPERTYFROMGEOLAYER": SetPropertyFromGeoLayer(),
         "SIMPLIFYGEOLAYERGEOMETRY": SimplifyGeoLayerGeometry(),
@@ -150,11 +169,14 @@ class GeoProcessorCommandFactory(object):
         "WRITEGEOLAYERPROPERTIESTOFILE": WriteGeoLayerPropertiesToFile(),
         "WRITEGEOLAYERTODELIMITEDFILE": WriteGeoLayerToDelimitedFile(),
         "WRITEGEOLAYERTOGEOJSON": WriteGeoLayerToGeoJSON(),
+        "WRITEGEOLAYERTOGEOPACKAGE": WriteGeoLayerToGeoPackage(),
         "WRITEGEOLAYERTOKML": WriteGeoLayerToKML(),
         "WRITEGEOLAYERTOSHAPEFILE": WriteGeoLayerToShapefile(),
         "WRITETABLETODELIMITEDFILE": WriteTableToDelimitedFile(),
         "WRITETABLETODATASTORE": WriteTableToDataStore(),
         "WRITETABLETOEXCEL": WriteTableToExcel(),
+        "WRITETABLETOFEATHER": WriteTableToFeather(),
+        "WRITETABLETOPARQUET": WriteTableToParquet(),
         "WRITEPROPERTIESTOFILE": WritePropertiesToFile()
     }
 
@@ -243,6 +265,8 @@ class GeoProcessorCommandFactory(object):
                 # - Alphabetize the commands.
                 if command_name_upper == "ADDGEOLAYERATTRIBUTE":
                     return AddGeoLayerAttribute()
+                elif command_name_upper == "AGGREGATETABLE":
+                    return AggregateTable()
                 elif command_name_upper == "BLANK":
                     return Blank()
                 elif command_name_upper == "CLIPGEOLAYER":
@@ -251,6 +275,8 @@ class GeoProcessorCommandFactory(object):
                 # - might be able to treat similar to other commands but need to confirm out parsing is done
                 elif command_name_upper == "CLOSEDATASTORE":
                     return CloseDataStore()
+                elif command_name_upper == "CLOSEEXCELWORKBOOK":
+                    return CloseExcelWorkbook()
                 elif command_name_upper == "COMPAREFILES":
                     return CompareFiles()
                 elif command_name_upper == "COPYFILE":
@@ -265,6 +291,8 @@ class GeoProcessorCommandFactory(object):
                     return EndFor()
                 elif command_name_upper == "ENDIF":
                     return EndIf()
+                elif command_name_upper == "FILTERTABLE":
+                    return FilterTable()
                 elif command_name_upper == "FOR":
                     return For()
                 elif command_name_upper == "FREEGEOLAYERS":
@@ -273,6 +301,8 @@ class GeoProcessorCommandFactory(object):
                     return If()
                 elif command_name_upper == "INTERSECTGEOLAYER":
                     return IntersectGeoLayer()
+                elif command_name_upper == "JOINTABLES":
+                    return JoinTables()
                 elif command_name_upper == "LISTFILES":
                     return ListFiles()
                 elif command_name_upper == "MERGEGEOLAYERS":
@@ -285,6 +315,8 @@ class GeoProcessorCommandFactory(object):
                     return ReadGeoLayerFromDelimitedFile()
                 elif command_name_upper == "READGEOLAYERFROMGEOJSON":
                     return ReadGeoLayerFromGeoJSON()
+                elif command_name_upper == "READGEOLAYERFROMGEOPACKAGE":
+                    return ReadGeoLayerFromGeoPackage()
                 elif command_name_upper == "READGEOLAYERFROMSHAPEFILE":
                     return ReadGeoLayerFromShapefile()
                 elif command_name_upper == "READGEOLAYERSFROMFGDB":
@@ -297,6 +329,10 @@ class GeoProcessorCommandFactory(object):
                     return ReadTableFromDelimitedFile()
                 elif command_name_upper == "READTABLEFROMEXCEL":
                     return ReadTableFromExcel()
+                elif command_name_upper == "READTABLEFROMFEATHER":
+                    return ReadTableFromFeather()
+                elif command_name_upper == "READTABLEFROMPARQUET":
+                    return ReadTableFromParquet()
                 elif command_name_upper == "REMOVEFILE":
                     return RemoveFile()
                 elif command_name_upper == "REMOVEGEOLAYERATTRIBUTES":
@@ -313,6 +349,8 @@ class GeoProcessorCommandFactory(object):
                     return SetGeoLayerCRS()
                 elif command_name_upper == "SETGEOLAYERPROPERTY":
                     return SetGeoLayerProperty()
+                elif command_name_upper == "SETPROPERTIESFROMTABLEROW":
+                    return SetPropertiesFromTableRow()
                 elif command_name_upper == "SETPROPERTY":
                     return SetProperty()
                 elif command_name_upper == "SETPROPERTYFROMGEOLAYER":
@@ -337,6 +375,8 @@ class GeoProcessorCommandFactory(object):
                     return WriteGeoLayerToDelimitedFile()
                 elif command_name_upper == "WRITEGEOLAYERTOGEOJSON":
                     return WriteGeoLayerToGeoJSON()
+                elif command_name_upper == "WRITEGEOLAYERTOGEOPACKAGE":
+                    return WriteGeoLayerToGeoPackage()
                 elif command_name_upper == "WRITEGEOLAYERTOKML":
                     return WriteGeoLayerToKML()
                 elif command_name_upper == "WRITEGEOLAYERTOSHAPEFILE":
@@ -349,6 +389,10 @@ class GeoProcessorCommandFactory(object):
                     return WriteTableToDataStore()
                 elif command_name_upper == "WRITETABLETOEXCEL":
                     return WriteTableToExcel()
+                elif command_name_upper == "WRITETABLETOFEATHER":
+                    return WriteTableToFeather()
+                elif command_name_upper == "WRITETABLETOPARQUET":
+                    return WriteTableToParquet()
 
             # If here the command name was not matched.
             # Don't know the command so create an UnknownCommand or throw an exception.
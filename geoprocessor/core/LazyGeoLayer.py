@@ -0,0 +1,174 @@
+# LazyGeoLayer - class for a GeoLayer that opens its data source when first used
+# ________________________________________________________________NoticeStart_
+# GeoProcessor
+# Copyright (C) 2017-2019 Open Water Foundation
+#
+# GeoProcessor is free software:  you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     GeoProcessor is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with GeoProcessor.  If not, see <https://www.gnu.org/licenses/>.
+# ________________________________________________________________NoticeEnd___
+
+from geoprocessor.core.GeoLayer import GeoLayer
+
+import logging
+
+
+class LazyGeoLayer(GeoLayer):
+
+    """
+    The LazyGeoLayer class is a GeoLayer that does not open its data source until the features are needed.
+
+    Commands that read many spatial data files (for example, all the files in a folder or all the feature classes in a
+    file geodatabase) create LazyGeoLayer instances from metadata read from the file headers
+    (see gdal_util.read_ogr_layers_metadata()), so that a QgsVectorLayer is only created for the GeoLayers that are
+    used by later commands.
+
+    * The coordinate reference system, extent, feature count, attribute names and geometry type are returned from the
+        metadata without opening the data source, if the metadata has the value.
+    * The QgsVectorLayer is created the first time the qgs_vector_layer data member is used. Because all GeoLayer
+        functions and commands use the qgs_vector_layer data member, a LazyGeoLayer can be used anywhere a GeoLayer is
+        used, including the GeoLayers returned by GeoProcessor.get_geolayer().
+    """
+
+    def __init__(self, geolayer_id, open_function, open_arguments, geolayer_source_path, metadata=None,
+                 properties=None):
+        """
+        Initialize a new LazyGeoLayer instance.
+
+        Args:
+            geolayer_id (str):
+                String that is the GeoLayer's reference ID. This ID is used to access the GeoLayer from the
+                GeoProcessor for manipulation.
+            open_function (function):
+                The function that creates the QgsVectorLayer, for example qgis_util.read_qgsvectorlayer_from_file().
+            open_arguments (tuple):
+                The arguments passed to open_function.
+            geolayer_source_path (str):
+                The full pathname to the original spatial data file on the user's local computer.
+            metadata ({}):
+                A dictionary of the layer metadata read without opening the data source, as returned by
+                gdal_util.read_ogr_layers_metadata(). Values that are missing or None are read from the QgsVectorLayer.
+            properties ({}):
+                A dictionary of user (non-built-in) properties that can be assigned to the layer.
+                These properties facilitate processing.
+        """
+
+        # "open_function" and "open_arguments" create the QgsVectorLayer when it is first used.
+        self.open_function = open_function
+        self.open_arguments = tuple(open_arguments)
+
+        # "metadata" (dict) holds the layer metadata read without opening the data source.
+        if metadata is None:
+            self.metadata = {}
+        else:
+            self.metadata = metadata
+
+        super().__init__(geolayer_id, None, geolayer_source_path, properties)
+
+    @property
+    def qgs_vector_layer(self):
+        """
+        Returns the QgsVectorLayer object, creating it if the data source has not been opened.
+
+        Raises:
+            IOError if the data source cannot be opened.
+        """
+
+        if self.__qgs_vector_layer is None:
+            logger = logging.getLogger(__name__)
+            logger.info("Opening GeoLayer {} from {}.".format(self.id, self.source_path))
+            self.qgs_vector_layer = self.open_function(*self.open_arguments)
+        return self.__qgs_vector_layer
+
+    @qgs_vector_layer.setter
+    def qgs_vector_layer(self, qgs_vector_layer):
+        """
+        Sets the QgsVectorLayer object. If set to None, the data source is opened again when the layer is next used.
+        """
+
+        self.__qgs_vector_layer = qgs_vector_layer
+        if qgs_vector_layer is not None:
+            self.qgs_id = qgs_vector_layer.id()
+
+    @qgs_vector_layer.deleter
+    def qgs_vector_layer(self):
+        """
+        Deletes the QgsVectorLayer object (for example, when the GeoLayer is freed). The data member is reset to None
+        rather than removed, so that the data source is opened again if the layer is used again.
+        """
+
+        self.__qgs_vector_layer = None
+
+    def get_attribute_field_names(self):
+        """
+        Returns the a list of attribute field names (list of strings) within the GeoLayer.
+        """
+
+        if not self.is_open() and self.metadata.get("attribute_names") is not None:
+            return list(self.metadata["attribute_names"])
+        return super().get_attribute_field_names()
+
+    def get_crs(self):
+        """
+        Returns the coordinate reference system (str, EPSG code) of a GeoLayer.
+        """
+
+        if not self.is_open() and self.metadata.get("crs") is not None:
+            return self.metadata["crs"]
+        return super().get_crs()
+
+    def get_extent(self):
+        """
+        Returns the extent of the GeoLayer as a tuple (minimum x, minimum y, maximum x, maximum y), in the coordinate
+        reference system of the GeoLayer.
+        """
+
+        if not self.is_open() and self.metadata.get("extent") is not None:
+            # The OGR extent is (minimum x, maximum x, minimum y, maximum y).
+            xmin, xmax, ymin, ymax = self.metadata["extent"]
+            return xmin, ymin, xmax, ymax
+        return super().get_extent()
+
+    def get_feature_count(self):
+        """
+        Returns the number of features (int) within a GeoLayer.
+        """
+
+        if not self.is_open() and self.metadata.get("feature_count") is not None:
+            return self.metadata["feature_count"]
+        return super().get_feature_count()
+
+    def get_geometry(self, geom_format="qgis"):
+        """
+        Returns the GeoLayer's geometry in desired format. The QGIS format is returned from the metadata if the data
+        source has not been opened.
+
+        Args:
+            geom_format: the desired geometry format. QGIS format by default.
+
+        Returns:
+            The GeoLayer's geometry in desired format (returns text version, not enumerator version).
+
+        Raises:
+            Value Error if the geom_foramt is not a valid format.
+        """
+
+        if not self.is_open() and geom_format.upper() == "QGIS" and self.metadata.get("geometry") is not None:
+            return self.metadata["geometry"]
+        return super().get_geometry(geom_format)
+
+    def is_open(self):
+        """
+        Returns TRUE if the QgsVectorLayer has been created, FALSE if the data source has not been opened.
+        """
+
+        return self.__qgs_vector_layer is not None
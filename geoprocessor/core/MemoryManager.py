@@ -0,0 +1,444 @@
+# MemoryManager - class to keep the memory used by Tables and GeoLayers within a budget
+# ________________________________________________________________NoticeStart_
+# GeoProcessor
+# Copyright (C) 2017-2019 Open Water Foundation
+#
+# GeoProcessor is free software:  you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     GeoProcessor is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with GeoProcessor.  If not, see <https://www.gnu.org/licenses/>.
+# ________________________________________________________________NoticeEnd___
+
+from geoprocessor.core.GeoLayer import GeoLayer
+from geoprocessor.core.LazyGeoLayer import LazyGeoLayer
+
+import geoprocessor.util.arrow_util as arrow_util
+import geoprocessor.util.qgis_util as qgis_util
+
+from collections import OrderedDict
+
+import logging
+import os
+import re
+import shutil
+import tempfile
+import time
+
+
+class MemoryManager(object):
+    """
+    The MemoryManager class keeps the approximate memory used by the Tables and GeoLayers registered in the
+    GeoProcessor within a budget. When the budget is exceeded, the least recently used objects are spilled to files in
+    a spill folder and their data are released:
+
+    * Tables that use a pandas data frame are written to Arrow IPC (Feather) files and the data frame is released.
+    * GeoLayers are written to GeoPackage files and the QgsVectorLayer object is released.
+      Only GeoLayers that use the "memory" data provider are spilled, because other GeoLayers read their features from
+      the data source when needed.
+
+    Spilled objects stay in the GeoProcessor lists and are reloaded when the GeoProcessor get_table() or get_geolayer()
+    functions are called. Reloaded Tables are read from the Arrow file, and reloaded GeoLayers are copied from the
+    GeoPackage file to a new "memory" data provider layer (without the GeoPackage feature ID column), so that their
+    attributes can be changed. Reloaded objects are held in memory again and count against the budget, and the spill
+    file is removed. A summary of each spilled object (see get_spilled_summary()) is kept, so that lists of the objects
+    can be displayed without reloading them.
+
+    The budget is only enforced between commands (see enforce()), so that objects are never spilled while a command is
+    using them. Object sizes are estimated when objects are added and re-estimated after they are accessed, because
+    commands may change them.
+    """
+
+    # Multipliers for the units allowed in memory size strings, for example 512MB or 8GB.
+    __size_units = {"": 1, "B": 1, "K": 1024, "KB": 1024, "M": 1024 ** 2, "MB": 1024 ** 2,
+                    "G": 1024 ** 3, "GB": 1024 ** 3, "T": 1024 ** 4, "TB": 1024 ** 4}
+
+    def __init__(self, max_memory, spill_folder=None):
+        """
+        Initialize a new MemoryManager instance.
+
+        Args:
+            max_memory (int): the memory budget for the Tables and GeoLayers, in bytes
+            spill_folder (str): the folder in which to create the spill files, or None to use the system temporary
+                folder. A unique sub-folder is created when the first object is spilled, and removed by close().
+        """
+
+        # "max_memory" (int) is the memory budget, in bytes.
+        self.max_memory = max_memory
+
+        # "spill_folder" (str) is the folder in which the spill sub-folder is created.
+        self.spill_folder = spill_folder
+
+        # "resident" (OrderedDict) holds the Tables and GeoLayers that are in memory, in least recently used order.
+        # Key: id() of the object, Value: list of the object and its estimated size in bytes
+        self.resident = OrderedDict()
+
+        # "spilled" (dict) holds the Tables and GeoLayers that have been spilled.
+        # Key: id() of the object, Value: list of the object, the spill file path, the estimated size in bytes and the
+        # summary of the object (see get_spilled_summary())
+        self.spilled = {}
+
+        # "accessed" (set) holds the id() of the objects that were added or accessed since the budget was last
+        # enforced, which need their sizes to be estimated again.
+        self.accessed = set()
+
+        # "unspillable" (set) holds the id() of the objects that failed to spill, so that spilling is not attempted
+        # again. For example, Tables with mixed-type columns cannot be written to Arrow files.
+        self.unspillable = set()
+
+        # Statistics, logged by log_statistics().
+        self.spill_count = 0
+        self.spill_bytes = 0
+        self.spill_seconds = 0.0
+        self.reload_count = 0
+        self.reload_seconds = 0.0
+        self.peak_resident_bytes = 0
+
+        # The sub-folder holding the spill files, created when needed.
+        self.__spill_dir = None
+        self.__spill_file_count = 0
+
+        self.logger = logging.getLogger(__name__)
+
+    def access(self, obj):
+        """
+        Indicate that a Table or GeoLayer is being used. If the object has been spilled it is reloaded.
+        The object is marked as the most recently used object.
+
+        Args:
+            obj: the Table or GeoLayer object
+
+        Returns:
+            None
+        """
+
+        key = id(obj)
+        if key in self.spilled:
+            self.__reload(obj)
+        elif key not in self.resident:
+            # The object was added to the GeoProcessor lists without calling add().
+            self.add(obj)
+            return
+        self.resident.move_to_end(key)
+        self.accessed.add(key)
+
+    def add(self, obj):
+        """
+        Start managing a Table or GeoLayer, as the most recently used object.
+
+        Args:
+            obj: the Table or GeoLayer object
+
+        Returns:
+            None
+        """
+
+        key = id(obj)
+        self.resident[key] = [obj, self.__estimate_size(obj)]
+        self.resident.move_to_end(key)
+        self.accessed.add(key)
+
+    def close(self):
+        """
+        Stop managing all objects and remove the spill files. Spilled objects can no longer be reloaded, so this should
+        only be called when the objects are no longer used, for example at the start of a new run.
+
+        Returns:
+            None
+        """
+
+        self.resident.clear()
+        self.spilled.clear()
+        self.accessed.clear()
+        self.unspillable.clear()
+        if self.__spill_dir is not None:
+            shutil.rmtree(self.__spill_dir, ignore_errors=True)
+            self.__spill_dir = None
+
+    def enforce(self, registered_objects=None):
+        """
+        Spill the least recently used objects until the estimated memory used by the resident objects is within the
+        budget. This is called by the GeoProcessor between commands.
+
+        Args:
+            registered_objects (list): the Tables and GeoLayers that are registered in the GeoProcessor, or None if not
+                known. Managed objects that are not in the list were removed without calling remove() and are no longer
+                managed, so that they are not spilled and do not count against the budget.
+
+        Returns:
+            None
+        """
+
+        # Stop managing the objects that are no longer registered.
+        if registered_objects is not None:
+            registered_keys = set([id(obj) for obj in registered_objects])
+            for obj, size in list(self.resident.values()):
+                if id(obj) not in registered_keys:
+                    self.remove(obj)
+            for entry in list(self.spilled.values()):
+                if id(entry[0]) not in registered_keys:
+                    self.remove(entry[0])
+
+        # Update the sizes of the objects that may have been changed by the last command. The set is cleared first so
+        # that an error estimating a size does not leave objects marked as accessed for the next command.
+        accessed = self.accessed
+        self.accessed = set()
+        for key in accessed:
+            entry = self.resident.get(key)
+            if entry is not None:
+                try:
+                    entry[1] = self.__estimate_size(entry[0])
+                except Exception:
+                    self.logger.warning("Unable to estimate the size of {} {}.".format(
+                        entry[0].__class__.__name__, getattr(entry[0], "id", None)), exc_info=True)
+                    entry[1] = 0
+
+        resident_bytes = self.get_resident_bytes()
+        self.peak_resident_bytes = max(self.peak_resident_bytes, resident_bytes)
+
+        # Spill the least recently used objects first.
+        for key in list(self.resident.keys()):
+            if resident_bytes <= self.max_memory:
+                break
+            obj, size = self.resident[key]
+            if size == 0 or key in self.unspillable:
+                continue
+            if self.__spill(obj, size):
+                resident_bytes -= size
+
+    def get_resident_bytes(self):
+        """
+        Return the estimated memory used by the resident objects.
+
+        Returns:
+            The estimated size in bytes (int).
+        """
+
+        return sum([size for obj, size in self.resident.values()])
+
+    def get_spilled_summary(self, obj):
+        """
+        Return a summary of a spilled Table or GeoLayer, which was determined before the object was spilled, so that
+        the object does not need to be reloaded to list it.
+
+        Args:
+            obj: the Table or GeoLayer object
+
+        Returns:
+            None if the object is not spilled, or a dictionary with the following keys:
+                For a GeoLayer: "geometry" (str, the QGIS geometry type), "feature_count" (int) and "crs" (str).
+                For a Table: "column_count" (int) and "row_count" (int).
+        """
+
+        entry = self.spilled.get(id(obj))
+        if entry is None:
+            return None
+        return entry[3]
+
+    def log_statistics(self):
+        """
+        Log the spill and reload statistics.
+
+        Returns:
+            None
+        """
+
+        self.logger.info(
+            "Memory budget {:.1f} MB: peak resident {:.1f} MB, {} spills ({:.1f} MB, {:.2f} s), "
+            "{} reloads ({:.2f} s), {} objects spilled now.".format(
+                self.max_memory / 1024 ** 2, self.peak_resident_bytes / 1024 ** 2, self.spill_count,
+                self.spill_bytes / 1024 ** 2, self.spill_seconds, self.reload_count, self.reload_seconds,
+                len(self.spilled)))
+
+    @staticmethod
+    def parse_size(size_string):
+        """
+        Convert a memory size string to bytes. The number can be followed by a unit: B, K or KB, M or MB, G or GB,
+        T or TB (powers of 1024, case-insensitive). A number without a unit is in bytes.
+
+        Args:
+            size_string (str): the memory size string, for example 8GB or 512M
+
+        Returns:
+            The size in bytes (int).
+
+        Raises:
+            ValueError if the string is not a valid memory size.
+        """
+
+        match = re.match(r"^\s*([0-9]*\.?[0-9]+)\s*([A-Za-z]*)\s*$", size_string)
+        if match is None or match.group(2).upper() not in MemoryManager.__size_units:
+            raise ValueError("Memory size ({}) is not a number optionally followed by B, KB, MB, GB or TB.".format(
+                size_string))
+        return int(float(match.group(1)) * MemoryManager.__size_units[match.group(2).upper()])
+
+    def remove(self, obj):
+        """
+        Stop managing a Table or GeoLayer, for example when it is freed from the GeoProcessor.
+        The spill file of the object is removed.
+
+        Args:
+            obj: the Table or GeoLayer object
+
+        Returns:
+            None
+        """
+
+        key = id(obj)
+        self.resident.pop(key, None)
+        self.accessed.discard(key)
+        self.unspillable.discard(key)
+        entry = self.spilled.pop(key, None)
+        if entry is not None:
+            self.__remove_spill_file(entry[1])
+
+    @staticmethod
+    def __estimate_size(obj):
+        """
+        Estimate the memory used by a Table or GeoLayer.
+
+        Args:
+            obj: the Table or GeoLayer object
+
+        Returns:
+            The estimated size in bytes (int).
+        """
+
+        if isinstance(obj, GeoLayer):
+            # A LazyGeoLayer that has not been opened has no features in memory, and is not opened to check.
+            if isinstance(obj, LazyGeoLayer) and not obj.is_open():
+                return 0
+            # The QgsVectorLayer may have been released, for example by a command that deleted it.
+            qgs_vector_layer = getattr(obj, "qgs_vector_layer", None)
+            if qgs_vector_layer is None:
+                return 0
+            return qgis_util.estimate_qgsvectorlayer_memory_size(qgs_vector_layer)
+        else:
+            # Tables that do not store their data in a pandas data frame (core.Table) are not spilled.
+            if getattr(obj, "df", None) is None:
+                return 0
+            return int(obj.df.memory_usage(index=True, deep=True).sum())
+
+    def __get_spill_file_path(self, extension):
+        """
+        Return the path to a new spill file, creating the spill folder if necessary.
+
+        Args:
+            extension (str): the file extension, including the period
+
+        Returns:
+            The full pathname to the spill file.
+        """
+
+        if self.__spill_dir is None:
+            if self.spill_folder is not None:
+                os.makedirs(self.spill_folder, exist_ok=True)
+            self.__spill_dir = tempfile.mkdtemp(prefix="gp-spill-", dir=self.spill_folder)
+        self.__spill_file_count += 1
+        return os.path.join(self.__spill_dir, "spill-{}{}".format(self.__spill_file_count, extension))
+
+    def __reload(self, obj):
+        """
+        Reload a spilled Table or GeoLayer from its spill file and make it resident.
+
+        Args:
+            obj: the Table or GeoLayer object
+
+        Returns:
+            None
+        """
+
+        key = id(obj)
+        obj, spill_file, size, summary = self.spilled.pop(key)
+        start = time.perf_counter()
+        if isinstance(obj, GeoLayer):
+            # The features are copied back into memory without the GeoPackage feature ID column, so that the GeoLayer
+            # has the same attributes as before it was spilled and its attributes can still be changed.
+            layer_name = os.path.splitext(os.path.basename(spill_file))[0]
+            spill_layer = qgis_util.read_qgsvectorlayer_from_geopackage(spill_file, layer_name, include_fid=False)
+            obj.qgs_vector_layer = qgis_util.copy_qgsvectorlayer(spill_layer, layer_name=obj.id)
+            obj.qgs_id = obj.qgs_vector_layer.id()
+            spill_layer = None
+        else:
+            obj.df = arrow_util.read_df(spill_file, "Feather")
+        self.__remove_spill_file(spill_file)
+        seconds = time.perf_counter() - start
+
+        self.reload_count += 1
+        self.reload_seconds += seconds
+        self.resident[key] = [obj, size]
+        self.logger.info("Reloaded {} {} from {} ({:.2f} s).".format(
+            obj.__class__.__name__, obj.id, spill_file, seconds))
+
+    @staticmethod
+    def __remove_spill_file(spill_file):
+        """
+        Remove a spill file, ignoring errors. GeoPackage files may have additional files that are also removed.
+
+        Args:
+            spill_file (str): the full pathname to the spill file
+
+        Returns:
+            None
+        """
+
+        for path in [spill_file, spill_file + "-wal", spill_file + "-shm"]:
+            try:
+                if os.path.exists(path):
+                    os.remove(path)
+            except OSError:
+                pass
+
+    def __spill(self, obj, size):
+        """
+        Write a resident Table or GeoLayer to a spill file and release its data.
+
+        Args:
+            obj: the Table or GeoLayer object
+            size (int): the estimated size of the object in bytes
+
+        Returns:
+            True if the object was spilled, False if it could not be spilled.
+        """
+
+        key = id(obj)
+        start = time.perf_counter()
+        try:
+            # Determine the summary of the object before its data are released.
+            if isinstance(obj, GeoLayer):
+                summary = {"geometry": obj.get_geometry(), "feature_count": obj.get_feature_count(),
+                           "crs": obj.get_crs()}
+            else:
+                summary = {"column_count": obj.count(returnCol=True), "row_count": obj.count(returnCol=False)}
+
+            if isinstance(obj, GeoLayer):
+                spill_file = self.__get_spill_file_path(".gpkg")
+                qgis_util.write_qgsvectorlayer_to_geopackage(obj.qgs_vector_layer, spill_file, obj.get_crs())
+                obj.qgs_vector_layer = None
+            else:
+                spill_file = self.__get_spill_file_path(".arrow")
+                arrow_util.write_df(obj.df, spill_file, "Feather", list(obj.df.columns), include_index=True,
+                                    compression="none")
+                obj.df = None
+        except Exception:
+            self.unspillable.add(key)
+            self.logger.warning("Unable to spill {} {}. It will be kept in memory.".format(
+                obj.__class__.__name__, obj.id), exc_info=True)
+            return False
+        seconds = time.perf_counter() - start
+
+        del self.resident[key]
+        self.spilled[key] = [obj, spill_file, size, summary]
+        self.spill_count += 1
+        self.spill_bytes += size
+        self.spill_seconds += seconds
+        self.logger.info("Spilled {} {} ({:.1f} MB) to {} ({:.2f} s).".format(
+            obj.__class__.__name__, obj.id, size / 1024 ** 2, spill_file, seconds))
+        return True
@@ -17,8 +17,9 @@
 #     along with GeoProcessor.  If not, see <https://www.gnu.org/licenses/>.
 # ________________________________________________________________NoticeEnd___
 
+import geoprocessor.util.type_util as type_util
+
 import pandas as pd
-import enum
 
 
 class Table(object):
@@ -235,138 +236,18 @@ class TableField(object):
         # "null_values" is a list of values from the original table that represent NULL values
         self.null_values = []
 
-    def __is_data_type(self, data_type_to_check):
-        """
-        Check if the items in the column are of the desired data type. Pass over None values. Only assess the column
-         based off of the non-None values.
-
-         Args:
-            data_type_to_check: The data type to check if the column items match.
-
-        Return: Boolean that specifies if the items in the column are of the specified data type.
-        """
-
-        # Boolean to determine if the items are all of the expected data type or None.
-        # Set to TRUE until proven FALSE.
-        is_correct_type = True
-
-        boolean_dic = {"TRUE": True, "FALSE": False, "1": True, "0": False}
-
-        # Iterate over the TableField items.
-        for item in self.items:
-
-            # If the item is equal to None, pass and do not run any further checks.
-            if item is None:
-                pass
-
-            # If checking for Boolean values and the item is not a Boolean value, set the is_correct_type to FALSE.
-            elif data_type_to_check.upper() == "BOOLEAN" and item.upper() not in boolean_dic.keys():
-                is_correct_type = False
-
-            # If checking of INT values and the item is not an int value, set the is_correct_type to FALSE.
-            elif data_type_to_check.upper() == "INT":
-                try:
-                    int(item)
-                except:
-                    is_correct_type = False
-
-            # If checking for FLOAT values and the item is not a float value, set the is_correct_type to FALSE.
-            elif data_type_to_check.upper() == "FLOAT":
-                try:
-                    float(item)
-                except:
-                    is_correct_type = False
-
-            # If checking for STR values and the item is not a string value, set the is_correct_type to FALSE.
-            elif data_type_to_check.upper() == "STR":
-                try:
-                    str(item)
-                except:
-                    is_correct_type = False
-
-            if not is_correct_type:
-                break
-
-        return is_correct_type
-
-    def __convert_data_type(self, output_data_type):
-        """
-        Comvert the items in the column (string) to the desired data type.
-
-        Args:
-            output_data_type (str): the desired data type of which to convert the column items
-
-        Return:
-            None
-        """
-
-        #  A list to hold the column items that have been converted to the desired data type.
-        converted_list = []
-
-        # Iterate over the items in the column.
-        for item in self.items:
-
-            # If the item is None, retain the None value as that item's value. Add None to the converted_list.
-            if item is None:
-                converted_list.append(None)
-
-            # If the conversion data type is Boolean, convert the item to a Boolean value.
-            # Add the converted item to the converted_list.
-            elif output_data_type.upper() == "BOOLEAN":
-                boolean_dic = {"TRUE": True, "FALSE": False, "1": True, "0": False}
-                converted_list.append(boolean_dic[item.upper()])
-
-            # If the conversion data type is an integer, convert the item to an Int value.
-            # Add the converted item to the converted_list.
-            elif output_data_type.upper() == "INT":
-                converted_list.append(int(item))
-
-            # If the conversion data type is a float, convert the item to a Float value.
-            # Add the converted item to the converted_list.
-            elif output_data_type.upper() == "FLOAT":
-                converted_list.append(float(item))
-
-            # If the conversion data type is a string, convert the item to a Str value.
-            # Add the converted item to the converted_list.
-            elif output_data_type.upper() == "STR":
-                converted_list.append(str(item))
-
-        # Overwrite the old column items with the converted column items.
-        self.items = converted_list
-
     def assign_data_type(self):
         """
-        Convert the column contents to the correct data type. By default, the logic attempts to determine the correct
-        data type based upon the content items. Handles Boolean, integers, floats and strings. Need to figure out how
-        to gracefully handle dictionaries, lists, and tuples.
+        Convert the column contents to the correct data type. The logic determines the data type based upon the
+        content items in one pass (see type_util.convert_column()). Handles Boolean, integers, floats and strings. Items
+        that are in the null_values list are converted to None. Need to figure out how to gracefully handle
+        dictionaries, lists, and tuples.
 
         Return: None
         """
 
-        # If the column is a column of only None values, assign the data_type to None.
-        if all(x == self.items[0] for x in self.items) and self.items[0] is None:
-            self.data_type = None
-
-        # If there is at least one value other than None in the column, determine the column data type.
-        else:
-
-            # Enumerator of DataTypes
-            # In specific order to make sure that the logic assumes the correct data type.
-            class DataTypes(enum.Enum):
-                Boolean, Int, Float, Str = bool, int, float, str
-
-            # Iterate over the data types.
-            for data_type in DataTypes:
-
-                # If the items in the column are of the data type, continue.
-                if self.__is_data_type(data_type.name):
-
-                    # Convert the data values (all strings) in the column to the assumed data type.
-                    self.__convert_data_type(str(data_type.name))
-
-                    # Assign the data type of the column to the assumed data type.
-                    self.data_type = data_type.value
-                    break
+        # If the column is a column of only None values, the data_type is None.
+        self.data_type, self.items = type_util.convert_column(self.items, self.null_values)
 
     def assign_nulls(self):
         """
@@ -375,25 +256,19 @@ class TableField(object):
         For example:
         1.0 (float) != 1 (int) != True (Boolean) != "1" (str)
 
-            Args:
-                data_list (list): a list of items to check for null values
-                null_values (list): a list of values that represent null values. This list can be mixed type.
+        The null values are checked using a hashed set, so the time to check an item does not depend on the number of
+        null values.
 
-            Return: an updated data list with the substituted null values as None value.
+            Return: None
             """
 
-        # Iterate over the null values.
-        for null_value in self.null_values:
-
-            # Iterate over the data list items.
-            for item in self.items:
-
-                # If the null value is equal to the data list item. The data types must also match. Python doesn't
-                # require that two objects have the same type for them to be considered equal.
-                if null_value == item and isinstance(item, type(null_value)):
+        if not self.null_values:
+            return
 
-                    # Get the index of the null value in the data list.
-                    index = self.items.index(item)
+        # The null values and their data types. Python doesn't require that two objects have the same type for them
+        # to be considered equal, so the type of the item is also checked.
+        null_values = frozenset(self.null_values)
+        null_types = tuple(set(type(null_value) for null_value in self.null_values))
 
-                    # Assign the null value in the data list to None.
-                    self.items[index] = None
+        # Assign the items that are null values to None.
+        self.items = [None if item in null_values and isinstance(item, null_types) else item for item in self.items]
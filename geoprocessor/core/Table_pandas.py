@@ -37,6 +37,10 @@ class Table(object):
     Tables can be made in memory from within the GeoProcessor. This occurs when a command is called that, by design,
     creates a new Table. When this occurs, the in-memory Table is assigned a table_id from within the command,
     the df is created from within the command and the source_path is set to 'MEMORY'or 'NONE'.
+
+    Keyed lookups of rows (see find_row_positions()) use a hash index of the column values, which is built the first
+    time a column is used as a key and reused by later lookups. The indexes are discarded when the data frame is
+    replaced (the df property is set). Code that modifies the data frame in place must call invalidate_indexes().
     """
 
     def __init__(self, table_id, pandas_df, table_source_path, properties=None):
@@ -62,6 +66,11 @@ class Table(object):
         # for manipulation.
         self.id = table_id
 
+        # "column_indexes" (dict) holds the hash indexes of the columns used for keyed lookups.
+        # Key: the column name, Value: dictionary where the key is a column value and the value is the list of the
+        # positions (0-reference) of the rows with that value. Indexes are created when first needed.
+        self.__column_indexes = {}
+
         # "pandas_df" is a Pandas Data Frame object created by the pandas library. All manipulations are performed on
         # the Table's pandas data frame.
         self.df = pandas_df
@@ -84,6 +93,30 @@ class Table(object):
         else:
             self.properties = properties
 
+    @property
+    def df(self):
+        """
+        Return the pandas data frame object of the Table.
+
+        Return: A pandas Data Frame object.
+        """
+
+        return self.__df
+
+    @df.setter
+    def df(self, pandas_df):
+        """
+        Set the pandas data frame object of the Table. The column indexes of the previous data frame are discarded.
+
+        Args:
+            pandas_df (pandas Data Frame object): the new data frame object
+
+        Return: None
+        """
+
+        self.__df = pandas_df
+        self.invalidate_indexes()
+
     def deep_copy(self):
         """
         Creates and returns a deep copy of the Table's pandas Data Frame object.
@@ -94,6 +127,43 @@ class Table(object):
 
         return self.df.copy(deep=True)
 
+    def find_row_positions(self, column_name, value):
+        """
+        Return the positions of the rows that have a given value in a column. The hash index of the column is used,
+        so that repeated lookups (for example, within a For loop) do not scan the table.
+
+        Args:
+            column_name (str): the name of the column to search
+            value: the value to find. The value must have the same type as the column values to match.
+
+        Return: A list of the row positions (0-reference), in table order. The list is empty if no rows match.
+        """
+
+        return self.get_column_index(column_name).get(value, [])
+
+    def get_column_index(self, column_name):
+        """
+        Return the hash index of a column, creating it if it has not been created.
+
+        Args:
+            column_name (str): the name of the column
+
+        Return: A dictionary where the key is a column value and the value is the list of the positions (0-reference)
+            of the rows with that value.
+
+        Raises:
+            KeyError if the column is not in the Table.
+        """
+
+        column_index = self.__column_indexes.get(column_name)
+        if column_index is None:
+            # Build the index with one pass through the column values.
+            column_index = {}
+            for position, value in enumerate(self.get_column_values_as_list(column_name)):
+                column_index.setdefault(value, []).append(position)
+            self.__column_indexes[column_name] = column_index
+        return column_index
+
     def get_column_names(self):
         """
         Return a list of column names.
@@ -118,6 +188,16 @@ class Table(object):
         # Return a list of the column values for the given input column.
         return self.df[column_name].tolist()
 
+    def invalidate_indexes(self):
+        """
+        Discard the hash indexes of the columns. This must be called after the data frame is modified in place,
+        so that later keyed lookups do not use out of date indexes.
+
+        Return: None
+        """
+
+        self.__column_indexes = {}
+
     def count(self, returnCol=True):
         """
         Return either the number of columns within the table or the number of rows within the table.
@@ -864,6 +864,15 @@ class GeoProcessorUI(QtWidgets.QMainWindow):  # , Ui_MainWindow):
         self.Menu_Commands_Read_GeoLayers.addAction(self.Menu_Commands_Read_ReadGeoLayerFromGeoJSON)
         self.Menu_Commands_Read_ReadGeoLayerFromGeoJSON.triggered.connect(
             functools.partial(self.new_command_editor, "ReadGeoLayerFromGeoJSON"))
+        # ReadGeoLayerFromGeoPackage
+        self.Menu_Commands_Read_ReadGeoLayerFromGeoPackage = QtWidgets.QAction(main_window)
+        self.Menu_Commands_Read_ReadGeoLayerFromGeoPackage.setObjectName(
+            qt_util.from_utf8("Menu_Commands_GeoLayers_Read_ReadGeoLayerFromGeoPackage"))
+        self.Menu_Commands_Read_ReadGeoLayerFromGeoPackage.setText(
+            "ReadGeoLayerFromGeoPackage()... <reads a GeoLayer from a layer in a .gpkg file>")
+        self.Menu_Commands_Read_GeoLayers.addAction(self.Menu_Commands_Read_ReadGeoLayerFromGeoPackage)
+        self.Menu_Commands_Read_ReadGeoLayerFromGeoPackage.triggered.connect(
+            functools.partial(self.new_command_editor, "ReadGeoLayerFromGeoPackage"))
         # ReadGeoLayersFromShapefile
         self.Menu_Commands_Read_ReadGeoLayerFromShapefile = QtWidgets.QAction(main_window)
         self.Menu_Commands_Read_ReadGeoLayerFromShapefile.setObjectName(
@@ -1047,6 +1056,15 @@ class GeoProcessorUI(QtWidgets.QMainWindow):  # , Ui_MainWindow):
         self.Menu_Commands_Write_WriteGeoLayerToGeoJSON.triggered.connect(
             functools.partial(self.new_command_editor, "WriteGeoLayerToGeoJSON"))
         self.Menu_Commands_Write_GeoLayers.addAction(self.Menu_Commands_Write_WriteGeoLayerToGeoJSON)
+        # WriteGeoLayerToGeoPackage
+        self.Menu_Commands_Write_WriteGeoLayerToGeoPackage = QtWidgets.QAction(main_window)
+        self.Menu_Commands_Write_WriteGeoLayerToGeoPackage.setObjectName(
+            qt_util.from_utf8("Menu_Commands_Write_WriteGeoLayerToGeoPackage"))
+        self.Menu_Commands_Write_WriteGeoLayerToGeoPackage.setText(
+            "WriteGeoLayerToGeoPackage()... <write GeoLayer to a layer in a file in GeoPackage format>")
+        self.Menu_Commands_Write_WriteGeoLayerToGeoPackage.triggered.connect(
+            functools.partial(self.new_command_editor, "WriteGeoLayerToGeoPackage"))
+        self.Menu_Commands_Write_GeoLayers.addAction(self.Menu_Commands_Write_WriteGeoLayerToGeoPackage)
         # WriteGeoLayerToKML
         self.Menu_Commands_Write_WriteGeoLayerToKML = QtWidgets.QAction(main_window)
         self.Menu_Commands_Write_WriteGeoLayerToKML.setObjectName(
@@ -1353,6 +1371,16 @@ class GeoProcessorUI(QtWidgets.QMainWindow):  # , Ui_MainWindow):
             functools.partial(self.new_command_editor, "SetPropertyFromGeoLayer"))
         self.Menu_Commands_General_RunningProperties.addAction(
             self.Menu_Commands_General_RunningProperties_SetPropertyFromGeoLayer)
+        # SetPropertiesFromTableRow
+        self.Menu_Commands_General_RunningProperties_SetPropertiesFromTableRow = QtWidgets.QAction(main_window)
+        self.Menu_Commands_General_RunningProperties_SetPropertiesFromTableRow.setObjectName(
+            qt_util.from_utf8("Menu_Commands_General_RunningProperties_SetPropertiesFromTableRow"))
+        self.Menu_Commands_General_RunningProperties_SetPropertiesFromTableRow.setText(
+            "SetPropertiesFromTableRow()... <set GeoProcessor properties from a table row>")
+        self.Menu_Commands_General_RunningProperties_SetPropertiesFromTableRow.triggered.connect(
+            functools.partial(self.new_command_editor, "SetPropertiesFromTableRow"))
+        self.Menu_Commands_General_RunningProperties.addAction(
+            self.Menu_Commands_General_RunningProperties_SetPropertiesFromTableRow)
         # WritePropertiesToFile
         self.Menu_Commands_General_RunningProperties_WritePropertiesToFile = QtWidgets.QAction(main_window)
         self.Menu_Commands_General_RunningProperties_WritePropertiesToFile.setObjectName(
@@ -1458,13 +1486,57 @@ class GeoProcessorUI(QtWidgets.QMainWindow):  # , Ui_MainWindow):
         self.Menu_Commands_Table_ReadTableFromExcel.triggered.connect(
             functools.partial(self.new_command_editor, "ReadTableFromExcel"))
         self.Menu_Commands_Tables_Read.addAction(self.Menu_Commands_Table_ReadTableFromExcel)
+        # ReadTableFromFeather
+        self.Menu_Commands_Table_ReadTableFromFeather = QtWidgets.QAction(main_window)
+        self.Menu_Commands_Table_ReadTableFromFeather.setObjectName(
+            qt_util.from_utf8("Menu_Commands_Table_ReadTableFromFeather"))
+        self.Menu_Commands_Table_ReadTableFromFeather.setText(
+            "ReadTableFromFeather()... <read a table from a Feather file>")
+        self.Menu_Commands_Table_ReadTableFromFeather.triggered.connect(
+            functools.partial(self.new_command_editor, "ReadTableFromFeather"))
+        self.Menu_Commands_Tables_Read.addAction(self.Menu_Commands_Table_ReadTableFromFeather)
+        # ReadTableFromParquet
+        self.Menu_Commands_Table_ReadTableFromParquet = QtWidgets.QAction(main_window)
+        self.Menu_Commands_Table_ReadTableFromParquet.setObjectName(
+            qt_util.from_utf8("Menu_Commands_Table_ReadTableFromParquet"))
+        self.Menu_Commands_Table_ReadTableFromParquet.setText(
+            "ReadTableFromParquet()... <read a table from a Parquet file>")
+        self.Menu_Commands_Table_ReadTableFromParquet.triggered.connect(
+            functools.partial(self.new_command_editor, "ReadTableFromParquet"))
+        self.Menu_Commands_Tables_Read.addAction(self.Menu_Commands_Table_ReadTableFromParquet)
 
         # Commands / Tables / Process menu
         self.Menu_Commands_Tables_Process = QtWidgets.QMenu(self.Menu_Commands_Table)
         self.Menu_Commands_Tables_Process.setObjectName(qt_util.from_utf8("Menu_Commands_Tables_Process"))
         self.Menu_Commands_Tables_Process.setTitle("Process Table")
-        self.Menu_Commands_Tables_Process.setEnabled(False)
         self.Menu_Commands_Table.addAction(self.Menu_Commands_Tables_Process.menuAction())
+        # AggregateTable
+        self.Menu_Commands_Table_AggregateTable = QtWidgets.QAction(main_window)
+        self.Menu_Commands_Table_AggregateTable.setObjectName(
+            qt_util.from_utf8("Menu_Commands_Table_AggregateTable"))
+        self.Menu_Commands_Table_AggregateTable.setText(
+            "AggregateTable()... <aggregate the rows of a table by group>")
+        self.Menu_Commands_Table_AggregateTable.triggered.connect(
+            functools.partial(self.new_command_editor, "AggregateTable"))
+        self.Menu_Commands_Tables_Process.addAction(self.Menu_Commands_Table_AggregateTable)
+        # FilterTable
+        self.Menu_Commands_Table_FilterTable = QtWidgets.QAction(main_window)
+        self.Menu_Commands_Table_FilterTable.setObjectName(
+            qt_util.from_utf8("Menu_Commands_Table_FilterTable"))
+        self.Menu_Commands_Table_FilterTable.setText(
+            "FilterTable()... <filter the rows of a table using a condition>")
+        self.Menu_Commands_Table_FilterTable.triggered.connect(
+            functools.partial(self.new_command_editor, "FilterTable"))
+        self.Menu_Commands_Tables_Process.addAction(self.Menu_Commands_Table_FilterTable)
+        # JoinTables
+        self.Menu_Commands_Table_JoinTables = QtWidgets.QAction(main_window)
+        self.Menu_Commands_Table_JoinTables.setObjectName(
+            qt_util.from_utf8("Menu_Commands_Table_JoinTables"))
+        self.Menu_Commands_Table_JoinTables.setText(
+            "JoinTables()... <join the columns of a table to another table>")
+        self.Menu_Commands_Table_JoinTables.triggered.connect(
+            functools.partial(self.new_command_editor, "JoinTables"))
+        self.Menu_Commands_Tables_Process.addAction(self.Menu_Commands_Table_JoinTables)
 
         # Commands / Tables / Write menu
         self.Menu_Commands_Tables_Write = QtWidgets.QMenu(self.Menu_Commands_Table)
@@ -1500,6 +1572,33 @@ class GeoProcessorUI(QtWidgets.QMainWindow):  # , Ui_MainWindow):
         self.Menu_Commands_Table_WriteTableToExcel.triggered.connect(
             functools.partial(self.new_command_editor, "WriteTableToExcel"))
         self.Menu_Commands_Tables_Write.addAction(self.Menu_Commands_Table_WriteTableToExcel)
+        # WriteTableToFeather
+        self.Menu_Commands_Table_WriteTableToFeather = QtWidgets.QAction(main_window)
+        self.Menu_Commands_Table_WriteTableToFeather.setObjectName(
+            qt_util.from_utf8("Menu_Commands_Table_WriteTableToFeather"))
+        self.Menu_Commands_Table_WriteTableToFeather.setText(
+            "WriteTableToFeather()... <write a table to a Feather file>")
+        self.Menu_Commands_Table_WriteTableToFeather.triggered.connect(
+            functools.partial(self.new_command_editor, "WriteTableToFeather"))
+        self.Menu_Commands_Tables_Write.addAction(self.Menu_Commands_Table_WriteTableToFeather)
+        # WriteTableToParquet
+        self.Menu_Commands_Table_WriteTableToParquet = QtWidgets.QAction(main_window)
+        self.Menu_Commands_Table_WriteTableToParquet.setObjectName(
+            qt_util.from_utf8("Menu_Commands_Table_WriteTableToParquet"))
+        self.Menu_Commands_Table_WriteTableToParquet.setText(
+            "WriteTableToParquet()... <write a table to a Parquet file>")
+        self.Menu_Commands_Table_WriteTableToParquet.triggered.connect(
+            functools.partial(self.new_command_editor, "WriteTableToParquet"))
+        self.Menu_Commands_Tables_Write.addAction(self.Menu_Commands_Table_WriteTableToParquet)
+        # CloseExcelWorkbook
+        self.Menu_Commands_Table_CloseExcelWorkbook = QtWidgets.QAction(main_window)
+        self.Menu_Commands_Table_CloseExcelWorkbook.setObjectName(
+            qt_util.from_utf8("Menu_Commands_Table_CloseExcelWorkbook"))
+        self.Menu_Commands_Table_CloseExcelWorkbook.setText(
+            "CloseExcelWorkbook()... <write the worksheets of an open Excel file>")
+        self.Menu_Commands_Table_CloseExcelWorkbook.triggered.connect(
+            functools.partial(self.new_command_editor, "CloseExcelWorkbook"))
+        self.Menu_Commands_Tables_Write.addAction(self.Menu_Commands_Table_CloseExcelWorkbook)
 
         # Tools menu
         self.Menu_Tools = QtWidgets.QMenu(self.menubar)
@@ -2266,6 +2365,15 @@ class GeoProcessorUI(QtWidgets.QMainWindow):  # , Ui_MainWindow):
 
         for geolayer in self.gp.geolayers:
 
+            # A GeoLayer that was spilled to disk by the memory manager is not reloaded to list it. Its summary, which
+            # was determined before it was spilled, is used instead.
+            summary = None
+            if self.gp.memory_manager is not None:
+                summary = self.gp.memory_manager.get_spilled_summary(geolayer)
+            if summary is None:
+                summary = {"geometry": geolayer.get_geometry(), "feature_count": geolayer.get_feature_count(),
+                           "crs": geolayer.get_crs()}
+
             # Get the index of the next available row in the table. Add a new row to the table.
             new_row_index = self.results_GeoLayers_Table.rowCount()
             self.results_GeoLayers_Table.insertRow(new_row_index)
@@ -2274,14 +2382,14 @@ class GeoProcessorUI(QtWidgets.QMainWindow):  # , Ui_MainWindow):
             self.results_GeoLayers_Table.setItem(new_row_index, 0, QtWidgets.QTableWidgetItem(geolayer.id))
 
             # Retrieve the GeoLayer's geometry and set as the attribute for the Geometry column.
-            self.results_GeoLayers_Table.setItem(new_row_index, 1, QtWidgets.QTableWidgetItem(geolayer.get_geometry()))
+            self.results_GeoLayers_Table.setItem(new_row_index, 1, QtWidgets.QTableWidgetItem(summary["geometry"]))
 
             # Retrieve the number of features within the GeoLayer and set as the attribute for the Feature Count column.
             self.results_GeoLayers_Table.setItem(new_row_index, 2,
-                                                 QtWidgets.QTableWidgetItem(str(geolayer.get_feature_count())))
+                                                 QtWidgets.QTableWidgetItem(str(summary["feature_count"])))
 
             # Retrieve the GeoLayer's CRS and set as the attribute for the Coordinate Reference System column.
-            self.results_GeoLayers_Table.setItem(new_row_index, 3, QtWidgets.QTableWidgetItem(geolayer.get_crs()))
+            self.results_GeoLayers_Table.setItem(new_row_index, 3, QtWidgets.QTableWidgetItem(summary["crs"]))
 
         self.update_ui_status_results_geolayers()
 
@@ -2385,6 +2493,14 @@ class GeoProcessorUI(QtWidgets.QMainWindow):  # , Ui_MainWindow):
         # Iterate through all of the Table objects in the GeoProcessor.
         for table in self.gp.tables:
 
+            # A Table that was spilled to disk by the memory manager is not reloaded to list it. Its summary, which was
+            # determined before it was spilled, is used instead.
+            summary = None
+            if self.gp.memory_manager is not None:
+                summary = self.gp.memory_manager.get_spilled_summary(table)
+            if summary is None:
+                summary = {"column_count": table.count(returnCol=True), "row_count": table.count(returnCol=False)}
+
             # Get the index of the next available row in the table. Add a new row to the table.
             new_row_index = self.results_Tables_Table.rowCount()
             self.results_Tables_Table.insertRow(new_row_index)
@@ -2394,11 +2510,11 @@ class GeoProcessorUI(QtWidgets.QMainWindow):  # , Ui_MainWindow):
 
             # Retrieve the number of columns in the Table and set as the attribute for the Column Count column.
             self.results_Tables_Table.setItem(new_row_index, 1,
-                                              QtWidgets.QTableWidgetItem(str(table.count(returnCol=True))))
+                                              QtWidgets.QTableWidgetItem(str(summary["column_count"])))
 
             # Retrieve the number of rows in the Table and set as the attribute for the Row Count column.
             self.results_Tables_Table.setItem(new_row_index, 2,
-                                              QtWidgets.QTableWidgetItem(str(table.count(returnCol=False))))
+                                              QtWidgets.QTableWidgetItem(str(summary["row_count"])))
 
         # Sort by Table ID
         # self.results_Tables_Table.sortByColumn(0, QtCore.Qt.AscendingOrder)
@@ -2812,11 +2928,11 @@ class GeoProcessorUI(QtWidgets.QMainWindow):  # , Ui_MainWindow):
 
         # Get GeoLayer from Table
         selected_row_index = self.results_GeoLayers_Table.currentRow()
-        selected_geolayer = self.gp.geolayers[selected_row_index]
+        selected_geolayer = self.gp.get_geolayer(self.gp.geolayers[selected_row_index].id)
         selected_vector_layer = selected_geolayer.qgs_vector_layer
 
-        # Get features from vector layer
-        features = selected_vector_layer.getFeatures()
+        # Get features from vector layer. Only the attributes are displayed, so the geometry is not read.
+        features = qgis_util.get_features(selected_vector_layer, include_geometry=False)
         num_features = selected_vector_layer.featureCount()
         # Get attribute field names
         attribute_field_names = selected_geolayer.get_attribute_field_names()
@@ -2887,7 +3003,7 @@ class GeoProcessorUI(QtWidgets.QMainWindow):  # , Ui_MainWindow):
         for row in selected_rows:
             if not row.isValid():
                 raise IOError
-            selected_geolayers.append(self.gp.geolayers[row.row()].qgs_vector_layer)
+            selected_geolayers.append(self.gp.get_geolayer(self.gp.geolayers[row.row()].id).qgs_vector_layer)
         # Get the extent for all the layers by calling qgis_util
         extent = qgis_util.get_extent_from_geolayers(selected_geolayers)
         self.canvas.setExtent(extent)
@@ -0,0 +1,163 @@
+# arrow_util - utility functions related to the Apache Arrow (pyarrow) library
+# ________________________________________________________________NoticeStart_
+# GeoProcessor
+# Copyright (C) 2017-2019 Open Water Foundation
+#
+# GeoProcessor is free software:  you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     GeoProcessor is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with GeoProcessor.  If not, see <https://www.gnu.org/licenses/>.
+# ________________________________________________________________NoticeEnd___
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
+
+import geoprocessor.util.string_util as string_util
+
+import operator
+import re
+
+# The file formats that are supported by the functions in this module.
+# Key: the format name used in function arguments, Value: the pyarrow.dataset format name
+FILE_FORMATS = {"FEATHER": "feather", "PARQUET": "parquet"}
+
+# The comparison operators that can be used in row filters.
+# The longer operators are listed first so that the regular expression matches them before the shorter operators.
+__filter_operators = {"==": operator.eq, "!=": operator.ne, "<=": operator.le, ">=": operator.ge,
+                      "<": operator.lt, ">": operator.gt, "=": operator.eq}
+
+# Regular expression to split a row filter into the column name, operator and value.
+__filter_pattern = re.compile(r"^\s*(.+?)\s*(==|!=|<=|>=|<|>|=)\s*(.*?)\s*$")
+
+
+def get_column_names(file_path, file_format):
+    """
+    Return the column names of a Parquet or Feather file. Only the file schema is read.
+
+    Args:
+        file_path (str): the full pathname to the file
+        file_format (str): the file format, Parquet or Feather
+
+    Returns:
+        A list of column names.
+    """
+
+    return ds.dataset(file_path, format=FILE_FORMATS[file_format.upper()]).schema.names
+
+
+def parse_row_filters(row_filters):
+    """
+    Convert row filter strings to a pyarrow dataset filter expression. Each row filter has the syntax
+    "ColumnName Operator Value", where the operator is one of ==, =, !=, <, <=, >, >=. Values are converted to integers
+    or floats if possible. Values that are surrounded by single or double quotes are always treated as strings.
+    All the row filters must be true for a row to be read. Empty row filter strings are ignored.
+
+    Args:
+        row_filters (list): a list of row filter strings
+
+    Returns:
+        A pyarrow.dataset.Expression, or None if there are no row filters.
+
+    Raises:
+        ValueError if a row filter does not have valid syntax.
+    """
+
+    expression = None
+    for row_filter in row_filters:
+        # Ignore empty row filters, for example from a trailing semicolon.
+        if not row_filter.strip():
+            continue
+        match = __filter_pattern.match(row_filter)
+        if match is None or not match.group(3):
+            raise ValueError("Row filter ({}) does not have the syntax: ColumnName Operator Value".format(row_filter))
+        col_name, filter_operator, value = match.groups()
+
+        # Convert the value to the most specific type.
+        if len(value) >= 2 and value[0] == value[-1] and value[0] in ["'", '"']:
+            value = value[1:-1]
+        elif string_util.is_int(value):
+            value = int(value)
+        elif string_util.is_float(value):
+            value = float(value)
+
+        condition = __filter_operators[filter_operator](ds.field(col_name), value)
+        if expression is None:
+            expression = condition
+        else:
+            expression = expression & condition
+
+    return expression
+
+
+def read_df(file_path, file_format, columns=None, row_filter=None):
+    """
+    Read a Parquet or Feather file into a pandas data frame.
+
+    Only the requested columns are read from the file. For Parquet files, the row filter is checked against the row
+    group statistics so that row groups that cannot contain matching rows are not read. The Arrow columns are converted
+    to pandas one column at a time and released as they are converted, which avoids copies for numeric columns
+    without nulls and keeps the peak memory close to the size of the data frame.
+
+    Args:
+        file_path (str): the full pathname to the file
+        file_format (str): the file format, Parquet or Feather
+        columns (list): the names of the columns to read, or None to read all columns
+        row_filter (pyarrow.dataset.Expression): the expression that rows must match to be read (see
+            parse_row_filters()), or None to read all rows
+
+    Returns:
+        A pandas data frame object.
+    """
+
+    dataset = ds.dataset(file_path, format=FILE_FORMATS[file_format.upper()])
+    table = dataset.to_table(columns=columns, filter=row_filter)
+    return table.to_pandas(split_blocks=True, self_destruct=True)
+
+
+def write_df(df, file_path, file_format, columns, include_index=False, compression=None, dictionary_columns=None,
+             row_group_size=None):
+    """
+    Write a pandas data frame to a Parquet or Feather file.
+
+    Args:
+        df (object): the pandas data frame object to write
+        file_path (str): the full pathname to the output file
+        file_format (str): the file format, Parquet or Feather
+        columns (list): the names of the columns to write
+        include_index (bool): If TRUE, write the index column. If FALSE, do not write the index column.
+        compression (str): the compression codec (for example snappy, zstd, lz4, gzip), "none" for no compression,
+            or None to use the pyarrow default for the format
+        dictionary_columns (list): the names of the columns to dictionary encode, or None to use the pyarrow default
+            for the format (Parquet dictionary encodes all columns, Feather does not dictionary encode)
+        row_group_size (int): the maximum number of rows in each Parquet row group, or None to use the pyarrow
+            default. Smaller row groups allow more row groups to be skipped when reading with a row filter.
+
+    Returns: None
+    """
+
+    table = pa.Table.from_pandas(df[columns], preserve_index=include_index)
+
+    if compression is not None and compression.upper() == "NONE":
+        compression = "none" if file_format.upper() == "PARQUET" else "uncompressed"
+
+    if file_format.upper() == "PARQUET":
+        use_dictionary = True if dictionary_columns is None else dictionary_columns
+        pq.write_table(table, file_path, compression=compression or "snappy", use_dictionary=use_dictionary,
+                       row_group_size=row_group_size)
+
+    else:
+        # Feather files store dictionary encoded columns as Arrow dictionary arrays.
+        for col_name in dictionary_columns or []:
+            i = table.schema.get_field_index(col_name)
+            table = table.set_column(i, col_name, table.column(i).dictionary_encode())
+        feather.write_feather(table, file_path, compression=compression)
@@ -24,6 +24,9 @@ from geoprocessor.core.CommandLogRecord import CommandLogRecord
 from geoprocessor.core.CommandPhaseType import CommandPhaseType
 from geoprocessor.core.CommandStatusType import CommandStatusType
 
+import geoprocessor.util.string_util as string_util
+import geoprocessor.util.validator_util as validators
+
 import logging
 
 
@@ -69,6 +72,44 @@ def append_command_status_log_records(command_status, commands):
             command_status.add_to_log(CommandPhaseType.RUN, log_record)
 
 
+def check_read_bbox_parameters(command, command_parameters, warning):
+    """
+    Check the BoundingBox and ClipGeoLayerID parameters of a command that reads GeoLayers: the BoundingBox parameter
+    must be a valid bounding box and cannot be used with the ClipGeoLayerID parameter.
+    Any problems are logged to the command status and appended to the warning message.
+    This function is typically called by the command's check_command_parameters() function.
+
+    Args:
+        command: The command to evaluate.
+        command_parameters (dict): The dictionary of command parameters to check (key:string_param_name,
+            value:string_param_value).
+        warning (str): The multi-line warning message output by check_command_parameters() function.
+
+    Returns:
+        The updated warning argument.
+    """
+
+    pv_BoundingBox = command.get_parameter_value(parameter_name="BoundingBox", command_parameters=command_parameters)
+    pv_ClipGeoLayerID = command.get_parameter_value(parameter_name="ClipGeoLayerID",
+                                                    command_parameters=command_parameters)
+    if not validators.validate_bounding_box(pv_BoundingBox, none_allowed=True, empty_string_allowed=True):
+        message = "BoundingBox parameter value ({}) is not a valid bounding box.".format(pv_BoundingBox)
+        recommendation = "Specify the BoundingBox parameter as xmin,ymin,xmax,ymax."
+        warning += "\n" + message
+        command.command_status.add_to_log(
+            CommandPhaseType.INITIALIZATION,
+            CommandLogRecord(CommandStatusType.FAILURE, message, recommendation))
+    elif pv_BoundingBox and pv_ClipGeoLayerID:
+        message = "The BoundingBox and ClipGeoLayerID parameters cannot both be specified."
+        recommendation = "Specify the BoundingBox parameter or the ClipGeoLayerID parameter."
+        warning += "\n" + message
+        command.command_status.add_to_log(
+            CommandPhaseType.INITIALIZATION,
+            CommandLogRecord(CommandStatusType.FAILURE, message, recommendation))
+
+    return warning
+
+
 def get_command_status_max_severity(processor):
     """
     Get the maximum command status severity for the processor.  This is used, for example, when
@@ -128,6 +169,31 @@ def get_highest_command_status_severity(command_status):
     return status_severity
 
 
+def get_read_bbox(command, bounding_box, clip_geolayer_id):
+    """
+    Determine the bounding box of the features to read by a command that reads GeoLayers, from the BoundingBox
+    parameter or the extent of the ClipGeoLayerID GeoLayer (see check_read_bbox_parameters()).
+
+    Args:
+        command: The command that reads the GeoLayers.
+        bounding_box (str): the BoundingBox parameter value (xmin,ymin,xmax,ymax), or None
+        clip_geolayer_id (str): the ClipGeoLayerID parameter value, or None
+
+    Returns:
+        A tuple of the bounding box (xmin, ymin, xmax, ymax) and its coordinate reference system code, which is
+        None if the bounding box is in the coordinate reference system of the data. The bounding box is None if
+        neither parameter is specified.
+    """
+
+    if clip_geolayer_id:
+        clip_geolayer = command.command_processor.get_geolayer(clip_geolayer_id)
+        return clip_geolayer.get_extent(), clip_geolayer.get_crs()
+    elif bounding_box:
+        return tuple([float(bound) for bound in string_util.delimited_string_to_list(bounding_box)]), None
+    else:
+        return None, None
+
+
 def parse_command_name_from_command_string(command_string):
     """
     Parses the command name out of the command string.
@@ -21,6 +21,21 @@ from osgeo import gdal, ogr, osr
 import geoprocessor.util.io_util as io_util
 import os
 
+from concurrent.futures import ThreadPoolExecutor
+
+# The default maximum number of threads used to read files concurrently (see read_ogr_files_metadata()).
+# Reading is limited by disk and network I/O more than by processing, so more threads than processors can be used.
+READ_MAX_WORKERS = min(32, (os.cpu_count() or 1) + 4)
+
+# The QGIS geometry type (see qgis_util.get_geometrytype_qgis()) of each OGR geometry type, without the 2.5D flag.
+__ogr_geometry_types = {ogr.wkbPoint: "Point",
+                        ogr.wkbMultiPoint: "Point",
+                        ogr.wkbLineString: "LineString",
+                        ogr.wkbMultiLineString: "LineString",
+                        ogr.wkbPolygon: "Polygon",
+                        ogr.wkbMultiPolygon: "Polygon",
+                        ogr.wkbNone: "NoGeometry"}
+
 
 def polygonize(raster_full_path, field_name, output_format, output_file, crs_code_int):
     # TODO egiles 2018-02-14 document
@@ -74,6 +89,137 @@ def polygonize(raster_full_path, field_name, output_format, output_file, crs_cod
     # Get the layer projection.
     spatialRef = dst_layer.GetSpatialRef()
 
+def read_ogr_files_metadata(spatial_data_files_abs, max_workers=None, where=None):
+    """
+    Reads the metadata of the first layer of each of several spatial data files (see read_ogr_layers_metadata()),
+    concurrently using a bounded pool of threads. Each file is opened with its own OGR dataset, and OGR does not hold
+    the Python global interpreter lock while it reads the file headers, so the files are read in parallel.
+    Only OGR objects are used on the worker threads. QGIS objects such as QgsVectorLayer must not be created here:
+    they are created on the command thread when the layer is first used (see LazyGeoLayer).
+
+    Args:
+        spatial_data_files_abs (list): the full pathnames of the spatial data files
+        max_workers (int): the maximum number of threads. Default: READ_MAX_WORKERS, limited to the number of
+            files.
+        where (str): an OGR SQL WHERE clause that is checked for each file (see read_ogr_layers_metadata()), or None
+
+    Returns:
+        A list of (metadata dictionary, exception) tuples in the order of spatial_data_files_abs. The metadata is None
+        if the file could not be read, and the exception is None if the file was read.
+    """
+
+    def read_one(spatial_data_file_abs):
+        try:
+            return read_ogr_layers_metadata(spatial_data_file_abs, where=where)[0], None
+        except Exception as e:
+            return None, e
+
+    spatial_data_files_abs = list(spatial_data_files_abs)
+    if max_workers is None:
+        max_workers = READ_MAX_WORKERS
+    max_workers = max(1, min(max_workers, len(spatial_data_files_abs)))
+
+    if max_workers == 1:
+        return [read_one(spatial_data_file_abs) for spatial_data_file_abs in spatial_data_files_abs]
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(read_one, spatial_data_files_abs))
+
+
+def read_ogr_layers_metadata(data_source_abs, layer_names=None, where=None):
+    """
+    Reads the metadata of the layers of an OGR data source (a spatial data file or a file geodatabase) without reading
+    the features. The data source is opened once, read-only, and the metadata of all the requested layers are read
+    using the same dataset handle. The metadata are read from the file headers where the format allows it: the feature
+    count and extent are only included if the driver can determine them without reading the features
+    (for example, shapefiles store them in the file header).
+
+    If a WHERE clause is specified, it is checked for each layer by setting it as the OGR attribute filter, which
+    parses it against the layer attributes without reading the features, so that a filter that is applied later, when
+    the layer is opened, is known to be valid.
+
+    Args:
+        data_source_abs (str): the full pathname to the data source
+        layer_names (list): the names of the layers to read, or None to read all layers
+        where (str): an OGR SQL WHERE clause to check for each layer, or None to not check a WHERE clause
+
+    Returns:
+        A list of dictionaries, one for each layer, in the order of layer_names (or the data source), with the
+        following keys:
+            "layer_name" (str): the name of the layer
+            "crs" (str): the coordinate reference system as an authority code (for example "EPSG:4326"), or None if
+                the coordinate reference system does not have an authority code
+            "feature_count" (int): the number of features, or None if it is not known without reading the features
+            "extent" (tuple): (minimum x, maximum x, minimum y, maximum y), or None if it is not known without reading
+                the features
+            "attribute_names" (list): the names of the attributes
+            "geometry" (str): the geometry type in QGIS format (see qgis_util.get_geometrytype_qgis())
+
+    Raises:
+        IOError if the data source cannot be opened or a layer is not found.
+        ValueError if the WHERE clause is not valid for a layer.
+    """
+
+    data_source = ogr.Open(data_source_abs, 0)
+    if data_source is None:
+        raise IOError('Unable to open "{}" as an OGR data source.'.format(data_source_abs))
+
+    if layer_names is None:
+        layers = [data_source.GetLayerByIndex(i) for i in range(data_source.GetLayerCount())]
+    else:
+        layers = []
+        for layer_name in layer_names:
+            layer = data_source.GetLayerByName(layer_name)
+            if layer is None:
+                raise IOError('Layer "{}" is not found in "{}".'.format(layer_name, data_source_abs))
+            layers.append(layer)
+
+    metadata_list = []
+    for layer in layers:
+
+        # Check the WHERE clause. Depending on whether OGR exceptions are enabled, an invalid clause returns an error
+        # code or raises an exception. The filter is removed so that it does not affect the metadata.
+        if where:
+            try:
+                error = layer.SetAttributeFilter(where)
+            except Exception as e:
+                error = e
+            layer.SetAttributeFilter(None)
+            if error:
+                raise ValueError('The filter "{}" is not valid for layer "{}" in "{}".'.format(
+                    where, layer.GetName(), data_source_abs))
+
+        # The coordinate reference system is only used if it has an authority code, so that it matches the QGIS
+        # authority identifier.
+        crs = None
+        spatial_ref = layer.GetSpatialRef()
+        if spatial_ref is not None:
+            authority_name = spatial_ref.GetAuthorityName(None)
+            authority_code = spatial_ref.GetAuthorityCode(None)
+            if authority_name and authority_code:
+                crs = "{}:{}".format(authority_name, authority_code)
+
+        # Do not force the driver to read the features to count them or to compute the extent.
+        feature_count = layer.GetFeatureCount(force=0)
+        extent = layer.GetExtent(force=0, can_return_null=True)
+
+        layer_defn = layer.GetLayerDefn()
+        attribute_names = [layer_defn.GetFieldDefn(i).GetName() for i in range(layer_defn.GetFieldCount())]
+
+        metadata_list.append({
+            "layer_name": layer.GetName(),
+            "crs": crs,
+            "feature_count": feature_count if feature_count >= 0 else None,
+            "extent": extent,
+            "attribute_names": attribute_names,
+            "geometry": __ogr_geometry_types.get(ogr.GT_Flatten(layer.GetGeomType()), "UnknownGeometry")})
+
+    # Close the data source.
+    data_source = None
+
+    return metadata_list
+
+
 def reproject_a_layer(input_path, input_driver, output_path, output_crs_int):
 
     driver = ogr.GetDriverByName(input_driver)
@@ -0,0 +1,434 @@
+# geojson_util - utility functions to read GeoJSON files incrementally
+# ________________________________________________________________NoticeStart_
+# GeoProcessor
+# Copyright (C) 2017-2019 Open Water Foundation
+#
+# GeoProcessor is free software:  you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     GeoProcessor is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with GeoProcessor.  If not, see <https://www.gnu.org/licenses/>.
+# ________________________________________________________________NoticeEnd___
+
+import json
+
+# The number of characters read from a GeoJSON file at a time (see read_features()).
+READ_SIZE = 1048576
+
+# The record separator character that can start each feature in a GeoJSON text sequence (RFC 8142).
+RECORD_SEPARATOR = "\x1e"
+
+# The WKT geometry type of each GeoJSON geometry type.
+__wkt_geometry_types = {"Point": "POINT",
+                        "MultiPoint": "MULTIPOINT",
+                        "LineString": "LINESTRING",
+                        "MultiLineString": "MULTILINESTRING",
+                        "Polygon": "POLYGON",
+                        "MultiPolygon": "MULTIPOLYGON",
+                        "GeometryCollection": "GEOMETRYCOLLECTION"}
+
+
+def bbox_intersects(bbox, other_bbox):
+    """
+    Determine whether two bounding boxes intersect. Bounding boxes that only touch are considered to intersect.
+
+    Args:
+        bbox (tuple): the first bounding box (xmin, ymin, xmax, ymax)
+        other_bbox (tuple): the second bounding box (xmin, ymin, xmax, ymax)
+
+    Returns:
+        Boolean. TRUE if the bounding boxes intersect, FALSE if not.
+    """
+
+    return not (bbox[2] < other_bbox[0] or bbox[0] > other_bbox[2] or
+                bbox[3] < other_bbox[1] or bbox[1] > other_bbox[3])
+
+
+def __format_position(position, dimension):
+    """
+    Format a GeoJSON position as WKT coordinates.
+
+    Args:
+        position (list): the position [x, y] or [x, y, z]
+        dimension (int): the number of dimensions to write
+
+    Returns:
+        The coordinates separated by spaces.
+    """
+
+    if dimension == 3:
+        return "{} {} {}".format(position[0], position[1], position[2] if len(position) > 2 else 0)
+    return "{} {}".format(position[0], position[1])
+
+
+def __format_positions(positions, dimension):
+    """
+    Format a list of GeoJSON positions as WKT coordinates.
+
+    Args:
+        positions (list): the positions
+        dimension (int): the number of dimensions to write
+
+    Returns:
+        The coordinates of each position, separated by commas.
+    """
+
+    return ", ".join([__format_position(position, dimension) for position in positions])
+
+
+def geometry_to_wkt(geometry, dimension=None):
+    """
+    Convert a GeoJSON geometry to well-known text (WKT), so that it can be used to create a geometry object without
+    parsing the JSON again.
+
+    Args:
+        geometry (dict): the GeoJSON geometry
+        dimension (int): the number of dimensions to write (2 or 3). Missing Z values are written as 0.
+            If None, the dimension is determined from the geometry (see get_geometry_dimension()).
+
+    Returns:
+        The WKT string, or None if the geometry is null.
+
+    Raises:
+        ValueError if the geometry type is not recognized.
+    """
+
+    if not geometry:
+        return None
+    geometry_type = geometry.get("type")
+    wkt_type = __wkt_geometry_types.get(geometry_type)
+    if wkt_type is None:
+        raise ValueError('GeoJSON geometry type "{}" is not recognized.'.format(geometry_type))
+    if dimension is None:
+        dimension = get_geometry_dimension(geometry) or 2
+    if dimension == 3:
+        wkt_type += " Z"
+
+    if geometry_type == "GeometryCollection":
+        members = geometry.get("geometries") or []
+        if not members:
+            return wkt_type + " EMPTY"
+        return "{} ({})".format(wkt_type, ", ".join([geometry_to_wkt(member, dimension) for member in members]))
+
+    coordinates = geometry.get("coordinates")
+    if not coordinates:
+        return wkt_type + " EMPTY"
+    if geometry_type == "Point":
+        text = __format_position(coordinates, dimension)
+    elif geometry_type in ("MultiPoint", "LineString"):
+        text = __format_positions(coordinates, dimension)
+    elif geometry_type in ("MultiLineString", "Polygon"):
+        text = ", ".join(["(" + __format_positions(part, dimension) + ")" for part in coordinates])
+    else:
+        text = ", ".join(["(" + ", ".join(["(" + __format_positions(ring, dimension) + ")" for ring in polygon]) + ")"
+                          for polygon in coordinates])
+    return "{} ({})".format(wkt_type, text)
+
+
+def get_crs_code(geojson_crs):
+    """
+    Return the coordinate reference system code of a GeoJSON "crs" member, as written by GDAL and older GeoJSON files.
+    GeoJSON files without a "crs" member use WGS 84 (RFC 7946).
+
+    Args:
+        geojson_crs (dict): the value of the "crs" member, or None if the file does not have a "crs" member
+
+    Returns:
+        The coordinate reference system code (for example, EPSG:26913).
+    """
+
+    if not geojson_crs:
+        return "EPSG:4326"
+    name = geojson_crs.get("properties", {}).get("name", "")
+    if name.startswith("urn:ogc:def:crs:"):
+        # For example, urn:ogc:def:crs:EPSG::26913 or urn:ogc:def:crs:OGC:1.3:CRS84.
+        parts = name[len("urn:ogc:def:crs:"):].split(":")
+        if parts[0].upper() == "OGC" and parts[-1].upper() == "CRS84":
+            return "EPSG:4326"
+        return "{}:{}".format(parts[0], parts[-1])
+    elif name:
+        return name
+    else:
+        return "EPSG:4326"
+
+
+def get_geometry_bbox(geometry):
+    """
+    Return the bounding box of a GeoJSON geometry, using the "bbox" member if the geometry has one.
+
+    Args:
+        geometry (dict): the GeoJSON geometry
+
+    Returns:
+        The bounding box (xmin, ymin, xmax, ymax), or None if the geometry is null or has no coordinates.
+    """
+
+    if not geometry:
+        return None
+    bbox = geometry.get("bbox")
+    if bbox:
+        # The bounding box can have two or three dimensions.
+        half = len(bbox) // 2
+        return bbox[0], bbox[1], bbox[half], bbox[half + 1]
+
+    xmin = ymin = float("inf")
+    xmax = ymax = float("-inf")
+    for x, y in __iterate_positions(geometry):
+        if x < xmin:
+            xmin = x
+        if x > xmax:
+            xmax = x
+        if y < ymin:
+            ymin = y
+        if y > ymax:
+            ymax = y
+    if xmin > xmax:
+        return None
+    return xmin, ymin, xmax, ymax
+
+
+def get_geometry_dimension(geometry):
+    """
+    Return the number of dimensions of the positions of a GeoJSON geometry, determined from its first position.
+
+    Args:
+        geometry (dict): the GeoJSON geometry
+
+    Returns:
+        2 or 3, or 0 if the geometry is null or has no coordinates.
+    """
+
+    if not geometry:
+        return 0
+    if geometry.get("type") == "GeometryCollection":
+        for member in geometry.get("geometries") or []:
+            dimension = get_geometry_dimension(member)
+            if dimension:
+                return dimension
+        return 0
+    coordinates = geometry.get("coordinates")
+    while isinstance(coordinates, list) and coordinates and isinstance(coordinates[0], list):
+        coordinates = coordinates[0]
+    if not coordinates:
+        return 0
+    return 3 if len(coordinates) > 2 else 2
+
+
+def __iterate_positions(geometry):
+    """
+    Iterate over the x and y values of the positions of a GeoJSON geometry.
+
+    Args:
+        geometry (dict): the GeoJSON geometry
+
+    Returns:
+        A generator of (x, y) tuples.
+    """
+
+    if geometry.get("type") == "GeometryCollection":
+        for member in geometry.get("geometries") or []:
+            yield from __iterate_positions(member)
+        return
+
+    # Positions are the innermost lists, which contain numbers.
+    stack = [geometry.get("coordinates") or []]
+    while stack:
+        coordinates = stack.pop()
+        if coordinates and not isinstance(coordinates[0], list):
+            yield coordinates[0], coordinates[1]
+        else:
+            stack.extend(coordinates)
+
+
+def read_features(geojson_file_abs, sequence=False, members=None, read_size=READ_SIZE):
+    """
+    Read the features of a GeoJSON file one at a time. Only the current feature and a buffer of the file text are held
+    in memory, so files much larger than the available memory can be read.
+
+    A GeoJSON file is read with an incremental parser: the file is read in blocks of text, and each feature of the
+    FeatureCollection "features" array is decoded as soon as its text has been read. A GeoJSON text sequence
+    (GeoJSONSeq, RFC 8142) has one feature per line, optionally starting with a record separator character, and each
+    line is decoded separately.
+
+    Args:
+        geojson_file_abs (str): the full pathname to the GeoJSON file
+        sequence (bool): If TRUE, the file is a GeoJSON text sequence. If FALSE, the file contains a single
+            FeatureCollection or Feature.
+        members (dict): a dictionary that is filled with the members of the FeatureCollection other than "features",
+            for example "crs", or None if the members are not needed. Members that follow the "features" array are only
+            available after all features have been read.
+        read_size (int): the number of characters to read from the file at a time
+
+    Returns:
+        A generator of features, as dictionaries with the decoded JSON.
+
+    Raises:
+        ValueError if the file is not valid GeoJSON.
+    """
+
+    if members is None:
+        members = dict()
+
+    with open(geojson_file_abs, "r", encoding="utf-8-sig") as geojson_file:
+
+        if sequence:
+            for line in geojson_file:
+                line = line.strip().lstrip(RECORD_SEPARATOR)
+                if line:
+                    value = json.loads(line)
+                    if value.get("type") == "FeatureCollection":
+                        # Some sequences are written with one FeatureCollection per line.
+                        yield from value.get("features") or []
+                    else:
+                        yield value
+            return
+
+        reader = __GeoJSONTextReader(geojson_file, read_size)
+        reader.expect("{")
+        while True:
+            character = reader.peek()
+            if character == "}":
+                break
+            elif character == ",":
+                reader.skip()
+                continue
+
+            key = reader.decode()
+            reader.expect(":")
+            if key != "features":
+                members[key] = reader.decode()
+                continue
+
+            # Decode the features in the "features" array one at a time.
+            reader.expect("[")
+            while True:
+                character = reader.peek()
+                if character == "]":
+                    reader.skip()
+                    break
+                elif character == ",":
+                    reader.skip()
+                    continue
+                yield reader.decode()
+
+    # A file can contain a single Feature rather than a FeatureCollection.
+    if members.get("type") == "Feature":
+        yield dict(members)
+
+
+class __GeoJSONTextReader(object):
+    """
+    Decodes JSON values one at a time from a file, using a buffer of the file text that is extended as needed.
+    """
+
+    # The characters that can separate JSON values.
+    whitespace = frozenset(" \t\n\r")
+
+    def __init__(self, text_file, read_size):
+        """
+        Initialize the reader.
+
+        Args:
+            text_file (file): the file, open for reading text
+            read_size (int): the number of characters to read from the file at a time
+        """
+
+        self.decoder = json.JSONDecoder()
+        self.text_file = text_file
+        self.read_size = read_size
+        self.buffer = ""
+        self.position = 0
+        self.eof = False
+
+    def __read(self):
+        """
+        Read more text from the file and append it to the text that has not been decoded.
+
+        Returns:
+            Boolean. TRUE if text was read, FALSE if the end of the file was reached.
+        """
+
+        text = self.text_file.read(self.read_size)
+        if not text:
+            self.eof = True
+            return False
+        # Discard the text that has been decoded, so that the buffer only holds the current value.
+        self.buffer = self.buffer[self.position:] + text
+        self.position = 0
+        return True
+
+    def decode(self):
+        """
+        Decode the next JSON value.
+
+        Returns:
+            The decoded value.
+
+        Raises:
+            ValueError if the text is not valid JSON.
+        """
+
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.position)
+            except ValueError:
+                # The value may be incomplete. Read more text and try again.
+                if self.__read():
+                    continue
+                raise
+            if end == len(self.buffer) and not self.eof and self.__read():
+                # A number at the end of the buffer may continue in the text that has not been read.
+                continue
+            self.position = end
+            return value
+
+    def expect(self, character):
+        """
+        Skip the next character, which must be a specific character.
+
+        Args:
+            character (str): the expected character
+
+        Raises:
+            ValueError if the next character is not the expected character.
+        """
+
+        next_character = self.peek()
+        if next_character != character:
+            raise ValueError('Expected "{}" but found "{}" in GeoJSON text.'.format(character, next_character))
+        self.position += 1
+
+    def peek(self):
+        """
+        Return the next character that is not whitespace, without skipping it.
+
+        Returns:
+            The next character.
+
+        Raises:
+            ValueError if the end of the file is reached.
+        """
+
+        while True:
+            while self.position < len(self.buffer):
+                if self.buffer[self.position] not in self.whitespace:
+                    return self.buffer[self.position]
+                self.position += 1
+            if not self.__read():
+                raise ValueError("Unexpected end of GeoJSON text.")
+
+    def skip(self):
+        """
+        Skip the next character that is not whitespace.
+        """
+
+        self.peek()
+        self.position += 1
@@ -22,13 +22,54 @@ import geoprocessor.util.string_util as string_util
 import geoprocessor.util.app_util as app_util
 import geoprocessor.util.os_util as os_util
 
+import bz2
 import datetime
 import getpass
+import gzip
+import io
 import logging
+import lzma
 import os
 import platform
 import re
 import sys
+import zipfile
+
+# The compression types that are recognized by get_compression_type() and open_file().
+# Key: the compression type, Value: tuple of the file extension and the magic bytes at the start of the file
+COMPRESSION_TYPES = {
+    "BZ2": (".bz2", b"BZh"),
+    "GZIP": (".gz", b"\x1f\x8b"),
+    "XZ": (".xz", b"\xfd7zXZ\x00"),
+    "ZIP": (".zip", b"PK\x03\x04")
+}
+
+
+class __ZipMemberTextFile(io.TextIOWrapper):
+    """
+    Text file object for a member of a zip file, which also closes the zip file when it is closed.
+    """
+
+    def __init__(self, zip_file, member_file, **kwargs):
+        """
+        Initialize a new text file object.
+
+        Args:
+            zip_file (zipfile.ZipFile): the open zip file
+            member_file: the open binary file object of the zip file member
+            **kwargs: the keyword arguments for io.TextIOWrapper (encoding, newline)
+        """
+        super().__init__(member_file, **kwargs)
+        self.zip_file = zip_file
+
+    def close(self):
+        """
+        Close the member file and the zip file.
+        """
+        try:
+            super().close()
+        finally:
+            self.zip_file.close()
 
 
 def expand_formatter(absolute_path, formatter):
@@ -267,8 +308,8 @@ def get_col_names_from_delimited_file(delimited_file_abs, delimiter):
 
     try:
 
-        # Open the delimited file and iterate through the lines of the file.
-        with open(delimited_file_abs) as in_file:
+        # Open the delimited file and iterate through the lines of the file. The file may be compressed.
+        with open_file(delimited_file_abs) as in_file:
             for lineNum, line in enumerate(in_file):
 
                 # Return the column names of the header line in the delimited file. The column names are items of a
@@ -281,6 +322,39 @@ def get_col_names_from_delimited_file(delimited_file_abs, delimiter):
         return None
 
 
+def get_compression_type(full_path, check_content=True):
+    """
+    Determine the compression type of a file. If the file exists, the magic bytes at the start of the file are checked,
+    so that compressed files without the usual extension are recognized. Otherwise, the file extension is checked
+    (.bz2, .gz, .xz or .zip, case-insensitive).
+
+    Args:
+        full_path (str): the full pathname to the file
+        check_content (bool): If TRUE, check the magic bytes of existing files. If FALSE, only check the extension,
+            for example for output files that will be overwritten.
+
+    Returns:
+        The compression type (BZ2, GZIP, XZ or ZIP), or None if the file is not compressed.
+    """
+
+    if check_content and os.path.isfile(full_path):
+        with open(full_path, "rb") as f:
+            magic_bytes = f.read(6)
+        for compression_type, (extension, compression_magic_bytes) in COMPRESSION_TYPES.items():
+            if magic_bytes.startswith(compression_magic_bytes):
+                # The bzip2 magic bytes are followed by the block size digit, which avoids matching text files that
+                # happen to start with "BZh".
+                if compression_type == "BZ2" and (len(magic_bytes) < 4 or magic_bytes[3:4] not in b"123456789"):
+                    continue
+                return compression_type
+        return None
+
+    for compression_type, (extension, compression_magic_bytes) in COMPRESSION_TYPES.items():
+        if full_path.lower().endswith(extension):
+            return compression_type
+    return None
+
+
 def get_extension(full_path):
     """
     Returns the extension of a full path.
@@ -322,6 +396,54 @@ def get_path(full_path):
     return os.path.dirname(full_path)
 
 
+def open_file(full_path, mode="r", encoding=None, newline=None):
+    """
+    Open a text file, decompressing or compressing it as it is read or written if it is compressed
+    (see get_compression_type()). The data are streamed through the compression, so that a decompressed copy of the
+    file is never written to disk. When reading a zip file, the first file in the zip file is read. When writing a zip
+    file, the zip file contains one file with the name of the zip file without the .zip extension.
+
+    Args:
+        full_path (str): the full pathname to the file
+        mode (str): "r" to read, "w" to write, or "a" to append (appending is not supported for zip files)
+        encoding (str): the text encoding, or None to use the default encoding
+        newline (str): the newline handling, as for the built-in open() function (use "" with the csv module)
+
+    Returns:
+        An open text file object, which should be closed by the caller (for example, by using a with statement).
+
+    Raises:
+        ValueError if mode is "a" and the file is a zip file, because a zip file cannot be appended to without
+            replacing it.
+    """
+
+    compression_type = get_compression_type(full_path, check_content=(mode == "r"))
+
+    if compression_type == "BZ2":
+        return bz2.open(full_path, mode + "t", encoding=encoding, newline=newline)
+    elif compression_type == "GZIP":
+        return gzip.open(full_path, mode + "t", encoding=encoding, newline=newline)
+    elif compression_type == "XZ":
+        return lzma.open(full_path, mode + "t", encoding=encoding, newline=newline)
+    elif compression_type == "ZIP":
+        if mode == "a":
+            # Opening the zip file for writing would truncate it.
+            raise ValueError('Appending to zip file "{}" is not supported.'.format(full_path))
+        if mode == "r":
+            zip_file = zipfile.ZipFile(full_path, "r")
+            member_names = [name for name in zip_file.namelist() if not name.endswith("/")]
+            if len(member_names) == 0:
+                zip_file.close()
+                raise IOError('Zip file "{}" does not contain any files.'.format(full_path))
+            member_file = zip_file.open(member_names[0], "r")
+        else:
+            zip_file = zipfile.ZipFile(full_path, "w", compression=zipfile.ZIP_DEFLATED)
+            member_file = zip_file.open(os.path.basename(full_path)[:-len(".zip")], "w")
+        return __ZipMemberTextFile(zip_file, member_file, encoding=encoding, newline=newline)
+    else:
+        return open(full_path, mode, encoding=encoding, newline=newline)
+
+
 def print_standard_file_header(ofp, comment_line_prefix='#', max_width=120, properties=None):
     """
     Print a standard header to a file.  See __format_standard_file_header for an example of the header.
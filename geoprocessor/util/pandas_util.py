@@ -23,6 +23,8 @@ from openpyxl import load_workbook
 import xlwt
 
 import geoprocessor.util.io_util as io_util
+import geoprocessor.util.string_util as string_util
+import geoprocessor.util.type_util as type_util
 
 
 def create_data_frame_from_datastore_with_sql(sql_query, datastore_obj):
@@ -58,27 +60,167 @@ def create_data_frame_from_delimited_file(file_path, delimiter):
     return df
 
 
-def create_data_frame_from_excel(excel_workbook_path, excel_worksheet_name=None):
+def create_data_frame_from_excel(excel_workbook_path, excel_worksheet_name=None, include_col_patterns=None,
+                                 exclude_col_patterns=None, row_count=None, header_row=None, col_types=None):
     """
     Creates a pandas data frame object from an excel file.
 
+    Excel 2007+ workbooks (.xlsx, .xlsm) are streamed with openpyxl in read-only mode so that only the requested
+    worksheet is parsed, one row at a time. Only the selected columns are kept and reading stops when the requested
+    number of rows has been read, so that large workbooks can be read in bounded memory. Older workbooks (.xls) are
+    read with pandas.read_excel.
+
     Args:
         excel_workbook_path (str): the full pathname to the excel file
-        excel_worksheet_name (str): the name of the worksheet to read from the excel workbook
+        excel_worksheet_name (str): the name of the worksheet to read from the excel workbook. Default: the first
+            worksheet.
+        include_col_patterns (list): a list of glob-style patterns for the columns to read. Default: all columns.
+        exclude_col_patterns (list): a list of glob-style patterns for the columns to NOT read. Default: no columns
+            are excluded.
+        row_count (int): the maximum number of data rows to read. Default: all rows are read.
+        header_row (int): the worksheet row number (1 is the first row) containing the column names. Default: the
+            first row that is not empty. Rows above the header row are ignored.
+        col_types (dict): a dictionary of column data types. Key: the column name, Value: the data type (Boolean,
+            DateTime, Float, Int or Str). Columns that are not in the dictionary are assigned a data type based on
+            the values in the column.
 
     Returns:
         A pandas data frame object. This is the object that support the GeoProcessor's Table object.
     """
 
-    # If an excel worksheet is defined, define and return the data frame from the worksheet.
-    if excel_worksheet_name:
-        df = pd.read_excel(excel_workbook_path, sheet_name=excel_worksheet_name)
-        return df
+    # Old format workbooks cannot be streamed. Read with pandas, applying the column selection after the header
+    # is read.
+    if io_util.get_extension(excel_workbook_path).upper() == ".XLS":
+
+        if excel_worksheet_name is None:
+            excel_worksheet_name = 0
+
+        def use_col(col_name):
+            return len(string_util.filter_list_of_strings([str(col_name)], include_col_patterns,
+                                                          exclude_col_patterns)) > 0
+
+        df = pd.read_excel(excel_workbook_path, sheet_name=excel_worksheet_name, usecols=use_col, nrows=row_count,
+                           header=0 if header_row is None else header_row - 1)
+
+    else:
+
+        # The read-only workbook is required to be closed to release the file handle.
+        workbook = load_workbook(excel_workbook_path, read_only=True, data_only=True)
+        try:
+            if excel_worksheet_name is None:
+                worksheet = workbook.worksheets[0]
+            else:
+                worksheet = workbook[excel_worksheet_name]
+
+            rows = worksheet.iter_rows(values_only=True)
+
+            # Find the header row. Rows before the header row are skipped.
+            header = None
+            for row_number, row in enumerate(rows, start=1):
+                if header_row is None:
+                    if any(value is not None and value != "" for value in row):
+                        header = row
+                        break
+                elif row_number == header_row:
+                    header = row
+                    break
+
+            # If the worksheet has no header, return an empty data frame.
+            if header is None:
+                return pd.DataFrame()
+
+            # Name the columns without a header like pandas.read_excel does. Other header cells keep their values, so
+            # that, as with pandas.read_excel, a numeric header such as 2020 is an integer column name.
+            header_values = []
+            for i, value in enumerate(header):
+                if value is None or value == "":
+                    header_values.append("Unnamed: {}".format(i))
+                else:
+                    header_values.append(value)
+
+            # Determine the indices of the columns to keep. The patterns are matched to the header values as strings.
+            col_names = [str(value) for value in header_values]
+            selected_col_names = string_util.filter_list_of_strings(col_names, include_col_patterns,
+                                                                    exclude_col_patterns)
+            col_indices = [i for i, col_name in enumerate(col_names) if col_name in selected_col_names]
+
+            # Rename duplicate column names like pandas.read_excel does, so that no column is lost.
+            df_col_names = __deduplicate_col_names([header_values[i] for i in col_indices])
+
+            # Read the data rows for the selected columns, one list of values per column.
+            # Empty rows are only added if they are followed by a non-empty row, so that the trailing empty rows that
+            # are often included in the worksheet dimensions are ignored.
+            col_values = [[] for i in col_indices]
+            empty_row_count = 0
+            data_row_count = 0
+            for row in rows:
+                if row_count is not None and data_row_count >= row_count:
+                    break
+                values = [row[i] if i < len(row) else None for i in col_indices]
+                if all(value is None for value in values):
+                    empty_row_count += 1
+                    continue
+                for i in range(empty_row_count):
+                    for col_value_list in col_values:
+                        col_value_list.append(None)
+                data_row_count += empty_row_count + 1
+                empty_row_count = 0
+                for col_value_list, value in zip(col_values, values):
+                    col_value_list.append(value)
+
+            # Trim rows if the empty rows that were added pushed the row count over the limit.
+            if row_count is not None:
+                col_values = [col_value_list[:row_count] for col_value_list in col_values]
+
+            # Create a typed column for each list of values. Cell values are already typed, so text cells are kept
+            # as strings.
+            df = pd.DataFrame({col_name: create_series(col_value_list, parse_strings=False) for col_name, col_value_list
+                               in zip(df_col_names, col_values)}, columns=df_col_names)
+        finally:
+            workbook.close()
+
+    # Apply the data type hints.
+    if col_types:
+        pandas_types = {"BOOLEAN": "boolean", "DATETIME": "datetime64[ns]", "FLOAT": "float64", "INT": "Int64",
+                        "STR": "string"}
+        for col_name, col_type in col_types.items():
+            if col_name in df.columns:
+                if col_type.upper() == "DATETIME":
+                    df[col_name] = pd.to_datetime(df[col_name])
+                else:
+                    df[col_name] = df[col_name].astype(pandas_types[col_type.upper()])
+
+    return df
+
+
+def create_series(values, null_values=None, parse_strings=True):
+    """
+    Creates a pandas Series object from a list of column values, using the data type determined by
+    type_util.convert_column(). Columns of integers and Boolean values that contain null values use the pandas
+    nullable data types (Int64 and boolean), so that integers are not converted to floats.
+
+    Args:
+        values (list): the column values
+        null_values (list): the values that represent null values
+        parse_strings (bool): If TRUE, strings are converted to the data type of the column (see
+            type_util.convert_column()).
 
-    # If an excel worksheet is not defined, define and return the data frame from the FIRST worksheet.
+    Returns:
+        A pandas Series object.
+    """
+
+    data_type, converted_values = type_util.convert_column(values, null_values, parse_strings=parse_strings)
+    has_nulls = any(value is None for value in converted_values)
+    if data_type is bool:
+        dtype = "boolean" if has_nulls else "bool"
+    elif data_type is int:
+        dtype = "Int64" if has_nulls else "int64"
+    elif data_type is float:
+        dtype = "float64"
     else:
-        df = pd.read_excel(excel_workbook_path)
-        return df
+        # Let pandas determine the data type, for example for date/time values.
+        dtype = None
+    return pd.Series(converted_values, dtype=dtype)
 
 
 def create_excel_workbook_obj(excel_workbook_path):
@@ -98,6 +240,63 @@ def create_excel_workbook_obj(excel_workbook_path):
     return xl
 
 
+def __deduplicate_col_names(col_names):
+    """
+    Renames duplicate column names the same way that pandas does when it reads a file: the second and later
+    occurrences of a name are given the suffixes .1, .2, etc. For example, ["a", "a", "b"] is renamed to
+    ["a", "a.1", "b"]. A suffix is skipped if the suffixed name is used by another column, so ["a", "a", "a.1"] is
+    renamed to ["a", "a.2", "a.1"].
+
+    Args:
+        col_names (list): the column names, which are strings or other header cell values (for example, 2020).
+            A renamed duplicate is a string (for example, "2020.1").
+
+    Returns:
+        A list of unique column names, in the same order.
+    """
+
+    # The names that are used, including all of the original names.
+    used_col_names = set(col_names)
+    # Key: original column name, Value: the next suffix to try for the name.
+    next_suffixes = {}
+    seen_col_names = set()
+    unique_col_names = []
+    for col_name in col_names:
+        if col_name in seen_col_names:
+            suffix = next_suffixes.get(col_name, 1)
+            while "{}.{}".format(col_name, suffix) in used_col_names:
+                suffix += 1
+            next_suffixes[col_name] = suffix + 1
+            col_name = "{}.{}".format(col_name, suffix)
+            used_col_names.add(col_name)
+        seen_col_names.add(col_name)
+        unique_col_names.append(col_name)
+    return unique_col_names
+
+
+def get_excel_sheet_names(excel_workbook_path):
+    """
+    Returns the names of the worksheets in an excel file. For Excel 2007+ workbooks, only the workbook index is
+    read (the worksheets are not parsed).
+
+    Args:
+        excel_workbook_path (str): the full pathname to the excel file
+
+    Returns:
+        A list of worksheet names, in workbook order.
+    """
+
+    # Old format workbooks cannot be opened with openpyxl.
+    if io_util.get_extension(excel_workbook_path).upper() == ".XLS":
+        return create_excel_workbook_obj(excel_workbook_path).sheet_names
+
+    workbook = load_workbook(excel_workbook_path, read_only=True)
+    try:
+        return workbook.sheetnames
+    finally:
+        workbook.close()
+
+
 def write_df_to_delimited_file(df, output_file_full_path, include_col_list, include_index, delimiter=","):
     """
     Writes a pandas data frame object to a delimited file.
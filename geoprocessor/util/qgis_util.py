@@ -19,12 +19,17 @@
 
 from datetime import datetime
 
+import csv
+import json
 import logging
 import os
+import zipfile
+from xml.sax.saxutils import escape, quoteattr
 
 from qgis.core import QgsApplication, QgsCoordinateReferenceSystem, QgsExpression, QgsFeature, QgsField
-from qgis.core import QgsGeometry, QgsRasterLayer, QgsVectorFileWriter, QgsVectorLayer
-from qgis.core import QgsExpressionContext, QgsExpressionContextScope
+from qgis.core import QgsGeometry, QgsRasterLayer, QgsVectorDataProvider, QgsVectorFileWriter, QgsVectorLayer
+from qgis.core import QgsExpressionContext, QgsExpressionContextUtils, QgsFeatureRequest
+from qgis.core import QgsCoordinateTransform, QgsProject, QgsRectangle, QgsWkbTypes
 
 from qgis.analysis import QgsNativeAlgorithms
 
@@ -32,6 +37,8 @@ import qgis.utils
 
 from plugins.processing.core import Processing
 
+import geoprocessor.util.geojson_util as geojson_util
+import geoprocessor.util.io_util as io_util
 import geoprocessor.util.string_util as string_util
 
 from PyQt5.QtCore import QVariant, QFileInfo
@@ -132,6 +139,218 @@ def add_qgsvectorlayer_attribute(qgsvectorlayer, attribute_name, attribute_type)
         raise ValueError(message)
 
 
+def change_qgsvectorlayer_attribute_values(qgsvectorlayer, attribute_values, chunk_size=10000):
+    """
+    Changes the attribute values of features of a QgsVectorLayer, using one data provider call per chunk of features
+    rather than one call per feature. Each data provider call may write to the data source (for example, one
+    transaction for a GeoPackage), so batching the changes is much faster for large layers. Chunking limits the size
+    of the change map that is passed to the data provider for huge layers.
+
+    Args:
+        qgsvectorlayer (QgsVectorLayer): a QgsVectorLayer object
+        attribute_values (dict or iterable): the attribute values to change, as a dictionary or an iterable of
+            (key, value) tuples (for example, from a generator, so that the change map does not need to be created for
+            all features at once).
+            Key: the feature ID, Value: a dictionary of attribute values (Key: attribute index, Value: attribute value)
+        chunk_size (int): the maximum number of features that are changed in one data provider call
+
+    Returns:
+        None
+
+    Raises:
+        RuntimeError if the data provider cannot change the attribute values.
+    """
+
+    if isinstance(attribute_values, dict):
+        attribute_values = attribute_values.items()
+
+    data_provider = qgsvectorlayer.dataProvider()
+    chunk = {}
+    for feature_id, feature_attribute_values in attribute_values:
+        chunk[feature_id] = feature_attribute_values
+        if len(chunk) >= chunk_size:
+            if not data_provider.changeAttributeValues(chunk):
+                raise RuntimeError('Error changing the attribute values of layer "{}".'.format(qgsvectorlayer.name()))
+            chunk = {}
+    if chunk:
+        if not data_provider.changeAttributeValues(chunk):
+            raise RuntimeError('Error changing the attribute values of layer "{}".'.format(qgsvectorlayer.name()))
+
+
+def copy_qgsvectorlayer(qgsvectorlayer, attribute_names=None, filter_expression=None, batch_size=10000,
+                        feature_ids=None, layer_name=None, filter_rect=None):
+    """
+    Creates a copy of a QgsVectorLayer object in memory, optionally with only some of the attributes and only the
+    features that match a filter expression. The filter expression and the attributes are applied in the feature
+    request of the input layer (see get_qgsfeaturerequest_obj()), so features that are not copied are filtered by the
+    data provider when possible, and attributes that are not copied are not read. The features are read and added to
+    the copied QgsVectorLayer in batches, so the input features are never all held in a list.
+
+    Args:
+        qgsvectorlayer (QgsVectorLayer): the QgsVectorLayer object to copy.
+        attribute_names (list): the names of the attributes to copy, or None to copy all attributes. The attributes
+            are copied in the order of the input layer.
+        filter_expression (QgsExpression): an expression that features must match to be copied, or None to copy all
+            features.
+        batch_size (int): the number of features added to the copied QgsVectorLayer in each data provider call.
+        feature_ids (set): the IDs of the features to copy (a set or other iterable), or None to copy all features.
+            Cannot be used with filter_expression.
+        layer_name (str): the name of the copied QgsVectorLayer. Default: a unique name using the current time.
+        filter_rect (QgsRectangle): a rectangle that features must intersect to be copied, in the coordinate reference
+            system of the layer, or None to copy all features.
+
+    Returns:
+        The copied QgsVectorLayer object.
+    """
+
+    # REF: https://gis.stackexchange.com/questions/205947/duplicating-layer-in-memory-using-pyqgis
+    # acceptable geometry values: Point, LineString, Polygon, MultiLineString, MultiPolygon
+
+    # Get the geometry of the input QgsVectorLayer (qgis format).
+    qgis_geometry = get_geometrytype_qgis(qgsvectorlayer)
+
+    # Get the coordinate reference system of teh input QgsVectorLayer (string epsg code).
+    crs = qgsvectorlayer.crs().authid()
+
+    # Get the now_id: a string of numbers representing the current date and time. This is used to uniquely define the
+    # layer name of the copied QgsVectorLayer (otherwise errors could occur).
+    if layer_name is None:
+        now = datetime.now()
+        now_id = "{}{}{}{}{}{}{}".format(now.year, now.month, now.day, now.hour, now.minute, now.second,
+                                         now.microsecond)
+        layer_name = "layer_{}".format(now_id)
+
+    # Create a new in-memory QgsVectorLayer with same feature geometry type and CRS as the input QgsVectorLayer.
+    copied_qgsvectorlayer = QgsVectorLayer("{}?crs={}".format(qgis_geometry, crs), layer_name, "memory")
+
+    # Start the data provider for the in-memory copied QgsVectorLayer.
+    copied_qgsvectorlayer_data = copied_qgsvectorlayer.dataProvider()
+
+    # Get a list of the input QgsVectorLayer's attributes to copy, and their indices in the input QgsVectorLayer.
+    fields = qgsvectorlayer.dataProvider().fields()
+    if attribute_names is None:
+        attr = fields.toList()
+        attr_indices = None
+    else:
+        attribute_names = set(attribute_names)
+        attr = [field for field in fields.toList() if field.name() in attribute_names]
+        attr_indices = [fields.lookupField(field.name()) for field in attr]
+
+    # Add the attributes to copy to the copied QgsVectorLayer.
+    copied_qgsvectorlayer_data.addAttributes(attr)
+    copied_qgsvectorlayer.updateFields()
+    copied_fields = copied_qgsvectorlayer.fields()
+
+    # Read the features to copy. Only the attributes to copy (and the attributes used by the filter expression) are
+    # requested.
+    request = get_qgsfeaturerequest_obj(qgsvectorlayer, None if attribute_names is None else list(attribute_names),
+                                        include_geometry=True, filter_expression=filter_expression,
+                                        feature_ids=feature_ids, filter_rect=filter_rect)
+
+    # Add the features to the copied QgsVectorLayer in batches.
+    batch = []
+    for feature in qgsvectorlayer.getFeatures(request):
+        if attr_indices is not None:
+            # Create a feature with only the copied attributes.
+            attributes = feature.attributes()
+            copied_feature = QgsFeature(copied_fields)
+            copied_feature.setGeometry(feature.geometry())
+            copied_feature.setAttributes([attributes[i] for i in attr_indices])
+            feature = copied_feature
+        batch.append(feature)
+        if len(batch) >= batch_size:
+            copied_qgsvectorlayer_data.addFeatures(batch)
+            batch = []
+    if batch:
+        copied_qgsvectorlayer_data.addFeatures(batch)
+
+    # Update the extent of the copied QgsVectorLayer, which is not updated as features are added by the data provider.
+    copied_qgsvectorlayer.updateExtents()
+
+    # Return the copied QgsVectorLayer.
+    return copied_qgsvectorlayer
+
+
+def create_delimited_file_vrt(delimited_file_abs, crs, x_col_name=None, y_col_name=None, wkt_col_name=None,
+                              delimiter=","):
+    """
+    Create an OGR virtual format (VRT) data source for a compressed delimited file. The VRT reads the delimited file
+    through the GDAL /vsigzip/ or /vsizip/ virtual file systems, so the file is decompressed as it is read and a
+    decompressed copy of the file is never written to disk. The OGR CSV driver is opened with the delimiter and with
+    the data types of the fields detected from the values (all of the values are checked), so that the attributes have
+    the same types as when the uncompressed file is read by the QGIS delimited text provider.
+    REF: https://gdal.org/drivers/vector/vrt.html
+    REF: https://gdal.org/drivers/vector/csv.html
+
+    Args:
+        delimited_file_abs (str): the full pathname to a delimited file compressed with gzip (.gz) or zip (.zip)
+        crs (str): the coordinate reference system (in EPSG code)
+        x_col_name (str): the name of the field containing the x coordinates, if the geometry is from X and Y columns
+        y_col_name (str): the name of the field containing the y coordinates, if the geometry is from X and Y columns
+        wkt_col_name (str): the name of the field containing the WKT geometry data, if the geometry is from WKT
+        delimiter (str): the delimiter character: a comma, semicolon, tab, space or pipe (|) character
+
+    Raises:
+        IOError if the compression type cannot be read by GDAL (bzip2 and xz are not supported) or the delimiter is
+        not supported by the OGR CSV driver.
+
+    Returns:
+        The VRT XML as a string, which can be used as the data source of an "ogr" QgsVectorLayer.
+    """
+
+    # GDAL uses forward slashes in virtual file system paths on all operating systems.
+    delimited_file_path = delimited_file_abs.replace("\\", "/")
+
+    # Determine the GDAL virtual file system path and the OGR layer name, which is the filename without extensions.
+    compression_type = io_util.get_compression_type(delimited_file_abs)
+    if compression_type == "GZIP":
+        virtual_path = "/vsigzip/" + delimited_file_path
+        layer_name = os.path.basename(delimited_file_path)
+        if layer_name.lower().endswith(".gz"):
+            layer_name = layer_name[:-len(".gz")]
+    elif compression_type == "ZIP":
+        # Read the first file in the zip file, consistent with io_util.open_file().
+        with zipfile.ZipFile(delimited_file_abs, "r") as zip_file:
+            member_names = [name for name in zip_file.namelist() if not name.endswith("/")]
+        if len(member_names) == 0:
+            raise IOError('Zip file "{}" does not contain any files.'.format(delimited_file_abs))
+        virtual_path = "/vsizip/" + delimited_file_path + "/" + member_names[0]
+        layer_name = os.path.basename(member_names[0])
+    else:
+        message = 'Compression type {} of delimited file "{}" cannot be read as a GeoLayer. ' \
+                  'Use gzip (.gz) or zip (.zip) compression.'.format(compression_type, delimited_file_abs)
+        logger = logging.getLogger(__name__)
+        logger.warning(message)
+        raise IOError(message)
+    if layer_name.lower().endswith(".csv"):
+        layer_name = layer_name[:-len(".csv")]
+
+    # The OGR CSV driver only supports some delimiters, which are specified by name.
+    separators = {",": "COMMA", ";": "SEMICOLON", "\t": "TAB", " ": "SPACE", "|": "PIPE"}
+    if delimiter not in separators:
+        message = 'Delimiter "{}" of compressed delimited file "{}" is not supported. ' \
+                  'Use a comma, semicolon, tab, space or pipe (|) delimiter.'.format(delimiter, delimited_file_abs)
+        logger = logging.getLogger(__name__)
+        logger.warning(message)
+        raise IOError(message)
+    open_options = '<OpenOptions><OOI key="SEPARATOR">{}</OOI><OOI key="AUTODETECT_TYPE">YES</OOI>' \
+                   '<OOI key="AUTODETECT_SIZE_LIMIT">0</OOI></OpenOptions>'.format(separators[delimiter])
+
+    # The geometry is created from the X and Y columns or from the WKT column.
+    if wkt_col_name:
+        geometry_field = '<GeometryField encoding="WKT" field={}/>'.format(quoteattr(wkt_col_name))
+    else:
+        geometry_field = '<GeometryField encoding="PointFromColumns" x={} y={}/>'.format(quoteattr(x_col_name),
+                                                                                        quoteattr(y_col_name))
+
+    # The "CSV:" prefix forces the OGR CSV driver, regardless of the file extension.
+    return ('<OGRVRTDataSource><OGRVRTLayer name={}>'
+            '<SrcDataSource>CSV:{}</SrcDataSource>{}<SrcLayer>{}</SrcLayer>'
+            '<LayerSRS>{}</LayerSRS>{}'
+            '</OGRVRTLayer></OGRVRTDataSource>').format(quoteattr(layer_name), escape(virtual_path), open_options,
+                                                        escape(layer_name), escape(crs), geometry_field)
+
+
 def create_qgsgeometry(geometry_format, geometry_input_as_string):
     """
     Create a QGSGeometry object from input data. Can create an object from data in well-known text (WKT) and
@@ -201,7 +420,7 @@ def deepcopy_qqsvectorlayer(qgsvectorlayer):
     """
     Creates a deep copy (separate instance) of a QgsVectorLayer object. Spatial features, attributes, and the
     coordinate reference system from the input QgsVectorLayer object will be retained in the output copied
-    QgsVectorLayer object.
+    QgsVectorLayer object. The features are copied in batches (see copy_qgsvectorlayer()).
 
     Args:
         qgsvectorlayer (QgsVectorLayer): the QgsVectorLayer object to deep copy.
@@ -210,41 +429,46 @@ def deepcopy_qqsvectorlayer(qgsvectorlayer):
         The deep copied QgsVectorLater object.
     """
 
-    # REF: https://gis.stackexchange.com/questions/205947/duplicating-layer-in-memory-using-pyqgis
-    # acceptable geometry values: Point, LineString, Polygon, MultiLineString, MultiPolygon
-
-    # Get the features of the input QgsVectorLayer.
-    feats = [feat for feat in qgsvectorlayer.getFeatures()]
-
-    # Get the geometry of the input QgsVectorLayer (qgis format).
-    qgis_geometry = get_geometrytype_qgis(qgsvectorlayer)
+    return copy_qgsvectorlayer(qgsvectorlayer)
 
-    # Get the coordinate reference system of teh input QgsVectorLayer (string epsg code).
-    crs = qgsvectorlayer.crs().authid()
 
-    # Get the now_id: a string of numbers representing the current date and time. This is used to uniquely define the
-    # layer name of the copied QgsVectorLayer (otherwise errors could occur).
-    now = datetime.now()
-    now_id = "{}{}{}{}{}{}{}".format(now.year, now.month, now.day, now.hour, now.minute, now.second, now.microsecond)
+def estimate_qgsvectorlayer_memory_size(qgsvectorlayer, sample_size=100):
+    """
+    Estimate the memory used by the features of a QgsVectorLayer object. Only layers that use the "memory" data
+    provider hold their features in memory. Other layers read their features from the data source when needed.
+    The size is estimated from the geometry and attribute sizes of a sample of the features, so that the estimate
+    does not require reading all the features.
 
-    # Create a new in-memory QgsVectorLayer with same feature geometry type and CRS as the input QgsVectorLayer.
-    copied_qgsvectorlayer = QgsVectorLayer("{}?crs={}".format(qgis_geometry, crs), "layer_{}".format(now_id), "memory")
+    Args:
+        qgsvectorlayer (QgsVectorLayer): the QgsVectorLayer object
+        sample_size (int): the number of features used to estimate the average feature size
 
-    # Start the data provider for the in-memory copied QgsVectorLayer.
-    copied_qgsvectorlayer_data = copied_qgsvectorlayer.dataProvider()
+    Returns:
+        The estimated size in bytes (int). Zero is returned for layers that do not use the "memory" data provider.
+    """
 
-    # Get a list of the input QgsVectorLayer's attributes.
-    attr = qgsvectorlayer.dataProvider().fields().toList()
+    if qgsvectorlayer.dataProvider().name() != "memory":
+        return 0
 
-    # Add the attributes of the input QgsVectorLayer to the copied QgsVectorLayer.
-    copied_qgsvectorlayer_data.addAttributes(attr)
-    copied_qgsvectorlayer.updateFields()
+    feature_count = qgsvectorlayer.featureCount()
+    if feature_count <= 0:
+        return 0
 
-    # Add the features of the input QgsVectorLayer to the copied QgsVectorLayer.
-    copied_qgsvectorlayer_data.addFeatures(feats)
+    # Add the size of the geometry in WKB format, the size of the attribute values as strings, and an allowance for
+    # the feature object overhead.
+    sample_bytes = 0
+    sample_count = 0
+    for feature in qgsvectorlayer.getFeatures(QgsFeatureRequest().setLimit(sample_size)):
+        sample_count += 1
+        sample_bytes += 100
+        if feature.hasGeometry():
+            sample_bytes += len(feature.geometry().asWkb())
+        for attribute in feature.attributes():
+            sample_bytes += 16 + len(str(attribute))
 
-    # Return the deep copied QgsVectorLayer.
-    return copied_qgsvectorlayer
+    if sample_count == 0:
+        return 0
+    return int(sample_bytes / sample_count * feature_count)
 
 
 def exit_qgis():
@@ -297,82 +521,23 @@ def get_extent_from_geolayers(selected_geolayers):
     return qgis.core.QgsRectangle(xmin, ymin, xmax, ymax)
 
 
-def get_features_matching_expression(qgsvectorlayer, qgs_expression):
-    """
-    Returns the QgsFeature objects of the features that match the input QgsExpression.
-
-    Args:
-        qgsvectorlayer (QgsVectorLayer): the QgsVectorLayer object to evaluate.
-        qgs_expression (QgsExpression): the QgsExpression object to filter the QgsVectorLayer's features.
-
-    Returns:
-        - A list of QgsFeature objects of features that match the input qgs_expression.
-        - Empty list if no features match the input expression.
-    """
-
-    # A list to hold the QgsFeature objects that match the QgsExpression.
-    matching_features = []
-
-    # These variables are used to increase the speed that the evaluation takes to run when evaluating multiple features
-    # of a QgsVectorLayer.
-    # REF: https://docs.qgis.org/testing/en/docs/pyqgis_developer_cookbook/expressions.html
-    # REF: https://gis.stackexchange.com/questions/244068/pyqgis-gives-typeerror-qgsexpression-prepare-argument-1-
-    #      has-unexpected-type/244088#244088
-    context = QgsExpressionContext()
-    scope = QgsExpressionContextScope()
-
-    # Iterate over the features of the QgsVectorLayer
-    for feature in qgsvectorlayer.getFeatures():
-
-        # Set the scope to the current feature.
-        scope.setFeature(feature)
-        context.appendScope(scope)
-
-        # If the evaluation of the feature is TRUE, append the feature to the matching_features list.
-        if qgs_expression.evaluate(context) == 1:
-            matching_features.append(feature)
-
-    # Return the list of QgsFeatures that match the input QgsExpression.
-    return matching_features
-
-
-def get_features_not_matching_expression(qgsvectorlayer, qgs_expression):
+def get_features(qgsvectorlayer, attribute_names=None, include_geometry=True):
     """
-    Returns the QgsFeature objects of the features that do not match the input QgsExpression.
+    Returns an iterator over the features of a QgsVectorLayer. Only the requested attributes, and only the geometry if
+    requested, are read by the data provider (see get_qgsfeaturerequest_obj()). Commands that only use attribute values
+    should not request the geometry, to avoid reading and decoding the geometry of each feature.
 
     Args:
-        qgsvectorlayer (QgsVectorLayer): the QgsVectorLayer object to evaluate.
-        qgs_expression (QgsExpression): the QgsExpression object to filter the QgsVectorLayer's features.
+        qgsvectorlayer (QgsVectorLayer): the QgsVectorLayer object
+        attribute_names (list): the names of the attributes to read, an empty list to read no attributes (for example,
+            if only the feature IDs are needed), or None to read all attributes
+        include_geometry (bool): If TRUE, the feature geometry is read. If FALSE, the features do not have a geometry.
 
     Returns:
-        A list of QgsFeature objects of features that do not match the input qgs_expression.
-        Return an empty list if all features match the input expression.
+        A QgsFeatureIterator of QgsFeature objects. Attributes that are not read have NULL values.
     """
 
-    # A list to hold the QgsFeature objects that do not match the QgsExpression.
-    non_matching_features = []
-
-    # These variables are used to increase the speed that the evaluation takes to run when evaluating multiple features
-    # of a QgsVectorLayer.
-    # REF: https://docs.qgis.org/testing/en/docs/pyqgis_developer_cookbook/expressions.html
-    # REF: https://gis.stackexchange.com/questions/244068/pyqgis-gives-typeerror-qgsexpression-prepare-argument-1-
-    #      has-unexpected-type/244088#244088
-    context = QgsExpressionContext()
-    scope = QgsExpressionContextScope()
-
-    # Iterate over the features of the QgsVectorLayer
-    for feature in qgsvectorlayer.getFeatures():
-
-        # Set the scope to the current feature.
-        scope.setFeature(feature)
-        context.appendScope(scope)
-
-        # If the evaluation of the feature is FALSE, append the feature to the non_matching_features list.
-        if qgs_expression.evaluate(context) == 0:
-            non_matching_features.append(feature)
-
-    # Return the list of QgsFeatures that do not match the input QgsExpression.
-    return non_matching_features
+    return qgsvectorlayer.getFeatures(get_qgsfeaturerequest_obj(qgsvectorlayer, attribute_names, include_geometry))
 
 
 def get_geometrytype_qgis(qgsvectorlayer):
@@ -564,6 +729,71 @@ def get_qgscoordinatereferencesystem_obj(crs_code):
         return None
 
 
+def get_qgsfeaturerequest_obj(qgsvectorlayer, attribute_names=None, include_geometry=True, filter_expression=None,
+                              feature_ids=None, filter_rect=None):
+    """
+    Returns a QgsFeatureRequest object that only requests the attributes and geometry that are needed, and optionally
+    only the features that match a filter expression, have specific feature IDs or intersect a rectangle.
+    REF: https://qgis.org/api/classQgsFeatureRequest.html
+
+    Args:
+        qgsvectorlayer (QgsVectorLayer): the QgsVectorLayer object that the request is for, used to look up the
+            attribute indices
+        attribute_names (list): the names of the attributes to request, an empty list to request no attributes, or
+            None to request all attributes
+        include_geometry (bool): If TRUE, the feature geometry is requested. If FALSE, the NoGeometry flag is set.
+        filter_expression (QgsExpression): an expression that features must match, or None to request all features.
+            Features for which the expression evaluates to NULL do not match the expression and are not requested.
+            The attributes and geometry used by the expression are requested, so that the expression can be evaluated.
+            Data providers that can compile the expression filter the features in the data source.
+        feature_ids (set): the IDs of the features to request (a set or other iterable), or None to request all
+            features. Cannot be used with filter_expression.
+        filter_rect (QgsRectangle): a rectangle that the feature geometries must intersect, in the coordinate reference
+            system of the layer, or None to request all features. The OGR data provider passes the rectangle to OGR
+            as a spatial filter, which uses the spatial index of the data source (for example, a shapefile .qix or
+            .sbn file or a GeoPackage R-tree), if it has one.
+
+    Returns:
+        A QgsFeatureRequest object.
+
+    Raises:
+        ValueError if both filter_expression and feature_ids are specified.
+    """
+
+    request = QgsFeatureRequest()
+
+    if feature_ids is not None:
+        if filter_expression is not None:
+            raise ValueError("A feature request cannot filter by both an expression and feature IDs.")
+        # The request requires a set of feature IDs.
+        request.setFilterFids(set(feature_ids))
+
+    if filter_expression is not None:
+        request.setFilterExpression(filter_expression.expression())
+        # The expression context is used to prepare the expression once for all features.
+        request.setExpressionContext(
+            QgsExpressionContext(QgsExpressionContextUtils.globalProjectLayerScopes(qgsvectorlayer)))
+        if filter_expression.needsGeometry():
+            include_geometry = True
+        if attribute_names is not None:
+            referenced_columns = filter_expression.referencedColumns()
+            if QgsFeatureRequest.ALL_ATTRIBUTES in referenced_columns:
+                attribute_names = None
+            else:
+                attribute_names = list(attribute_names) + [name for name in referenced_columns
+                                                           if name not in attribute_names]
+
+    if filter_rect is not None:
+        # The geometries are tested exactly, rather than only their bounding boxes.
+        request.setFilterRect(filter_rect)
+        request.setFlags(QgsFeatureRequest.ExactIntersect)
+    elif not include_geometry:
+        request.setFlags(QgsFeatureRequest.NoGeometry)
+    if attribute_names is not None:
+        request.setSubsetOfAttributes(list(attribute_names), qgsvectorlayer.fields())
+    return request
+
+
 def get_qgsexpression_obj(expression_as_string):
     """
     Checks if the expression_as_string creates a valid and usable QgsExpression object. If so, return
@@ -637,6 +867,134 @@ def initialize_qgis_processor():
     return pr
 
 
+def merge_qgsvectorlayers(qgsvectorlayers, attribute_maps=None, crs=None, batch_size=10000, layer_name=None):
+    """
+    Merges QgsVectorLayer objects with the same geometry type into one new in-memory QgsVectorLayer.
+
+    The attributes of the merged QgsVectorLayer are determined before any features are read: each input attribute is
+    renamed using the attribute map of its layer, and attributes with the same (renamed) name are merged into one
+    attribute, in the order that they are first found. The features of each input layer are then read and added to the
+    merged QgsVectorLayer in batches, with the attribute values placed in the merged attributes as they are read. The
+    input layers are not copied or modified, and the input features are never all held in a list.
+
+    * Features from an input layer that does not have a merged attribute have a NULL value for that attribute.
+    * If a merged attribute has different types in the input layers, the attribute is a string attribute.
+    * If any input layer has a multi-part geometry type, the merged QgsVectorLayer is multi-part and single-part
+        geometries are converted to multi-part geometries.
+    * Features from an input layer with a different coordinate reference system are reprojected to the merged CRS.
+
+    Args:
+        qgsvectorlayers (list): a list of QgsVectorLayer objects to merge, which must have the same geometry type.
+        attribute_maps (list): a list of dictionaries, one for each input layer, that rename the input attributes.
+            Key: the name of the input attribute. Value: the name of the attribute in the merged QgsVectorLayer.
+            Attributes that are not in the dictionary keep their names. If None, no attributes are renamed.
+        crs (QgsCoordinateReferenceSystem): the coordinate reference system of the merged QgsVectorLayer.
+            Default: the coordinate reference system of the first input layer.
+        batch_size (int): the number of features added to the merged QgsVectorLayer in each data provider call.
+        layer_name (str): the name of the merged QgsVectorLayer. Default: a unique name using the current time.
+
+    Returns:
+        The merged QgsVectorLayer object.
+    """
+
+    if attribute_maps is None:
+        attribute_maps = [{}] * len(qgsvectorlayers)
+
+    if crs is None:
+        crs = qgsvectorlayers[0].crs()
+
+    # Get the geometry type of the merged QgsVectorLayer. Single-part geometries can be stored as multi-part
+    # geometries, but not the reverse.
+    qgis_geometry = get_geometrytype_qgis(qgsvectorlayers[0])
+    is_multi = any(QgsWkbTypes.isMultiType(qgsvectorlayer.wkbType()) for qgsvectorlayer in qgsvectorlayers)
+    if is_multi:
+        qgis_geometry = "Multi{}".format(qgis_geometry)
+
+    # Get a unique layer name using the current date and time, as in copy_qgsvectorlayer().
+    if layer_name is None:
+        now = datetime.now()
+        now_id = "{}{}{}{}{}{}{}".format(now.year, now.month, now.day, now.hour, now.minute, now.second,
+                                         now.microsecond)
+        layer_name = "layer_{}".format(now_id)
+
+    # Determine the merged attributes, and for each input layer, the index of the merged attribute for each input
+    # attribute. This only reads the layer fields, not the features.
+    # Key: the merged attribute name. Value: the QgsField of the merged attribute.
+    merged_fields = {}
+    merged_names_list = []
+    for qgsvectorlayer, attribute_map in zip(qgsvectorlayers, attribute_maps):
+        merged_names = []
+        for field in qgsvectorlayer.fields().toList():
+            merged_name = attribute_map.get(field.name(), field.name())
+            merged_names.append(merged_name)
+            merged_field = merged_fields.get(merged_name)
+            if merged_field is None:
+                merged_field = QgsField(field)
+                merged_field.setName(merged_name)
+                merged_fields[merged_name] = merged_field
+            elif merged_field.type() != field.type():
+                # The attribute has different types in the input layers, so store the values as strings.
+                merged_fields[merged_name] = QgsField(merged_name, QVariant.String)
+        merged_names_list.append(merged_names)
+
+    # Create the merged in-memory QgsVectorLayer with the merged attributes.
+    merged_qgsvectorlayer = QgsVectorLayer("{}?crs={}".format(qgis_geometry, crs.authid()), layer_name, "memory")
+    merged_qgsvectorlayer_data = merged_qgsvectorlayer.dataProvider()
+    merged_qgsvectorlayer_data.addAttributes(list(merged_fields.values()))
+    merged_qgsvectorlayer.updateFields()
+    merged_layer_fields = merged_qgsvectorlayer.fields()
+    merged_field_count = merged_layer_fields.count()
+    string_indices = {i for i, field in enumerate(merged_fields.values()) if field.type() == QVariant.String}
+
+    # Add the features of each input layer to the merged QgsVectorLayer in batches.
+    batch = []
+    for qgsvectorlayer, merged_names in zip(qgsvectorlayers, merged_names_list):
+
+        # The index of the merged attribute for each attribute of the input layer, in the input attribute order.
+        merged_indices = [merged_layer_fields.lookupField(merged_name) for merged_name in merged_names]
+
+        # The input attributes with values that must be converted to strings for the merged attribute.
+        convert_indices = [i for i, field in enumerate(qgsvectorlayer.fields().toList())
+                           if merged_indices[i] in string_indices and field.type() != QVariant.String]
+
+        # Reproject the features if the input layer has a different coordinate reference system.
+        if qgsvectorlayer.crs() != crs:
+            transform = QgsCoordinateTransform(qgsvectorlayer.crs(), crs, QgsProject.instance())
+        else:
+            transform = None
+
+        for feature in qgsvectorlayer.getFeatures():
+            attributes = feature.attributes()
+            for i in convert_indices:
+                value = attributes[i]
+                if not (value is None or (isinstance(value, QVariant) and value.isNull())):
+                    attributes[i] = str(value)
+            merged_attributes = [None] * merged_field_count
+            for i, value in enumerate(attributes):
+                merged_attributes[merged_indices[i]] = value
+
+            geometry = feature.geometry()
+            if is_multi and not geometry.isMultipart():
+                geometry.convertToMultiType()
+            if transform is not None:
+                geometry.transform(transform)
+
+            merged_feature = QgsFeature(merged_layer_fields)
+            merged_feature.setGeometry(geometry)
+            merged_feature.setAttributes(merged_attributes)
+            batch.append(merged_feature)
+            if len(batch) >= batch_size:
+                merged_qgsvectorlayer_data.addFeatures(batch)
+                batch = []
+    if batch:
+        merged_qgsvectorlayer_data.addFeatures(batch)
+
+    # Update the extent of the merged QgsVectorLayer, which is not updated as features are added by the data provider.
+    merged_qgsvectorlayer.updateExtents()
+
+    return merged_qgsvectorlayer
+
+
 def populate_qgsvectorlayer_attribute(qgsvectorlayer, attribute_name, attribute_value):
     """
     Populates an attribute of a QgsVectorLayer with a single attribute value. If the attribute already has a value,
@@ -659,11 +1017,14 @@ def populate_qgsvectorlayer_attribute(qgsvectorlayer, attribute_name, attribute_
     # Value: the string to populate as the attribute's values
     attr = {attr_index: attribute_value}
 
-    # Iterate over the features of the QgsVectorLayer
-    for feature in qgsvectorlayer.getFeatures():
+    # Get the IDs of all features. Only the feature IDs are needed, so the attributes and the geometry are not read.
+    # The IDs are read before the attributes are changed so that the data source is not written while it is read.
+    feature_ids = [feature.id() for feature in get_features(qgsvectorlayer, attribute_names=[],
+                                                            include_geometry=False)]
 
-        # Rename/populate the features attribute with the desired input attribute value.
-        qgsvectorlayer.dataProvider().changeAttributeValues({feature.id(): attr})
+    # Populate the attribute of all features with the desired input attribute value, in batches. The change map is
+    # generated as it is applied, so the attribute dictionary is shared rather than created for each feature.
+    change_qgsvectorlayer_attribute_values(qgsvectorlayer, ((feature_id, attr) for feature_id in feature_ids))
 
 
 def read_qgsrasterlayer_from_file(spatial_data_file_abs):
@@ -705,7 +1066,8 @@ def read_qgsvectorlayer_from_delimited_file_wkt(delimited_file_abs, delimiter, c
     Reads a delimited file (with WKT column) and returns a QGSVectorLayerObject.
 
     Args:
-        delimited_file_abs (str): the full pathname to a delimited file
+        delimited_file_abs (str): the full pathname to a delimited file, which can be compressed with gzip (.gz) or
+            zip (.zip) (see create_delimited_file_vrt())
         delimiter (str): the delimiter symbol (often times is a comma)
         crs (str): the coordinate reference system (in EPSG code)
         wkt_col_name (str): the name of the field/column containing the WKT geometry data
@@ -723,8 +1085,13 @@ def read_qgsvectorlayer_from_delimited_file_wkt(delimited_file_abs, delimiter, c
     #   (3) the coordinate reference system (EPSG code)
     #   (4) the name of the field containing the wkt geometry data
     # REF: https://docs.qgis.org/2.14/en/docs/pyqgis_developer_cookbook/loadlayer.html
-    uri = "file:///{}?delimiter={}&crs={}&wktField={}".format(delimited_file_abs, delimiter, crs, wkt_col_name)
-    qgsvectorlayer = QgsVectorLayer(uri, os.path.basename(delimited_file_abs), "delimitedtext")
+    # Compressed files are read through an OGR virtual format data source, which decompresses the file as it is read.
+    if io_util.get_compression_type(delimited_file_abs) is not None:
+        vrt = create_delimited_file_vrt(delimited_file_abs, crs, wkt_col_name=wkt_col_name, delimiter=delimiter)
+        qgsvectorlayer = QgsVectorLayer(vrt, os.path.basename(delimited_file_abs), "ogr")
+    else:
+        uri = "file:///{}?delimiter={}&crs={}&wktField={}".format(delimited_file_abs, delimiter, crs, wkt_col_name)
+        qgsvectorlayer = QgsVectorLayer(uri, os.path.basename(delimited_file_abs), "delimitedtext")
 
     # If the QgsVectorLayer is valid, return it. Otherwise return None.
     if qgsvectorlayer.isValid():
@@ -741,7 +1108,8 @@ def read_qgsvectorlayer_from_delimited_file_xy(delimited_file_abs, delimiter, cr
     Reads a delimited file (with X and Y coordinates) and returns a QGSVectorLayerObject.
 
     Args:
-        delimited_file_abs (str): the full pathname to a delimited file
+        delimited_file_abs (str): the full pathname to a delimited file, which can be compressed with gzip (.gz) or
+            zip (.zip) (see create_delimited_file_vrt())
         delimiter (str): the delimiter symbol (often times is a comma)
         crs (str): the coordinate reference system (in EPSG code)
         x_col_name (str): the name of the field containing the x coordinates
@@ -762,9 +1130,15 @@ def read_qgsvectorlayer_from_delimited_file_xy(delimited_file_abs, delimiter, cr
     #   (4) the name of the field containing the x coordinates
     #   (5) the name of the field containing the y coordinates
     # REF: https://docs.qgis.org/2.14/en/docs/pyqgis_developer_cookbook/loadlayer.html
-    uri = "file:///{}?delimiter={}&crs={}&xField={}&yField={}".format(delimited_file_abs,
-                                                                      delimiter, crs, x_col_name, y_col_name)
-    qgsvectorlayer = QgsVectorLayer(uri, os.path.basename(delimited_file_abs), "delimitedtext")
+    # Compressed files are read through an OGR virtual format data source, which decompresses the file as it is read.
+    if io_util.get_compression_type(delimited_file_abs) is not None:
+        vrt = create_delimited_file_vrt(delimited_file_abs, crs, x_col_name=x_col_name, y_col_name=y_col_name,
+                                        delimiter=delimiter)
+        qgsvectorlayer = QgsVectorLayer(vrt, os.path.basename(delimited_file_abs), "ogr")
+    else:
+        uri = "file:///{}?delimiter={}&crs={}&xField={}&yField={}".format(delimited_file_abs,
+                                                                          delimiter, crs, x_col_name, y_col_name)
+        qgsvectorlayer = QgsVectorLayer(uri, os.path.basename(delimited_file_abs), "delimitedtext")
 
     # If the QgsVectorLayer is valid, return it. Otherwise return None.
     if qgsvectorlayer.isValid():
@@ -897,6 +1271,243 @@ def read_qgsvectorlayer_from_file(spatial_data_file_abs):
         raise IOError(message)
 
 
+def read_qgsvectorlayer_from_geojson_stream(geojson_file_abs, sequence=False, bbox=None, include_attributes=None,
+                                            exclude_attributes=None, geopackage_file_abs=None, layer_name=None,
+                                            batch_size=10000):
+    """
+    Reads a GeoJSON or GeoJSONSeq file incrementally and returns a QgsVectorLayer object with its features. Unlike
+    read_qgsvectorlayer_from_file(), the whole document is never loaded into memory: the features are parsed one at a
+    time (see geojson_util.read_features()) and added to the layer in batches, so memory use is bounded by the layer
+    storage. The features can be stored in memory or, for very large files, in a GeoPackage file.
+
+    The file is read twice. The first pass determines the geometry type and the attributes and their types, so that
+    the layer can be created before any features are added. The second pass adds the features.
+
+    Args:
+        geojson_file_abs (str): the full pathname to the GeoJSON file
+        sequence (bool): If TRUE, the file is a GeoJSON text sequence (GeoJSONSeq), with one feature per line.
+        bbox (tuple): a bounding box (xmin, ymin, xmax, ymax) in the coordinate reference system of the file. Only the
+            features with a bounding box that intersects it are read. If None, all features are read.
+        include_attributes (list): a list of glob-style patterns of the attributes to read. If None, all attributes
+            are read.
+        exclude_attributes (list): a list of glob-style patterns of the attributes to not read. If None, no attributes
+            are excluded.
+        geopackage_file_abs (str): the full pathname to a GeoPackage file to store the features in, or None to store
+            the features in memory. The file is overwritten. The returned layer is a layer of the GeoPackage file, so
+            its first attribute is the GeoPackage feature ID column, which the layer stored in memory does not have.
+        layer_name (str): the name of the layer, or None to use the filename
+        batch_size (int): the number of features to add to the layer at a time
+
+    Returns:
+        A QgsVectorLayer object containing the features of the GeoJSON file.
+
+    Raises:
+        ValueError if the file is not valid GeoJSON or has features with different geometry types.
+    """
+
+    if layer_name is None:
+        layer_name = os.path.splitext(os.path.basename(geojson_file_abs))[0]
+
+    def include_feature(feature):
+        # Only include the features that intersect the bounding box.
+        if bbox is None:
+            return True
+        feature_bbox = geojson_util.get_geometry_bbox(feature.get("geometry"))
+        return feature_bbox is not None and geojson_util.bbox_intersects(feature_bbox, bbox)
+
+    # Determine the geometry type and the type of each attribute from the features that are read.
+    # The attribute type is the Python type of the values, with int promoted to float if the attribute has both, and
+    # str if the attribute has any other combination of types or has object or array values.
+    members = dict()
+    geometry_types = set()
+    is_multi = False
+    has_z = False
+    attribute_types = dict()
+    for feature in geojson_util.read_features(geojson_file_abs, sequence, members):
+        if not include_feature(feature):
+            continue
+        geometry = feature.get("geometry")
+        if geometry:
+            geometry_type = geometry.get("type", "")
+            if geometry_type.startswith("Multi"):
+                is_multi = True
+                geometry_type = geometry_type[len("Multi"):]
+            geometry_types.add(geometry_type)
+            if not has_z and geojson_util.get_geometry_dimension(geometry) == 3:
+                has_z = True
+        for attribute_name, value in (feature.get("properties") or {}).items():
+            if value is None:
+                attribute_types.setdefault(attribute_name, None)
+                continue
+            value_type = str if isinstance(value, (dict, list)) else type(value)
+            attribute_type = attribute_types.get(attribute_name)
+            if attribute_type is None:
+                attribute_types[attribute_name] = value_type
+            elif attribute_type is not value_type:
+                attribute_types[attribute_name] = float if {attribute_type, value_type} == {int, float} else str
+
+    if len(geometry_types) > 1:
+        raise ValueError('GeoJSON file "{}" has more than one geometry type ({}).'.format(
+            geojson_file_abs, ", ".join(sorted(geometry_types))))
+    elif geometry_types:
+        geometry_type = geometry_types.pop()
+        if is_multi and geometry_type != "GeometryCollection":
+            geometry_type = "Multi" + geometry_type
+        if has_z:
+            geometry_type += "Z"
+    else:
+        geometry_type = "none"
+    crs = geojson_util.get_crs_code(members.get("crs"))
+
+    # Determine the attributes to read.
+    attribute_names = list(attribute_types.keys())
+    if include_attributes or exclude_attributes:
+        # Keep the attributes in the order of the file.
+        selected_names = set(string_util.filter_list_of_strings(attribute_names, include_attributes,
+                                                                exclude_attributes, return_inclusions=True))
+        attribute_names = [attribute_name for attribute_name in attribute_names if attribute_name in selected_names]
+    field_types = {bool: QVariant.Bool, int: QVariant.LongLong, float: QVariant.Double}
+
+    # Create the layer with the attributes. A GeoPackage layer is created by writing the empty in-memory layer.
+    qgsvectorlayer = create_qgsvectorlayer(geometry_type, crs, layer_name)
+    qgsvectorlayer.dataProvider().addAttributes([
+        QgsField(attribute_name, field_types.get(attribute_types[attribute_name], QVariant.String))
+        for attribute_name in attribute_names])
+    qgsvectorlayer.updateFields()
+    if geopackage_file_abs is not None:
+        write_qgsvectorlayer_to_geopackage(qgsvectorlayer, geopackage_file_abs, crs, layer_name=layer_name,
+                                           write_mode="Overwrite")
+        qgsvectorlayer = read_qgsvectorlayer_from_geopackage(geopackage_file_abs, layer_name)
+    qgsvectorlayer_data = qgsvectorlayer.dataProvider()
+
+    # The layer index of each attribute, which is different from the order of the attribute names if the layer has
+    # other fields, such as the GeoPackage feature ID.
+    layer_fields = qgsvectorlayer.fields()
+    field_count = layer_fields.count()
+    attribute_indices = [(attribute_name, layer_fields.lookupField(attribute_name),
+                          attribute_types[attribute_name] or str) for attribute_name in attribute_names]
+    dimension = 3 if has_z else 2
+
+    # Add the features to the layer in batches.
+    batch = []
+    for feature in geojson_util.read_features(geojson_file_abs, sequence):
+        if not include_feature(feature):
+            continue
+        properties = feature.get("properties") or {}
+        attributes = [None] * field_count
+        for attribute_name, i, attribute_type in attribute_indices:
+            value = properties.get(attribute_name)
+            if value is None:
+                continue
+            elif attribute_type is str and not isinstance(value, str):
+                # Objects and arrays are stored as JSON text.
+                value = json.dumps(value) if isinstance(value, (dict, list)) else str(value)
+            elif attribute_type is float:
+                value = float(value)
+            attributes[i] = value
+
+        qgs_feature = QgsFeature(layer_fields)
+        geometry_wkt = geojson_util.geometry_to_wkt(feature.get("geometry"), dimension)
+        if geometry_wkt is not None:
+            geometry = QgsGeometry.fromWkt(geometry_wkt)
+            if is_multi and not geometry.isMultipart():
+                geometry.convertToMultiType()
+            qgs_feature.setGeometry(geometry)
+        qgs_feature.setAttributes(attributes)
+        batch.append(qgs_feature)
+        if len(batch) >= batch_size:
+            qgsvectorlayer_data.addFeatures(batch)
+            batch = []
+    if batch:
+        qgsvectorlayer_data.addFeatures(batch)
+
+    # Update the extent of the layer, which is not updated as features are added by the data provider.
+    qgsvectorlayer.updateExtents()
+
+    return qgsvectorlayer
+
+
+def read_qgsvectorlayer_from_geopackage(geopackage_file_abs, layer_name=None, include_fid=True):
+
+    """
+    Reads a layer in a GeoPackage file and returns a QGSVectorLayer object.
+
+    The OGR data provider adds the GeoPackage feature ID (primary key) column as the first attribute of the layer.
+    If include_fid is False, the layer is read through an OGR virtual format (VRT) data source that does not declare
+    the feature ID column, so that the layer has the same attributes as the layer that was written. The features of
+    such a layer can be edited, but attributes cannot be added, removed or renamed.
+    REF: https://gdal.org/drivers/vector/vrt.html
+
+    Raises:
+        IOError if the GeoPackage layer is invalid.
+        ValueError if include_fid is False and layer_name is not specified.
+
+    Args:
+        geopackage_file_abs (str): the full pathname to a GeoPackage file
+        layer_name (str): the name of the layer to read, or None to read the first layer
+        include_fid (bool): If TRUE, the feature ID column is included as the first attribute. If FALSE, the feature ID
+            column is not included, and layer_name must be specified.
+
+    Returns:
+        A QGSVectorLayer object containing the data from the GeoPackage layer.
+    """
+
+    # Instantiate the QGSVectorLayer object. A layer in a multi-layer file is selected using the "layername" option of
+    # the OGR data provider.
+    if not include_fid:
+        if not layer_name:
+            raise ValueError("The layer name must be specified to read a GeoPackage layer without the feature ID.")
+        # The source geometry fields and attributes are used because none are declared.
+        vrt = ('<OGRVRTDataSource><OGRVRTLayer name={}>'
+               '<SrcDataSource>{}</SrcDataSource><SrcLayer>{}</SrcLayer>'
+               '</OGRVRTLayer></OGRVRTDataSource>').format(quoteattr(layer_name), escape(geopackage_file_abs),
+                                                           escape(layer_name))
+        qgs_vector_layer_obj = QgsVectorLayer(vrt, layer_name, 'ogr')
+    elif layer_name:
+        qgs_vector_layer_obj = QgsVectorLayer("{}|layername={}".format(geopackage_file_abs, layer_name), layer_name,
+                                              'ogr')
+    else:
+        qgs_vector_layer_obj = QgsVectorLayer(geopackage_file_abs, os.path.basename(geopackage_file_abs), 'ogr')
+
+    # A QgsVectorLayer object is almost always created even if it is invalid.
+    if qgs_vector_layer_obj.isValid():
+        return qgs_vector_layer_obj
+
+    # If the created QGSVectorLayer object is invalid, print an error message and raise an exception.
+    else:
+        message = 'The QGSVectorLayer from GeoPackage "{}" layer "{}" is invalid.'.format(geopackage_file_abs,
+                                                                                         layer_name)
+        logger = logging.getLogger(__name__)
+        logger.warning(message)
+        raise IOError(message)
+
+
+def read_qgsvectorlayer_subset(read_function, read_arguments, where=None, bbox=None, bbox_crs=None,
+                               include_attributes=None, exclude_attributes=None):
+    """
+    Reads a QgsVectorLayer with a read function and returns the subset of its features and attributes that match the
+    filters (see subset_qgsvectorlayer()). This is used to open LazyGeoLayers with filters.
+
+    Args:
+        read_function (function): the function that reads the QgsVectorLayer, for example read_qgsvectorlayer_from_file
+        read_arguments (tuple): the arguments of the read function
+        where (str): an attribute filter, or None to read all features
+        bbox (tuple): a bounding box (xmin, ymin, xmax, ymax), or None to read all features
+        bbox_crs (str): the coordinate reference system code of the bounding box, or None if it is the same as the
+            coordinate reference system of the layer
+        include_attributes (list): a list of glob-style patterns of the attributes to read, or None to read all
+            attributes
+        exclude_attributes (list): a list of glob-style patterns of the attributes to not read, or None to not exclude
+            any attributes
+
+    Returns:
+        The QgsVectorLayer object with the subset of the features and attributes.
+    """
+
+    return subset_qgsvectorlayer(read_function(*read_arguments), where=where, bbox=bbox, bbox_crs=bbox_crs,
+                                 include_attributes=include_attributes, exclude_attributes=exclude_attributes)
+
+
 def remove_qgsvectorlayer_attribute(qgsvectorlayer, attribute_name):
     """
     Deletes an attribute of a QgsVectorLayer object.
@@ -945,9 +1556,12 @@ def remove_qgsvectorlayer_attributes(qgsvectorlayer, keep_patterns, remove_patte
     attrs_to_remove = string_util.filter_list_of_strings(orig_attribute_field_names, keep_patterns, remove_patterns,
                                                          return_inclusions=False)
 
-    # Iterate over each attribute to be removed and delete it.
-    for attr_to_remove in attrs_to_remove:
-        remove_qgsvectorlayer_attribute(qgsvectorlayer, attr_to_remove)
+    # Delete all of the attributes to be removed at once, so that the data provider only rewrites its fields once.
+    if attrs_to_remove:
+        fields = qgsvectorlayer.fields()
+        qgsvectorlayer.dataProvider().deleteAttributes([fields.lookupField(attr_to_remove)
+                                                        for attr_to_remove in attrs_to_remove])
+        qgsvectorlayer.updateFields()
 
 
 def remove_qgsvectorlayer_features(qgsvectorlayer, list_of_feature_ids):
@@ -981,42 +1595,181 @@ def rename_qgsvectorlayer_attribute(qgsvectorlayer, attribute_name, new_attribut
         None.
     """
 
-    # Iterate over the attributes in the Qgs Vector Layer object.
-    for attribute in qgsvectorlayer.fields():
+    rename_qgsvectorlayer_attributes(qgsvectorlayer, {attribute_name: new_attribute_name})
 
-        # If the Qgs Vector Layer attribute name matches the parameter attribute_name, continue.
-        if attribute.name().upper() == attribute_name.upper():
 
-            # Start an editing session within QGIS environment.
-            qgsvectorlayer.startEditing()
+def rename_qgsvectorlayer_attributes(qgsvectorlayer, attribute_names):
+    """
+    Renames attributes of a QgsVectorLayer object. The attributes are renamed in one data provider call if the data
+    provider supports renaming attributes, rather than in an editing session for each attribute. Otherwise, all the
+    attributes are renamed in one editing session.
 
-            # Get the index of the attribute to be renamed.
-            index = qgsvectorlayer.fields().lookupField(attribute.name())
+    Args:
+        qgsvectorlayer (QgsVectorLayer): a QgsVectorLayer object
+        attribute_names (dict): the attributes to rename. Key: the original attribute name (case-insensitive),
+            Value: the new attribute name. Original attribute names that are not found are ignored.
+
+    Returns:
+        None.
+
+    Raises:
+        RuntimeError if the attributes cannot be renamed.
+    """
 
-            # Rename the attribute with the new name (string).
-            qgsvectorlayer.renameAttribute(index, str(new_attribute_name))
+    # Get the index of each attribute to rename. Attribute names are matched case-insensitively.
+    attribute_names_upper = {name.upper(): str(new_name) for name, new_name in attribute_names.items()}
+    new_attribute_names = {}
+    for index, attribute in enumerate(qgsvectorlayer.fields()):
+        if attribute.name().upper() in attribute_names_upper:
+            new_attribute_names[index] = attribute_names_upper[attribute.name().upper()]
 
-            # Commit the changes made to the qgsvectorlayer
-            qgsvectorlayer.commitChanges()
+    if not new_attribute_names:
+        return
 
+    data_provider = qgsvectorlayer.dataProvider()
+    if data_provider.capabilities() & QgsVectorDataProvider.RenameAttributes:
+        # Rename the attributes in the data provider and update the layer fields.
+        if not data_provider.renameAttributes(new_attribute_names):
+            raise RuntimeError('Error renaming the attributes of layer "{}".'.format(qgsvectorlayer.name()))
+        qgsvectorlayer.updateFields()
+    else:
+        # Start an editing session within QGIS environment, rename the attributes, and commit the changes made to the
+        # qgsvectorlayer.
+        qgsvectorlayer.startEditing()
+        for index, new_attribute_name in new_attribute_names.items():
+            qgsvectorlayer.renameAttribute(index, new_attribute_name)
+        if not qgsvectorlayer.commitChanges():
+            raise RuntimeError('Error renaming the attributes of layer "{}": {}'.format(
+                qgsvectorlayer.name(), qgsvectorlayer.commitErrors()))
 
-def split_qgsvectorlayer_by_attribute(qgsvectorlayer, attribute_name, output_qgsvectorlayers):
+
+def split_qgsvectorlayer_by_attribute(qgsvectorlayer, attribute_name):
     """
-    Split the QgsVectorLayer object into multiple vector layers based on an attribute's unique values.
+    Split the QgsVectorLayer object into multiple in-memory vector layers based on an attribute's unique values.
 
-    REF: QGIS User Manual <https://docs.qgis.org/2.8/en/docs/user_manual/processing_algs/qgis/vector_general_tools.html#split-vector-layer>
+    The input features are scanned once, reading only the attribute (no geometry), to group the feature IDs by
+    attribute value. Each group of features is then copied to a new in-memory QgsVectorLayer in batches
+    (see copy_qgsvectorlayer()), requesting only the features in the group.
 
     Args:
         qgsvectorlayer (QgsVectorLayer): the QGSVectorLayer object
         attribute_name (str):  the name of the attribute that splits the qgsvectorlayer into multiple layers
-        output_qgsvectorlayers (QgsVectorLayer): the QgsVectorLayer objects that are created by the split
 
     Returns:
-        multiple QgsVectorLayers.  The number of layers is based on the number of unique values of the selected attribute.
+        A list of (attribute value, QgsVectorLayer) tuples, in the order that the attribute values are first found.
+        The number of layers is based on the number of unique values of the selected attribute. Features with a NULL
+        attribute value are in the layer for the value None.
+    """
+
+    # Group the feature IDs by attribute value. Dictionaries maintain insertion order, so the groups are in the order
+    # that the attribute values are first found.
+    feature_ids_by_value = {}
+    for feature in get_features(qgsvectorlayer, attribute_names=[attribute_name], include_geometry=False):
+        attribute_value = feature[attribute_name]
+        # NULL values are QVariant objects, which are not equal to each other as dictionary keys.
+        if isinstance(attribute_value, QVariant) and attribute_value.isNull():
+            attribute_value = None
+        feature_ids_by_value.setdefault(attribute_value, []).append(feature.id())
+
+    # Copy each group of features to a new in-memory QgsVectorLayer.
+    output_qgsvectorlayers = []
+    for attribute_value, feature_ids in feature_ids_by_value.items():
+        output_qgsvectorlayer = copy_qgsvectorlayer(qgsvectorlayer, feature_ids=feature_ids,
+                                                    layer_name="{}_{}".format(attribute_name, attribute_value))
+        output_qgsvectorlayers.append((attribute_value, output_qgsvectorlayer))
+
+    return output_qgsvectorlayers
+
+
+def subset_qgsvectorlayer(qgsvectorlayer, where=None, bbox=None, bbox_crs=None, layer_name=None,
+                          include_attributes=None, exclude_attributes=None):
+    """
+    Returns the subset of the features of a QgsVectorLayer that match an attribute filter and intersect a bounding box,
+    optionally with only some of the attributes. The filters are passed to the data provider, so that features that do
+    not match and attributes that are not selected are not decoded.
+
+    The attribute filter is set as the subset string of the layer (QgsVectorLayer.setSubsetString()). For the OGR data
+    provider, the subset string is an OGR SQL WHERE clause that is evaluated by OGR, and the layer remains a layer of
+    the data source. The bounding box is used as an OGR spatial filter, which uses the spatial index of the data source
+    (for example, a shapefile .qix or .sbn file or a GeoPackage R-tree), and the features that intersect it are copied
+    to an in-memory layer. If attributes are selected, the features are copied to an in-memory layer with only the
+    selected attributes. The OGR data provider tells OGR to ignore the other attributes, so that they are not read
+    (for example, from a shapefile .dbf file).
+
+    Args:
+        qgsvectorlayer (QgsVectorLayer): the QgsVectorLayer object
+        where (str): an attribute filter (for the OGR data provider, an OGR SQL WHERE clause, for example
+            "COUNTY = 'Larimer'"), or None to include all features
+        bbox (tuple): a bounding box (xmin, ymin, xmax, ymax) that the features must intersect, or None to include all
+            features
+        bbox_crs (str): the coordinate reference system code of the bounding box, or None if it is the same as the
+            coordinate reference system of the layer. The bounding box is transformed to the coordinate reference
+            system of the layer.
+        layer_name (str): the name of the in-memory layer, or None to use the name of the layer
+        include_attributes (list): a list of glob-style patterns of the attributes to include, or None to include all
+            attributes
+        exclude_attributes (list): a list of glob-style patterns of the attributes to not include, or None to not
+            exclude any attributes
+
+    Returns:
+        The QgsVectorLayer object, with the subset string set, or a new in-memory QgsVectorLayer object if a bounding
+        box or attribute patterns are specified.
+
+    Raises:
+        ValueError if the attribute filter is invalid.
+    """
+
+    if where:
+        if not qgsvectorlayer.setSubsetString(where):
+            raise ValueError('The filter "{}" is not valid for layer "{}".'.format(where, qgsvectorlayer.name()))
+
+    # Determine the attributes to include. The attributes are copied in the order of the layer.
+    attribute_names = None
+    if include_attributes or exclude_attributes:
+        attribute_names = string_util.filter_list_of_strings([field.name() for field in qgsvectorlayer.fields()],
+                                                             include_attributes, exclude_attributes,
+                                                             return_inclusions=True)
+
+    if bbox is None and attribute_names is None:
+        return qgsvectorlayer
+
+    filter_rect = None
+    if bbox is not None:
+        filter_rect = QgsRectangle(bbox[0], bbox[1], bbox[2], bbox[3])
+        if bbox_crs:
+            bbox_qgs_crs = QgsCoordinateReferenceSystem(bbox_crs)
+            if bbox_qgs_crs != qgsvectorlayer.crs():
+                transform = QgsCoordinateTransform(bbox_qgs_crs, qgsvectorlayer.crs(), QgsProject.instance())
+                filter_rect = transform.transformBoundingBox(filter_rect)
+
+    if layer_name is None:
+        layer_name = qgsvectorlayer.name()
+    return copy_qgsvectorlayer(qgsvectorlayer, attribute_names=attribute_names, layer_name=layer_name,
+                               filter_rect=filter_rect)
+
+
+def __write_geojson_chunk(output, chunk, sequence, feature_count):
+    """
+    Write a chunk of GeoJSON feature text to a file with one string operation.
+
+    Args:
+        output (file): the output file
+        chunk (list): the text of each feature in the chunk
+        sequence (bool): If TRUE, the features are written as GeoJSONSeq, with each feature on its own line. If FALSE,
+            the features are separated by commas within a FeatureCollection "features" array.
+        feature_count (int): the number of features that have already been written, used to determine whether a
+            comma is needed before the first feature of the chunk
+
+    Returns:
+        None
     """
 
-    # Split the QgsVectorLayer by the chosen attribute.  Output QgsVectorLayer names should be automatically generated??
-    processing.run('qgis:splitvectorlayer', qgsvectorlayer, attribute_name, output_qgsvectorlayers)
+    if sequence:
+        output.write("\n".join(chunk) + "\n")
+    elif feature_count > 0:
+        output.write(",\n" + ",\n".join(chunk))
+    else:
+        output.write(",\n".join(chunk))
 
 
 def write_qgsvectorlayer_to_delimited_file(qgsvectorlayer, output_file, crs, geometry_type, separator="COMMA"):
@@ -1056,6 +1809,85 @@ def write_qgsvectorlayer_to_delimited_file(qgsvectorlayer, output_file, crs, geo
                                                           'SEPARATOR={}'.format(separator)])
 
 
+def write_qgsvectorlayer_to_delimited_file_stream(qgsvectorlayer, output_file, crs, geometry_type, separator="COMMA"):
+    """
+    Write the QgsVectorLayer object to a delimited file, one feature at a time, through io_util.open_file(). If the
+    output file has a compression extension (.bz2, .gz, .xz or .zip), the text is compressed as it is written, so an
+    uncompressed copy of the file is never written. The layout is the same as the layout written by
+    write_qgsvectorlayer_to_delimited_file() (the OGR CSV driver): the geometry columns are first (X and Y, X, Y and Z,
+    Y and X, or WKT), followed by the attributes. Null values are written as empty values.
+
+    Args:
+        qgsvectorlayer (QgsVectorLayer): the QGSVectorLayer object
+        output_file (str): the full pathname to the output file, including the extensions (for example example.csv.gz)
+        crs (str): the output coordinate reference system in EPSG code. The features are reprojected if the
+            QgsVectorLayer has a different coordinate reference system.
+        geometry_type (str): the type of geometry to export ( `WKT`, `XYZ`, `XY` or `YX`). The coordinate columns are
+            only written for point geometries and are empty for other geometries.
+        separator (str): the delimiter of the output delimited file (`COMMA`, `SEMICOLON`, `TAB` or `SPACE`)
+
+    Returns:
+        The number of features that were written.
+    """
+
+    delimiters = {"COMMA": ",", "SEMICOLON": ";", "TAB": "\t", "SPACE": " "}
+    geometry_type = geometry_type.upper()
+    if geometry_type == "WKT":
+        geometry_columns = ["WKT"]
+    else:
+        geometry_columns = list(geometry_type)
+
+    # Reproject the features if the output coordinate reference system is different.
+    output_crs = QgsCoordinateReferenceSystem(crs)
+    if qgsvectorlayer.crs() != output_crs:
+        transform = QgsCoordinateTransform(qgsvectorlayer.crs(), output_crs, QgsProject.instance())
+    else:
+        transform = None
+
+    def format_value(value):
+        # Format a value the same way as the OGR CSV driver.
+        if value is None or (isinstance(value, QVariant) and value.isNull()):
+            return ""
+        elif isinstance(value, bool):
+            return str(int(value))
+        elif isinstance(value, float):
+            return "{:.15g}".format(value)
+        elif isinstance(value, QtCore.QDateTime):
+            return value.toString("yyyy/MM/dd HH:mm:ss")
+        elif isinstance(value, QtCore.QDate):
+            return value.toString("yyyy/MM/dd")
+        elif isinstance(value, QtCore.QTime):
+            return value.toString("HH:mm:ss")
+        else:
+            return str(value)
+
+    feature_count = 0
+    with io_util.open_file(output_file, "w", encoding="utf-8", newline="") as output:
+        writer = csv.writer(output, delimiter=delimiters[separator.upper()], lineterminator=os.linesep)
+        writer.writerow(geometry_columns + qgsvectorlayer.fields().names())
+
+        for feature in qgsvectorlayer.getFeatures():
+            geometry = feature.geometry()
+            if geometry.isNull():
+                geometry_values = [""] * len(geometry_columns)
+            else:
+                if transform is not None:
+                    geometry.transform(transform)
+                if geometry_type == "WKT":
+                    geometry_values = [geometry.asWkt()]
+                elif QgsWkbTypes.flatType(geometry.wkbType()) == QgsWkbTypes.Point:
+                    point = geometry.constGet()
+                    coordinates = {"X": point.x(), "Y": point.y(), "Z": point.z() if point.is3D() else None}
+                    geometry_values = [format_value(coordinates[column]) for column in geometry_columns]
+                else:
+                    geometry_values = [""] * len(geometry_columns)
+
+            writer.writerow(geometry_values + [format_value(value) for value in feature.attributes()])
+            feature_count += 1
+
+    return feature_count
+
+
 def write_qgsvectorlayer_to_geojson(qgsvectorlayer, output_file, crs, precision):
     """
     Write the QgsVectorLayer object to a spatial data file in GeoJSON format.
@@ -1091,6 +1923,220 @@ def write_qgsvectorlayer_to_geojson(qgsvectorlayer, output_file, crs, precision)
                                             layerOptions=['COORDINATE_PRECISION={}'.format(precision), 'WRITE_NAME=NO'])
 
 
+def write_qgsvectorlayer_to_geojson_stream(qgsvectorlayer, output_file, crs, precision, sequence=False,
+                                           attribute_names=None, include_bbox=False, chunk_size=1000,
+                                           buffer_size=1048576):
+    """
+    Write the QgsVectorLayer object to a GeoJSON or GeoJSONSeq file, one feature at a time. Only the features in the
+    current chunk are held in memory, so large layers can be written without building the whole document in memory.
+    The text of each feature is created directly from the geometry and attribute values, and chunks of features are
+    written through a buffered file.
+    REF: `GeoJSON Text Sequences <https://tools.ietf.org/html/rfc8142>_`
+
+    Args:
+        qgsvectorlayer (QgsVectorLayer): the QgsVectorLayer object
+        output_file (str): the full pathname to the output file
+        crs (str): the output coordinate reference system in EPSG code. The features are reprojected if the
+            QgsVectorLayer has a different coordinate reference system.
+        precision (int): a integer at or between 0 and 15 that determines the number of decimal places to include
+            in the output geometry and bounding boxes
+        sequence (bool): If TRUE, the file is written as GeoJSONSeq, with one feature per line. If FALSE, the file is
+            written as a GeoJSON FeatureCollection, with one feature per line within the "features" array.
+        attribute_names (list): the names of the attributes to write, in order, or None to write all attributes.
+            Only these attributes are read from the data provider.
+        include_bbox (bool): If TRUE, the bounding box of each feature is written as the feature "bbox" member.
+        chunk_size (int): the number of features to write to the file at a time
+        buffer_size (int): the size of the output file buffer, in bytes
+
+    Returns:
+        The number of features that were written.
+    """
+
+    # Reproject the features if the output coordinate reference system is different.
+    output_crs = QgsCoordinateReferenceSystem(crs)
+    if qgsvectorlayer.crs() != output_crs:
+        transform = QgsCoordinateTransform(qgsvectorlayer.crs(), output_crs, QgsProject.instance())
+    else:
+        transform = None
+
+    # Only request the attributes that are written. The attribute names are encoded once, rather than per feature.
+    fields = qgsvectorlayer.fields()
+    if attribute_names is None:
+        attribute_names = fields.names()
+    attribute_indices = [fields.lookupField(attribute_name) for attribute_name in attribute_names]
+    request = get_qgsfeaturerequest_obj(qgsvectorlayer, attribute_names)
+
+    def encode_value(value):
+        # Called by json.dumps for values that are not JSON types, such as NULL and date/time values.
+        if isinstance(value, QVariant) and value.isNull():
+            return None
+        elif isinstance(value, (QtCore.QDate, QtCore.QDateTime, QtCore.QTime)):
+            return value.toString(QtCore.Qt.ISODate)
+        else:
+            return str(value)
+
+    feature_count = 0
+    with open(output_file, "w", encoding="utf-8", newline="\n", buffering=buffer_size) as output:
+
+        # A FeatureCollection has a header and footer around the features. The "crs" member is written the same way as
+        # the GDAL GeoJSON driver, which only writes it if the coordinate reference system is not WGS 84.
+        if not sequence:
+            output.write('{"type": "FeatureCollection",\n')
+            authid = output_crs.authid()
+            if authid and authid != "EPSG:4326":
+                output.write('"crs": {{"type": "name", "properties": {{"name": "urn:ogc:def:crs:{}"}}}},\n'.format(
+                    authid.replace(":", "::")))
+            output.write('"features": [\n')
+
+        chunk = []
+        for feature in qgsvectorlayer.getFeatures(request):
+            attributes = feature.attributes()
+            properties = json.dumps({attribute_name: attributes[i]
+                                     for attribute_name, i in zip(attribute_names, attribute_indices)},
+                                    ensure_ascii=False, default=encode_value)
+
+            geometry = feature.geometry()
+            if geometry.isNull():
+                geometry_json = "null"
+                bbox_json = None
+            else:
+                if transform is not None:
+                    geometry.transform(transform)
+                geometry_json = geometry.asJson(precision)
+                if include_bbox:
+                    rectangle = geometry.boundingBox()
+                    bbox_json = json.dumps([round(rectangle.xMinimum(), precision),
+                                            round(rectangle.yMinimum(), precision),
+                                            round(rectangle.xMaximum(), precision),
+                                            round(rectangle.yMaximum(), precision)])
+                else:
+                    bbox_json = None
+
+            if bbox_json is None:
+                chunk.append('{{"type": "Feature", "geometry": {}, "properties": {}}}'.format(
+                    geometry_json, properties))
+            else:
+                chunk.append('{{"type": "Feature", "bbox": {}, "geometry": {}, "properties": {}}}'.format(
+                    bbox_json, geometry_json, properties))
+
+            # Write the chunk. Features in a FeatureCollection are separated by commas.
+            if len(chunk) >= chunk_size:
+                __write_geojson_chunk(output, chunk, sequence, feature_count)
+                feature_count += len(chunk)
+                chunk = []
+        if chunk:
+            __write_geojson_chunk(output, chunk, sequence, feature_count)
+            feature_count += len(chunk)
+
+        if not sequence:
+            output.write("\n]}\n")
+
+    return feature_count
+
+
+def write_qgsvectorlayer_to_geopackage(qgsvectorlayer, output_file, crs, layer_name=None, write_mode="Overwrite",
+                                       spatial_index=True, transaction_size=None):
+    """
+    Write the QgsVectorLayer object to a layer in a spatial data file in GeoPackage format. A GeoPackage file can hold
+    many layers, so a layer can be added to or replaced in an existing file, or features can be appended to an existing
+    layer. GeoPackage files do not have the 2 GB size limit and 10-character attribute name limit of shapefiles.
+    REF: `QGIS API Documentation <https://qgis.org/api/classQgsVectorFileWriter.html>_`
+    REF: `GeoPackage GDAL Specifications <https://gdal.org/drivers/vector/gpkg.html>_`
+
+    Args:
+        qgsvectorlayer (QgsVectorLayer): the QgsVectorLayer object
+        output_file (str): the full pathname to the output file (including the .gpkg extension)
+        crs (str): the output coordinate reference system in EPSG code
+        layer_name (str): the name of the layer in the GeoPackage, or None to use the output filename
+        write_mode (str): how the layer is written if the output file exists (the file is created if it does not):
+            "Overwrite": the file is replaced with a file that only has the layer.
+            "ReplaceLayer": the layer is added to the file, replacing a layer with the same name. Other layers are kept.
+            "Append": the features are appended to the existing layer with the same name.
+        spatial_index (bool): If TRUE, a spatial index is created for the layer (SPATIAL_INDEX=YES).
+        transaction_size (int): the number of features written in each database transaction, or None to write all
+            features in one transaction (fastest). Smaller transactions limit the size of the uncommitted data.
+
+    Returns:
+        None
+
+    Raises:
+        ValueError if the write mode is not recognized.
+        IOError if the layer could not be written.
+    """
+
+    actions = {"OVERWRITE": QgsVectorFileWriter.CreateOrOverwriteFile,
+               "REPLACELAYER": QgsVectorFileWriter.CreateOrOverwriteLayer,
+               "APPEND": QgsVectorFileWriter.AppendToLayerNoNewFields}
+    if write_mode.upper() not in actions:
+        raise ValueError('Write mode "{}" is not recognized. Valid write modes are: {}'.format(
+            write_mode, ["Overwrite", "ReplaceLayer", "Append"]))
+
+    if layer_name is None:
+        layer_name = os.path.splitext(os.path.basename(output_file))[0]
+
+    # Layers can only be added to, or appended to, an existing file.
+    if os.path.exists(output_file):
+        action = actions[write_mode.upper()]
+    else:
+        action = QgsVectorFileWriter.CreateOrOverwriteFile
+
+    options = QgsVectorFileWriter.SaveVectorOptions()
+    options.driverName = "GPKG"
+    options.fileEncoding = "utf-8"
+    options.layerName = layer_name
+    options.layerOptions = ["SPATIAL_INDEX={}".format("YES" if spatial_index else "NO")]
+    output_crs = QgsCoordinateReferenceSystem(crs)
+    if output_crs != qgsvectorlayer.crs():
+        options.ct = QgsCoordinateTransform(qgsvectorlayer.crs(), output_crs, QgsProject.instance())
+
+    # Each call to the writer writes its features in one transaction. To use smaller transactions, the features are
+    # written in batches of feature IDs, appending each batch after the first to the layer.
+    if transaction_size and qgsvectorlayer.featureCount() > transaction_size:
+        feature_ids = [feature.id() for feature in get_features(qgsvectorlayer, attribute_names=[],
+                                                                include_geometry=False)]
+        feature_id_batches = [feature_ids[i:i + transaction_size] for i in range(0, len(feature_ids),
+                                                                                 transaction_size)]
+    else:
+        feature_id_batches = [None]
+
+    # An attribute with the name of the feature ID (primary key) column ("fid") is written as the feature ID, which
+    # fails if the values are not unique integers. Unless the attribute is the feature ID of the input layer (for
+    # example, a layer read from a GeoPackage), the feature ID column is given an unused name, so that the attribute is
+    # written as a normal attribute. Features that are appended to an existing layer use the layer's feature ID column.
+    if action != QgsVectorFileWriter.AppendToLayerNoNewFields:
+        field_names = qgsvectorlayer.fields().names()
+        key_names = [field_names[i] for i in qgsvectorlayer.dataProvider().pkAttributeIndexes()]
+        if any(name.lower() == "fid" and name not in key_names for name in field_names):
+            lower_field_names = set([name.lower() for name in field_names])
+            fid_number = 1
+            while "fid_{}".format(fid_number) in lower_field_names:
+                fid_number += 1
+            options.layerOptions.append("FID=fid_{}".format(fid_number))
+
+    for feature_id_batch in feature_id_batches:
+        options.actionOnExistingFile = action
+        if feature_id_batch is not None:
+            # The writer requires a set of feature IDs.
+            options.filterFeatureIds = set(feature_id_batch)
+
+        # Write the QgsVectorLayer object to a spatial data file in GeoPackage format.
+        # Depending on the QGIS version, the error is returned alone or with an error message.
+        result = QgsVectorFileWriter.writeAsVectorFormat(qgsvectorlayer, output_file, options)
+        if isinstance(result, tuple):
+            error, error_message = result[0], result[1]
+        else:
+            error, error_message = result, ""
+        if error != QgsVectorFileWriter.NoError:
+            message = 'Error writing layer "{}" to GeoPackage "{}" ({}).'.format(layer_name, output_file,
+                                                                                  error_message)
+            logger = logging.getLogger(__name__)
+            logger.warning(message)
+            raise IOError(message)
+
+        # Append the remaining batches to the layer that was written.
+        action = QgsVectorFileWriter.AppendToLayerNoNewFields
+
+
 def write_qgsvectorlayer_to_kml(qgsvectorlayer, output_file, crs, name_field, desc_field, altitude_mode):
     """
     Write the QgsVectorLayer object to a spatial data file in KML format.
@@ -0,0 +1,247 @@
+# type_util - utility functions to determine the data type of table column values
+# ________________________________________________________________NoticeStart_
+# GeoProcessor
+# Copyright (C) 2017-2019 Open Water Foundation
+#
+# GeoProcessor is free software:  you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     GeoProcessor is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with GeoProcessor.  If not, see <https://www.gnu.org/licenses/>.
+# ________________________________________________________________NoticeEnd___
+
+import logging
+
+# The strings that are recognized as Boolean values (case-insensitive).
+BOOLEAN_VALUES = {"TRUE": True, "FALSE": False, "1": True, "0": False}
+
+# The number of non-null values used to determine the initial data type of a column of strings.
+DEFAULT_SAMPLE_SIZE = 1000
+
+# The data types that strings are converted to, in order of preference. A column is assigned the first data type that
+# all of its non-null values can be converted to. For example, "1" and "0" are converted to Boolean values, unless the
+# column also has values such as "2", in which case the values are converted to integers.
+STRING_DATA_TYPES = [bool, int, float, str]
+
+
+def __convert_boolean(value):
+    """
+    Convert a string to a Boolean value.
+
+    Args:
+        value (str): the string to convert
+
+    Returns:
+        The Boolean value.
+
+    Raises:
+        KeyError if the string is not a Boolean value (see BOOLEAN_VALUES).
+    """
+
+    return BOOLEAN_VALUES[value.upper()]
+
+
+def __get_converter(data_type):
+    """
+    Return the function to convert strings to a data type.
+
+    Args:
+        data_type (type): bool, int, float or str
+
+    Returns:
+        A function that takes a string and returns the converted value, or raises KeyError or ValueError if the string
+        cannot be converted.
+    """
+
+    if data_type is bool:
+        return __convert_boolean
+    elif data_type is str:
+        return str
+    else:
+        return data_type
+
+
+def convert_column(values, null_values=None, sample_size=DEFAULT_SAMPLE_SIZE, parse_strings=True):
+    """
+    Determine the data type of the values in a column and return the values converted to that data type, with null
+    values converted to None.
+
+    If parse_strings is TRUE and the values are strings (for example, read from a delimited file), the column is
+    assigned the first data type in STRING_DATA_TYPES that all of the non-null values can be converted to.
+    The initial data type is determined from a sample of values (see infer_column_type()), and the values are then
+    converted in one pass. If a value cannot be converted, the column falls back to the next data type and the values
+    that were already converted are converted again. Because the sample normally determines the data type, this rarely
+    happens, and it happens at most three times. Once the data type is str, the remaining values are copied without
+    checking.
+
+    Otherwise, the values are already typed (for example, read from a database or Excel worksheet) and are not
+    converted. The data type is the type of the non-null values, with int promoted to float if a column contains both.
+
+    Args:
+        values (list): the column values
+        null_values (list): the values that represent null values, which are converted to None. The values are
+            compared using a hashed set, so the time to check a value does not depend on the number of null values.
+        sample_size (int): the number of non-null values used to determine the initial data type of a column of
+            strings. If None, all of the values are checked first.
+        parse_strings (bool): If TRUE, strings are converted to the data type of the column. If FALSE, strings are
+            kept as strings, for example to preserve text cells that look like numbers.
+
+    Returns:
+        A tuple of the data type (bool, int, float, str, the common type of typed values, or object if the typed values
+        have different types) and the list of converted values. The data type is None if all values are null.
+    """
+
+    null_values = frozenset(null_values) if null_values else frozenset()
+
+    # Find the first non-null value, which determines whether the values are strings that need to be parsed.
+    first_value = None
+    for value in values:
+        if value is not None and not (null_values and value in null_values):
+            first_value = value
+            break
+
+    # If all values are null, the data type cannot be determined.
+    if first_value is None:
+        return None, [None] * len(values)
+
+    if not (parse_strings and isinstance(first_value, str)):
+        # The values are typed. Replace null values with None and determine the common data type.
+        # Typed values may not be hashable (for example, database array values), so they are only checked against
+        # the null values if null values are specified.
+        if null_values:
+            converted_values = [None if value is None or value in null_values else value for value in values]
+        else:
+            converted_values = list(values)
+        return get_common_type(converted_values), converted_values
+
+    # Determine the initial data type from a sample of the values.
+    data_type = infer_column_type(values, null_values, sample_size)
+    data_type_index = STRING_DATA_TYPES.index(data_type)
+    converter = __get_converter(data_type)
+
+    converted_values = []
+    append = converted_values.append
+    for i, value in enumerate(values):
+        if value is None or value in null_values:
+            append(None)
+            continue
+        if data_type is str:
+            # No value can fail to be a string, so the remaining values are copied.
+            converted_values.extend([None if value is None or value in null_values else value
+                                     for value in values[i:]])
+            break
+        try:
+            append(converter(value))
+        except (AttributeError, KeyError, ValueError):
+            # The value does not match the sample. Fall back to the next data type that all values so far match, and
+            # convert the values that were already converted.
+            while True:
+                data_type_index += 1
+                data_type = STRING_DATA_TYPES[data_type_index]
+                converter = __get_converter(data_type)
+                try:
+                    converted_values[:] = [None if previous is None or previous in null_values else
+                                           converter(previous) for previous in values[:i + 1]]
+                    break
+                except (AttributeError, KeyError, ValueError):
+                    continue
+
+    return data_type, converted_values
+
+
+def get_common_type(values):
+    """
+    Return the common type of typed values. None values are ignored. Integers are promoted to float if the values
+    also contain floats. The check stops at the first value with a type that cannot be combined with the others.
+
+    Args:
+        values (list): the values to check
+
+    Returns:
+        The common type, object if the values have different types, or None if all values are None.
+    """
+
+    common_type = None
+    for value in values:
+        if value is None:
+            continue
+        value_type = type(value)
+        if common_type is None or value_type is common_type:
+            common_type = value_type
+        elif {common_type, value_type} == {int, float}:
+            common_type = float
+        else:
+            logger = logging.getLogger(__name__)
+            logger.debug("Column values have different types ({} and {}).".format(common_type.__name__,
+                                                                                  value_type.__name__))
+            return object
+    return common_type
+
+
+def infer_column_type(values, null_values=None, sample_size=None):
+    """
+    Determine the data type of a column of strings in one pass. Each non-null value is only checked against the data
+    types that all previous values matched, and the check stops as soon as only str is possible, so columns of text
+    are detected after the first value that is not a number or Boolean.
+
+    Args:
+        values (list): the column values (strings or None)
+        null_values (set or list): the values that represent null values, which are ignored
+        sample_size (int): the maximum number of non-null values to check. If None, all values are checked.
+
+    Returns:
+        The first data type in STRING_DATA_TYPES that all checked values can be converted to, or None if all values
+        are null.
+    """
+
+    if null_values is None:
+        null_values = frozenset()
+    elif not isinstance(null_values, (set, frozenset)):
+        null_values = frozenset(null_values)
+
+    is_boolean = True
+    is_int = True
+    is_float = True
+    checked_count = 0
+    for value in values:
+        if value is None or value in null_values:
+            continue
+        checked_count += 1
+
+        if is_boolean and value.upper() not in BOOLEAN_VALUES:
+            is_boolean = False
+        if is_int:
+            try:
+                int(value)
+            except ValueError:
+                is_int = False
+        # Integers are also floats, so the float conversion only needs to be checked if the value is not an integer.
+        if is_float and not is_int:
+            try:
+                float(value)
+            except ValueError:
+                is_float = False
+
+        # Stop checking if the values can only be strings or enough values have been checked.
+        if not (is_boolean or is_int or is_float):
+            return str
+        if sample_size is not None and checked_count >= sample_size:
+            break
+
+    if checked_count == 0:
+        return None
+    elif is_boolean:
+        return bool
+    elif is_int:
+        return int
+    elif is_float:
+        return float
+    else:
+        return str
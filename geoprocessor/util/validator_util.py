@@ -226,8 +226,7 @@ def run_check(self, condition, parameter_name, parameter_value, fail_response, o
                                                                                                    excel_file_abs)
         recommendation = "Specify an existing and valid {}.".format(parameter_name)
 
-        excel_workbook_obj = pandas_util.create_excel_workbook_obj(excel_file_abs)
-        excel_worksheet_list = excel_workbook_obj.sheet_names
+        excel_worksheet_list = pandas_util.get_excel_sheet_names(excel_file_abs)
 
         if parameter_value not in excel_worksheet_list:
             check_failed = True
@@ -490,6 +489,34 @@ def run_check(self, condition, parameter_name, parameter_value, fail_response, o
     return run_the_command
 
 
+def validate_bounding_box(bbox_value, none_allowed, empty_string_allowed):
+    """
+    Validate that a bounding box string is four comma-separated numbers (xmin,ymin,xmax,ymax), with the minimum values
+    not greater than the maximum values.
+
+    Args:
+        bbox_value: Bounding box string to check.
+        none_allowed: If the value is None, OK.
+        empty_string_allowed: If the value is an empty string, OK.
+
+    Returns:
+        True if bounding box value is valid, False if invalid.
+    """
+    # First check some specific cases
+    if bbox_value is None:
+        return none_allowed
+    if bbox_value == "":
+        return empty_string_allowed
+    bounds = [bound.strip() for bound in bbox_value.split(",")]
+    if len(bounds) != 4:
+        return False
+    try:
+        xmin, ymin, xmax, ymax = [float(bound) for bound in bounds]
+    except ValueError:
+        return False
+    return xmin <= xmax and ymin <= ymax
+
+
 def validate_bool(bool_value, none_allowed, empty_string_allowed):
     """
     Validate that a boolean value is True or False.